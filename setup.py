@@ -27,4 +27,5 @@ setup(
     description='Business One Customer (B1C)',
     author='John James',
     license='BSD-3',
+    entry_points={'console_scripts': ['xrec=xrec.cli:main']},
 )
@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+# ======================================================================================================================== #
+# Project  : Explainable Recommendation (XRec)                                                                             #
+# Version  : 0.1.0                                                                                                         #
+# File     : \test_benchmarks_pipeline.py                                                                                  #
+# Language : Python 3.8                                                                                                    #
+# ------------------------------------------------------------------------------------------------------------------------ #
+# Author   : John James                                                                                                    #
+# Company  : Bryant St. Labs                                                                                               #
+# Email    : john.james.ai.studio@gmail.com                                                                                #
+# URL      : https://github.com/john-james-ai/xrec                                                                         #
+# ------------------------------------------------------------------------------------------------------------------------ #
+# Created  : Monday, October 19th 2026, 9:00:00 am                                                                         #
+# Modified : Monday, October 19th 2026, 9:00:00 am                                                                         #
+# Modifier : John James (john.james.ai.studio@gmail.com)                                                                   #
+# ------------------------------------------------------------------------------------------------------------------------ #
+# License  : BSD 3-clause "New" or "Revised" License                                                                       #
+# Copyright: (c) 2021 Bryant St. Labs                                                                                      #
+# ======================================================================================================================== #
+# %%
+import copy
+import logging
+import inspect
+from xrec.benchmarks.pipeline import STAGES, run, compare
+# ------------------------------------------------------------------------------------------------------------------------ #
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+class TestPipelineBenchmark:
+
+    def test_run(self, tmp_path):
+        logger.info("    Started {} {}".format(
+            self.__class__.__name__, inspect.stack()[0][3]))
+
+        results = run(str(tmp_path), n_categories=2, n_reviews=2000, factors=8, iterations=2,
+                      k=10, n_workers=2)
+        assert list(results['stages']) == STAGES, \
+            logger.error("     Failure in {}.".format(inspect.stack()[0][3]))
+        assert results['stages']['metadata']['records'] == 4, \
+            logger.error("     Failure in {}.".format(inspect.stack()[0][3]))
+        assert results['stages']['ingestion']['records'] == 4000, \
+            logger.error("     Failure in {}.".format(inspect.stack()[0][3]))
+        for stage in results['stages'].values():
+            assert stage['seconds'] > 0 and stage['peak_rss'] > 0, \
+                logger.error("     Failure in {}.".format(inspect.stack()[0][3]))
+
+        assert compare(results, results) == [], \
+            logger.error("     Failure in {}.".format(inspect.stack()[0][3]))
+        slower = copy.deepcopy(results)
+        slower['stages']['training'].update(seconds=10.0, throughput=1.0)
+        baseline = copy.deepcopy(results)
+        baseline['stages']['training'].update(seconds=1.0, throughput=100.0)
+        regressions = compare(slower, baseline)
+        assert {(r['stage'], r['measure']) for r in regressions} == \
+            {('training', 'seconds'), ('training', 'throughput')}, \
+            logger.error("     Failure in {}.".format(inspect.stack()[0][3]))
+
+        logger.info("    Successfully completed {} {}".format(
+            self.__class__.__name__, inspect.stack()[0][3]))
+# %%
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+# ======================================================================================================================== #
+# Project  : Explainable Recommendation (XRec)                                                                             #
+# Version  : 0.1.0                                                                                                         #
+# File     : \test_cli.py                                                                                                  #
+# Language : Python 3.8                                                                                                    #
+# ------------------------------------------------------------------------------------------------------------------------ #
+# Author   : John James                                                                                                    #
+# Company  : Bryant St. Labs                                                                                               #
+# Email    : john.james.ai.studio@gmail.com                                                                                #
+# URL      : https://github.com/john-james-ai/xrec                                                                         #
+# ------------------------------------------------------------------------------------------------------------------------ #
+# Created  : Monday, October 19th 2026, 9:00:00 am                                                                         #
+# Modified : Monday, October 19th 2026, 9:00:00 am                                                                         #
+# Modifier : John James (john.james.ai.studio@gmail.com)                                                                   #
+# ------------------------------------------------------------------------------------------------------------------------ #
+# License  : BSD 3-clause "New" or "Revised" License                                                                       #
+# Copyright: (c) 2021 Bryant St. Labs                                                                                      #
+# ======================================================================================================================== #
+# %%
+import os
+import json
+import logging
+import inspect
+from click.testing import CliRunner
+from xrec.benchmarks.startup import loaded_modules
+from xrec.cli import cli
+from xrec.data.synthetic import SyntheticAmazon
+# ------------------------------------------------------------------------------------------------------------------------ #
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+class TestCLI:
+
+    def test_lazy_imports(self):
+        logger.info("    Started {} {}".format(
+            self.__class__.__name__, inspect.stack()[0][3]))
+
+        assert loaded_modules('xrec.cli') == [], \
+            logger.error("     Failure in {}.".format(inspect.stack()[0][3]))
+        assert loaded_modules('xrec.data.extract') == [], \
+            logger.error("     Failure in {}.".format(inspect.stack()[0][3]))
+        result = CliRunner().invoke(cli, ['--help'])
+        assert result.exit_code == 0 and 'evaluate' in result.output, \
+            logger.error("     Failure in {}.".format(inspect.stack()[0][3]))
+
+        logger.info("    Successfully completed {} {}".format(
+            self.__class__.__name__, inspect.stack()[0][3]))
+
+    def test_pipeline(self, tmp_path):
+        logger.info("    Started {} {}".format(
+            self.__class__.__name__, inspect.stack()[0][3]))
+
+        categories = SyntheticAmazon(3000, 1, n_workers=1).generate(str(tmp_path / 'site'),
+                                                                    'http://127.0.0.1')
+        runner = CliRunner()
+        data = str(tmp_path / 'data')
+        events = str(tmp_path / 'events')
+        commands = [
+            ['ingest', data + '/reviews', categories[0]['reviews']],
+            ['features', data + '/reviews', data + '/features'],
+            ['train', 'als', data + '/features/train', data + '/model', '--factors', '8',
+             '--iterations', '2', '--vocabularies', data + '/reviews'],
+            ['--instrument', events, 'predict', data + '/model', data + '/table', '--k', '5',
+             '--seen', data + '/features/train'],
+            ['evaluate', data + '/model', data + '/features/test', '--train',
+             data + '/features/train', '--k', '5', '--output', data + '/metrics.json']]
+        for args in commands:
+            result = runner.invoke(cli, args)
+            assert result.exit_code == 0, \
+                logger.error("     Failure in {}: {}".format(inspect.stack()[0][3], result.output))
+        with open(data + '/metrics.json') as f:
+            metrics = json.load(f)
+        assert metrics and all(0 <= value <= 1 for value in metrics.values()
+                               if isinstance(value, float)), \
+            logger.error("     Failure in {}.".format(inspect.stack()[0][3]))
+        assert os.listdir(events), \
+            logger.error("     Failure in {}.".format(inspect.stack()[0][3]))
+
+        logger.info("    Successfully completed {} {}".format(
+            self.__class__.__name__, inspect.stack()[0][3]))
+# %%
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+# ======================================================================================================================== #
+# Project  : Explainable Recommendation (XRec)                                                                             #
+# Version  : 0.1.0                                                                                                         #
+# File     : \test_data_make_dataset.py                                                                                    #
+# Language : Python 3.8                                                                                                    #
+# ------------------------------------------------------------------------------------------------------------------------ #
+# Author   : John James                                                                                                    #
+# Company  : Bryant St. Labs                                                                                               #
+# Email    : john.james.ai.studio@gmail.com                                                                                #
+# URL      : https://github.com/john-james-ai/xrec                                                                         #
+# ------------------------------------------------------------------------------------------------------------------------ #
+# Created  : Monday, October 19th 2026, 9:00:00 am                                                                         #
+# Modified : Monday, October 19th 2026, 9:00:00 am                                                                         #
+# Modifier : John James (john.james.ai.studio@gmail.com)                                                                   #
+# ------------------------------------------------------------------------------------------------------------------------ #
+# License  : BSD 3-clause "New" or "Revised" License                                                                       #
+# Copyright: (c) 2021 Bryant St. Labs                                                                                      #
+# ======================================================================================================================== #
+# %%
+import os
+import logging
+import inspect
+from xrec.benchmarks.pipeline import LocalSource
+from xrec.data.ingest import load_products, load_reviews
+from xrec.data.make_dataset import make_dataset
+from xrec.data.synthetic import SyntheticAmazon
+from xrec.data.textstore import TextStore
+from xrec.utils.config import Config
+# ------------------------------------------------------------------------------------------------------------------------ #
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+class TestMakeDataset:
+
+    def test_make_dataset(self, tmp_path):
+        logger.info("    Started {} {}".format(
+            self.__class__.__name__, inspect.stack()[0][3]))
+
+        configfile = Config.configfile
+        Config.configfile = str(tmp_path / 'config.ini')
+        data, models = str(tmp_path / 'data'), str(tmp_path / 'models')
+        site = str(tmp_path / 'site')
+        kwargs = {'n_workers': 2, 'factors': 8, 'iterations': 2}
+        try:
+            with LocalSource(site) as source:
+                SyntheticAmazon(2000, n_categories=2, n_workers=1).generate(site, source.url)
+                Config().create('DATA', 'url', source.url + '/index.html')
+                Config().create('DATA', 'amazon_metadata_uri', str(tmp_path / 'amazon.csv'))
+                Config().create('DATA', 'data_external_amazon', str(tmp_path / 'external'))
+                first = make_dataset(data, models, **kwargs)
+                second = make_dataset(data, models, **kwargs)
+                os.utime(os.path.join(data, 'interim', 'reviews', 'beauty.npz'))
+                third = make_dataset(data, models, **kwargs)
+        finally:
+            Config.configfile = configfile
+
+        assert len(first) == 11 and {r['status'] for r in first.values()} == {'completed'}, \
+            logger.error("     Failure in {}.".format(inspect.stack()[0][3]))
+        assert {r['status'] for r in second.values()} == {'skipped'}, \
+            logger.error("     Failure in {}.".format(inspect.stack()[0][3]))
+        assert {n for n, r in third.items() if r['status'] == 'completed'} == \
+            {'encode', 'features', 'train'}, \
+            logger.error("     Failure in {}.".format(inspect.stack()[0][3]))
+        arrays, vocabularies = load_reviews(os.path.join(data, 'processed', 'reviews'))
+        assert len(arrays['ratings']) == 4000, \
+            logger.error("     Failure in {}.".format(inspect.stack()[0][3]))
+        products, vocabularies = load_products(os.path.join(data, 'processed', 'products'))
+        assert len(products['title']) == len(vocabularies['items']) > 0, \
+            logger.error("     Failure in {}.".format(inspect.stack()[0][3]))
+        texts = TextStore(os.path.join(data, 'processed', 'texts'))
+        assert len(texts) == 4000 and texts.n_texts <= 4000, \
+            logger.error("     Failure in {}.".format(inspect.stack()[0][3]))
+        assert os.path.isdir(os.path.join(models, 'als')), \
+            logger.error("     Failure in {}.".format(inspect.stack()[0][3]))
+
+        logger.info("    Successfully completed {} {}".format(
+            self.__class__.__name__, inspect.stack()[0][3]))
+# %%
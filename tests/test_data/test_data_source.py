@@ -27,9 +27,11 @@ import inspect
 import pandas as pd
 import numpy as np
 from datetime import datetime
+from xrec.benchmarks.pipeline import LocalSource
 from xrec.data.source import AmazonSource
+from xrec.data.synthetic import SyntheticAmazon
 from xrec.utils.config import Config
-from xrec.data.extract import download_callback
+from xrec.data.extract import download_callback, extract
 # ------------------------------------------------------------------------------------------------------------------------ #
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -250,6 +252,64 @@ class AmazonSourceTests:
             self.__class__.__name__))
 
 
+class TestAmazonSourceMirror:
+
+    def test_mirror(self, tmp_path, caplog):
+        logger.info("    Started {} {}".format(
+            self.__class__.__name__, inspect.stack()[0][3]))
+
+        configfile = Config.configfile
+        Config.configfile = str(tmp_path / 'config.ini')
+        site, mirror = str(tmp_path / 'site'), str(tmp_path / 'mirror')
+        caplog.set_level(logging.DEBUG, logger='xrec.benchmarks.pipeline')
+        try:
+            with LocalSource(site) as source:
+                url = source.url + '/index.html'
+                SyntheticAmazon(500, n_categories=2, n_workers=1).generate(site, source.url)
+                Config().create('DATA', 'amazon_metadata_uri', str(tmp_path / 'amazon.csv'))
+                Config().create('DATA', 'data_external_amazon', str(tmp_path / 'external'))
+                live = AmazonSource()
+                live.create_metadata(url)
+                expected = live.metadata.copy()
+                key = live.get_keys()[0]
+                caplog.clear()
+                manifest = AmazonSource().snapshot(url, mirror, files=True, keys=[key],
+                                                   n_workers=1)
+                requests = [r.getMessage() for r in caplog.records if '/files/' in r.getMessage()]
+            os.remove(str(tmp_path / 'amazon.csv'))
+            mirrored = AmazonSource(mirror)
+            mirrored.create_metadata(url)
+            created = mirrored.metadata.copy()
+            tasks = extract(url, keys=[key], n_workers=1, mirror=mirror)
+            downloaded = mirrored.read_metadata(key=key)
+        finally:
+            Config.configfile = configfile
+
+        assert len(manifest['files']) == live.n_files == 4, \
+            logger.error("     Failure in {}.".format(inspect.stack()[0][3]))
+        assert sorted(os.listdir(mirror)) == sorted(['files', 'manifest.json', manifest['index']]), \
+            logger.error("     Failure in {}.".format(inspect.stack()[0][3]))
+        assert not [name for _, _, names in os.walk(mirror) for name in names
+                    if name.endswith(('.part', '.staged'))], \
+            logger.error("     Failure in {}.".format(inspect.stack()[0][3]))
+        assert len(requests) == live.n_files + 2, \
+            logger.error("     Failure in {}.".format(inspect.stack()[0][3]))
+        assert created.equals(expected), \
+            logger.error("     Failure in {}.".format(inspect.stack()[0][3]))
+        assert len(tasks) == 2 and all(t['url'].startswith('file://') for t in tasks), \
+            logger.error("     Failure in {}.".format(inspect.stack()[0][3]))
+        assert downloaded['downloaded'].all(), \
+            logger.error("     Failure in {}.".format(inspect.stack()[0][3]))
+        for task in tasks:
+            with open(task['filepath'], 'rb') as a, \
+                    open(os.path.join(mirror, 'files', task['kind'], key + '.json.gz'), 'rb') as b:
+                assert a.read() == b.read(), \
+                    logger.error("     Failure in {}.".format(inspect.stack()[0][3]))
+
+        logger.info("    Successfully completed {} {}".format(
+            self.__class__.__name__, inspect.stack()[0][3]))
+
+
 if __name__ == "__main__":
     t = AmazonSourceTests()
     t.test_setup()
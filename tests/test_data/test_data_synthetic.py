@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+# ======================================================================================================================== #
+# Project  : Explainable Recommendation (XRec)                                                                             #
+# Version  : 0.1.0                                                                                                         #
+# File     : \test_data_synthetic.py                                                                                       #
+# Language : Python 3.8                                                                                                    #
+# ------------------------------------------------------------------------------------------------------------------------ #
+# Author   : John James                                                                                                    #
+# Company  : Bryant St. Labs                                                                                               #
+# Email    : john.james.ai.studio@gmail.com                                                                                #
+# URL      : https://github.com/john-james-ai/xrec                                                                         #
+# ------------------------------------------------------------------------------------------------------------------------ #
+# Created  : Monday, October 19th 2026, 9:00:00 am                                                                         #
+# Modified : Monday, October 19th 2026, 9:00:00 am                                                                         #
+# Modifier : John James (john.james.ai.studio@gmail.com)                                                                   #
+# ------------------------------------------------------------------------------------------------------------------------ #
+# License  : BSD 3-clause "New" or "Revised" License                                                                       #
+# Copyright: (c) 2021 Bryant St. Labs                                                                                      #
+# ======================================================================================================================== #
+# %%
+import os
+import gzip
+import json
+import logging
+import inspect
+import numpy as np
+from bs4 import BeautifulSoup
+from xrec.benchmarks.pipeline import LocalSource
+from xrec.data.source import AmazonSource
+from xrec.data.synthetic import SyntheticAmazon, power_law, scatter
+from xrec.utils.config import Config
+# ------------------------------------------------------------------------------------------------------------------------ #
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+REVIEW_KEYS = {'overall', 'vote', 'verified', 'reviewTime', 'reviewerID', 'asin', 'style',
+               'reviewerName', 'reviewText', 'summary', 'unixReviewTime', 'image'}
+
+
+class TestSyntheticAmazon:
+
+    def test_distributions(self):
+        logger.info("    Started {} {}".format(
+            self.__class__.__name__, inspect.stack()[0][3]))
+
+        rng = np.random.default_rng(0)
+        ranks = power_law(rng, 1000, 1.0, 200000)
+        counts = np.bincount(ranks, minlength=1000)
+        assert ranks.min() >= 0 and ranks.max() < 1000 and counts[0] > counts[9] > counts[99], \
+            logger.error("     Failure in {}.".format(inspect.stack()[0][3]))
+        assert np.array_equal(np.sort(scatter(np.arange(1000), 1000, 7)), np.arange(1000)), \
+            logger.error("     Failure in {}.".format(inspect.stack()[0][3]))
+
+        logger.info("    Successfully completed {} {}".format(
+            self.__class__.__name__, inspect.stack()[0][3]))
+
+    def test_generate(self, tmp_path):
+        logger.info("    Started {} {}".format(
+            self.__class__.__name__, inspect.stack()[0][3]))
+
+        outputs = []
+        for n_workers in (1, 2):
+            directory = str(tmp_path / 'site{}'.format(n_workers))
+            categories = SyntheticAmazon(5000, n_categories=2, shard_size=1500,
+                                         n_workers=n_workers).generate(directory, 'http://x')
+            with gzip.open(categories[1]['reviews'], 'rt') as f:
+                outputs.append(f.read())
+        assert outputs[0] == outputs[1], \
+            logger.error("     Failure in {}.".format(inspect.stack()[0][3]))
+
+        reviews = [json.loads(line) for line in outputs[0].splitlines()]
+        assert len(reviews) == 5000 and all(set(r) <= REVIEW_KEYS for r in reviews), \
+            logger.error("     Failure in {}.".format(inspect.stack()[0][3]))
+        ratings = np.array([r['overall'] for r in reviews])
+        assert 4.0 < ratings.mean() < 4.5 and (ratings == 5).mean() > 0.5, \
+            logger.error("     Failure in {}.".format(inspect.stack()[0][3]))
+        with gzip.open(categories[0]['products'], 'rt') as f:
+            products = [json.loads(line)['asin'] for line in f]
+        assert len(products) == 5000 // 15, \
+            logger.error("     Failure in {}.".format(inspect.stack()[0][3]))
+
+        # Users and items of different categories never share an ID.
+        with gzip.open(categories[0]['reviews'], 'rt') as f:
+            first = [json.loads(line) for line in f]
+        for key in ('reviewerID', 'asin'):
+            assert not {r[key] for r in first} & {r[key] for r in reviews}, \
+                logger.error("     Failure in {}.".format(inspect.stack()[0][3]))
+        assert {r['asin'] for r in first} <= set(products), \
+            logger.error("     Failure in {}.".format(inspect.stack()[0][3]))
+
+        logger.info("    Successfully completed {} {}".format(
+            self.__class__.__name__, inspect.stack()[0][3]))
+
+    def test_parse_table(self, tmp_path):
+        logger.info("    Started {} {}".format(
+            self.__class__.__name__, inspect.stack()[0][3]))
+
+        configfile = Config.configfile
+        Config.configfile = str(tmp_path / 'config.ini')
+        try:
+            Config().create('DATA', 'amazon_metadata_uri', str(tmp_path / 'amazon.csv'))
+            Config().create('DATA', 'data_external_amazon', str(tmp_path / 'external'))
+            site = str(tmp_path / 'site')
+            with LocalSource(site) as source:
+                SyntheticAmazon(1000, n_categories=3, n_workers=1).generate(site, source.url)
+                with open(os.path.join(site, 'index.html')) as f:
+                    metadata = AmazonSource()._parse_table(BeautifulSoup(f.read(), 'html.parser'))
+        finally:
+            Config.configfile = configfile
+        assert metadata.shape == (6, 12), \
+            logger.error("     Failure in {}.".format(inspect.stack()[0][3]))
+        assert list(metadata['n']) == [1000, 66] * 3, \
+            logger.error("     Failure in {}.".format(inspect.stack()[0][3]))
+
+        logger.info("    Successfully completed {} {}".format(
+            self.__class__.__name__, inspect.stack()[0][3]))
+# %%
@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+# ======================================================================================================================== #
+# Project  : Explainable Recommendation (XRec)                                                                             #
+# Version  : 0.1.0                                                                                                         #
+# File     : \test_data_textstore.py                                                                                       #
+# Language : Python 3.8                                                                                                    #
+# ------------------------------------------------------------------------------------------------------------------------ #
+# Author   : John James                                                                                                    #
+# Company  : Bryant St. Labs                                                                                               #
+# Email    : john.james.ai.studio@gmail.com                                                                                #
+# URL      : https://github.com/john-james-ai/xrec                                                                         #
+# ------------------------------------------------------------------------------------------------------------------------ #
+# Created  : Monday, October 19th 2026, 9:00:00 am                                                                         #
+# Modified : Monday, October 19th 2026, 9:00:00 am                                                                         #
+# Modifier : John James (john.james.ai.studio@gmail.com)                                                                   #
+# ------------------------------------------------------------------------------------------------------------------------ #
+# License  : BSD 3-clause "New" or "Revised" License                                                                       #
+# Copyright: (c) 2021 Bryant St. Labs                                                                                      #
+# ======================================================================================================================== #
+# %%
+import os
+import logging
+import inspect
+import numpy as np
+import pytest
+from xrec.data.textstore import TextStore
+# ------------------------------------------------------------------------------------------------------------------------ #
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+def _texts(n: int, seed: int = 0) -> list:
+    rng = np.random.default_rng(seed)
+    words = np.array(['great', 'fit', 'broke', 'cheap', 'five', 'stars', 'ünïcode', 'ok'])
+    texts = [' '.join(rng.choice(words, rng.integers(0, 40))) for _ in range(n)]
+    for i in range(0, n, 7):
+        texts[i] = 'Great product'
+    texts[3] = None
+    return texts
+
+
+class TestTextStore:
+
+    def test_store(self, tmp_path):
+        logger.info("    Started {} {}".format(
+            self.__class__.__name__, inspect.stack()[0][3]))
+
+        directory = str(tmp_path / 'texts')
+        texts = _texts(3000)
+        expected = [text or '' for text in texts]
+        with TextStore(directory, mode='a', block_size=4096) as store:
+            first = store.append(texts[:2000])
+            assert store.get(5) == expected[5], \
+                logger.error("     Failure in {}.".format(inspect.stack()[0][3]))
+            store.flush()
+            assert os.path.getsize(os.path.join(directory, 'offsets.bin')) == 2000 * 8, \
+                logger.error("     Failure in {}.".format(inspect.stack()[0][3]))
+            second = store.append(texts[2000:])
+            assert store[2100] == expected[2100], \
+                logger.error("     Failure in {}.".format(inspect.stack()[0][3]))
+        assert np.array_equal(np.concatenate([first, second]), np.arange(3000)), \
+            logger.error("     Failure in {}.".format(inspect.stack()[0][3]))
+
+        store = TextStore(directory)
+        assert len(store) == 3000 and store.n_texts == len(set(expected)), \
+            logger.error("     Failure in {}.".format(inspect.stack()[0][3]))
+        reviews = np.random.default_rng(1).permutation(3000)
+        assert store[reviews] == [expected[i] for i in reviews], \
+            logger.error("     Failure in {}.".format(inspect.stack()[0][3]))
+        assert store.n_bytes < sum(len(text.encode('utf-8')) for text in expected) / 3, \
+            logger.error("     Failure in {}.".format(inspect.stack()[0][3]))
+        with pytest.raises(IndexError):
+            store.get(3000)
+        with pytest.raises(ValueError):
+            store.append(['read only'])
+        with pytest.raises(FileNotFoundError):
+            TextStore(str(tmp_path / 'missing'))
+
+        # Texts seen in earlier flushes are found in the digest index, which stays a few runs.
+        directory = str(tmp_path / 'batches')
+        with TextStore(directory, mode='a', block_size=4096) as store:
+            for start in range(0, 3000, 100):
+                store.append(texts[start:start + 100])
+                store.flush()
+            assert len(store.manifest['runs']) <= 6, \
+                logger.error("     Failure in {}.".format(inspect.stack()[0][3]))
+        with TextStore(directory, mode='a') as store:
+            store.append(texts[:10])
+        store = TextStore(directory)
+        assert store.n_texts == len(set(expected)) and store[[3000, 3009]] == expected[:10:9], \
+            logger.error("     Failure in {}.".format(inspect.stack()[0][3]))
+        assert sorted(name for name in os.listdir(directory) if name.startswith('index-')) == \
+            sorted(name for name, _ in store.manifest['runs']), \
+            logger.error("     Failure in {}.".format(inspect.stack()[0][3]))
+
+        # A trailing empty text starts where the last block ends.
+        directory = str(tmp_path / 'trailing')
+        with TextStore(directory, mode='a', block_size=8) as store:
+            store.append(['hello world!', None])
+        assert TextStore(directory)[[0, 1]] == ['hello world!', ''], \
+            logger.error("     Failure in {}.".format(inspect.stack()[0][3]))
+
+        logger.info("    Successfully completed {} {}".format(
+            self.__class__.__name__, inspect.stack()[0][3]))
+
+    def test_recovery(self, tmp_path):
+        logger.info("    Started {} {}".format(
+            self.__class__.__name__, inspect.stack()[0][3]))
+
+        directory = str(tmp_path / 'texts')
+        with TextStore(directory, mode='a', block_size=1024) as store:
+            store.append(_texts(500))
+        size = os.path.getsize(os.path.join(directory, 'blob.bin'))
+
+        # A flush interrupted after sealing its block leaves bytes the manifest does not cover.
+        store = TextStore(directory, mode='a', block_size=1024)
+        store.append(['lost'] * 300)
+        store._seal()
+        assert os.path.getsize(os.path.join(directory, 'blob.bin')) > size, \
+            logger.error("     Failure in {}.".format(inspect.stack()[0][3]))
+
+        with TextStore(directory, mode='a') as store:
+            assert len(store) == 500, \
+                logger.error("     Failure in {}.".format(inspect.stack()[0][3]))
+            store.append(['Great product', 'kept'])
+        store = TextStore(directory)
+        assert len(store) == 502 and store[[0, 500, 501]] == ['Great product'] * 2 + ['kept'], \
+            logger.error("     Failure in {}.".format(inspect.stack()[0][3]))
+
+        logger.info("    Successfully completed {} {}".format(
+            self.__class__.__name__, inspect.stack()[0][3]))
+# %%
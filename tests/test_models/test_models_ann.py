@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+# ======================================================================================================================== #
+# Project  : Explainable Recommendation (XRec)                                                                             #
+# Version  : 0.1.0                                                                                                         #
+# File     : \test_models_ann.py                                                                                           #
+# Language : Python 3.8                                                                                                    #
+# ------------------------------------------------------------------------------------------------------------------------ #
+# Author   : John James                                                                                                    #
+# Company  : Bryant St. Labs                                                                                               #
+# Email    : john.james.ai.studio@gmail.com                                                                                #
+# URL      : https://github.com/john-james-ai/xrec                                                                         #
+# ------------------------------------------------------------------------------------------------------------------------ #
+# Created  : Monday, October 19th 2026, 9:00:00 am                                                                         #
+# Modified : Monday, October 19th 2026, 9:00:00 am                                                                         #
+# Modifier : John James (john.james.ai.studio@gmail.com)                                                                   #
+# ------------------------------------------------------------------------------------------------------------------------ #
+# License  : BSD 3-clause "New" or "Revised" License                                                                       #
+# Copyright: (c) 2021 Bryant St. Labs                                                                                      #
+# ======================================================================================================================== #
+# %%
+import logging
+import inspect
+import numpy as np
+from xrec.models.ann import IVFIndex, evaluate_recall
+# ------------------------------------------------------------------------------------------------------------------------ #
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+def embeddings(n=2000, d=16, seed=0):
+    rng = np.random.default_rng(seed)
+    return rng.standard_normal((n, d), dtype=np.float32), rng.standard_normal((20, d))
+
+
+class TestIVFIndex:
+
+    def test_search(self):
+        logger.info("    Started {} {}".format(
+            self.__class__.__name__, inspect.stack()[0][3]))
+
+        V, Q = embeddings()
+        index = IVFIndex(n_lists=16).build(V)
+        results = evaluate_recall(index, Q, V, k=10, n_probes=(1, 16))
+        assert results[0]['recall'] < 1.0, \
+            logger.error("     Failure in {}.".format(inspect.stack()[0][3]))
+        assert results[1]['recall'] == 1.0, \
+            logger.error("     Failure in {}.".format(inspect.stack()[0][3]))
+
+        logger.info("    Successfully completed {} {}".format(
+            self.__class__.__name__, inspect.stack()[0][3]))
+
+    def test_save_load(self, tmp_path):
+        logger.info("    Started {} {}".format(
+            self.__class__.__name__, inspect.stack()[0][3]))
+
+        V, Q = embeddings()
+        index = IVFIndex(n_lists=16, pq_subspaces=4).build(V)
+        index.save(str(tmp_path))
+        loaded = IVFIndex.load(str(tmp_path))
+        assert isinstance(loaded.arrays['codes'], np.memmap), \
+            logger.error("     Failure in {}.".format(inspect.stack()[0][3]))
+        ids, scores = index.search(Q, 10, n_probe=4)
+        loaded_ids, loaded_scores = loaded.search(Q, 10, n_probe=4)
+        assert np.array_equal(ids, loaded_ids), \
+            logger.error("     Failure in {}.".format(inspect.stack()[0][3]))
+        assert evaluate_recall(loaded, Q, V, k=10, n_probes=(16,))[0]['recall'] > 0.5, \
+            logger.error("     Failure in {}.".format(inspect.stack()[0][3]))
+
+        logger.info("    Successfully completed {} {}".format(
+            self.__class__.__name__, inspect.stack()[0][3]))
+# %%
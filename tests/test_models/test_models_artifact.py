@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+# ======================================================================================================================== #
+# Project  : Explainable Recommendation (XRec)                                                                             #
+# Version  : 0.1.0                                                                                                         #
+# File     : \test_models_artifact.py                                                                                      #
+# Language : Python 3.8                                                                                                    #
+# ------------------------------------------------------------------------------------------------------------------------ #
+# Author   : John James                                                                                                    #
+# Company  : Bryant St. Labs                                                                                               #
+# Email    : john.james.ai.studio@gmail.com                                                                                #
+# URL      : https://github.com/john-james-ai/xrec                                                                         #
+# ------------------------------------------------------------------------------------------------------------------------ #
+# Created  : Monday, October 19th 2026, 9:00:00 am                                                                         #
+# Modified : Monday, October 19th 2026, 9:00:00 am                                                                         #
+# Modifier : John James (john.james.ai.studio@gmail.com)                                                                   #
+# ------------------------------------------------------------------------------------------------------------------------ #
+# License  : BSD 3-clause "New" or "Revised" License                                                                       #
+# Copyright: (c) 2021 Bryant St. Labs                                                                                      #
+# ======================================================================================================================== #
+# %%
+import os
+import logging
+import inspect
+import numpy as np
+from scipy import sparse
+from xrec.models.artifact import Vocabulary, load_artifact, versions
+from xrec.models.predict_model import BatchRecommender
+from xrec.models.train_model import ALS
+# ------------------------------------------------------------------------------------------------------------------------ #
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+class TestArtifact:
+
+    def test_save_load(self, tmp_path):
+        logger.info("    Started {} {}".format(
+            self.__class__.__name__, inspect.stack()[0][3]))
+
+        X = sparse.random(50, 30, density=0.1, format='csr', random_state=0)
+        users = ['U{:03d}'.format(u) for u in range(50)]
+        items = ['B{:09d}'.format(i) for i in range(30)]
+        model = ALS(factors=4, iterations=2).fit(X)
+        root = str(tmp_path / 'als')
+        first = model.save(root, vocabularies={'users': users, 'items': items})
+        second = model.save(root, vocabularies={'users': users, 'items': items})
+        assert versions(root) == [1, 2], \
+            logger.error("     Failure in {}.".format(inspect.stack()[0][3]))
+        assert load_artifact(root).path == second and load_artifact(first).version == 1, \
+            logger.error("     Failure in {}.".format(inspect.stack()[0][3]))
+        assert not [name for name in os.listdir(root) if name.startswith('.')], \
+            logger.error("     Failure in {}.".format(inspect.stack()[0][3]))
+
+        loaded = ALS.load(root)
+        assert isinstance(loaded.user_factors, np.memmap), \
+            logger.error("     Failure in {}.".format(inspect.stack()[0][3]))
+        assert np.array_equal(loaded.item_factors, model.item_factors), \
+            logger.error("     Failure in {}.".format(inspect.stack()[0][3]))
+        assert loaded.params() == model.params(), \
+            logger.error("     Failure in {}.".format(inspect.stack()[0][3]))
+        assert list(loaded.vocabularies['items'].lookup(['B000000007', 'missing'])) == [7, -1], \
+            logger.error("     Failure in {}.".format(inspect.stack()[0][3]))
+
+        recommender = BatchRecommender.load(root)
+        assert recommender.version == 2 and recommender.vocabularies['users'][3] == 'U003', \
+            logger.error("     Failure in {}.".format(inspect.stack()[0][3]))
+
+        logger.info("    Successfully completed {} {}".format(
+            self.__class__.__name__, inspect.stack()[0][3]))
+
+    def test_vocabulary(self):
+        logger.info("    Started {} {}".format(
+            self.__class__.__name__, inspect.stack()[0][3]))
+
+        vocabulary = Vocabulary.from_ids(['b', 'a', 'zz'])
+        appended = vocabulary.append(['q', 'a', 'longer', 'q'])
+        assert list(appended.lookup(['b', 'a', 'zz', 'q', 'longer', 'x'])) == [0, 1, 2, 3, 4, -1], \
+            logger.error("     Failure in {}.".format(inspect.stack()[0][3]))
+        assert list(appended[[3, 4]]) == ['q', 'longer'], \
+            logger.error("     Failure in {}.".format(inspect.stack()[0][3]))
+
+        logger.info("    Successfully completed {} {}".format(
+            self.__class__.__name__, inspect.stack()[0][3]))
+# %%
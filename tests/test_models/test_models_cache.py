@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+# ======================================================================================================================== #
+# Project  : Explainable Recommendation (XRec)                                                                             #
+# Version  : 0.1.0                                                                                                         #
+# File     : \test_models_cache.py                                                                                         #
+# Language : Python 3.8                                                                                                    #
+# ------------------------------------------------------------------------------------------------------------------------ #
+# Author   : John James                                                                                                    #
+# Company  : Bryant St. Labs                                                                                               #
+# Email    : john.james.ai.studio@gmail.com                                                                                #
+# URL      : https://github.com/john-james-ai/xrec                                                                         #
+# ------------------------------------------------------------------------------------------------------------------------ #
+# Created  : Monday, October 19th 2026, 9:00:00 am                                                                         #
+# Modified : Monday, October 19th 2026, 9:00:00 am                                                                         #
+# Modifier : John James (john.james.ai.studio@gmail.com)                                                                   #
+# ------------------------------------------------------------------------------------------------------------------------ #
+# License  : BSD 3-clause "New" or "Revised" License                                                                       #
+# Copyright: (c) 2021 Bryant St. Labs                                                                                      #
+# ======================================================================================================================== #
+# %%
+import time
+import logging
+import inspect
+from xrec.models.cache import ExplanationCache
+# ------------------------------------------------------------------------------------------------------------------------ #
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+class TestExplanationCache:
+
+    def test_memory(self):
+        logger.info("    Started {} {}".format(
+            self.__class__.__name__, inspect.stack()[0][3]))
+
+        cache = ExplanationCache(max_entries=2, ttl=0.05, version=1)
+        cache.put('u1', 'i1', 'because of a')
+        cache.put('u1', 'i2', 'because of b')
+        assert cache.get('u1', 'i1') == 'because of a', \
+            logger.error("     Failure in {}.".format(inspect.stack()[0][3]))
+        cache.put('u1', 'i3', 'because of c')
+        assert cache.get('u1', 'i2') is None and cache.get('u1', 'i1') is not None, \
+            logger.error("     Failure in {}.".format(inspect.stack()[0][3]))
+        time.sleep(0.06)
+        assert cache.get('u1', 'i1') is None, \
+            logger.error("     Failure in {}.".format(inspect.stack()[0][3]))
+        cache.put('u1', 'i1', 'because of a')
+        cache.set_version(2)
+        assert cache.get('u1', 'i1') is None, \
+            logger.error("     Failure in {}.".format(inspect.stack()[0][3]))
+        stats = cache.stats()
+        assert stats['evictions'] == 1 and stats['expirations'] == 1 and stats['hits'] == 2, \
+            logger.error("     Failure in {}.".format(inspect.stack()[0][3]))
+
+        logger.info("    Successfully completed {} {}".format(
+            self.__class__.__name__, inspect.stack()[0][3]))
+
+    def test_disk(self, tmp_path):
+        logger.info("    Started {} {}".format(
+            self.__class__.__name__, inspect.stack()[0][3]))
+
+        path = str(tmp_path / 'explanations.db')
+        first = ExplanationCache(version='v1', path=path)
+        second = ExplanationCache(version='v1', path=path)
+        calls = []
+        value = first.get_or_compute('u', 'i', lambda: calls.append(1) or [{'item': 'x'}])
+        assert second.get_or_compute('u', 'i', lambda: calls.append(1)) == value, \
+            logger.error("     Failure in {}.".format(inspect.stack()[0][3]))
+        assert len(calls) == 1 and second.stats()['disk_hits'] == 1, \
+            logger.error("     Failure in {}.".format(inspect.stack()[0][3]))
+
+        third = ExplanationCache(version='v2', path=path)
+        assert third.get('u', 'i') is None and third.purge() == 1, \
+            logger.error("     Failure in {}.".format(inspect.stack()[0][3]))
+
+        logger.info("    Successfully completed {} {}".format(
+            self.__class__.__name__, inspect.stack()[0][3]))
+# %%
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+# ======================================================================================================================== #
+# Project  : Explainable Recommendation (XRec)                                                                             #
+# Version  : 0.1.0                                                                                                         #
+# File     : \test_models_checkpoint.py                                                                                    #
+# Language : Python 3.8                                                                                                    #
+# ------------------------------------------------------------------------------------------------------------------------ #
+# Author   : John James                                                                                                    #
+# Company  : Bryant St. Labs                                                                                               #
+# Email    : john.james.ai.studio@gmail.com                                                                                #
+# URL      : https://github.com/john-james-ai/xrec                                                                         #
+# ------------------------------------------------------------------------------------------------------------------------ #
+# Created  : Monday, October 19th 2026, 9:00:00 am                                                                         #
+# Modified : Monday, October 19th 2026, 9:00:00 am                                                                         #
+# Modifier : John James (john.james.ai.studio@gmail.com)                                                                   #
+# ------------------------------------------------------------------------------------------------------------------------ #
+# License  : BSD 3-clause "New" or "Revised" License                                                                       #
+# Copyright: (c) 2021 Bryant St. Labs                                                                                      #
+# ======================================================================================================================== #
+# %%
+import os
+import logging
+import inspect
+import numpy as np
+import pytest
+from scipy import sparse
+from xrec.models.checkpoint import Checkpointer
+from xrec.models.train_model import ALS, BPR
+# ------------------------------------------------------------------------------------------------------------------------ #
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+def interactions(n_users=300, n_items=100, density=0.05, seed=0):
+    return sparse.random(n_users, n_items, density=density, format='csr', random_state=seed)
+
+
+class TestCheckpointer:
+
+    def test_als_resume(self, tmp_path):
+        logger.info("    Started {} {}".format(
+            self.__class__.__name__, inspect.stack()[0][3]))
+
+        X = interactions()
+        expected = ALS(factors=8, iterations=4).fit(X)
+        directory = str(tmp_path / 'als')
+        ALS(factors=8, iterations=2).fit(X, checkpointer=Checkpointer(directory))
+        model = ALS(factors=8, iterations=4).fit(X, checkpointer=Checkpointer(directory),
+                                                 resume=True)
+        for name in model.arrays:
+            assert np.array_equal(getattr(model, name), getattr(expected, name)), \
+                logger.error("     Failure in {}.".format(inspect.stack()[0][3]))
+        assert [h['iteration'] for h in model.history] == [0, 1, 2, 3], \
+            logger.error("     Failure in {}.".format(inspect.stack()[0][3]))
+
+        logger.info("    Successfully completed {} {}".format(
+            self.__class__.__name__, inspect.stack()[0][3]))
+
+    def test_bpr_resume(self, tmp_path):
+        logger.info("    Started {} {}".format(
+            self.__class__.__name__, inspect.stack()[0][3]))
+
+        X = interactions()
+        kwargs = {'factors': 8, 'batch_size': 64, 'n_workers': 1}
+        expected = BPR(epochs=4, **kwargs).fit(X)
+        directory = str(tmp_path / 'bpr')
+        checkpointer = Checkpointer(directory, every=1, keep=2)
+        BPR(epochs=3, **kwargs).fit(X, checkpointer=checkpointer)
+        assert sorted(os.listdir(directory)) == ['LATEST', 'v000002', 'v000003'], \
+            logger.error("     Failure in {}.".format(inspect.stack()[0][3]))
+        model = BPR(epochs=4, **kwargs).fit(X, checkpointer=checkpointer, resume=True)
+        for name in model.arrays:
+            assert np.array_equal(getattr(model, name), getattr(expected, name)), \
+                logger.error("     Failure in {}.".format(inspect.stack()[0][3]))
+        assert len(model.history) == 4, \
+            logger.error("     Failure in {}.".format(inspect.stack()[0][3]))
+
+        logger.info("    Successfully completed {} {}".format(
+            self.__class__.__name__, inspect.stack()[0][3]))
+
+    def test_resume_mismatch(self, tmp_path):
+        logger.info("    Started {} {}".format(
+            self.__class__.__name__, inspect.stack()[0][3]))
+
+        X = interactions()
+        checkpointer = Checkpointer(str(tmp_path / 'als'))
+        ALS(factors=8, iterations=1).fit(X, checkpointer=checkpointer)
+        with pytest.raises(ValueError, match='factors=8, not 16'):
+            ALS(factors=16, iterations=2).fit(X, checkpointer=checkpointer, resume=True)
+        with pytest.raises(ValueError, match="model 'als', not 'bpr'"):
+            BPR(factors=8, epochs=2, n_workers=1).fit(X, checkpointer=checkpointer, resume=True)
+        with pytest.raises(ValueError, match='keep must be at least 1'):
+            Checkpointer(str(tmp_path / 'none'), keep=0)
+
+        logger.info("    Successfully completed {} {}".format(
+            self.__class__.__name__, inspect.stack()[0][3]))
+# %%
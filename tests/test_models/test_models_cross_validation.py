@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+# ======================================================================================================================== #
+# Project  : Explainable Recommendation (XRec)                                                                             #
+# Version  : 0.1.0                                                                                                         #
+# File     : \test_models_cross_validation.py                                                                              #
+# Language : Python 3.8                                                                                                    #
+# ------------------------------------------------------------------------------------------------------------------------ #
+# Author   : John James                                                                                                    #
+# Company  : Bryant St. Labs                                                                                               #
+# Email    : john.james.ai.studio@gmail.com                                                                                #
+# URL      : https://github.com/john-james-ai/xrec                                                                         #
+# ------------------------------------------------------------------------------------------------------------------------ #
+# Created  : Monday, October 19th 2026, 9:00:00 am                                                                         #
+# Modified : Monday, October 19th 2026, 9:00:00 am                                                                         #
+# Modifier : John James (john.james.ai.studio@gmail.com)                                                                   #
+# ------------------------------------------------------------------------------------------------------------------------ #
+# License  : BSD 3-clause "New" or "Revised" License                                                                       #
+# Copyright: (c) 2021 Bryant St. Labs                                                                                      #
+# ======================================================================================================================== #
+# %%
+import logging
+import inspect
+import numpy as np
+from scipy import sparse
+from xrec.models.cross_validation import CrossValidation, assign_folds, split
+# ------------------------------------------------------------------------------------------------------------------------ #
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+class TestCrossValidation:
+
+    def test_split(self):
+        logger.info("    Started {} {}".format(
+            self.__class__.__name__, inspect.stack()[0][3]))
+
+        X = sparse.random(300, 80, density=0.1, format='csr', random_state=0)
+        folds = assign_folds(X, 4)
+        sizes = [X.nnz // 4 + (fold < X.nnz % 4) for fold in range(4)]
+        assert np.array_equal(np.bincount(folds), sizes), \
+            logger.error("     Failure in {}.".format(inspect.stack()[0][3]))
+        tests = []
+        for fold in range(4):
+            X_train, X_test = split(X, folds, fold)
+            assert abs(X_train + X_test - X).sum() == 0 and X_train.multiply(X_test).nnz == 0, \
+                logger.error("     Failure in {}.".format(inspect.stack()[0][3]))
+            tests.append(X_test)
+        assert abs(sum(tests) - X).sum() == 0, \
+            logger.error("     Failure in {}.".format(inspect.stack()[0][3]))
+
+        logger.info("    Successfully completed {} {}".format(
+            self.__class__.__name__, inspect.stack()[0][3]))
+
+    def test_run(self, tmp_path):
+        logger.info("    Started {} {}".format(
+            self.__class__.__name__, inspect.stack()[0][3]))
+
+        X = sparse.random(300, 80, density=0.1, format='csr', random_state=0)
+        cv = CrossValidation('als', {'factors': 8, 'iterations': 3}, n_folds=3, k_values=(10,),
+                             cpu_budget=2, directory=str(tmp_path))
+        report = cv.run(X)
+        assert [r['fold'] for r in report['folds']] == [0, 1, 2], \
+            logger.error("     Failure in {}.".format(inspect.stack()[0][3]))
+        assert sum(r['test'] for r in report['folds']) == X.nnz, \
+            logger.error("     Failure in {}.".format(inspect.stack()[0][3]))
+        expected = np.mean([r['metrics']['ndcg@10'] for r in report['folds']])
+        assert np.isclose(report['mean']['ndcg@10'], expected) and 'ndcg@10' in report['std'], \
+            logger.error("     Failure in {}.".format(inspect.stack()[0][3]))
+
+        cv = CrossValidation('als', {'factors': 8}, n_folds=3, cpu_budget=8, memory_budget=1,
+                             directory=str(tmp_path))
+        assert cv.n_workers(X) == 1, \
+            logger.error("     Failure in {}.".format(inspect.stack()[0][3]))
+        cv.memory_budget = 2 * cv.fold_memory(X)
+        assert cv.n_workers(X) == 2, \
+            logger.error("     Failure in {}.".format(inspect.stack()[0][3]))
+
+        logger.info("    Successfully completed {} {}".format(
+            self.__class__.__name__, inspect.stack()[0][3]))
+# %%
@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+# ======================================================================================================================== #
+# Project  : Explainable Recommendation (XRec)                                                                             #
+# Version  : 0.1.0                                                                                                         #
+# File     : \test_models_evaluate.py                                                                                      #
+# Language : Python 3.8                                                                                                    #
+# ------------------------------------------------------------------------------------------------------------------------ #
+# Author   : John James                                                                                                    #
+# Company  : Bryant St. Labs                                                                                               #
+# Email    : john.james.ai.studio@gmail.com                                                                                #
+# URL      : https://github.com/john-james-ai/xrec                                                                         #
+# ------------------------------------------------------------------------------------------------------------------------ #
+# Created  : Monday, October 19th 2026, 9:00:00 am                                                                         #
+# Modified : Monday, October 19th 2026, 9:00:00 am                                                                         #
+# Modifier : John James (john.james.ai.studio@gmail.com)                                                                   #
+# ------------------------------------------------------------------------------------------------------------------------ #
+# License  : BSD 3-clause "New" or "Revised" License                                                                       #
+# Copyright: (c) 2021 Bryant St. Labs                                                                                      #
+# ======================================================================================================================== #
+# %%
+import logging
+import inspect
+import numpy as np
+from scipy import sparse
+from xrec.models.evaluate import evaluate, evaluate_recommender
+from xrec.models.knn import ItemKNN
+from xrec.models.predict_model import BatchRecommender
+# ------------------------------------------------------------------------------------------------------------------------ #
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+class TestEvaluate:
+
+    def test_evaluate(self):
+        logger.info("    Started {} {}".format(
+            self.__class__.__name__, inspect.stack()[0][3]))
+
+        rng = np.random.default_rng(0)
+        X_train = sparse.random(300, 100, density=0.05, format='csr', random_state=0)
+        X_test = sparse.random(300, 100, density=0.03, format='csr', random_state=1)
+        X_test = (X_test - X_test.multiply(X_train > 0)).tocsr()
+        X_test.eliminate_zeros()
+        recommender = BatchRecommender(rng.standard_normal((300, 8), dtype=np.float32),
+                                       rng.standard_normal((100, 8), dtype=np.float32),
+                                       memory_budget=20000, n_threads=1)
+        topk, _ = recommender.recommend_all(20, X_train)
+        neighbours = ItemKNN(k=10, n_workers=1).fit(X_train).neighbours
+        metrics = evaluate(topk, X_test, (5, 10, 20), X_train, neighbours, block_size=37,
+                           n_workers=2)
+
+        test, train, explains = X_test.toarray() > 0, X_train.toarray() > 0, neighbours.toarray() > 0
+        recall, ndcg, mrr, explained = [], [], [], []
+        for u in range(300):
+            relevant = test[u].sum()
+            if not relevant:
+                continue
+            hits = test[u, topk[u]]
+            recall.append(hits[:5].sum() / relevant)
+            ideal = (1 / np.log2(np.arange(2, 2 + min(relevant, 10)))).sum()
+            ndcg.append((hits[:10] / np.log2(np.arange(2, 12))).sum() / ideal)
+            mrr.append(1 / (np.argmax(hits) + 1) if hits.any() else 0)
+            explained.extend((explains[i] & train[u]).any() for i in topk[u])
+        expected = {'recall@5': np.mean(recall), 'ndcg@10': np.mean(ndcg), 'mrr': np.mean(mrr),
+                    'explanation_coverage': np.mean(explained), 'users': len(recall)}
+        for name, value in expected.items():
+            assert np.isclose(metrics[name], value), \
+                logger.error("     Failure in {}. {}".format(inspect.stack()[0][3], name))
+
+        streamed = evaluate_recommender(recommender, X_test, X_train, (5, 10, 20), neighbours)
+        for name, value in metrics.items():
+            assert np.isclose(streamed[name], value), \
+                logger.error("     Failure in {}. {}".format(inspect.stack()[0][3], name))
+
+        logger.info("    Successfully completed {} {}".format(
+            self.__class__.__name__, inspect.stack()[0][3]))
+# %%
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+# ======================================================================================================================== #
+# Project  : Explainable Recommendation (XRec)                                                                             #
+# Version  : 0.1.0                                                                                                         #
+# File     : \test_models_knn.py                                                                                           #
+# Language : Python 3.8                                                                                                    #
+# ------------------------------------------------------------------------------------------------------------------------ #
+# Author   : John James                                                                                                    #
+# Company  : Bryant St. Labs                                                                                               #
+# Email    : john.james.ai.studio@gmail.com                                                                                #
+# URL      : https://github.com/john-james-ai/xrec                                                                         #
+# ------------------------------------------------------------------------------------------------------------------------ #
+# Created  : Monday, October 19th 2026, 9:00:00 am                                                                         #
+# Modified : Monday, October 19th 2026, 9:00:00 am                                                                         #
+# Modifier : John James (john.james.ai.studio@gmail.com)                                                                   #
+# ------------------------------------------------------------------------------------------------------------------------ #
+# License  : BSD 3-clause "New" or "Revised" License                                                                       #
+# Copyright: (c) 2021 Bryant St. Labs                                                                                      #
+# ======================================================================================================================== #
+# %%
+import logging
+import inspect
+import numpy as np
+from scipy import sparse
+from xrec.models.knn import ItemKNN
+# ------------------------------------------------------------------------------------------------------------------------ #
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+class TestItemKNN:
+
+    def test_fit(self, tmp_path):
+        logger.info("    Started {} {}".format(
+            self.__class__.__name__, inspect.stack()[0][3]))
+
+        X = sparse.random(400, 150, density=0.05, format='csr', random_state=0)
+        model = ItemKNN(k=10, block_size=32, n_workers=2).fit(X)
+
+        dense = X.toarray()
+        norms = np.linalg.norm(dense, axis=0)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            S = np.nan_to_num(dense.T @ dense / np.outer(norms, norms))
+        np.fill_diagonal(S, 0)
+        expected = np.sort(S, axis=1)[:, ::-1][:, :10]
+        for i in range(150):
+            row = model.neighbours.data[model.neighbours.indptr[i]:model.neighbours.indptr[i + 1]]
+            assert np.allclose(row, expected[i, :len(row)], atol=1e-6), \
+                logger.error("     Failure in {}.".format(inspect.stack()[0][3]))
+            assert len(row) == min(10, (S[i] > 0).sum()), \
+                logger.error("     Failure in {}.".format(inspect.stack()[0][3]))
+
+        model.save(str(tmp_path))
+        loaded = ItemKNN.load(str(tmp_path))
+        assert (loaded.neighbours != model.neighbours).nnz == 0, \
+            logger.error("     Failure in {}.".format(inspect.stack()[0][3]))
+
+        seen = X[0].indices
+        item = int(np.argmax(np.where(np.isin(np.arange(150), seen), -np.inf,
+                                      model.score(X[0])[0])))
+        because = model.explain(seen, item)
+        assert because and all(j in seen for j, _ in because), \
+            logger.error("     Failure in {}.".format(inspect.stack()[0][3]))
+
+        logger.info("    Successfully completed {} {}".format(
+            self.__class__.__name__, inspect.stack()[0][3]))
+# %%
@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+# ======================================================================================================================== #
+# Project  : Explainable Recommendation (XRec)                                                                             #
+# Version  : 0.1.0                                                                                                         #
+# File     : \test_models_predict_model.py                                                                                 #
+# Language : Python 3.8                                                                                                    #
+# ------------------------------------------------------------------------------------------------------------------------ #
+# Author   : John James                                                                                                    #
+# Company  : Bryant St. Labs                                                                                               #
+# Email    : john.james.ai.studio@gmail.com                                                                                #
+# URL      : https://github.com/john-james-ai/xrec                                                                         #
+# ------------------------------------------------------------------------------------------------------------------------ #
+# Created  : Monday, October 19th 2026, 9:00:00 am                                                                         #
+# Modified : Monday, October 19th 2026, 9:00:00 am                                                                         #
+# Modifier : John James (john.james.ai.studio@gmail.com)                                                                   #
+# ------------------------------------------------------------------------------------------------------------------------ #
+# License  : BSD 3-clause "New" or "Revised" License                                                                       #
+# Copyright: (c) 2021 Bryant St. Labs                                                                                      #
+# ======================================================================================================================== #
+# %%
+import asyncio
+import logging
+import inspect
+import numpy as np
+from scipy import sparse
+from xrec.benchmarks.loadgen import get
+from xrec.models.cache import ExplanationCache
+from xrec.models.knn import ItemKNN
+from xrec.models.predict_model import BatchRecommender, RecommendationService
+# ------------------------------------------------------------------------------------------------------------------------ #
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+def factors(n_users=500, n_items=300, k=16, seed=0):
+    rng = np.random.default_rng(seed)
+    return (rng.standard_normal((n_users, k), dtype=np.float32),
+            rng.standard_normal((n_items, k), dtype=np.float32))
+
+
+class TestBatchRecommender:
+
+    def test_recommend_all(self):
+        logger.info("    Started {} {}".format(
+            self.__class__.__name__, inspect.stack()[0][3]))
+
+        U, V = factors()
+        X = sparse.random(500, 300, density=0.05, format='csr', random_state=0)
+        recommender = BatchRecommender(U, V, memory_budget=200000, n_threads=2)
+        assert recommender.block_size(10) < 500, \
+            logger.error("     Failure in {}.".format(inspect.stack()[0][3]))
+        items, scores = recommender.recommend_all(k=10, X_seen=X)
+
+        expected = U @ V.T
+        expected[X.nonzero()] = -np.inf
+        order = np.argsort(-expected, axis=1, kind='stable')[:, :10]
+        assert np.allclose(scores, np.take_along_axis(expected, order, axis=1), atol=1e-4), \
+            logger.error("     Failure in {}.".format(inspect.stack()[0][3]))
+        assert not X[np.repeat(np.arange(500), 10), items.ravel()].any(), \
+            logger.error("     Failure in {}.".format(inspect.stack()[0][3]))
+
+        users = np.array([3, 400, 7])
+        some_items, some_scores = recommender.recommend(users, k=10, X_seen=X)
+        assert np.array_equal(some_items, items[users]), \
+            logger.error("     Failure in {}.".format(inspect.stack()[0][3]))
+
+        logger.info("    Successfully completed {} {}".format(
+            self.__class__.__name__, inspect.stack()[0][3]))
+
+
+class TestRecommendationService:
+
+    def test_service(self):
+        logger.info("    Started {} {}".format(
+            self.__class__.__name__, inspect.stack()[0][3]))
+
+        U, V = factors()
+        X = sparse.random(500, 300, density=0.05, format='csr', random_state=0)
+        recommender = BatchRecommender(U, V, n_threads=1)
+        expected, _ = recommender.recommend(np.arange(20), k=5, X_seen=X)
+
+        async def request(port, target):
+            reader, writer = await asyncio.open_connection('127.0.0.1', port)
+            try:
+                return await get(reader, writer, '127.0.0.1', target)
+            finally:
+                writer.close()
+
+        async def oversized(port):
+            reader, writer = await asyncio.open_connection('127.0.0.1', port)
+            try:
+                writer.write(b'GET /health HTTP/1.1\r\nX-Padding: ' + b'a' * (1 << 17) +
+                             b'\r\n\r\n')
+                await writer.drain()
+                return await reader.readline()
+            finally:
+                writer.close()
+
+        async def scenario():
+            service = RecommendationService(recommender, X, window_ms=20, max_pending=64)
+            await service.start('127.0.0.1', 0)
+            try:
+                responses = await asyncio.gather(*[
+                    request(service.port, '/recommend?user={}&k=5'.format(u)) for u in range(20)])
+                unknown = await request(service.port, '/recommend?user=9999')
+                invalid = [(await request(service.port, '/recommend?user=0&k={}'.format(k)))[0]
+                           for k in ('0', '-3', '2.5', 'ten')]
+                line = await oversized(service.port)
+                metrics = (await request(service.port, '/metrics'))[1]
+            finally:
+                await service.stop()
+            return responses, unknown, invalid, line, metrics
+
+        responses, unknown, invalid, line, metrics = asyncio.run(scenario())
+        for u, (status, body) in enumerate(responses):
+            assert status == 200 and body['items'] == expected[u].tolist(), \
+                logger.error("     Failure in {}.".format(inspect.stack()[0][3]))
+        assert unknown[0] == 400 and invalid == [400] * 4, \
+            logger.error("     Failure in {}.".format(inspect.stack()[0][3]))
+        assert line.startswith(b'HTTP/1.1 431'), \
+            logger.error("     Failure in {}.".format(inspect.stack()[0][3]))
+        assert metrics['requests'] == 20 and metrics['mean_batch_size'] > 1, \
+            logger.error("     Failure in {}.".format(inspect.stack()[0][3]))
+        assert metrics['latency_ms']['p99'] >= metrics['latency_ms']['p50'], \
+            logger.error("     Failure in {}.".format(inspect.stack()[0][3]))
+
+        logger.info("    Successfully completed {} {}".format(
+            self.__class__.__name__, inspect.stack()[0][3]))
+
+    def test_explanation_versions(self):
+        logger.info("    Started {} {}".format(
+            self.__class__.__name__, inspect.stack()[0][3]))
+
+        U, V = factors()
+        X = sparse.random(500, 300, density=0.05, format='csr', random_state=0)
+        recommender = BatchRecommender(U, V, n_threads=1, version=1)
+        cache = ExplanationCache()
+        user = 3
+        wide, narrow = ItemKNN(k=20, n_workers=1).fit(X), ItemKNN(k=1, n_workers=1).fit(X)
+        seen = X.indices[X.indptr[user]:X.indptr[user + 1]]
+        item = next(i for i in range(300) if len(wide.explain(seen, i)) > 1)
+        query = {'user': str(user), 'item': str(item)}
+
+        # Only the explainer changes: a different neighbour table, as after retraining it.
+        first = RecommendationService(recommender, X, wide, cache=cache)
+        _, before = asyncio.run(first._explain(user, query))
+        second = RecommendationService(recommender, X, narrow, cache=cache)
+        _, after = asyncio.run(second._explain(user, query))
+        assert first.version != second.version and first.version[0] == second.version[0], \
+            logger.error("     Failure in {}.".format(inspect.stack()[0][3]))
+        assert len(before['because']) > 1 and len(after['because']) <= 1, \
+            logger.error("     Failure in {}.".format(inspect.stack()[0][3]))
+        assert cache.stats()['hits'] == 0, \
+            logger.error("     Failure in {}.".format(inspect.stack()[0][3]))
+
+        logger.info("    Successfully completed {} {}".format(
+            self.__class__.__name__, inspect.stack()[0][3]))
+
+
+if __name__ == "__main__":
+    t = TestBatchRecommender()
+    t.test_recommend_all()
+    t = TestRecommendationService()
+    t.test_service()
+# %%
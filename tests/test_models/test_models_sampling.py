@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+# ======================================================================================================================== #
+# Project  : Explainable Recommendation (XRec)                                                                             #
+# Version  : 0.1.0                                                                                                         #
+# File     : \test_models_sampling.py                                                                                      #
+# Language : Python 3.8                                                                                                    #
+# ------------------------------------------------------------------------------------------------------------------------ #
+# Author   : John James                                                                                                    #
+# Company  : Bryant St. Labs                                                                                               #
+# Email    : john.james.ai.studio@gmail.com                                                                                #
+# URL      : https://github.com/john-james-ai/xrec                                                                         #
+# ------------------------------------------------------------------------------------------------------------------------ #
+# Created  : Monday, October 19th 2026, 9:00:00 am                                                                         #
+# Modified : Monday, October 19th 2026, 9:00:00 am                                                                         #
+# Modifier : John James (john.james.ai.studio@gmail.com)                                                                   #
+# ------------------------------------------------------------------------------------------------------------------------ #
+# License  : BSD 3-clause "New" or "Revised" License                                                                       #
+# Copyright: (c) 2021 Bryant St. Labs                                                                                      #
+# ======================================================================================================================== #
+# %%
+import logging
+import inspect
+import numpy as np
+from scipy import sparse
+from xrec.models.sampling import NegativeSampler
+from xrec.utils.sparse import csr_contains
+# ------------------------------------------------------------------------------------------------------------------------ #
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+def interactions(n_users=200, n_items=50, density=0.2, seed=1):
+    return sparse.random(n_users, n_items, density=density, format='csr',
+                         random_state=seed, dtype=np.float32)
+
+
+class TestNegativeSampler:
+
+    def test_csr_contains(self):
+        logger.info("    Started {} {}".format(
+            self.__class__.__name__, inspect.stack()[0][3]))
+
+        X = interactions()
+        rows = np.repeat(np.arange(X.shape[0]), X.shape[1])
+        cols = np.tile(np.arange(X.shape[1]), X.shape[0])
+        expected = X.toarray().ravel() != 0
+        assert np.array_equal(csr_contains(X, rows, cols), expected), \
+            logger.error("     Failure in {}.".format(inspect.stack()[0][3]))
+
+        logger.info("    Successfully completed {} {}".format(
+            self.__class__.__name__, inspect.stack()[0][3]))
+
+    def test_negatives(self):
+        logger.info("    Started {} {}".format(
+            self.__class__.__name__, inspect.stack()[0][3]))
+
+        X = interactions()
+        for distribution in ('uniform', 'popularity'):
+            sampler = NegativeSampler(X, distribution=distribution, batch_size=128)
+            n = 0
+            for users, positives, negatives in sampler.epoch(0):
+                assert csr_contains(X, users, positives).all(), \
+                    logger.error("     Failure in {}.".format(inspect.stack()[0][3]))
+                assert not csr_contains(X, users, negatives).any(), \
+                    logger.error("     Failure in {}.".format(inspect.stack()[0][3]))
+                n += len(users)
+            assert n == X.nnz, \
+                logger.error("     Failure in {}.".format(inspect.stack()[0][3]))
+
+        logger.info("    Successfully completed {} {}".format(
+            self.__class__.__name__, inspect.stack()[0][3]))
+
+    def test_reproducible(self):
+        logger.info("    Started {} {}".format(
+            self.__class__.__name__, inspect.stack()[0][3]))
+
+        X = interactions()
+        sampler = NegativeSampler(X, batch_size=100, seed=7)
+        first = list(sampler.epoch(3))
+        second = list(sampler.prefetch(3, n_workers=2, queue_size=4))
+        other = list(sampler.epoch(4))
+        assert len(first) == len(second) == sampler.n_batches, \
+            logger.error("     Failure in {}.".format(inspect.stack()[0][3]))
+        for a, b, c in zip(first, second, other):
+            for x, y in zip(a, b):
+                assert np.array_equal(x, y), \
+                    logger.error("     Failure in {}.".format(inspect.stack()[0][3]))
+            assert not np.array_equal(a[0], c[0]), \
+                logger.error("     Failure in {}.".format(inspect.stack()[0][3]))
+
+        logger.info("    Successfully completed {} {}".format(
+            self.__class__.__name__, inspect.stack()[0][3]))
+
+
+if __name__ == "__main__":
+    t = TestNegativeSampler()
+    t.test_csr_contains()
+    t.test_negatives()
+    t.test_reproducible()
+# %%
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+# ======================================================================================================================== #
+# Project  : Explainable Recommendation (XRec)                                                                             #
+# Version  : 0.1.0                                                                                                         #
+# File     : \test_models_search.py                                                                                        #
+# Language : Python 3.8                                                                                                    #
+# ------------------------------------------------------------------------------------------------------------------------ #
+# Author   : John James                                                                                                    #
+# Company  : Bryant St. Labs                                                                                               #
+# Email    : john.james.ai.studio@gmail.com                                                                                #
+# URL      : https://github.com/john-james-ai/xrec                                                                         #
+# ------------------------------------------------------------------------------------------------------------------------ #
+# Created  : Monday, October 19th 2026, 9:00:00 am                                                                         #
+# Modified : Monday, October 19th 2026, 9:00:00 am                                                                         #
+# Modifier : John James (john.james.ai.studio@gmail.com)                                                                   #
+# ------------------------------------------------------------------------------------------------------------------------ #
+# License  : BSD 3-clause "New" or "Revised" License                                                                       #
+# Copyright: (c) 2021 Bryant St. Labs                                                                                      #
+# ======================================================================================================================== #
+# %%
+import logging
+import inspect
+import numpy as np
+from scipy import sparse
+from xrec.models.artifact import load_matrix, save_matrix
+from xrec.models.search import HyperparameterSearch, _run_trial
+from xrec.models.train_model import BPR
+# ------------------------------------------------------------------------------------------------------------------------ #
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+def _mapped(array: np.ndarray) -> bool:
+    """Returns True if an array is a view of a memory map."""
+    while array is not None:
+        if isinstance(array, np.memmap):
+            return True
+        array = getattr(array, 'base', None)
+    return False
+
+
+class TestHyperparameterSearch:
+
+    def test_run(self, tmp_path):
+        logger.info("    Started {} {}".format(
+            self.__class__.__name__, inspect.stack()[0][3]))
+
+        rng = np.random.default_rng(0)
+        users = rng.integers(0, 300, size=6000)
+        items = (100 * rng.random(6000) ** 2).astype(int)
+        valid = rng.random(6000) < 0.2
+        # float64 input, as scipy builds by default, is stored as float32.
+        X_train = sparse.csr_matrix((np.ones((~valid).sum()), (users[~valid], items[~valid])),
+                                    shape=(300, 100))
+        X_valid = sparse.csr_matrix((np.ones(valid.sum()), (users[valid], items[valid])),
+                                    shape=(300, 100))
+        space = {'factors': [4, 8], 'regularization': [0.01, 0.1, 1.0]}
+        search = HyperparameterSearch('als', space, n_trials=6, min_budget=1, max_budget=4,
+                                      eta=2, cpu_budget=2, directory=str(tmp_path))
+        results = search.run(X_train, X_valid)
+
+        budgets = sorted(r['budget'] for r in results)
+        assert budgets == [1] * 6 + [2] * 3 + [4], \
+            logger.error("     Failure in {}. {}".format(inspect.stack()[0][3], budgets))
+        assert search.best['budget'] == 4, \
+            logger.error("     Failure in {}.".format(inspect.stack()[0][3]))
+        for name in ('train', 'train_t', 'valid'):
+            X = load_matrix(str(tmp_path / name))
+            assert X.dtype == np.float32 and _mapped(X.data), \
+                logger.error("     Failure in {}.".format(inspect.stack()[0][3]))
+            assert np.shares_memory(sparse.csr_matrix(X, dtype=np.float32).data, X.data), \
+                logger.error("     Failure in {}.".format(inspect.stack()[0][3]))
+        assert any(r['warm_start'] for r in results if r['budget'] == 1), \
+            logger.error("     Failure in {}.".format(inspect.stack()[0][3]))
+        assert all(r['warm_start'] for r in results if r['budget'] > 1), \
+            logger.error("     Failure in {}.".format(inspect.stack()[0][3]))
+
+        logger.info("    Successfully completed {} {}".format(
+            self.__class__.__name__, inspect.stack()[0][3]))
+
+    def test_bpr_promotion(self, tmp_path):
+        logger.info("    Started {} {}".format(
+            self.__class__.__name__, inspect.stack()[0][3]))
+
+        X = sparse.random(200, 80, density=0.05, format='csr', random_state=0, dtype=np.float32)
+        matrices = {name: save_matrix(str(tmp_path / name), X) for name in ('train', 'valid')}
+        params = {'factors': 4, 'batch_size': 64}
+        BPR(epochs=2, n_workers=1, **params).fit(X).save(str(tmp_path / 'rung'))
+        task = {'id': 0, 'model': 'bpr', 'params': params, 'budget': 3, 'iterations': 1,
+                'init': str(tmp_path / 'rung'), 'threads': 1, 'metric': 'ndcg@10',
+                'matrices': matrices, 'output': str(tmp_path / 'promoted')}
+        promoted = BPR.load(_run_trial(task)['path'])
+
+        # The promoted trial keeps the biases and runs the third epoch, as uninterrupted training.
+        expected = BPR(epochs=3, n_workers=1, **params).fit(X)
+        assert np.any(promoted.item_bias != 0), \
+            logger.error("     Failure in {}.".format(inspect.stack()[0][3]))
+        for name in BPR.arrays:
+            assert np.array_equal(getattr(promoted, name), getattr(expected, name)), \
+                logger.error("     Failure in {}.".format(inspect.stack()[0][3]))
+
+        logger.info("    Successfully completed {} {}".format(
+            self.__class__.__name__, inspect.stack()[0][3]))
+# %%
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+# ======================================================================================================================== #
+# Project  : Explainable Recommendation (XRec)                                                                             #
+# Version  : 0.1.0                                                                                                         #
+# File     : \test_models_table.py                                                                                         #
+# Language : Python 3.8                                                                                                    #
+# ------------------------------------------------------------------------------------------------------------------------ #
+# Author   : John James                                                                                                    #
+# Company  : Bryant St. Labs                                                                                               #
+# Email    : john.james.ai.studio@gmail.com                                                                                #
+# URL      : https://github.com/john-james-ai/xrec                                                                         #
+# ------------------------------------------------------------------------------------------------------------------------ #
+# Created  : Monday, October 19th 2026, 9:00:00 am                                                                         #
+# Modified : Monday, October 19th 2026, 9:00:00 am                                                                         #
+# Modifier : John James (john.james.ai.studio@gmail.com)                                                                   #
+# ------------------------------------------------------------------------------------------------------------------------ #
+# License  : BSD 3-clause "New" or "Revised" License                                                                       #
+# Copyright: (c) 2021 Bryant St. Labs                                                                                      #
+# ======================================================================================================================== #
+# %%
+import os
+import logging
+import inspect
+import multiprocessing as mp
+import numpy as np
+from scipy import sparse
+from xrec.models.artifact import save_artifact, resolve
+from xrec.models.knn import ItemKNN
+from xrec.models.predict_model import BatchRecommender, RecommendationService
+from xrec.models.table import RecommendationTable
+from xrec.utils.workqueue import run_worker
+# ------------------------------------------------------------------------------------------------------------------------ #
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+class TestRecommendationTable:
+
+    def test_materialize(self, tmp_path):
+        logger.info("    Started {} {}".format(
+            self.__class__.__name__, inspect.stack()[0][3]))
+
+        X = sparse.random(200, 60, density=0.3, format='csr', random_state=0)
+        rng = np.random.default_rng(0)
+        vocabularies = {'users': ['u{}'.format(u) for u in range(200)],
+                        'items': ['i{}'.format(i) for i in range(60)]}
+        recommender = BatchRecommender(rng.standard_normal((200, 8)).astype(np.float32),
+                                       rng.standard_normal((60, 8)).astype(np.float32),
+                                       memory_budget=1 << 16, vocabularies=vocabularies,
+                                       version=1)
+        knn = ItemKNN(k=10, n_workers=1).fit(X)
+        path = str(tmp_path / 'table')
+        RecommendationTable.materialize(recommender, path, k=50, X_seen=X, explainer=knn)
+        table = RecommendationTable.load(path)
+
+        items, scores, because = table.lookup(np.arange(200))
+        expected_items, expected_scores = recommender.recommend(np.arange(200), 50, X)
+        assert np.array_equal(items, np.where(np.isfinite(expected_scores), expected_items, -1)), \
+            logger.error("     Failure in {}.".format(inspect.stack()[0][3]))
+        assert np.array_equal(scores, expected_scores), \
+            logger.error("     Failure in {}.".format(inspect.stack()[0][3]))
+        assert table.table.dtype.itemsize == 50 * 12 and table.params['model_version'] == 1, \
+            logger.error("     Failure in {}.".format(inspect.stack()[0][3]))
+        for user in range(0, 200, 17):
+            seen = X.indices[X.indptr[user]:X.indptr[user + 1]]
+            for item, pointer in zip(items[user], because[user]):
+                if item >= 0:
+                    justification = knn.explain(seen, item, n=1)
+                    assert pointer == (justification[0][0] if justification else -1), \
+                        logger.error("     Failure in {}.".format(inspect.stack()[0][3]))
+
+        top = table.get('u3', k=2)
+        assert [entry['item'] for entry in top] == ['i{}'.format(i) for i in items[3, :2]], \
+            logger.error("     Failure in {}.".format(inspect.stack()[0][3]))
+
+        logger.info("    Successfully completed {} {}".format(
+            self.__class__.__name__, inspect.stack()[0][3]))
+
+    def test_materialize_queued(self, tmp_path):
+        logger.info("    Started {} {}".format(
+            self.__class__.__name__, inspect.stack()[0][3]))
+
+        X = sparse.random(230, 40, density=0.2, format='csr', random_state=1)
+        sparse.save_npz(str(tmp_path / 'seen.npz'), X)
+        rng = np.random.default_rng(1)
+        model = str(tmp_path / 'model')
+        save_artifact(model, 'als', {'user_factors': rng.standard_normal((230, 8)),
+                                     'item_factors': rng.standard_normal((40, 8))})
+        queue = str(tmp_path / 'queue.db')
+        worker = mp.Process(target=run_worker, args=(queue, 0.05),
+                            kwargs={'exit_when_empty': True, 'max_units': 2})
+        worker.start()
+        path = str(tmp_path / 'table')
+        RecommendationTable.materialize_queued(model, path, queue, k=10,
+                                               seen=str(tmp_path / 'seen.npz'), block_users=50)
+        worker.join(30)
+        table = RecommendationTable.load(path)
+
+        items, scores, _ = table.lookup(np.arange(230))
+        expected_items, expected_scores = BatchRecommender.load(model).recommend(
+            np.arange(230), 10, X)
+        assert np.array_equal(items, np.where(np.isfinite(expected_scores), expected_items, -1)), \
+            logger.error("     Failure in {}.".format(inspect.stack()[0][3]))
+        assert np.array_equal(scores, expected_scores) and not table.explanations, \
+            logger.error("     Failure in {}.".format(inspect.stack()[0][3]))
+        assert sorted(os.listdir(resolve(path))) == ['manifest.json', 'table.npy'], \
+            logger.error("     Failure in {}.".format(inspect.stack()[0][3]))
+
+        # A table is served only with its own model, not another model at the same version.
+        other = str(tmp_path / 'other')
+        save_artifact(other, 'als', {'user_factors': rng.standard_normal((230, 8)),
+                                     'item_factors': rng.standard_normal((40, 8))})
+        assert RecommendationService(BatchRecommender.load(model), table=table).table is table, \
+            logger.error("     Failure in {}.".format(inspect.stack()[0][3]))
+        assert RecommendationService(BatchRecommender.load(other), table=table).table is None, \
+            logger.error("     Failure in {}.".format(inspect.stack()[0][3]))
+
+        logger.info("    Successfully completed {} {}".format(
+            self.__class__.__name__, inspect.stack()[0][3]))
+# %%
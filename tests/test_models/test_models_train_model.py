@@ -0,0 +1,228 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+# ======================================================================================================================== #
+# Project  : Explainable Recommendation (XRec)                                                                             #
+# Version  : 0.1.0                                                                                                         #
+# File     : \test_models_train_model.py                                                                                   #
+# Language : Python 3.8                                                                                                    #
+# ------------------------------------------------------------------------------------------------------------------------ #
+# Author   : John James                                                                                                    #
+# Company  : Bryant St. Labs                                                                                               #
+# Email    : john.james.ai.studio@gmail.com                                                                                #
+# URL      : https://github.com/john-james-ai/xrec                                                                         #
+# ------------------------------------------------------------------------------------------------------------------------ #
+# Created  : Monday, October 19th 2026, 9:00:00 am                                                                         #
+# Modified : Monday, October 19th 2026, 9:00:00 am                                                                         #
+# Modifier : John James (john.james.ai.studio@gmail.com)                                                                   #
+# ------------------------------------------------------------------------------------------------------------------------ #
+# License  : BSD 3-clause "New" or "Revised" License                                                                       #
+# Copyright: (c) 2021 Bryant St. Labs                                                                                      #
+# ======================================================================================================================== #
+# %%
+import os
+import time
+import logging
+import inspect
+from unittest import mock
+import numpy as np
+import pytest
+from scipy import sparse
+from xrec.models import train_model
+from xrec.models.artifact import Vocabulary, save_matrix, load_matrix, load_artifact
+from xrec.models.train_model import ALS, BPR, fold_in
+# ------------------------------------------------------------------------------------------------------------------------ #
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+def ratings(n_users=300, n_items=120, density=0.05, seed=1):
+    X = sparse.random(n_users, n_items, density=density, format='csr',
+                      random_state=seed, dtype=np.float64)
+    X.data = np.ceil(X.data * 5)
+    return X
+
+
+def _crashing_epoch(hyperparameters, buffers, shapes, sampler, epoch, worker, n_workers):
+    """Kills the second worker in its second epoch, as the OOM killer would."""
+    if worker == 1 and epoch == 1:
+        os._exit(3)
+
+
+class TestALS:
+
+    def test_solve(self):
+        logger.info("    Started {} {}".format(
+            self.__class__.__name__, inspect.stack()[0][3]))
+
+        X = ratings()
+        Y = np.random.default_rng(0).standard_normal((X.shape[1], 8))
+        for implicit in (True, False):
+            model = ALS(factors=8, regularization=0.1, implicit=implicit, cg_steps=None,
+                        block_bytes=4096, dtype=np.float64)
+            U = model.solve(X, Y)
+            for u in range(X.shape[0]):
+                items = X.indices[X.indptr[u]:X.indptr[u + 1]]
+                values = X.data[X.indptr[u]:X.indptr[u + 1]]
+                if implicit:
+                    c = 1 + model.alpha * values
+                    A = Y.T @ Y + (Y[items].T * (c - 1)) @ Y[items] + 0.1 * np.eye(8)
+                    b = Y[items].T @ c
+                else:
+                    A = Y[items].T @ Y[items] + 0.1 * max(len(items), 1) * np.eye(8)
+                    b = Y[items].T @ values
+                assert np.allclose(U[u], np.linalg.solve(A, b)), \
+                    logger.error("     Failure in {}.".format(inspect.stack()[0][3]))
+
+        logger.info("    Successfully completed {} {}".format(
+            self.__class__.__name__, inspect.stack()[0][3]))
+
+    def test_fit(self):
+        logger.info("    Started {} {}".format(
+            self.__class__.__name__, inspect.stack()[0][3]))
+
+        X = ratings()
+        model = ALS(factors=16, regularization=0.01, implicit=False, iterations=5,
+                    n_threads=2).fit(X)
+        predicted = np.einsum('ij,ij->i', model.user_factors[X.nonzero()[0]],
+                              model.item_factors[X.indices])
+        rmse = np.sqrt(np.mean((predicted - X.data) ** 2))
+        assert rmse < 1.0, \
+            logger.error("     Failure in {}. RMSE={}".format(inspect.stack()[0][3], rmse))
+        assert len(model.history) == 5, \
+            logger.error("     Failure in {}.".format(inspect.stack()[0][3]))
+
+        logger.info("    Successfully completed {} {}".format(
+            self.__class__.__name__, inspect.stack()[0][3]))
+
+    def test_fold_in(self, tmp_path):
+        logger.info("    Started {} {}".format(
+            self.__class__.__name__, inspect.stack()[0][3]))
+
+        X = ratings()
+        model = ALS(factors=8, iterations=5).fit(X[:250])
+        item_factors = model.item_factors.copy()
+        model.fold_in(X, items=[])
+        expected = model.solve(X[250:], item_factors, exact=True)
+        assert np.allclose(model.user_factors[250:], expected, atol=1e-5), \
+            logger.error("     Failure in {}.".format(inspect.stack()[0][3]))
+        assert np.array_equal(model.item_factors, item_factors), \
+            logger.error("     Failure in {}.".format(inspect.stack()[0][3]))
+
+        # Publish new interactions of a known user, a new user and a new item.
+        model = ALS(factors=8, iterations=5).fit(X[:250])
+        users = Vocabulary.from_ids(['u{}'.format(u) for u in range(250)])
+        items = Vocabulary.from_ids(['i{}'.format(i) for i in range(120)])
+        model.save(str(tmp_path / 'model'), vocabularies={'users': users, 'items': items})
+        save_matrix(str(tmp_path / 'matrix'), X[:250])
+        path = fold_in(str(tmp_path / 'model'), str(tmp_path / 'matrix'),
+                       ['u0', 'new', 'new'], ['i3', 'i5', 'inew'], [2.0, 1.0, 1.0])
+        updated = ALS.load(path)
+        Y = load_matrix(str(tmp_path / 'matrix'))
+        assert Y.shape == (251, 121) and Y[0, 3] == 2.0 and Y[250, 120] == 1.0, \
+            logger.error("     Failure in {}.".format(inspect.stack()[0][3]))
+        assert updated.user_factors.shape == (251, 8), \
+            logger.error("     Failure in {}.".format(inspect.stack()[0][3]))
+        assert list(updated.vocabularies['items'].lookup(['inew', 'i3'])) == [120, 3], \
+            logger.error("     Failure in {}.".format(inspect.stack()[0][3]))
+        unchanged = np.setdiff1d(np.arange(250), [0])
+        assert np.array_equal(updated.user_factors[unchanged], model.user_factors[unchanged]), \
+            logger.error("     Failure in {}.".format(inspect.stack()[0][3]))
+
+        logger.info("    Successfully completed {} {}".format(
+            self.__class__.__name__, inspect.stack()[0][3]))
+
+    def test_fold_in_layers(self, tmp_path):
+        logger.info("    Started {} {}".format(
+            self.__class__.__name__, inspect.stack()[0][3]))
+
+        X = ratings()
+        model = ALS(factors=8, iterations=5).fit(X[:250])
+        folded = ALS(factors=8, iterations=5).fit(X[:250])
+        items = [3, 7, 119]
+        model.fold_in(X, items=items)
+        folded.fold_in(X, items=items, Xt=X.T.tocsr())
+        assert np.allclose(model.item_factors, folded.item_factors, atol=1e-6), \
+            logger.error("     Failure in {}.".format(inspect.stack()[0][3]))
+
+        # Only the touched rows are saved, as layers over the full matrices.
+        users = Vocabulary.from_ids(['u{}'.format(u) for u in range(300)])
+        vocabulary = Vocabulary.from_ids(['i{}'.format(i) for i in range(120)])
+        model.save(str(tmp_path / 'model'), vocabularies={'users': users, 'items': vocabulary})
+        save_matrix(str(tmp_path / 'matrix'), X)
+        save_matrix(str(tmp_path / 'matrix_t'), X.T)
+        for user_ids, item_ids in ((['u0', 'u0'], ['i3', 'i9']), (['u5', 'new'], ['i3', 'i4'])):
+            fold_in(str(tmp_path / 'model'), str(tmp_path / 'matrix'), user_ids, item_ids,
+                    transpose_path=str(tmp_path / 'matrix_t'))
+        layer = load_artifact(str(tmp_path / 'matrix'))
+        assert layer.kind == 'rows' and list(layer.arrays['rows']) == [5, 300], \
+            logger.error("     Failure in {}.".format(inspect.stack()[0][3]))
+        expected = X.tolil()
+        expected.resize((301, 120))
+        expected[0, 3] = expected[0, 9] = expected[5, 3] = expected[300, 4] = 1.0
+        Y = load_matrix(str(tmp_path / 'matrix'))
+        assert (Y != expected.tocsr()).nnz == 0, \
+            logger.error("     Failure in {}.".format(inspect.stack()[0][3]))
+        assert (load_matrix(str(tmp_path / 'matrix_t')) != Y.T).nnz == 0, \
+            logger.error("     Failure in {}.".format(inspect.stack()[0][3]))
+
+        # The layers are merged into a full matrix once they grow past the compact fraction.
+        fold_in(str(tmp_path / 'model'), str(tmp_path / 'matrix'), ['u1'], ['i1'], compact=0.0)
+        assert load_artifact(str(tmp_path / 'matrix')).kind == 'interactions', \
+            logger.error("     Failure in {}.".format(inspect.stack()[0][3]))
+        assert load_matrix(str(tmp_path / 'matrix'))[1, 1] == 1.0, \
+            logger.error("     Failure in {}.".format(inspect.stack()[0][3]))
+
+        logger.info("    Successfully completed {} {}".format(
+            self.__class__.__name__, inspect.stack()[0][3]))
+
+
+class TestBPR:
+
+    def test_fit(self):
+        logger.info("    Started {} {}".format(
+            self.__class__.__name__, inspect.stack()[0][3]))
+
+        # Two blocks of users, each interacting only with its own half of the catalog.
+        rng = np.random.default_rng(0)
+        users = rng.integers(0, 200, size=4000)
+        items = rng.integers(0, 50, size=4000) + 50 * (users >= 100)
+        X = sparse.csr_matrix((np.ones(4000), (users, items)), shape=(200, 100))
+        for n_workers in (1, 2):
+            model = BPR(factors=8, learning_rate=0.1, epochs=10, batch_size=256,
+                        n_workers=n_workers).fit(X)
+            scores = model.user_factors @ model.item_factors.T + model.item_bias
+            own = np.where(np.arange(200)[:, None] >= 100, np.arange(100) >= 50,
+                           np.arange(100) < 50)
+            accuracy = (scores[own].reshape(200, 50).mean(axis=1)
+                        > scores[~own].reshape(200, 50).mean(axis=1)).mean()
+            assert accuracy > 0.95, \
+                logger.error("     Failure in {}.".format(inspect.stack()[0][3]))
+            assert len(model.history) == 10, \
+                logger.error("     Failure in {}.".format(inspect.stack()[0][3]))
+
+        logger.info("    Successfully completed {} {}".format(
+            self.__class__.__name__, inspect.stack()[0][3]))
+
+    def test_worker_failure(self):
+        logger.info("    Started {} {}".format(
+            self.__class__.__name__, inspect.stack()[0][3]))
+
+        X = ratings()
+        started = time.perf_counter()
+        with mock.patch.object(train_model, '_bpr_epoch', _crashing_epoch):
+            with pytest.raises(RuntimeError, match='exited with code 3'):
+                BPR(factors=4, epochs=5, batch_size=64, n_workers=2).fit(X)
+        assert time.perf_counter() - started < 30, \
+            logger.error("     Failure in {}.".format(inspect.stack()[0][3]))
+
+        logger.info("    Successfully completed {} {}".format(
+            self.__class__.__name__, inspect.stack()[0][3]))
+
+
+if __name__ == "__main__":
+    t = TestALS()
+    t.test_solve()
+    t.test_fit()
+    t = TestBPR()
+    t.test_fit()
+# %%
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+# ======================================================================================================================== #
+# Project  : Explainable Recommendation (XRec)                                                                             #
+# Version  : 0.1.0                                                                                                         #
+# File     : \test_utils_budget.py                                                                                         #
+# Language : Python 3.8                                                                                                    #
+# ------------------------------------------------------------------------------------------------------------------------ #
+# Author   : John James                                                                                                    #
+# Company  : Bryant St. Labs                                                                                               #
+# Email    : john.james.ai.studio@gmail.com                                                                                #
+# URL      : https://github.com/john-james-ai/xrec                                                                         #
+# ------------------------------------------------------------------------------------------------------------------------ #
+# Created  : Monday, October 19th 2026, 9:00:00 am                                                                         #
+# Modified : Monday, October 19th 2026, 9:00:00 am                                                                         #
+# Modifier : John James (john.james.ai.studio@gmail.com)                                                                   #
+# ------------------------------------------------------------------------------------------------------------------------ #
+# License  : BSD 3-clause "New" or "Revised" License                                                                       #
+# Copyright: (c) 2021 Bryant St. Labs                                                                                      #
+# ======================================================================================================================== #
+# %%
+import gzip
+import json
+import logging
+import inspect
+import pytest
+from xrec.data.ingest import ingest
+from xrec.utils.budget import MemoryPlanner, parse_size
+from xrec.utils.config import Config
+from xrec.utils.instrument import rss
+# ------------------------------------------------------------------------------------------------------------------------ #
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+class TestMemoryPlanner:
+
+    def test_plan(self):
+        logger.info("    Started {} {}".format(
+            self.__class__.__name__, inspect.stack()[0][3]))
+
+        assert [parse_size(s) for s in ('512', '4K', '1.5G', '2gb', '3MiB', 7)] == \
+            [512, 4096, 3 << 29, 2 << 30, 3 << 20, 7], \
+            logger.error("     Failure in {}.".format(inspect.stack()[0][3]))
+        with pytest.raises(ValueError):
+            parse_size('lots')
+
+        large = MemoryPlanner(rss() + (64 << 30), n_cpus=8)
+        assert large.workers(1 << 30) == 8 and large.workers(1 << 30, limit=3) == 3, \
+            logger.error("     Failure in {}.".format(inspect.stack()[0][3]))
+        assert large.download_buffer(4) == 16 << 20 and large.batch_size(1024) == 1000000, \
+            logger.error("     Failure in {}.".format(inspect.stack()[0][3]))
+        medium = MemoryPlanner(rss() + (1 << 30) + (100 << 20), n_cpus=8)
+        assert medium.workers(256 << 20) == 4 and 1000 < medium.batch_size(1024) < 1000000, \
+            logger.error("     Failure in {}.".format(inspect.stack()[0][3]))
+        assert medium.batch_size(1024, n_workers=4) < medium.batch_size(1024), \
+            logger.error("     Failure in {}.".format(inspect.stack()[0][3]))
+        assert medium.share(4).budget == medium.budget // 4 and medium.share(4).n_cpus == 2, \
+            logger.error("     Failure in {}.".format(inspect.stack()[0][3]))
+        small = MemoryPlanner(rss(), n_cpus=8)
+        assert small.workers(1 << 20) == 1 and small.download_buffer() == 64 << 10, \
+            logger.error("     Failure in {}.".format(inspect.stack()[0][3]))
+
+        assert small.adjust(8000, 10000) == 4000 and small.adjust(1500, 10000) == 1000, \
+            logger.error("     Failure in {}.".format(inspect.stack()[0][3]))
+        assert large.adjust(4000, 10000) == 6000 and large.adjust(8000, 10000) == 10000, \
+            logger.error("     Failure in {}.".format(inspect.stack()[0][3]))
+
+        logger.info("    Successfully completed {} {}".format(
+            self.__class__.__name__, inspect.stack()[0][3]))
+
+    def test_configured(self, tmp_path):
+        logger.info("    Started {} {}".format(
+            self.__class__.__name__, inspect.stack()[0][3]))
+
+        path = str(tmp_path / 'reviews.json.gz')
+        with gzip.open(path, 'wt') as f:
+            for i in range(2500):
+                f.write(json.dumps({'reviewerID': 'U{}'.format(i % 7), 'asin': 'I{}'.format(i),
+                                    'overall': 5.0, 'unixReviewTime': i}) + '\n')
+        configfile = Config.configfile
+        Config.configfile = str(tmp_path / 'config.ini')
+        try:
+            Config().create('RESOURCES', 'memory_budget', '3G')
+            planner = MemoryPlanner.from_config()
+            reviews = ingest([path])
+        finally:
+            Config.configfile = configfile
+        assert planner.budget == 3 << 30, \
+            logger.error("     Failure in {}.".format(inspect.stack()[0][3]))
+        assert len(reviews['overall']) == 2500, \
+            logger.error("     Failure in {}.".format(inspect.stack()[0][3]))
+        assert len(ingest([path], planner=MemoryPlanner(rss()))['asin']) == 2500, \
+            logger.error("     Failure in {}.".format(inspect.stack()[0][3]))
+
+        logger.info("    Successfully completed {} {}".format(
+            self.__class__.__name__, inspect.stack()[0][3]))
+# %%
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+# ======================================================================================================================== #
+# Project  : Explainable Recommendation (XRec)                                                                             #
+# Version  : 0.1.0                                                                                                         #
+# File     : \test_utils_instrument.py                                                                                     #
+# Language : Python 3.8                                                                                                    #
+# ------------------------------------------------------------------------------------------------------------------------ #
+# Author   : John James                                                                                                    #
+# Company  : Bryant St. Labs                                                                                               #
+# Email    : john.james.ai.studio@gmail.com                                                                                #
+# URL      : https://github.com/john-james-ai/xrec                                                                         #
+# ------------------------------------------------------------------------------------------------------------------------ #
+# Created  : Monday, October 19th 2026, 9:00:00 am                                                                         #
+# Modified : Monday, October 19th 2026, 9:00:00 am                                                                         #
+# Modifier : John James (john.james.ai.studio@gmail.com)                                                                   #
+# ------------------------------------------------------------------------------------------------------------------------ #
+# License  : BSD 3-clause "New" or "Revised" License                                                                       #
+# Copyright: (c) 2021 Bryant St. Labs                                                                                      #
+# ======================================================================================================================== #
+# %%
+import os
+import socket
+import logging
+import inspect
+from multiprocessing import Pool
+import numpy as np
+from xrec.utils.instrument import (Stage, instrumented, count, enable, disable, merge,
+                                   summarize, report)
+# ------------------------------------------------------------------------------------------------------------------------ #
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+@instrumented(records=len)
+def _work(n: int) -> np.ndarray:
+    return np.ones(n)
+
+
+@instrumented('outer')
+def _outer(path: str) -> None:
+    with open(path, 'wb') as f:
+        f.write(b'x' * 10000)
+    count(7)
+    _work(5)
+
+
+class TestInstrument:
+
+    def test_events(self, tmp_path):
+        logger.info("    Started {} {}".format(
+            self.__class__.__name__, inspect.stack()[0][3]))
+
+        directory = str(tmp_path / 'events')
+        assert _work(3).shape == (3,), \
+            logger.error("     Failure in {}.".format(inspect.stack()[0][3]))
+        enable(directory)
+        try:
+            _outer(str(tmp_path / 'file.bin'))
+            with Pool(2) as pool:
+                assert sum(len(a) for a in pool.map(_work, [10, 20, 30])) == 60, \
+                    logger.error("     Failure in {}.".format(inspect.stack()[0][3]))
+            with Stage('tagged', tags={'run': 1}) as stage:
+                stage.records = 2
+        finally:
+            disable()
+        _work(4)
+
+        events = merge(directory)
+        assert len(events) == 6, \
+            logger.error("     Failure in {}.".format(inspect.stack()[0][3]))
+        assert os.path.isfile(os.path.join(directory, 'events-{}-{}.jsonl'.format(
+            socket.gethostname(), os.getpid()))), \
+            logger.error("     Failure in {}.".format(inspect.stack()[0][3]))
+        assert [e['start'] for e in events] == sorted(e['start'] for e in events), \
+            logger.error("     Failure in {}.".format(inspect.stack()[0][3]))
+        work = [e for e in events if e['stage'] == '_work']
+        assert sorted(e['records'] for e in work) == [5, 10, 20, 30], \
+            logger.error("     Failure in {}.".format(inspect.stack()[0][3]))
+        assert {e['parent'] for e in work} == {'outer', None}, \
+            logger.error("     Failure in {}.".format(inspect.stack()[0][3]))
+        assert any(e['pid'] != os.getpid() for e in work), \
+            logger.error("     Failure in {}.".format(inspect.stack()[0][3]))
+        outer = [e for e in events if e['stage'] == 'outer'][0]
+        assert outer['records'] == 7 and outer['bytes_written'] >= 10000, \
+            logger.error("     Failure in {}.".format(inspect.stack()[0][3]))
+        assert [e['tags'] for e in events if e['stage'] == 'tagged'] == [{'run': 1}], \
+            logger.error("     Failure in {}.".format(inspect.stack()[0][3]))
+
+        summary = summarize(events)
+        assert summary['stages']['_work']['calls'] == 4, \
+            logger.error("     Failure in {}.".format(inspect.stack()[0][3]))
+        assert summary['stages']['_work']['records'] == 65, \
+            logger.error("     Failure in {}.".format(inspect.stack()[0][3]))
+        assert summary['stages']['_work']['pids'] >= 2, \
+            logger.error("     Failure in {}.".format(inspect.stack()[0][3]))
+        assert summary['stages']['outer']['peak_rss'] > 0, \
+            logger.error("     Failure in {}.".format(inspect.stack()[0][3]))
+        assert 'outer' in report(directory), \
+            logger.error("     Failure in {}.".format(inspect.stack()[0][3]))
+
+        with open(os.path.join(directory, 'events-0.jsonl'), 'w') as f:
+            f.write('{"stage": "cut')
+        assert len(merge(directory)) == 6, \
+            logger.error("     Failure in {}.".format(inspect.stack()[0][3]))
+
+        logger.info("    Successfully completed {} {}".format(
+            self.__class__.__name__, inspect.stack()[0][3]))
+# %%
@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+# ======================================================================================================================== #
+# Project  : Explainable Recommendation (XRec)                                                                             #
+# Version  : 0.1.0                                                                                                         #
+# File     : \test_utils_pipeline.py                                                                                       #
+# Language : Python 3.8                                                                                                    #
+# ------------------------------------------------------------------------------------------------------------------------ #
+# Author   : John James                                                                                                    #
+# Company  : Bryant St. Labs                                                                                               #
+# Email    : john.james.ai.studio@gmail.com                                                                                #
+# URL      : https://github.com/john-james-ai/xrec                                                                         #
+# ------------------------------------------------------------------------------------------------------------------------ #
+# Created  : Monday, October 19th 2026, 9:00:00 am                                                                         #
+# Modified : Monday, October 19th 2026, 9:00:00 am                                                                         #
+# Modifier : John James (john.james.ai.studio@gmail.com)                                                                   #
+# ------------------------------------------------------------------------------------------------------------------------ #
+# License  : BSD 3-clause "New" or "Revised" License                                                                       #
+# Copyright: (c) 2021 Bryant St. Labs                                                                                      #
+# ======================================================================================================================== #
+# %%
+import os
+import time
+import logging
+import inspect
+import pytest
+import multiprocessing as mp
+from xrec.utils.pipeline import Pipeline
+from xrec.utils.workqueue import WorkQueue, run_worker
+# ------------------------------------------------------------------------------------------------------------------------ #
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+def _concatenate(inputs: list, output: str, seconds: float = 0.0) -> None:
+    started = time.time()
+    time.sleep(seconds)
+    text = ''.join(open(path).read() for path in inputs)
+    with open(output, 'w') as f:
+        f.write(text)
+    with open(output + '.times', 'w') as f:
+        f.write('{} {}'.format(started, time.time()))
+
+
+def _fail() -> None:
+    raise RuntimeError("failed")
+
+
+def _times(path: str) -> tuple:
+    with open(path + '.times') as f:
+        return tuple(float(t) for t in f.read().split())
+
+
+class TestPipeline:
+
+    def test_run(self, tmp_path):
+        logger.info("    Started {} {}".format(
+            self.__class__.__name__, inspect.stack()[0][3]))
+
+        paths = {name: str(tmp_path / name) for name in ('a', 'b', 'c', 'ab', 'abc')}
+        for name in ('a', 'b', 'c'):
+            with open(paths[name], 'w') as f:
+                f.write(name)
+
+        def build():
+            pipeline = Pipeline(str(tmp_path / 'state.json'), n_workers=2)
+            pipeline.add('abc', _concatenate, [paths['ab'], paths['c']], [paths['abc']],
+                         {'inputs': [paths['ab'], paths['c']], 'output': paths['abc']})
+            pipeline.add('ab', _concatenate, [paths['a'], paths['b']], [paths['ab']],
+                         {'inputs': [paths['a'], paths['b']], 'output': paths['ab']})
+            pipeline.add('copy_a', _concatenate, [paths['a']], [paths['a'] + '.copy'],
+                         {'inputs': [paths['a']], 'output': paths['a'] + '.copy',
+                          'seconds': 0.5})
+            pipeline.add('copy_b', _concatenate, [paths['b']], [paths['b'] + '.copy'],
+                         {'inputs': [paths['b']], 'output': paths['b'] + '.copy',
+                          'seconds': 0.5})
+            return pipeline
+
+        pipeline = build()
+        assert pipeline.dependencies() == {'abc': {'ab'}, 'ab': set(), 'copy_a': set(),
+                                           'copy_b': set()}, \
+            logger.error("     Failure in {}.".format(inspect.stack()[0][3]))
+        order = pipeline.order()
+        assert order.index('ab') < order.index('abc'), \
+            logger.error("     Failure in {}.".format(inspect.stack()[0][3]))
+
+        results = pipeline.run()
+        assert {r['status'] for r in results.values()} == {'completed'}, \
+            logger.error("     Failure in {}.".format(inspect.stack()[0][3]))
+        assert open(paths['abc']).read() == 'abc', \
+            logger.error("     Failure in {}.".format(inspect.stack()[0][3]))
+        a, b = _times(paths['a'] + '.copy'), _times(paths['b'] + '.copy')
+        assert a[0] < b[1] and b[0] < a[1], \
+            logger.error("     Failure in {}: branches did not overlap".format(
+                inspect.stack()[0][3]))
+
+        results = build().run()
+        assert {r['status'] for r in results.values()} == {'skipped'}, \
+            logger.error("     Failure in {}.".format(inspect.stack()[0][3]))
+
+        time.sleep(0.01)
+        with open(paths['b'], 'w') as f:
+            f.write('B')
+        results = build().run(targets=['abc'])
+        assert {n: r['status'] for n, r in results.items()} == {'ab': 'completed',
+                                                                'abc': 'completed'}, \
+            logger.error("     Failure in {}.".format(inspect.stack()[0][3]))
+        assert open(paths['abc']).read() == 'aBc', \
+            logger.error("     Failure in {}.".format(inspect.stack()[0][3]))
+
+        os.remove(paths['abc'])
+        results = build().run(force=['copy_a'])
+        assert {n for n, r in results.items() if r['status'] == 'completed'} == \
+            {'abc', 'copy_a', 'copy_b'}, \
+            logger.error("     Failure in {}.".format(inspect.stack()[0][3]))
+
+        logger.info("    Successfully completed {} {}".format(
+            self.__class__.__name__, inspect.stack()[0][3]))
+
+    def test_errors(self, tmp_path):
+        logger.info("    Started {} {}".format(
+            self.__class__.__name__, inspect.stack()[0][3]))
+
+        pipeline = Pipeline(str(tmp_path / 'state.json'))
+        pipeline.add('x', _concatenate, [str(tmp_path / 'y')], [str(tmp_path / 'x')])
+        pipeline.add('y', _concatenate, [str(tmp_path / 'x')], [str(tmp_path / 'y')])
+        with pytest.raises(ValueError):
+            pipeline.order()
+        with pytest.raises(ValueError):
+            pipeline.add('x', _fail)
+
+        pipeline = Pipeline(str(tmp_path / 'state.json'))
+        pipeline.add('fail', _fail, outputs=[str(tmp_path / 'fail')])
+        pipeline.add('after', _fail, after=['fail'])
+        with pytest.raises(RuntimeError):
+            pipeline.run()
+        assert not os.path.exists(str(tmp_path / 'state.json')), \
+            logger.error("     Failure in {}.".format(inspect.stack()[0][3]))
+
+        logger.info("    Successfully completed {} {}".format(
+            self.__class__.__name__, inspect.stack()[0][3]))
+
+    def test_queue(self, tmp_path):
+        logger.info("    Started {} {}".format(
+            self.__class__.__name__, inspect.stack()[0][3]))
+
+        paths = {name: str(tmp_path / name) for name in ('a', 'b', 'ab')}
+        for name in ('a', 'b'):
+            with open(paths[name], 'w') as f:
+                f.write(name)
+        queue = str(tmp_path / 'queue.db')
+        worker = mp.Process(target=run_worker, args=(queue, 0.05),
+                            kwargs={'exit_when_empty': True, 'max_units': 3})
+        worker.start()
+        pipeline = Pipeline(str(tmp_path / 'state.json'), n_workers=2, queue=queue)
+        for name in ('a', 'b'):
+            pipeline.add('copy_' + name, _concatenate, [paths[name]], [paths[name] + '.copy'],
+                         {'inputs': [paths[name]], 'output': paths[name] + '.copy',
+                          'seconds': 0.2})
+        pipeline.add('ab', _concatenate, [paths['a'] + '.copy', paths['b'] + '.copy'],
+                     [paths['ab']], {'inputs': [paths['a'] + '.copy', paths['b'] + '.copy'],
+                                     'output': paths['ab']})
+        results = pipeline.run()
+        worker.join(30)
+        assert open(paths['ab']).read() == 'ab', \
+            logger.error("     Failure in {}.".format(inspect.stack()[0][3]))
+        assert all(r['status'] == 'completed' for r in results.values()), \
+            logger.error("     Failure in {}.".format(inspect.stack()[0][3]))
+        assert WorkQueue(queue).counts()['done'] == 3, \
+            logger.error("     Failure in {}.".format(inspect.stack()[0][3]))
+
+        logger.info("    Successfully completed {} {}".format(
+            self.__class__.__name__, inspect.stack()[0][3]))
+# %%
@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+# ======================================================================================================================== #
+# Project  : Explainable Recommendation (XRec)                                                                             #
+# Version  : 0.1.0                                                                                                         #
+# File     : \test_utils_workqueue.py                                                                                      #
+# Language : Python 3.8                                                                                                    #
+# ------------------------------------------------------------------------------------------------------------------------ #
+# Author   : John James                                                                                                    #
+# Company  : Bryant St. Labs                                                                                               #
+# Email    : john.james.ai.studio@gmail.com                                                                                #
+# URL      : https://github.com/john-james-ai/xrec                                                                         #
+# ------------------------------------------------------------------------------------------------------------------------ #
+# Created  : Monday, October 19th 2026, 9:00:00 am                                                                         #
+# Modified : Monday, October 19th 2026, 9:00:00 am                                                                         #
+# Modifier : John James (john.james.ai.studio@gmail.com)                                                                   #
+# ------------------------------------------------------------------------------------------------------------------------ #
+# License  : BSD 3-clause "New" or "Revised" License                                                                       #
+# Copyright: (c) 2021 Bryant St. Labs                                                                                      #
+# ======================================================================================================================== #
+# %%
+import os
+import time
+import logging
+import inspect
+import sqlite3
+import multiprocessing as mp
+from unittest import mock
+import pytest
+from xrec.utils.workqueue import WorkQueue, QueueExecutor, run_worker
+# ------------------------------------------------------------------------------------------------------------------------ #
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+def _square(x: int, seconds: float = 0.0) -> dict:
+    time.sleep(seconds)
+    return {'square': x * x, 'pid': os.getpid()}
+
+
+def _fail() -> None:
+    raise ValueError("bad unit")
+
+
+def _node(path: str) -> None:
+    run_worker(WorkQueue(path, lease=2.0), poll=0.05, exit_when_empty=True)
+
+
+class TestWorkQueue:
+
+    def test_nodes(self, tmp_path):
+        logger.info("    Started {} {}".format(
+            self.__class__.__name__, inspect.stack()[0][3]))
+
+        path = str(tmp_path / 'queue.db')
+        queue = WorkQueue(path)
+        keys = queue.put([('unit{}'.format(i), _square, {'x': i, 'seconds': 0.05})
+                          for i in range(24)])
+        assert queue.put([('unit0', _square, {'x': 100})]) == ['unit0'] and \
+            queue.counts()['pending'] == 24, \
+            logger.error("     Failure in {}.".format(inspect.stack()[0][3]))
+
+        nodes = [mp.Process(target=_node, args=(path,)) for _ in range(3)]
+        for node in nodes:
+            node.start()
+        for node in nodes:
+            node.join(60)
+        status = queue.status(keys)
+        assert queue.finished() and queue.counts()['done'] == 24, \
+            logger.error("     Failure in {}.".format(inspect.stack()[0][3]))
+        assert [status[k]['result']['square'] for k in keys] == [i * i for i in range(24)], \
+            logger.error("     Failure in {}.".format(inspect.stack()[0][3]))
+        assert len({status[k]['result']['pid'] for k in keys}) >= 2, \
+            logger.error("     Failure in {}.".format(inspect.stack()[0][3]))
+
+        logger.info("    Successfully completed {} {}".format(
+            self.__class__.__name__, inspect.stack()[0][3]))
+
+    def test_leases(self, tmp_path):
+        logger.info("    Started {} {}".format(
+            self.__class__.__name__, inspect.stack()[0][3]))
+
+        path = str(tmp_path / 'queue.db')
+        dead = WorkQueue(path, lease=0.3, worker='dead')
+        dead.put([('lost', _square, {'x': 3}), ('slow', _square, {'x': 4, 'seconds': 1.0})])
+        assert dead.claim()['key'] == 'lost', \
+            logger.error("     Failure in {}.".format(inspect.stack()[0][3]))
+
+        live = WorkQueue(path, lease=0.3)
+        slow_queue = WorkQueue(path, lease=0.3, worker='slow')
+        unit = slow_queue.claim()
+        assert unit['key'] == 'slow', \
+            logger.error("     Failure in {}.".format(inspect.stack()[0][3]))
+        for _ in range(4):
+            time.sleep(0.1)
+            assert slow_queue.heartbeat('slow'), \
+                logger.error("     Failure in {}.".format(inspect.stack()[0][3]))
+        assert run_worker(live, poll=0.05, max_units=1) == 1, \
+            logger.error("     Failure in {}.".format(inspect.stack()[0][3]))
+        status = live.status(['lost', 'slow'])
+        assert status['lost']['state'] == 'done' and status['slow']['state'] == 'claimed', \
+            logger.error("     Failure in {}.".format(inspect.stack()[0][3]))
+        assert not dead.complete('lost', None) and slow_queue.complete('slow', 16), \
+            logger.error("     Failure in {}.".format(inspect.stack()[0][3]))
+
+        live.put([('long', _square, {'x': 5, 'seconds': 1.0})])
+        node = mp.Process(target=run_worker, args=(WorkQueue(path, lease=0.3),),
+                          kwargs={'heartbeat': 0.05, 'max_units': 1})
+        node.start()
+        claims = []
+        for _ in range(6):
+            time.sleep(0.15)
+            claims.append(live.claim())
+        assert claims == [None] * 6, \
+            logger.error("     Failure in {}.".format(inspect.stack()[0][3]))
+        node.join(30)
+        assert live.status(['long'])['long']['result']['square'] == 25, \
+            logger.error("     Failure in {}.".format(inspect.stack()[0][3]))
+
+        live.put([('bad', _fail, {})])
+        assert run_worker(live, poll=0.05, exit_when_empty=True) == 3, \
+            logger.error("     Failure in {}.".format(inspect.stack()[0][3]))
+        status = live.status(['bad'])['bad']
+        assert status['state'] == 'failed' and 'bad unit' in status['error'], \
+            logger.error("     Failure in {}.".format(inspect.stack()[0][3]))
+
+        logger.info("    Successfully completed {} {}".format(
+            self.__class__.__name__, inspect.stack()[0][3]))
+
+    def test_executor(self, tmp_path):
+        logger.info("    Started {} {}".format(
+            self.__class__.__name__, inspect.stack()[0][3]))
+
+        with QueueExecutor(str(tmp_path / 'queue.db'), poll=0.05, work=True) as executor:
+            futures = [executor.submit(_square, i) for i in range(5)]
+            failed = executor.submit(_fail)
+            assert [f.result(30)['square'] for f in futures] == [0, 1, 4, 9, 16], \
+                logger.error("     Failure in {}.".format(inspect.stack()[0][3]))
+            with pytest.raises(RuntimeError):
+                failed.result(30)
+
+        logger.info("    Successfully completed {} {}".format(
+            self.__class__.__name__, inspect.stack()[0][3]))
+
+    def test_executor_errors(self, tmp_path):
+        logger.info("    Started {} {}".format(
+            self.__class__.__name__, inspect.stack()[0][3]))
+
+        locked = sqlite3.OperationalError('database is locked')
+        queue = WorkQueue(str(tmp_path / 'queue.db'))
+        status, calls = queue.status, []
+
+        def flaky(keys):
+            calls.append(keys)
+            if len(calls) <= 2:
+                raise locked
+            return status(keys)
+
+        # A transient failure is retried at the next poll.
+        with mock.patch.object(queue, 'status', side_effect=flaky):
+            with QueueExecutor(queue, poll=0.05, work=True) as executor:
+                assert executor.submit(_square, 3).result(30)['square'] == 9, \
+                    logger.error("     Failure in {}.".format(inspect.stack()[0][3]))
+        # Persistent failures fail the outstanding futures rather than hang.
+        with mock.patch.object(queue, 'status', side_effect=locked):
+            with QueueExecutor(queue, poll=0.05, max_errors=3) as executor:
+                future = executor.submit(_square, 4)
+                with pytest.raises(RuntimeError, match='database is locked'):
+                    future.result(30)
+
+        logger.info("    Successfully completed {} {}".format(
+            self.__class__.__name__, inspect.stack()[0][3]))
+# %%
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+# ======================================================================================================================== #
+# Project  : Explainable Recommendation (XRec)                                                                             #
+# Version  : 0.1.0                                                                                                         #
+# File     : \test_visualization_visualize.py                                                                              #
+# Language : Python 3.8                                                                                                    #
+# ------------------------------------------------------------------------------------------------------------------------ #
+# Author   : John James                                                                                                    #
+# Company  : Bryant St. Labs                                                                                               #
+# Email    : john.james.ai.studio@gmail.com                                                                                #
+# URL      : https://github.com/john-james-ai/xrec                                                                         #
+# ------------------------------------------------------------------------------------------------------------------------ #
+# Created  : Monday, October 19th 2026, 9:00:00 am                                                                         #
+# Modified : Monday, October 19th 2026, 9:00:00 am                                                                         #
+# Modifier : John James (john.james.ai.studio@gmail.com)                                                                   #
+# ------------------------------------------------------------------------------------------------------------------------ #
+# License  : BSD 3-clause "New" or "Revised" License                                                                       #
+# Copyright: (c) 2021 Bryant St. Labs                                                                                      #
+# ======================================================================================================================== #
+# %%
+import logging
+import inspect
+import numpy as np
+from xrec.visualization.visualize import (Histogram, Histogram2D, TimeSeries, DegreeDistribution,
+                                          aggregate, iter_arrays, log_binned)
+# ------------------------------------------------------------------------------------------------------------------------ #
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+def reviews(n=50000, seed=0):
+    rng = np.random.default_rng(seed)
+    users = rng.zipf(2.0, n) % 5000
+    return {'overall': rng.integers(1, 6, n).astype(np.float64),
+            'unixReviewTime': rng.integers(1200000000, 1600000000, n),
+            'user': users,
+            'reviewerID': np.array(['A{}'.format(u) for u in users])}
+
+
+class TestAggregate:
+
+    def test_aggregates(self):
+        logger.info("    Started {} {}".format(
+            self.__class__.__name__, inspect.stack()[0][3]))
+
+        data = reviews()
+        results = aggregate(iter_arrays(data, batch_size=7000), {
+            'ratings': Histogram('overall', np.arange(0.5, 6)),
+            'grid': Histogram2D('overall', 'unixReviewTime', np.arange(0.5, 6),
+                                np.linspace(1.2e9, 1.6e9, 11)),
+            'volume': TimeSeries('unixReviewTime', 'Y'),
+            'users': DegreeDistribution('user'),
+            'reviewers': DegreeDistribution('reviewerID')})
+
+        assert np.array_equal(results['ratings']['counts'],
+                              np.bincount(data['overall'].astype(int))[1:]), \
+            logger.error("     Failure in {}.".format(inspect.stack()[0][3]))
+        assert np.array_equal(results['grid']['counts'].sum(axis=1), results['ratings']['counts']), \
+            logger.error("     Failure in {}.".format(inspect.stack()[0][3]))
+        years = data['unixReviewTime'].astype('datetime64[s]').astype('datetime64[Y]')
+        buckets, counts = np.unique(years, return_counts=True)
+        assert np.array_equal(results['volume']['buckets'], buckets) and \
+            np.array_equal(results['volume']['counts'], counts), \
+            logger.error("     Failure in {}.".format(inspect.stack()[0][3]))
+        expected = log_binned(np.bincount(data['user'])[np.bincount(data['user']) > 0])
+        for name in ('users', 'reviewers'):
+            assert np.array_equal(results[name]['counts'], expected['counts']), \
+                logger.error("     Failure in {}.".format(inspect.stack()[0][3]))
+
+        logger.info("    Successfully completed {} {}".format(
+            self.__class__.__name__, inspect.stack()[0][3]))
+
+    def test_log_binned(self):
+        logger.info("    Started {} {}".format(
+            self.__class__.__name__, inspect.stack()[0][3]))
+
+        binned = log_binned([1, 1, 1])
+        assert list(binned['edges']) == [1, 2] and list(binned['counts']) == [3], \
+            logger.error("     Failure in {}.".format(inspect.stack()[0][3]))
+        degrees = np.random.default_rng(0).zipf(1.8, 10000)
+        binned = log_binned(degrees)
+        edges = binned['edges']
+        assert binned['counts'].sum() == len(degrees) and edges[-1] > degrees.max(), \
+            logger.error("     Failure in {}.".format(inspect.stack()[0][3]))
+        assert np.array_equal(edges, np.round(edges)) and np.all(np.diff(edges) > 0), \
+            logger.error("     Failure in {}.".format(inspect.stack()[0][3]))
+
+        logger.info("    Successfully completed {} {}".format(
+            self.__class__.__name__, inspect.stack()[0][3]))
+
+    def test_cache(self, tmp_path):
+        logger.info("    Started {} {}".format(
+            self.__class__.__name__, inspect.stack()[0][3]))
+
+        data = reviews()
+        read = []
+
+        def batches(columns):
+            read.append(columns)
+            return iter_arrays(data, columns)
+
+        aggregators = {'ratings': Histogram('overall', np.arange(0.5, 6))}
+        first = aggregate(batches, aggregators, str(tmp_path), version='v1')
+        second = aggregate(batches, {'ratings': Histogram('overall', np.arange(0.5, 6))},
+                           str(tmp_path), version='v1')
+        assert read == [['overall']] and np.array_equal(first['ratings']['counts'],
+                                                        second['ratings']['counts']), \
+            logger.error("     Failure in {}.".format(inspect.stack()[0][3]))
+        aggregate(batches, {'ratings': Histogram('overall', np.arange(0.5, 6)),
+                            'users': DegreeDistribution('user')}, str(tmp_path), version='v1')
+        aggregate(batches, aggregators, str(tmp_path), version='v2')
+        assert read == [['overall'], ['user'], ['overall']], \
+            logger.error("     Failure in {}.".format(inspect.stack()[0][3]))
+
+        logger.info("    Successfully completed {} {}".format(
+            self.__class__.__name__, inspect.stack()[0][3]))
+# %%
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+# ======================================================================================================================== #
+# Project  : Explainable Recommendation (XRec)                                                                             #
+# Version  : 0.1.0                                                                                                         #
+# File     : \bpr_scaling.py                                                                                               #
+# Language : Python 3.8                                                                                                    #
+# ------------------------------------------------------------------------------------------------------------------------ #
+# Author   : John James                                                                                                    #
+# Company  : Bryant St. Labs                                                                                               #
+# Email    : john.james.ai.studio@gmail.com                                                                                #
+# URL      : https://github.com/john-james-ai/xrec                                                                         #
+# ------------------------------------------------------------------------------------------------------------------------ #
+# Created  : Monday, October 19th 2026, 9:00:00 am                                                                         #
+# Modified : Monday, October 19th 2026, 9:00:00 am                                                                         #
+# Modifier : John James (john.james.ai.studio@gmail.com)                                                                   #
+# ------------------------------------------------------------------------------------------------------------------------ #
+# License  : BSD 3-clause "New" or "Revised" License                                                                       #
+# Copyright: (c) 2021 Bryant St. Labs                                                                                      #
+# ======================================================================================================================== #
+import json
+import logging
+import argparse
+import numpy as np
+from scipy import sparse
+from xrec.models.train_model import BPR, physical_cores
+# ------------------------------------------------------------------------------------------------------------------------ #
+logger = logging.getLogger(__name__)
+# ------------------------------------------------------------------------------------------------------------------------ #
+
+
+def random_interactions(n_users: int, n_items: int, n: int, seed: int = 0) -> sparse.csr_matrix:
+    """Returns a binary CSR matrix with uniform user activity and skewed item popularity."""
+    rng = np.random.default_rng(seed)
+    users = rng.integers(0, n_users, size=n)
+    items = (n_items * rng.random(n) ** 2).astype(np.int64)
+    X = sparse.csr_matrix((np.ones(n, dtype=np.float32), (users, items)),
+                          shape=(n_users, n_items))
+    X.data[:] = 1
+    return X
+
+
+def scaling_curve(X: sparse.csr_matrix, worker_counts: list, epochs: int = 2,
+                  **kwargs) -> list:
+    """Measures BPR training throughput for each number of workers.
+
+    The first epoch of each run includes process start-up, so throughput is taken from the
+    fastest epoch.
+
+    Args:
+        X: Users by items CSR matrix.
+        worker_counts: Numbers of worker processes to measure.
+        epochs: Number of epochs per run.
+        kwargs: Additional BPR hyperparameters.
+
+    Returns:
+        List of dictionaries containing workers, samples per second and speedup over the first
+        entry.
+    """
+    curve = []
+    for n_workers in worker_counts:
+        model = BPR(epochs=epochs, n_workers=n_workers, **kwargs).fit(X)
+        rate = max(epoch['samples_per_second'] for epoch in model.history)
+        curve.append({'workers': n_workers, 'samples_per_second': rate,
+                      'speedup': rate / curve[0]['samples_per_second'] if curve else 1.0})
+        logger.info("{} workers: {:,.0f} samples/s".format(n_workers, rate))
+    return curve
+
+
+def main():
+    parser = argparse.ArgumentParser(description="BPR Hogwild scaling benchmark")
+    parser.add_argument('--users', type=int, default=200000)
+    parser.add_argument('--items', type=int, default=50000)
+    parser.add_argument('--interactions', type=int, default=5000000)
+    parser.add_argument('--factors', type=int, default=64)
+    parser.add_argument('--epochs', type=int, default=2)
+    parser.add_argument('--max-workers', type=int, default=physical_cores())
+    parser.add_argument('--output', help="Optional JSON file for the curve.")
+    args = parser.parse_args()
+
+    X = random_interactions(args.users, args.items, args.interactions)
+    counts = sorted({1, *[2 ** i for i in range(1, 8) if 2 ** i < args.max_workers],
+                     args.max_workers})
+    curve = scaling_curve(X, counts, epochs=args.epochs, factors=args.factors)
+    print("{:>8} {:>18} {:>8}".format('workers', 'samples/s', 'speedup'))
+    for point in curve:
+        print("{:>8} {:>18,.0f} {:>8.2f}".format(
+            point['workers'], point['samples_per_second'], point['speedup']))
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(curve, f, indent=2)
+
+
+if __name__ == '__main__':
+    log_fmt = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    logging.basicConfig(level=logging.INFO, format=log_fmt)
+    main()
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+# ======================================================================================================================== #
+# Project  : Explainable Recommendation (XRec)                                                                             #
+# Version  : 0.1.0                                                                                                         #
+# File     : \loadgen.py                                                                                                   #
+# Language : Python 3.8                                                                                                    #
+# ------------------------------------------------------------------------------------------------------------------------ #
+# Author   : John James                                                                                                    #
+# Company  : Bryant St. Labs                                                                                               #
+# Email    : john.james.ai.studio@gmail.com                                                                                #
+# URL      : https://github.com/john-james-ai/xrec                                                                         #
+# ------------------------------------------------------------------------------------------------------------------------ #
+# Created  : Monday, October 19th 2026, 9:00:00 am                                                                         #
+# Modified : Monday, October 19th 2026, 9:00:00 am                                                                         #
+# Modifier : John James (john.james.ai.studio@gmail.com)                                                                   #
+# ------------------------------------------------------------------------------------------------------------------------ #
+# License  : BSD 3-clause "New" or "Revised" License                                                                       #
+# Copyright: (c) 2021 Bryant St. Labs                                                                                      #
+# ======================================================================================================================== #
+import json
+import time
+import asyncio
+import logging
+import argparse
+import numpy as np
+# ------------------------------------------------------------------------------------------------------------------------ #
+logger = logging.getLogger(__name__)
+# ------------------------------------------------------------------------------------------------------------------------ #
+
+
+async def get(reader: asyncio.StreamReader, writer: asyncio.StreamWriter, host: str,
+              target: str) -> tuple:
+    """Sends one keep-alive GET request and returns its status and decoded JSON body."""
+    writer.write('GET {} HTTP/1.1\r\nHost: {}\r\n\r\n'.format(target, host).encode('latin-1'))
+    await writer.drain()
+    head = (await reader.readuntil(b'\r\n\r\n')).decode('latin-1').split('\r\n')
+    length = next(int(line.split(':')[1]) for line in head
+                  if line.lower().startswith('content-length'))
+    return int(head[0].split(' ')[1]), json.loads(await reader.readexactly(length))
+
+
+async def client(host: str, port: int, users: list, k: int, deadline: float,
+                 rng: np.random.Generator, latencies: list, statuses: dict) -> None:
+    """Issues requests for random users over one connection until the deadline."""
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        while time.perf_counter() < deadline:
+            user = users[rng.integers(len(users))]
+            start = time.perf_counter()
+            status, _ = await get(reader, writer, host, '/recommend?user={}&k={}'.format(user, k))
+            latencies.append(time.perf_counter() - start)
+            statuses[status] = statuses.get(status, 0) + 1
+    finally:
+        writer.close()
+
+
+async def run(host: str, port: int, users: list, k: int = 10, concurrency: int = 64,
+              seconds: float = 10.0, seed: int = 0) -> dict:
+    """Drives a recommendation service with concurrent closed-loop clients.
+
+    Args:
+        host: Host of the service.
+        port: Port of the service.
+        users: User IDs to request, drawn uniformly at random.
+        k: Number of recommendations per request.
+        concurrency: Number of concurrent connections, each with one request in flight.
+        seconds: Duration of the run.
+        seed: Seed for drawing users.
+
+    Returns:
+        Dictionary with client-side throughput and latency percentiles, and the service metrics.
+    """
+    latencies, statuses = [], {}
+    deadline = time.perf_counter() + seconds
+    rngs = np.random.default_rng(seed).spawn(concurrency)
+    start = time.perf_counter()
+    await asyncio.gather(*[client(host, port, users, k, deadline, rng, latencies, statuses)
+                           for rng in rngs])
+    elapsed = time.perf_counter() - start
+    reader, writer = await asyncio.open_connection(host, port)
+    _, metrics = await get(reader, writer, host, '/metrics')
+    writer.close()
+    p50, p95, p99 = 1000 * np.percentile(latencies, [50, 95, 99]) if latencies else [None] * 3
+    return {'requests': len(latencies), 'requests_per_second': len(latencies) / elapsed,
+            'statuses': statuses, 'latency_ms': {'p50': p50, 'p95': p95, 'p99': p99},
+            'service': metrics}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load generator for the recommendation service")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8080)
+    parser.add_argument('--users', type=int, default=1000,
+                        help="Requests draw dense user indices from 0 to users - 1.")
+    parser.add_argument('--user-ids', help="Optional file of external user IDs, one per line.")
+    parser.add_argument('--k', type=int, default=10)
+    parser.add_argument('--concurrency', type=int, default=64)
+    parser.add_argument('--seconds', type=float, default=10.0)
+    args = parser.parse_args()
+
+    if args.user_ids:
+        with open(args.user_ids) as f:
+            users = [line.strip() for line in f if line.strip()]
+    else:
+        users = list(range(args.users))
+    report = asyncio.run(run(args.host, args.port, users, k=args.k,
+                             concurrency=args.concurrency, seconds=args.seconds))
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == '__main__':
+    log_fmt = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    logging.basicConfig(level=logging.INFO, format=log_fmt)
+    main()
@@ -0,0 +1,274 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+# ======================================================================================================================== #
+# Project  : Explainable Recommendation (XRec)                                                                             #
+# Version  : 0.1.0                                                                                                         #
+# File     : \pipeline.py                                                                                                  #
+# Language : Python 3.8                                                                                                    #
+# ------------------------------------------------------------------------------------------------------------------------ #
+# Author   : John James                                                                                                    #
+# Company  : Bryant St. Labs                                                                                               #
+# Email    : john.james.ai.studio@gmail.com                                                                                #
+# URL      : https://github.com/john-james-ai/xrec                                                                         #
+# ------------------------------------------------------------------------------------------------------------------------ #
+# Created  : Monday, October 19th 2026, 9:00:00 am                                                                         #
+# Modified : Monday, October 19th 2026, 9:00:00 am                                                                         #
+# Modifier : John James (john.james.ai.studio@gmail.com)                                                                   #
+# ------------------------------------------------------------------------------------------------------------------------ #
+# License  : BSD 3-clause "New" or "Revised" License                                                                       #
+# Copyright: (c) 2021 Bryant St. Labs                                                                                      #
+# ======================================================================================================================== #
+import os
+import sys
+import json
+import logging
+import argparse
+import tempfile
+import threading
+import functools
+from datetime import datetime
+from http.server import ThreadingHTTPServer, SimpleHTTPRequestHandler
+from xrec.data.synthetic import SyntheticAmazon
+from xrec.utils.config import Config
+from xrec.utils.instrument import Stage
+# ------------------------------------------------------------------------------------------------------------------------ #
+logger = logging.getLogger(__name__)
+# ------------------------------------------------------------------------------------------------------------------------ #
+STAGES = ['metadata', 'extraction', 'ingestion', 'encoding', 'features', 'training', 'prediction',
+          'evaluation']
+# ------------------------------------------------------------------------------------------------------------------------ #
+
+
+class LocalSource:
+    """Serves a directory over HTTP from a background thread, standing in for the source site.
+
+    The standard library handler sends Content-Length and Last-Modified headers, which is all
+    AmazonSource reads from the data files.
+
+    Args:
+        directory: Directory served at the root of the site.
+        host: Interface to listen on.
+        port: Port to listen on, or 0 for any free port.
+
+    """
+
+    def __init__(self, directory: str, host: str = '127.0.0.1', port: int = 0) -> None:
+        handler = functools.partial(_QuietHandler, directory=directory)
+        self._server = _Server((host, port), handler)
+        self._thread = None
+
+    def __enter__(self) -> "LocalSource":
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+        self._thread.join()
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return 'http://{}:{}'.format(host, port)
+
+
+class _Server(ThreadingHTTPServer):
+    def handle_error(self, request, client_address) -> None:
+        """Ignores clients that disconnect early, as AmazonSource does after reading headers."""
+        if not isinstance(sys.exc_info()[1], ConnectionError):
+            super().handle_error(request, client_address)
+
+
+class _QuietHandler(SimpleHTTPRequestHandler):
+    def log_message(self, format, *args) -> None:
+        logger.debug(format % args)
+
+
+def run(directory: str, n_categories: int = 2, n_reviews: int = 100000, factors: int = 32,
+        iterations: int = 5, k: int = 20, n_workers: int = None, seed: int = 0) -> dict:
+    """Runs every stage of the pipeline against a local stand-in of the source site.
+
+    Args:
+        directory: Working directory for the site, configuration and pipeline outputs.
+        n_categories: Number of product categories of the synthetic site.
+        n_reviews: Number of reviews per category.
+        factors: Dimension of the ALS factors.
+        iterations: Number of ALS iterations.
+        k: Number of recommendations per user.
+        n_workers: Number of generator and download workers.
+        seed: Seed of the synthetic data.
+
+    Returns:
+        Dictionary with the scale of the run and the measurements of each stage.
+    """
+    from xrec.data.extract import extract
+    from xrec.data.ingest import ingest, encode_reviews, save_reviews
+    from xrec.data.source import AmazonSource
+    from xrec.features.build_features import build_features
+    from xrec.models.artifact import load_matrix
+    from xrec.models.evaluate import evaluate_recommender
+    from xrec.models.predict_model import BatchRecommender
+    from xrec.models.table import RecommendationTable
+    from xrec.models.train_model import ALS
+
+    site = os.path.join(directory, 'site')
+    data = os.path.join(directory, 'data')
+    configfile = Config.configfile
+    stages = {}
+    os.makedirs(site, exist_ok=True)
+    with LocalSource(site) as source:
+        SyntheticAmazon(n_reviews, n_categories, n_workers=n_workers, seed=seed).generate(
+            site, source.url)
+        Config.configfile = os.path.join(directory, 'config.ini')
+        try:
+            os.makedirs(os.path.join(data, 'metadata'), exist_ok=True)
+            config = Config()
+            config.create('DATA', 'url', source.url + '/index.html')
+            config.create('DATA', 'amazon_metadata_uri',
+                          os.path.join(data, 'metadata', 'amazon.csv'))
+            config.create('DATA', 'data_external_amazon', os.path.join(data, 'external'))
+
+            with Stage('metadata') as stage:
+                amazon = AmazonSource()
+                amazon.create_metadata(source.url + '/index.html')
+                stage.records = amazon.n_files
+            stages['metadata'] = stage.result
+
+            with Stage('extraction') as stage:
+                tasks = extract(source.url + '/index.html', n_workers=n_workers)
+                stage.records = len(tasks)
+            stages['extraction'] = dict(stage.result,
+                                        bytes=int(sum(t['download_size'] for t in tasks)))
+
+            paths = sorted(t['filepath'] for t in tasks if t['kind'] == 'reviews')
+            with Stage('ingestion') as stage:
+                reviews = ingest(paths)
+                stage.records = len(reviews['overall'])
+            stages['ingestion'] = dict(stage.result,
+                                       bytes=int(sum(os.path.getsize(p) for p in paths)))
+
+            with Stage('encoding') as stage:
+                arrays, vocabularies = encode_reviews(reviews)
+                save_reviews(os.path.join(data, 'reviews'), arrays, vocabularies)
+                stage.records = len(arrays['ratings'])
+            stages['encoding'] = stage.result
+            del reviews
+
+            with Stage('features') as stage:
+                matrices = build_features(os.path.join(data, 'reviews'),
+                                          os.path.join(data, 'features'))
+                stage.records = len(arrays['ratings'])
+            stages['features'] = stage.result
+
+            X_train, X_test = load_matrix(matrices['train']), load_matrix(matrices['test'])
+            with Stage('training') as stage:
+                model = ALS(factors=factors, iterations=iterations).fit(X_train)
+                stage.records = X_train.nnz * iterations
+            stages['training'] = stage.result
+            model.save(os.path.join(data, 'model'), vocabularies=vocabularies)
+
+            recommender = BatchRecommender.load(os.path.join(data, 'model'))
+            with Stage('prediction') as stage:
+                RecommendationTable.materialize(recommender, os.path.join(data, 'table'), k=k,
+                                                X_seen=X_train)
+                stage.records = recommender.n_users
+            stages['prediction'] = stage.result
+
+            with Stage('evaluation') as stage:
+                metrics = evaluate_recommender(recommender, X_test, X_train, k_values=(k,))
+                stage.records = recommender.n_users
+            stages['evaluation'] = dict(stage.result, metrics=metrics)
+        finally:
+            Config.configfile = configfile
+
+    return {'created': datetime.now().isoformat(),
+            'scale': {'categories': n_categories, 'reviews_per_category': n_reviews,
+                      'factors': factors, 'iterations': iterations, 'k': k},
+            'stages': stages,
+            'seconds': sum(s['seconds'] for s in stages.values())}
+
+
+def compare(results: dict, baseline: dict, tolerance: float = 0.25,
+            min_seconds: float = 0.1) -> list:
+    """Flags the stages that regressed against a baseline.
+
+    A stage regresses if its wall time or peak RSS grew, or its throughput fell, by more than
+    the tolerance relative to the baseline. Timings of stages that took less than min_seconds
+    in the baseline are too noisy to compare and are skipped.
+
+    Args:
+        results: Results of run.
+        baseline: Results of an earlier run at the same scale.
+        tolerance: Allowed relative change.
+        min_seconds: Shortest baseline wall time whose timings are compared.
+
+    Returns:
+        List of dictionaries with the stage, the measure, and the baseline and current values.
+    """
+    if results['scale'] != baseline['scale']:
+        logger.warning("Comparing runs at different scales: {} and {}".format(
+            results['scale'], baseline['scale']))
+    regressions = []
+    for name, stage in results['stages'].items():
+        reference = baseline['stages'].get(name)
+        if reference is None:
+            continue
+        for measure, worse in (('seconds', 1), ('peak_rss', 1), ('throughput', -1)):
+            current, previous = stage.get(measure), reference.get(measure)
+            if not current or not previous:
+                continue
+            if measure != 'peak_rss' and reference['seconds'] < min_seconds:
+                continue
+            if worse * (current - previous) > tolerance * previous:
+                regressions.append({'stage': name, 'measure': measure, 'baseline': previous,
+                                    'current': current})
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="End-to-end pipeline benchmark")
+    parser.add_argument('--categories', type=int, default=2)
+    parser.add_argument('--reviews', type=int, default=100000, help="Reviews per category.")
+    parser.add_argument('--factors', type=int, default=32)
+    parser.add_argument('--iterations', type=int, default=5)
+    parser.add_argument('--k', type=int, default=20)
+    parser.add_argument('--workers', type=int, help="Generator and download workers.")
+    parser.add_argument('--directory', help="Working directory. Defaults to a temporary one.")
+    parser.add_argument('--output', help="Optional JSON file for the results.")
+    parser.add_argument('--baseline', help="Optional JSON results to compare against.")
+    parser.add_argument('--save-baseline', action='store_true',
+                        help="Write the results to the baseline file instead of comparing.")
+    parser.add_argument('--tolerance', type=float, default=0.25)
+    parser.add_argument('--min-seconds', type=float, default=0.1,
+                        help="Shortest baseline stage time whose timings are compared.")
+    args = parser.parse_args()
+
+    directory = args.directory or tempfile.mkdtemp(prefix='xrec-benchmark-')
+    results = run(directory, args.categories, args.reviews, args.factors, args.iterations,
+                  args.k, args.workers)
+    print("{:<12} {:>10} {:>10} {:>14} {:>16}".format('stage', 'seconds', 'cpu', 'peak RSS MB',
+                                                      'records/s'))
+    for name, stage in results['stages'].items():
+        print("{:<12} {:>10.2f} {:>10.2f} {:>14,.0f} {:>16,.0f}".format(
+            name, stage['seconds'], stage['cpu_seconds'], stage['peak_rss'] / 2 ** 20,
+            stage['throughput'] or 0))
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+    if args.baseline and args.save_baseline:
+        with open(args.baseline, 'w') as f:
+            json.dump(results, f, indent=2)
+    elif args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(results, json.load(f), args.tolerance, args.min_seconds)
+        for r in regressions:
+            print("REGRESSION {stage} {measure}: {baseline:,.2f} -> {current:,.2f}".format(**r))
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    log_fmt = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    logging.basicConfig(level=logging.INFO, format=log_fmt)
+    main()
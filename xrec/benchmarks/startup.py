@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+# ======================================================================================================================== #
+# Project  : Explainable Recommendation (XRec)                                                                             #
+# Version  : 0.1.0                                                                                                         #
+# File     : \startup.py                                                                                                   #
+# Language : Python 3.8                                                                                                    #
+# ------------------------------------------------------------------------------------------------------------------------ #
+# Author   : John James                                                                                                    #
+# Company  : Bryant St. Labs                                                                                               #
+# Email    : john.james.ai.studio@gmail.com                                                                                #
+# URL      : https://github.com/john-james-ai/xrec                                                                         #
+# ------------------------------------------------------------------------------------------------------------------------ #
+# Created  : Monday, October 19th 2026, 9:00:00 am                                                                         #
+# Modified : Monday, October 19th 2026, 9:00:00 am                                                                         #
+# Modifier : John James (john.james.ai.studio@gmail.com)                                                                   #
+# ------------------------------------------------------------------------------------------------------------------------ #
+# License  : BSD 3-clause "New" or "Revised" License                                                                       #
+# Copyright: (c) 2021 Bryant St. Labs                                                                                      #
+# ======================================================================================================================== #
+import sys
+import json
+import time
+import logging
+import argparse
+import statistics
+import subprocess
+# ------------------------------------------------------------------------------------------------------------------------ #
+logger = logging.getLogger(__name__)
+# ------------------------------------------------------------------------------------------------------------------------ #
+HEAVY = ['numpy', 'scipy', 'pandas', 'requests', 'bs4', 'matplotlib', 'pyarrow']
+TARGET = 0.1
+# ------------------------------------------------------------------------------------------------------------------------ #
+
+
+def command_seconds(args: list, repeats: int = 5) -> float:
+    """Returns the median wall time of running a Python command in a fresh interpreter.
+
+    Args:
+        args: Arguments of the interpreter, e.g. ['-m', 'xrec.cli', '--help'].
+        repeats: Number of runs.
+
+    Returns:
+        Median seconds.
+    """
+    seconds = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        subprocess.run([sys.executable] + args, check=True, stdout=subprocess.DEVNULL)
+        seconds.append(time.perf_counter() - start)
+    return statistics.median(seconds)
+
+
+def import_seconds(module: str) -> dict:
+    """Returns the cumulative import time of a module and of every module it imports.
+
+    Args:
+        module: Name of the module.
+
+    Returns:
+        Dictionary of module names and seconds, from the slowest.
+    """
+    process = subprocess.run([sys.executable, '-X', 'importtime', '-c', 'import ' + module],
+                             check=True, capture_output=True, text=True)
+    seconds = {}
+    for line in process.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        seconds[name.strip()] = int(cumulative) / 1e6
+    return dict(sorted(seconds.items(), key=lambda item: -item[1]))
+
+
+def loaded_modules(module: str) -> list:
+    """Returns the heavy dependencies that importing a module loads."""
+    code = 'import sys, json, {}; print(json.dumps(sorted(sys.modules)))'.format(module)
+    process = subprocess.run([sys.executable, '-c', code], check=True, capture_output=True,
+                             text=True)
+    return [name for name in json.loads(process.stdout) if name.split('.')[0] in HEAVY and
+            '.' not in name]
+
+
+def measure(repeats: int = 5) -> dict:
+    """Measures the start-up cost of the xrec command line interface.
+
+    The cost is the wall time of `xrec --help` less that of an empty interpreter, which depends
+    on the machine and the site packages rather than on xrec.
+
+    Args:
+        repeats: Number of runs of each command.
+
+    Returns:
+        Dictionary with the seconds of the interpreter, of `xrec --help` and their difference,
+        the heavy dependencies loaded by importing the interface, and the slowest imports.
+    """
+    interpreter = command_seconds(['-c', 'pass'], repeats)
+    help_seconds = command_seconds(['-m', 'xrec.cli', '--help'], repeats)
+    imports = import_seconds('xrec.cli')
+    return {'interpreter': interpreter, 'help': help_seconds,
+            'overhead': help_seconds - interpreter, 'import': imports.get('xrec.cli'),
+            'heavy': loaded_modules('xrec.cli'), 'slowest': dict(list(imports.items())[:10])}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Start-up time of the xrec command line")
+    parser.add_argument('--repeats', type=int, default=5)
+    parser.add_argument('--target', type=float, default=TARGET,
+                        help="Largest acceptable overhead of `xrec --help` in seconds.")
+    parser.add_argument('--output', help="Optional JSON file for the measurements.")
+    args = parser.parse_args()
+
+    results = measure(args.repeats)
+    print("interpreter {:.3f}s, xrec --help {:.3f}s, overhead {:.3f}s, import xrec.cli {:.3f}s"
+          .format(results['interpreter'], results['help'], results['overhead'],
+                  results['import']))
+    for name, seconds in results['slowest'].items():
+        print("{:<40} {:>8.3f}s".format(name, seconds))
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+    if results['heavy']:
+        print("HEAVY IMPORTS: {}".format(', '.join(results['heavy'])))
+    if results['overhead'] > args.target:
+        print("OVERHEAD {:.3f}s exceeds the target of {:.3f}s".format(results['overhead'],
+                                                                      args.target))
+    if results['heavy'] or results['overhead'] > args.target:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    log_fmt = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    logging.basicConfig(level=logging.INFO, format=log_fmt)
+    main()
@@ -0,0 +1,269 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+# ======================================================================================================================== #
+# Project  : Explainable Recommendation (XRec)                                                                             #
+# Version  : 0.1.0                                                                                                         #
+# File     : \cli.py                                                                                                       #
+# Language : Python 3.8                                                                                                    #
+# ------------------------------------------------------------------------------------------------------------------------ #
+# Author   : John James                                                                                                    #
+# Company  : Bryant St. Labs                                                                                               #
+# Email    : john.james.ai.studio@gmail.com                                                                                #
+# URL      : https://github.com/john-james-ai/xrec                                                                         #
+# ------------------------------------------------------------------------------------------------------------------------ #
+# Created  : Monday, October 19th 2026, 9:00:00 am                                                                         #
+# Modified : Monday, October 19th 2026, 9:00:00 am                                                                         #
+# Modifier : John James (john.james.ai.studio@gmail.com)                                                                   #
+# ------------------------------------------------------------------------------------------------------------------------ #
+# License  : BSD 3-clause "New" or "Revised" License                                                                       #
+# Copyright: (c) 2021 Bryant St. Labs                                                                                      #
+# ======================================================================================================================== #
+import os
+import json
+import logging
+import click
+# ------------------------------------------------------------------------------------------------------------------------ #
+logger = logging.getLogger(__name__)
+# ------------------------------------------------------------------------------------------------------------------------ #
+# Only click and the standard library are imported here. Each command imports the modules it
+# needs when it runs, so `xrec --help` and spawned workers do not pay for numpy, scipy, pandas,
+# requests or bs4 until they are used. xrec.benchmarks.startup tracks the cost.
+# ------------------------------------------------------------------------------------------------------------------------ #
+
+
+@click.group(context_settings={'help_option_names': ['-h', '--help']})
+@click.option('--config', type=click.Path(dir_okay=False),
+              help="Configuration file. Defaults to config/config.ini.")
+@click.option('--instrument', type=click.Path(file_okay=False),
+              help="Directory receiving the instrumentation events of the command.")
+@click.option('-v', '--verbose', is_flag=True, help="Log debug messages.")
+@click.pass_context
+def cli(ctx, config, instrument, verbose):
+    """Explainable recommendation pipeline."""
+    log_fmt = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    logging.basicConfig(level=logging.DEBUG if verbose else logging.INFO, format=log_fmt)
+    if config:
+        from xrec.utils.config import Config
+        Config.configfile = config
+    if instrument:
+        from xrec.utils.instrument import enable, disable
+        enable(instrument)
+        ctx.call_on_close(disable)
+
+
+@cli.command()
+@click.option('--url', help="Index page of the source site. Defaults to the configured URL.")
+@click.option('--mirror', type=click.Path(exists=True, file_okay=False),
+              help="Mirror of the source site to read instead of the site.")
+def metadata(url, mirror):
+    """Extract the metadata of the source data files."""
+    from xrec.data.source import AmazonSource
+    source = AmazonSource(mirror)
+    source.create_metadata(url or _configured_url())
+    click.echo("Found {} files".format(source.n_files))
+
+
+@cli.command()
+@click.argument('directory', type=click.Path(file_okay=False))
+@click.option('--url', help="Index page of the source site. Defaults to the configured URL.")
+@click.option('--files', is_flag=True, help="Also download the data files.")
+@click.option('--key', 'keys', multiple=True, help="Category of the files. Defaults to all.")
+@click.option('--workers', type=int, help="Download workers. Defaults to the number of CPUs.")
+def mirror(directory, url, files, keys, workers):
+    """Snapshot the source site into a mirror DIRECTORY."""
+    from xrec.data.source import AmazonSource
+    manifest = AmazonSource().snapshot(url or _configured_url(), directory, files=files,
+                                       keys=list(keys), n_workers=workers)
+    n_mirrored = sum(1 for entry in manifest['files'].values() if entry['path'])
+    click.echo("Mirrored {} files, {} with data".format(len(manifest['files']), n_mirrored))
+
+
+@cli.command()
+@click.option('--url', help="Index page of the source site. Defaults to the configured URL.")
+@click.option('--key', 'keys', multiple=True, help="Category to extract. Defaults to all.")
+@click.option('--workers', type=int, help="Download workers. Defaults to the number of CPUs.")
+@click.option('--queue', type=click.Path(dir_okay=False),
+              help="Work queue database on a shared filesystem run by `xrec worker`.")
+@click.option('--mirror', type=click.Path(exists=True, file_okay=False),
+              help="Mirror of the source site to copy the files from.")
+def extract(url, keys, workers, queue, mirror):
+    """Download the source data files not yet downloaded."""
+    from xrec.data.extract import extract as extract_files
+    tasks = extract_files(url or _configured_url(), keys=list(keys), n_workers=workers,
+                          queue=queue, mirror=mirror)
+    click.echo("Downloaded {} files".format(len(tasks)))
+
+
+@cli.command()
+@click.argument('output', type=click.Path(file_okay=False))
+@click.argument('paths', nargs=-1, type=click.Path(exists=True, dir_okay=False))
+@click.option('--batch-size', type=int, help="Reviews per batch. Defaults to a planned size.")
+@click.option('--texts', type=click.Path(file_okay=False),
+              help="Text store receiving the review texts, numbered like the reviews.")
+def ingest(output, paths, batch_size, texts):
+    """Encode reviews files into a reviews artifact at OUTPUT.
+
+    PATHS default to the downloaded reviews files.
+    """
+    from xrec.data.ingest import ingest as read, encode_reviews, save_reviews, ingest_texts
+    if not paths:
+        from xrec.data.source import AmazonSource
+        files = AmazonSource().read_metadata(kind='reviews')
+        paths = sorted(files[files['downloaded']]['filepath'])
+    if not paths:
+        raise click.UsageError("No reviews files given or downloaded")
+    arrays, vocabularies = encode_reviews(read(paths, batch_size))
+    click.echo(save_reviews(output, arrays, vocabularies))
+    if texts:
+        click.echo("Stored {} texts in {}".format(ingest_texts(paths, texts, batch_size), texts))
+
+
+@cli.command()
+@click.argument('reviews', type=click.Path(exists=True, file_okay=False))
+@click.argument('output', type=click.Path(file_okay=False))
+@click.option('--test-fraction', type=float, default=0.2, show_default=True,
+              help="Fraction of the most recent reviews held out for testing.")
+def features(reviews, output, test_fraction):
+    """Build the training and test matrices at OUTPUT from a REVIEWS artifact."""
+    from xrec.features.build_features import build_features
+    for name, path in build_features(reviews, output, test_fraction).items():
+        click.echo("{}: {}".format(name, path))
+
+
+@cli.command()
+@click.argument('model', type=click.Choice(['als', 'bpr']))
+@click.argument('interactions', type=click.Path(exists=True))
+@click.argument('output', type=click.Path(file_okay=False))
+@click.option('--factors', type=int, default=64, show_default=True)
+@click.option('--regularization', type=float)
+@click.option('--iterations', type=int, default=15, show_default=True,
+              help="ALS iterations or BPR epochs.")
+@click.option('--learning-rate', type=float, default=0.05, show_default=True)
+@click.option('--workers', type=int, help="ALS threads or BPR worker processes.")
+@click.option('--seed', type=int, default=0, show_default=True)
+@click.option('--checkpoints', type=click.Path(file_okay=False),
+              help="Artifact directory of the training checkpoints.")
+@click.option('--checkpoint-every', type=int, default=1, show_default=True)
+@click.option('--keep', type=int, default=2, show_default=True,
+              help="Number of checkpoints retained.")
+@click.option('--resume', is_flag=True, help="Continue from the latest checkpoint.")
+@click.option('--vocabularies', type=click.Path(exists=True, file_okay=False),
+              help="Reviews artifact whose ID vocabularies are saved with the model.")
+def train(model, interactions, output, factors, regularization, iterations, learning_rate,
+          workers, seed, checkpoints, checkpoint_every, keep, resume, vocabularies):
+    """Train a MODEL on an INTERACTIONS matrix and save it at OUTPUT."""
+    from xrec.models.checkpoint import Checkpointer
+    from xrec.models.train_model import train as fit
+    checkpointer = None
+    if checkpoints:
+        checkpointer = Checkpointer(checkpoints, every=checkpoint_every, keep=keep)
+    fitted = fit(model, _load_matrix(interactions), factors, regularization, iterations,
+                 learning_rate, workers, seed, checkpointer, resume)
+    click.echo(fitted.save(output, vocabularies=_vocabularies(vocabularies)))
+
+
+@cli.command()
+@click.argument('model', type=click.Path(exists=True, file_okay=False))
+@click.argument('output', type=click.Path(file_okay=False))
+@click.option('--k', type=int, default=100, show_default=True)
+@click.option('--seen', type=click.Path(exists=True), help="Matrix of seen items to exclude.")
+@click.option('--knn', type=click.Path(exists=True, file_okay=False),
+              help="ItemKNN artifact directory for explanations.")
+@click.option('--memory-budget', help="Scoring memory, e.g. 2G. Defaults to a planned one.")
+@click.option('--queue', type=click.Path(dir_okay=False),
+              help="Work queue database on a shared filesystem run by `xrec worker`.")
+@click.option('--block-users', type=int, default=100000, show_default=True,
+              help="Users per unit of work of the queue.")
+def predict(model, output, k, seen, knn, memory_budget, queue, block_users):
+    """Materialize the top-K recommendations of every user of MODEL at OUTPUT."""
+    from xrec.models.predict_model import BatchRecommender
+    from xrec.models.table import RecommendationTable
+    if queue:
+        if knn:
+            raise click.UsageError("Explanations are not supported with --queue")
+        click.echo(RecommendationTable.materialize_queued(model, output, queue, k=k, seen=seen,
+                                                          block_users=block_users))
+        return
+    recommender = BatchRecommender.load(model, memory_budget=_size(memory_budget))
+    explainer = None
+    if knn:
+        from xrec.models.knn import ItemKNN
+        explainer = ItemKNN.load(knn)
+    click.echo(RecommendationTable.materialize(recommender, output, k=k,
+                                               X_seen=_load_matrix(seen) if seen else None,
+                                               explainer=explainer))
+
+
+@cli.command()
+@click.argument('model', type=click.Path(exists=True, file_okay=False))
+@click.argument('test', type=click.Path(exists=True))
+@click.option('--train', 'train_matrix', type=click.Path(exists=True),
+              help="Matrix of training interactions excluded from the recommendations.")
+@click.option('--k', 'k_values', type=int, multiple=True, help="Cutoff. Defaults to 10, 20, 100.")
+@click.option('--memory-budget', help="Scoring memory, e.g. 2G. Defaults to a planned one.")
+@click.option('--output', type=click.Path(dir_okay=False), help="Optional JSON file of metrics.")
+def evaluate(model, test, train_matrix, k_values, memory_budget, output):
+    """Compute the ranking metrics of MODEL on a TEST matrix."""
+    from xrec.models.evaluate import evaluate_recommender
+    from xrec.models.predict_model import BatchRecommender
+    recommender = BatchRecommender.load(model, memory_budget=_size(memory_budget))
+    X_train = _load_matrix(train_matrix) if train_matrix else None
+    metrics = evaluate_recommender(recommender, _load_matrix(test), X_train,
+                                   k_values=k_values or (10, 20, 100))
+    if output:
+        with open(output, 'w') as f:
+            json.dump(metrics, f, indent=2)
+    click.echo(json.dumps(metrics, indent=2))
+
+
+@cli.command()
+@click.argument('queue', type=click.Path(dir_okay=False))
+@click.option('--lease', type=float, default=60, show_default=True,
+              help="Seconds a claimed unit stays leased without a heartbeat.")
+@click.option('--poll', type=float, default=1.0, show_default=True,
+              help="Seconds to wait when no unit is available.")
+@click.option('--max-units', type=int, help="Number of units after which to stop.")
+@click.option('--exit-when-empty', is_flag=True,
+              help="Stop once no unit is pending or claimed.")
+def worker(queue, lease, poll, max_units, exit_when_empty):
+    """Run the units of work of a shared QUEUE database."""
+    from xrec.utils.workqueue import WorkQueue, run_worker
+    n_units = run_worker(WorkQueue(queue, lease=lease), poll=poll, max_units=max_units,
+                         exit_when_empty=exit_when_empty)
+    click.echo("Ran {} units".format(n_units))
+
+
+def _size(size: str) -> int:
+    if size is None:
+        return None
+    from xrec.utils.budget import parse_size
+    return parse_size(size)
+
+
+def _configured_url() -> str:
+    from xrec.utils.config import Config
+    return Config().read('DATA', 'url')
+
+
+def _load_matrix(path: str):
+    """Loads a CSR matrix from a matrix artifact directory or an .npz file."""
+    if os.path.isdir(path):
+        from xrec.models.artifact import load_matrix
+        return load_matrix(path)
+    from scipy import sparse
+    return sparse.load_npz(path).tocsr()
+
+
+def _vocabularies(path: str) -> dict:
+    if not path:
+        return None
+    from xrec.data.ingest import load_reviews
+    return load_reviews(path)[1]
+
+
+def main():
+    cli(prog_name='xrec')
+
+
+if __name__ == '__main__':
+    main()
@@ -19,33 +19,41 @@
 # Copyright: (c) 2021 Bryant St. Labs                                                                                      #
 # ======================================================================================================================== #
 import os
+import shutil
+import urllib.request
 from datetime import datetime
-from multiprocessing import Pool, Queue, current_process, freeze_support
+from concurrent.futures import as_completed
+from multiprocessing import Pool
 import logging
-from xrec.data.source import AmazonSource
+from xrec.utils.budget import MemoryPlanner
+from xrec.utils.config import Config
+from xrec.utils.instrument import instrumented
+from xrec.utils.workqueue import QueueExecutor
 # ------------------------------------------------------------------------------------------------------------------------ #
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 # ------------------------------------------------------------------------------------------------------------------------ #
 
 
+@instrumented(records=lambda _: 1)
 def download_file(task: dict) -> dict:
     """Worker responsible for downloading file given a download task
 
     Args:
-        task : Dictionary containing file metadata including url and local filepath.
+        task : Dictionary containing file metadata including url and local filepath, and
+            optionally the buffer_size of the copy.
 
     """
     start = datetime.now()
-    with urllib.request.urlopen(task['url']) as response:
-        f = open(task['filepath'], 'wb')
-        f.write(response.read())
-        f.close()
+    os.makedirs(os.path.dirname(task['filepath']), exist_ok=True)
+    partial = task['filepath'] + '.part'
+    with urllib.request.urlopen(task['url']) as response, open(partial, 'wb') as f:
+        shutil.copyfileobj(response, f, task.get('buffer_size', 1 << 20))
+    os.replace(partial, task['filepath'])
     end = datetime.now()
     duration = end - start
     task['downloaded'] = True
-    task['download_date'] = np.datetime64(end)
-    task['download_duration'] = duration
+    task['download_date'] = end
+    task['download_duration'] = int(duration.total_seconds())
     task['download_size'] = os.path.getsize(task['filepath'])
     return task
 
@@ -57,6 +65,7 @@ def download_callback(task: dict) -> None:
         task : Dictionary containing file metadata including url and local filepath.
 
     """
+    from xrec.data.source import AmazonSource
     metadata = AmazonSource()
     metadata.update_metadata(key=task['key'],
                              kind=task['kind'],
@@ -66,9 +75,53 @@ def download_callback(task: dict) -> None:
                              download_size=task['download_size'])
 
 
-def extract(url) -> None:
+@instrumented(records=len)
+def extract(url, keys: list = [], n_workers: int = None, queue: str = None,
+            mirror: str = None) -> list:
     """ Extracts Amazon reviews data using multiprocessing.
 
+    Files are streamed to disk by a pool of download workers, and the metadata is updated as each
+    download completes. Files already downloaded are skipped. The copy buffer of the workers is
+    planned from the memory budget.
+
+    With a queue, the downloads are instead claimed by the workers of a shared work queue,
+    typically on several machines, and by this process, so the data directory must be on the
+    shared filesystem. Only this process updates the metadata.
+
+    With a mirror created by AmazonSource.snapshot, mirrored files are copied from the mirror
+    instead of being downloaded.
+
     Args:
         url: URL for Amazon reviews and product data.
+        keys: Optional list of keys for the files to be extracted. Defaults to all.
+        n_workers: Number of download workers. Defaults to as many as the memory budget allows,
+            up to the number of CPUs.
+        queue: Optional SQLite database of a WorkQueue on a shared filesystem.
+        mirror: Optional mirror directory. Defaults to the configured one, if any.
+
+    Returns:
+        List of the completed download tasks.
     """
+    from xrec.data.source import AmazonSource
+    source = AmazonSource(mirror)
+    if not os.path.isfile(Config().read('DATA', 'amazon_metadata_uri')):
+        source.create_metadata(url)
+    planner = MemoryPlanner.from_config()
+    n_workers = n_workers or planner.workers()
+    buffer_size = planner.download_buffer(n_workers)
+    completed = []
+    with (QueueExecutor(queue, work=True) if queue else Pool(n_workers)) as pool:
+        tasks = source.get_extract_tasks(keys)
+        while tasks:
+            tasks = [dict(task, buffer_size=buffer_size) for task in tasks]
+            if queue:
+                downloads = (f.result() for f in as_completed(
+                    [pool.submit(download_file, task) for task in tasks]))
+            else:
+                downloads = pool.imap_unordered(download_file, tasks)
+            for task in downloads:
+                download_callback(task)
+                completed.append(task)
+            tasks = source.get_extract_tasks(keys)
+    logger.info("Extracted {} files".format(len(completed)))
+    return completed
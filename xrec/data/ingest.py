@@ -0,0 +1,243 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+# ======================================================================================================================== #
+# Project  : Explainable Recommendation (XRec)                                                                             #
+# Version  : 0.1.0                                                                                                         #
+# File     : \ingest.py                                                                                                    #
+# Language : Python 3.8                                                                                                    #
+# ------------------------------------------------------------------------------------------------------------------------ #
+# Author   : John James                                                                                                    #
+# Company  : Bryant St. Labs                                                                                               #
+# Email    : john.james.ai.studio@gmail.com                                                                                #
+# URL      : https://github.com/john-james-ai/xrec                                                                         #
+# ------------------------------------------------------------------------------------------------------------------------ #
+# Created  : Monday, October 19th 2026, 9:00:00 am                                                                         #
+# Modified : Monday, October 19th 2026, 9:00:00 am                                                                         #
+# Modifier : John James (john.james.ai.studio@gmail.com)                                                                   #
+# ------------------------------------------------------------------------------------------------------------------------ #
+# License  : BSD 3-clause "New" or "Revised" License                                                                       #
+# Copyright: (c) 2021 Bryant St. Labs                                                                                      #
+# ======================================================================================================================== #
+import time
+import logging
+from typing import Iterator, Tuple
+import numpy as np
+import pandas as pd
+from xrec.data.textstore import TextStore
+from xrec.models.artifact import Vocabulary, encode, save_artifact, load_artifact
+from xrec.utils.budget import MemoryPlanner, REVIEW_BYTES, PRODUCT_BYTES
+from xrec.utils.instrument import instrumented
+# ------------------------------------------------------------------------------------------------------------------------ #
+logger = logging.getLogger(__name__)
+# ------------------------------------------------------------------------------------------------------------------------ #
+COLUMNS = ['reviewerID', 'asin', 'overall', 'unixReviewTime']
+PRODUCT_COLUMNS = ['asin', 'title', 'brand', 'main_cat', 'price']
+# ------------------------------------------------------------------------------------------------------------------------ #
+
+
+def read_reviews(path: str, batch_size: int = None,
+                 planner: MemoryPlanner = None) -> Iterator[pd.DataFrame]:
+    """Streams the interaction columns of an Amazon reviews .json.gz file in batches of rows.
+
+    Args:
+        path: Path of a reviews file in the upstream JSON lines format.
+        batch_size: Number of reviews per batch. Defaults to a size planned from the memory
+            budget and adjusted to the measured RSS between batches.
+        planner: Optional MemoryPlanner. Defaults to one of the configured budget.
+
+    Yields:
+        DataFrames with the reviewerID, asin, overall and unixReviewTime columns.
+    """
+    for batch in _read_json(path, batch_size, REVIEW_BYTES, planner):
+        yield batch[COLUMNS]
+
+
+@instrumented(records=lambda reviews: len(reviews['overall']))
+def ingest(paths: list, batch_size: int = None, planner: MemoryPlanner = None) -> dict:
+    """Reads the interaction columns of one or more reviews files.
+
+    Args:
+        paths: Paths of reviews files.
+        batch_size: Number of reviews per batch. Defaults to a planned size.
+        planner: Optional MemoryPlanner planning the batch size.
+
+    Returns:
+        Dictionary of 'reviewerID' and 'asin' bytes arrays, float32 'overall' ratings and
+        int64 'unixReviewTime' timestamps.
+    """
+    start = time.perf_counter()
+    batches = {name: [] for name in COLUMNS}
+    for path in paths:
+        for batch in read_reviews(path, batch_size, planner):
+            batches['reviewerID'].append(encode(batch['reviewerID'].to_numpy(dtype=str)))
+            batches['asin'].append(encode(batch['asin'].to_numpy(dtype=str)))
+            batches['overall'].append(batch['overall'].to_numpy(dtype=np.float32))
+            batches['unixReviewTime'].append(batch['unixReviewTime'].to_numpy(dtype=np.int64))
+    reviews = {name: np.concatenate(values) if values else np.array([])
+               for name, values in batches.items()}
+    logger.info("Ingested {:,} reviews from {} files in {:.2f} seconds".format(
+        len(reviews['overall']), len(paths), time.perf_counter() - start))
+    return reviews
+
+
+@instrumented(records=lambda n: n)
+def ingest_texts(paths: list, directory: str, batch_size: int = None,
+                 planner: MemoryPlanner = None) -> int:
+    """Appends the review texts of one or more reviews files to a text store.
+
+    The texts are numbered in the order ingest reads the reviews, so the review IDs of the store
+    are the row indices of the reviews artifact built from the same files in the same order.
+    The store is flushed after every batch, so memory is bounded by the planned batch size.
+
+    Args:
+        paths: Paths of reviews files.
+        directory: Directory of the TextStore, created if it does not exist.
+        batch_size: Number of reviews per batch. Defaults to a planned size.
+        planner: Optional MemoryPlanner planning the batch size.
+
+    Returns:
+        Number of texts appended.
+    """
+    n_texts = 0
+    with TextStore(directory, mode='a') as store:
+        for path in paths:
+            for batch in _read_json(path, batch_size, REVIEW_BYTES, planner):
+                texts = batch['reviewText'] if 'reviewText' in batch else [None] * len(batch)
+                n_texts += len(store.append(texts))
+                store.flush()
+    return n_texts
+
+
+@instrumented(records=lambda result: len(result[0]['ratings']))
+def encode_reviews(reviews: dict, vocabularies: dict = None) -> Tuple[dict, dict]:
+    """Encodes reviewer and product IDs as dense indices.
+
+    Args:
+        reviews: Dictionary of columns returned by ingest.
+        vocabularies: Optional 'users' and 'items' vocabularies to extend. Known IDs keep their
+            indices and unknown IDs are appended.
+
+    Returns:
+        Tuple of a dictionary of int32 'users' and 'items', float32 'ratings' and int64
+        'timestamps' arrays, and the 'users' and 'items' vocabularies.
+    """
+    vocabularies = dict(vocabularies or {})
+    arrays = {}
+    for name, column in (('users', 'reviewerID'), ('items', 'asin')):
+        vocabulary = vocabularies.get(name) or Vocabulary(np.array([], dtype='S1'))
+        vocabularies[name] = vocabulary.append(reviews[column])
+        arrays[name] = vocabularies[name].lookup(reviews[column]).astype(np.int32)
+    arrays['ratings'] = np.asarray(reviews['overall'], dtype=np.float32)
+    arrays['timestamps'] = np.asarray(reviews['unixReviewTime'], dtype=np.int64)
+    return arrays, vocabularies
+
+
+@instrumented()
+def save_reviews(directory: str, arrays: dict, vocabularies: dict) -> str:
+    """Saves encoded reviews and their vocabularies as a new artifact version."""
+    return save_artifact(directory, 'reviews', arrays, vocabularies=vocabularies,
+                         params={'n_reviews': int(len(arrays['ratings']))})
+
+
+def load_reviews(path: str, mmap: bool = True) -> Tuple[dict, dict]:
+    """Opens encoded reviews, memory mapping the arrays unless mmap is False.
+
+    Returns:
+        Tuple of the arrays and vocabularies saved by save_reviews.
+    """
+    artifact = load_artifact(path, mmap=mmap)
+    return artifact.arrays, artifact.vocabularies
+
+
+def read_products(path: str, batch_size: int = None,
+                  planner: MemoryPlanner = None) -> Iterator[pd.DataFrame]:
+    """Streams the descriptive columns of an Amazon products .json.gz file in batches of rows.
+
+    Columns missing from the file are filled with empty strings.
+
+    Args:
+        path: Path of a products file in the upstream JSON lines format.
+        batch_size: Number of products per batch. Defaults to a planned size, as in
+            read_reviews.
+        planner: Optional MemoryPlanner. Defaults to one of the configured budget.
+
+    Yields:
+        DataFrames with the asin, title, brand, main_cat and price columns.
+    """
+    for batch in _read_json(path, batch_size, PRODUCT_BYTES, planner):
+        yield batch.reindex(columns=PRODUCT_COLUMNS).fillna('')
+
+
+@instrumented(records=lambda products: len(products['asin']))
+def ingest_products(paths: list, batch_size: int = None, planner: MemoryPlanner = None) -> dict:
+    """Reads the descriptive columns of one or more products files.
+
+    Prices are parsed from strings such as '$1,234.50', and are NaN when missing or given as a
+    range.
+
+    Args:
+        paths: Paths of products files.
+        batch_size: Number of products per batch. Defaults to a planned size.
+        planner: Optional MemoryPlanner planning the batch size.
+
+    Returns:
+        Dictionary of 'asin', 'title', 'brand' and 'main_cat' bytes arrays and float32 'price'.
+    """
+    batches = {name: [] for name in PRODUCT_COLUMNS}
+    for path in paths:
+        for batch in read_products(path, batch_size, planner):
+            for name in PRODUCT_COLUMNS[:-1]:
+                batches[name].append(encode(batch[name].to_numpy(dtype=str)))
+            price = batch['price'].astype(str).str.replace(r'[$,]', '', regex=True)
+            batches['price'].append(pd.to_numeric(price, errors='coerce').to_numpy(np.float32))
+    return {name: np.concatenate(values) if values else np.array([])
+            for name, values in batches.items()}
+
+
+@instrumented()
+def save_products(directory: str, products: dict) -> str:
+    """Saves products as a new artifact version, indexed by an 'items' vocabulary of ASINs.
+
+    A product listed more than once, e.g. in several categories, keeps its first listing.
+
+    Args:
+        directory: Artifact directory of the products.
+        products: Dictionary of columns returned by ingest_products.
+
+    Returns:
+        Path of the new version directory.
+    """
+    vocabulary = Vocabulary(np.array([], dtype='S1')).append(products['asin'])
+    _, first = np.unique(vocabulary.lookup(products['asin']), return_index=True)
+    arrays = {name: np.asarray(products[name])[first] for name in PRODUCT_COLUMNS[1:]}
+    return save_artifact(directory, 'products', arrays, vocabularies={'items': vocabulary},
+                         params={'n_products': len(vocabulary)})
+
+
+def load_products(path: str, mmap: bool = True) -> Tuple[dict, dict]:
+    """Opens saved products, memory mapping the arrays unless mmap is False.
+
+    Returns:
+        Tuple of the arrays, aligned with the 'items' vocabulary, and the vocabularies.
+    """
+    artifact = load_artifact(path, mmap=mmap)
+    return artifact.arrays, artifact.vocabularies
+
+
+def _read_json(path: str, batch_size: int, row_bytes: int,
+               planner: MemoryPlanner) -> Iterator[pd.DataFrame]:
+    """Streams a .json.gz file of JSON lines in batches.
+
+    Unless batch_size is given, the batch size is planned from the memory available under the
+    budget and adjusted to the measured RSS after each batch is consumed.
+    """
+    planned = batch_size
+    if batch_size is None:
+        planner = planner or MemoryPlanner.from_config()
+        planned = planner.batch_size(row_bytes)
+    with pd.read_json(path, lines=True, chunksize=planned, compression='gzip',
+                      convert_dates=False, dtype=False) as reader:
+        for batch in reader:
+            yield batch
+            if batch_size is None:
+                reader.chunksize = planner.adjust(reader.chunksize, planned)
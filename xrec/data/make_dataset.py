@@ -17,31 +17,204 @@
 # ------------------------------------------------------------------------------------------------------------------------ #
 # License  : BSD 3-clause "New" or "Revised" License                                                                       #
 # Copyright: (c) 2021 Your Company                                                                                         #
-# ======================================================================================================================== #
 # %%
-import requests
+import os
+import shutil
 import logging
-from bs4 import BeautifulSoup
-from .utils.config import Config
+import argparse
+import numpy as np
+from xrec.utils.budget import MemoryPlanner
+from xrec.utils.config import Config
+from xrec.utils.pipeline import Pipeline
+# ------------------------------------------------------------------------------------------------------------------------ #
+logger = logging.getLogger(__name__)
+# ------------------------------------------------------------------------------------------------------------------------ #
+# The pipeline runs in two passes: the metadata task runs first, since the categories it lists
+# determine the per-category ingestion tasks of the rest of the DAG.
+#
+#   metadata -> extract -+-> reviews_<key> (per category) -> encode -> features -> train
+#                        +-> products_<key> (per category) -> products
+#                        +-> texts
 # ------------------------------------------------------------------------------------------------------------------------ #
 
 
-def get_urls(url):
-    """Obtains the URLs for each Amazon rating and review file."""
-    page = requests.get(url)
-    soup = BeautifulSoup(page.content, 'html.parser')
-    results = soup.find('table', attrs={'class': 'code-table'})
+def create_metadata(url: str, mirror: str = None) -> None:
+    from xrec.data.source import AmazonSource
+    AmazonSource(mirror).create_metadata(url)
 
 
-def main():
-    """ Runs data processing scripts to turn raw data from (../raw) into
-        cleaned data ready to be analyzed (saved in ../processed).
+def extract_files(url: str, n_workers: int = None, mirror: str = None) -> None:
+    from xrec.data.extract import extract
+    extract(url, n_workers=n_workers, mirror=mirror)
+
+
+def ingest_reviews(path: str, output: str, n_workers: int = 1) -> None:
+    """Ingests the reviews of one category into an interim .npz file, in batches planned from
+    a share of the memory budget for each of n_workers concurrent tasks."""
+    from xrec.data.ingest import ingest
+    planner = MemoryPlanner.from_config().share(n_workers)
+    _save_interim(output, ingest([path], planner=planner))
+
+
+def ingest_products(path: str, output: str, n_workers: int = 1) -> None:
+    """Ingests the products of one category into an interim .npz file."""
+    from xrec.data.ingest import ingest_products as ingest
+    planner = MemoryPlanner.from_config().share(n_workers)
+    _save_interim(output, ingest([path], planner=planner))
+
+
+def encode(paths: list, output: str) -> None:
+    """Encodes the interim reviews of every category into a reviews artifact."""
+    from xrec.data.ingest import encode_reviews, save_reviews
+    arrays, vocabularies = encode_reviews(_load_interim(paths))
+    save_reviews(output, arrays, vocabularies)
+
+
+def build_products(paths: list, output: str) -> None:
+    """Merges the interim products of every category into a products artifact."""
+    from xrec.data.ingest import save_products
+    save_products(output, _load_interim(paths))
+
+
+def build_texts(paths: list, output: str) -> None:
+    """Stores the review texts of every category, numbered like the rows of the reviews
+    artifact, in a text store replaced only once complete."""
+    from xrec.data.ingest import ingest_texts
+    temporary = output + '.part'
+    shutil.rmtree(temporary, ignore_errors=True)
+    ingest_texts(paths, temporary)
+    shutil.rmtree(output, ignore_errors=True)
+    os.replace(temporary, output)
+
+
+def build_features(reviews: str, output: str, test_fraction: float = 0.2) -> None:
+    from xrec.features.build_features import build_features as build
+    build(reviews, output, test_fraction)
+
+
+def train(interactions: str, reviews: str, output: str, model: str = 'als', factors: int = 64,
+          iterations: int = 15, n_workers: int = None) -> None:
+    from xrec.data.ingest import load_reviews
+    from xrec.models.artifact import load_matrix
+    from xrec.models.train_model import train as fit
+    fitted = fit(model, load_matrix(interactions), factors, iterations=iterations,
+                 n_workers=n_workers)
+    fitted.save(output, vocabularies=load_reviews(reviews)[1])
+
+
+def make_dataset(data: str = 'data', models: str = 'models', url: str = None,
+                 n_workers: int = None, model: str = 'als', factors: int = 64,
+                 iterations: int = 15, force: list = None, queue: str = None,
+                 mirror: str = None) -> dict:
+    """Brings the data sets and the model up to date, running only the stages that are stale.
+
+    Args:
+        data: Data directory receiving the interim and processed data.
+        models: Directory receiving the trained model.
+        url: Index page of the source site. Defaults to the configured URL.
+        n_workers: Worker budget shared by concurrent tasks. Defaults to as many workers as the
+            configured memory budget allows, up to the number of CPUs.
+        model: Either 'als' or 'bpr'.
+        factors: Dimension of the factors.
+        iterations: ALS iterations or BPR epochs.
+        force: Optional names of tasks to run even if they are up to date.
+        queue: Optional SQLite database of a work queue on a shared filesystem. Tasks are then
+            run by the workers of the queue as well as by this process; the data and model
+            directories must be on the shared filesystem too.
+        mirror: Optional mirror directory of the source site created by AmazonSource.snapshot.
+
+    Returns:
+        Dictionary of the status and seconds of every task.
     """
-    logger = logging.getLogger(__name__)
-    logger.info('making final data set from raw data')
-    c = Config()
-    url = c.read('DATA', 'url')
-    urls = get_urls(url)
+    config = Config()
+    url = url or config.read('DATA', 'url')
+    metadata = config.read('DATA', 'amazon_metadata_uri')
+    n_workers = n_workers or MemoryPlanner.from_config().workers()
+    pipeline = Pipeline(os.path.join(data, 'pipeline.json'), n_workers, queue)
+    params = {'url': url}
+    if mirror:
+        params['mirror'] = mirror
+    pipeline.add('metadata', create_metadata, outputs=[metadata], params=params)
+    results = pipeline.run(force=force)
+
+    from xrec.data.source import AmazonSource
+    files = AmazonSource(mirror).read_metadata()
+    pipeline.add('extract', extract_files, inputs=[metadata], outputs=list(files['filepath']),
+                 params=params, options={'n_workers': n_workers}, workers=n_workers)
+    interim = {'reviews': [], 'products': []}
+    sources = {'reviews': [], 'products': []}
+    for row in files.sort_values(['kind', 'key']).itertuples():
+        output = os.path.join(data, 'interim', row.kind, row.key + '.npz')
+        function = ingest_reviews if row.kind == 'reviews' else ingest_products
+        pipeline.add('{}_{}'.format(row.kind, row.key), function, inputs=[row.filepath],
+                     outputs=[output], params={'path': row.filepath, 'output': output},
+                     options={'n_workers': n_workers})
+        interim[row.kind].append(output)
+        sources[row.kind].append(row.filepath)
+
+    processed = os.path.join(data, 'processed')
+    reviews = os.path.join(processed, 'reviews')
+    features = os.path.join(processed, 'features')
+    products = os.path.join(processed, 'products')
+    texts = os.path.join(processed, 'texts')
+    pipeline.add('encode', encode, inputs=interim['reviews'], outputs=[reviews],
+                 params={'paths': interim['reviews'], 'output': reviews})
+    pipeline.add('products', build_products, inputs=interim['products'], outputs=[products],
+                 params={'paths': interim['products'], 'output': products})
+    pipeline.add('texts', build_texts, inputs=sources['reviews'], outputs=[texts],
+                 params={'paths': sources['reviews'], 'output': texts})
+    pipeline.add('features', build_features, inputs=[reviews], outputs=[features],
+                 params={'reviews': reviews, 'output': features})
+    output = os.path.join(models, model)
+    pipeline.add('train', train, inputs=[os.path.join(features, 'train'), reviews],
+                 outputs=[output],
+                 params={'interactions': os.path.join(features, 'train'), 'reviews': reviews,
+                         'output': output, 'model': model, 'factors': factors,
+                         'iterations': iterations},
+                 options={'n_workers': n_workers}, workers=n_workers)
+    for name, result in pipeline.run(force=set(force or []) - set(results)).items():
+        results.setdefault(name, result)
+    return results
+
+
+def _save_interim(path: str, columns: dict) -> None:
+    """Writes columns to an .npz file, replacing it only once complete."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    temporary = path + '.part'
+    with open(temporary, 'wb') as f:
+        np.savez(f, **columns)
+    os.replace(temporary, path)
+
+
+def _load_interim(paths: list) -> dict:
+    """Concatenates the columns of interim .npz files."""
+    columns = {}
+    for path in paths:
+        with np.load(path) as f:
+            for name in f.files:
+                columns.setdefault(name, []).append(f[name])
+    return {name: np.concatenate(values) for name, values in columns.items()}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bring the data sets and model up to date")
+    parser.add_argument('data', nargs='?', default='data', help="Data directory.")
+    parser.add_argument('--models', default='models', help="Model directory.")
+    parser.add_argument('--url', help="Index page of the source site.")
+    parser.add_argument('--workers', type=int, help="Worker budget shared by concurrent tasks.")
+    parser.add_argument('--model', choices=['als', 'bpr'], default='als')
+    parser.add_argument('--factors', type=int, default=64)
+    parser.add_argument('--iterations', type=int, default=15)
+    parser.add_argument('--force', action='append', help="Task to run even if up to date.")
+    parser.add_argument('--queue', help="Work queue database on a shared filesystem.")
+    parser.add_argument('--mirror', help="Mirror directory of the source site.")
+    args = parser.parse_args()
+
+    results = make_dataset(args.data, args.models, args.url, args.workers, args.model,
+                           args.factors, args.iterations, args.force, args.queue,
+                           args.mirror)
+    for name, result in results.items():
+        print("{:<24} {:>10} {:>10.2f}".format(name, result['status'], result['seconds']))
 
 
 if __name__ == '__main__':
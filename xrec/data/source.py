@@ -19,16 +19,23 @@
 # Copyright: (c) 2021 Bryant St. Labs                                                                                      #
 # ======================================================================================================================== #
 import os
+import hashlib
+import logging
+import pathlib
 from datetime import datetime
-import requests
-from bs4 import BeautifulSoup
 import pandas as pd
 import numpy as np
 import json
 from email.utils import parsedate_to_datetime
 from xrec.utils.config import Config
+from xrec.utils.instrument import instrumented, count
 
 # ------------------------------------------------------------------------------------------------------------------------ #
+logger = logging.getLogger(__name__)
+# ------------------------------------------------------------------------------------------------------------------------ #
+MANIFEST = 'manifest.json'
+INDEX = 'index.html'
+# ------------------------------------------------------------------------------------------------------------------------ #
 
 
 class AmazonSource:
@@ -38,8 +45,21 @@ class AmazonSource:
         1. Manage the metadata for the Amazon reviews data source
         2. Serve tasks to download the source data to workers operating in a multiprocessing environment.
 
+    The source site can be snapshotted into a mirror directory holding the index page, the headers
+    of every file, optionally the files themselves, and a manifest. With a mirror, the metadata is
+    created from the snapshot without any request to the site, and the extract tasks of mirrored
+    files point at the mirror, so new machines and benchmark runs are bootstrapped quickly and
+    reproducibly.
+
+        mirror/
+            manifest.json       index URL and page, creation date and the headers and path of
+                                every file
+            index-<digest>.html
+            files/<kind>/<key>.json.gz
+
     The interface includes:
         create_metadata: Extracts file metadata from the source site
+        snapshot: Saves the source site into a mirror directory
         read_metadata: Returns metadata dataframe.
         update_metadata: Method called by the download callback. Updates metadata with download state and statistics.
         delete_metadata: Purges metadata
@@ -47,6 +67,10 @@ class AmazonSource:
         describe: Describes a file
         get_extract_tasks: Serves data extraction tasks. Method called by the extract process.
 
+    Args:
+        mirror: Optional mirror directory created by snapshot. Defaults to the 'mirror' option of
+            the DATA section of the configuration, if any.
+
     Attributes:
         metadata: DataFrame containing all metadata.
 
@@ -55,7 +79,7 @@ class AmazonSource:
 
     """
 
-    def __init__(self) -> None:
+    def __init__(self, mirror: str = None) -> None:
         """Initializes the class with filepaths for metadata and data. """
         self.metadata = None
         self._config = Config()
@@ -63,18 +87,100 @@ class AmazonSource:
             'DATA', 'amazon_metadata_uri')
         self._filepath_data = self._config.read(
             'DATA', 'data_external_amazon')
+        if mirror is None and self._config.exists('DATA', 'mirror'):
+            mirror = self._config.read('DATA', 'mirror') or None
+        self.mirror = mirror
+        self._manifest = None
+        self._headers_cache = {}
 
+    @instrumented()
     def create_metadata(self, url: str):
         """Extracts and saves the metadata for the Amazon reviews and products data sets.
 
+        With a mirror, the index page and file headers are read from the snapshot instead.
+
         Args:
             url: The URL for the Amazon reviews data source
         """
-        page = requests.get(url)
-        soup = BeautifulSoup(page.content, 'html.parser')
+        from bs4 import BeautifulSoup
+        soup = BeautifulSoup(self._index(url), 'html.parser')
         self.metadata = self._parse_table(soup)
+        count(len(self.metadata))
         self._save()
 
+    @instrumented()
+    def snapshot(self, url: str, directory: str, files: bool = False, keys: list = [],
+                 n_workers: int = None) -> dict:
+        """Saves the index page, the file headers and optionally the files into a mirror.
+
+        Each file is requested once for its headers. Files already in the mirror with the size
+        announced by the site are not downloaded again. Every file is staged under a temporary
+        name and renamed into place only once all of them are complete, and the manifest is
+        replaced last. The index page is saved under a name derived from its content, which the
+        manifest records, so a mirror always reads the index its manifest was built from, even
+        if a later snapshot is interrupted.
+
+        Args:
+            url: The URL for the Amazon reviews data source
+            directory: Mirror directory, created if it does not exist.
+            files: True to also download the data files.
+            keys: Optional list of keys of the files to download. Defaults to all.
+            n_workers: Number of download workers. Defaults to the number of CPUs.
+
+        Returns:
+            The manifest.
+        """
+        import requests
+        from bs4 import BeautifulSoup
+        from multiprocessing import Pool
+        from xrec.data.extract import download_file
+        os.makedirs(directory, exist_ok=True)
+        page = requests.get(url)
+        page.raise_for_status()
+        index = 'index-{}.html'.format(hashlib.sha1(page.content).hexdigest()[:16])
+        # The headers are always requested from the site, even if this source reads a mirror.
+        mirror, self.mirror, self._headers_cache = self.mirror, None, {}
+        try:
+            metadata = self._parse_table(BeautifulSoup(page.content, 'html.parser'))
+        finally:
+            self.mirror = mirror
+
+        manifest = {'url': url, 'index': index, 'created': datetime.now().isoformat(),
+                    'files': {}}
+        tasks = []
+        for row in metadata.itertuples():
+            path = os.path.join('files', row.kind, row.key + '.json.gz')
+            entry = {'key': row.key, 'kind': row.kind, 'headers': self._headers(row.url),
+                     'path': None}
+            manifest['files'][row.url] = entry
+            if files and (not keys or row.key in keys):
+                entry['path'] = path
+                filepath = os.path.join(directory, path)
+                if not os.path.isfile(filepath) or \
+                        os.path.getsize(filepath) != int(row.size):
+                    tasks.append({'url': row.url, 'filepath': filepath + '.staged'})
+        if tasks:
+            with Pool(n_workers) as pool:
+                for task in pool.imap_unordered(download_file, tasks):
+                    logger.info("Mirrored {} ({} bytes)".format(task['url'],
+                                                                task['download_size']))
+        count(len(manifest['files']))
+
+        staged = [(task['filepath'], task['filepath'][:-len('.staged')]) for task in tasks]
+        with open(os.path.join(directory, index + '.part'), 'wb') as f:
+            f.write(page.content)
+        staged.append((os.path.join(directory, index + '.part'), os.path.join(directory, index)))
+        with open(os.path.join(directory, MANIFEST + '.part'), 'w') as f:
+            json.dump(manifest, f, indent=2)
+        staged.append((os.path.join(directory, MANIFEST + '.part'),
+                       os.path.join(directory, MANIFEST)))
+        for temporary, path in staged:
+            os.replace(temporary, path)
+        self._manifest = None
+        logger.info("Snapshotted {} files of {} into {}, {} downloaded".format(
+            len(manifest['files']), url, directory, len(tasks)))
+        return manifest
+
     def read_metadata(self, key: str = None, kind: str = None) -> pd.DataFrame:
         """Returns metadata based upon selection criteria parameters
 
@@ -100,6 +206,7 @@ class AmazonSource:
             df = self.metadata
         return df
 
+    @instrumented(records=lambda _: 1)
     def update_metadata(self, key: str, kind: str, downloaded: bool,
                         download_date: datetime, download_duration: int, download_size: int) -> None:
         """Updates the download metadata for an Amazon review or product file.
@@ -174,6 +281,7 @@ class AmazonSource:
             self._save()
             self._load()
 
+    @instrumented(records=len)
     def get_extract_tasks(self, keys: list = [], max_tasks=100) -> list:
         """Returns a list of dictionaries containing metadata for files to be extracted.
 
@@ -194,7 +302,11 @@ class AmazonSource:
                 keys)) & (~self.metadata['downloaded'])]
         else:
             tasks = self.metadata[~self.metadata['downloaded']]
-        return tasks[['key', 'kind', 'url', 'filepath']].head(max_tasks).to_dict('records')
+        tasks = tasks[['key', 'kind', 'url', 'filepath']].head(max_tasks).to_dict('records')
+        if self.mirror:
+            for task in tasks:
+                task['url'] = self._mirrored(task['url'])
+        return tasks
 
     def _parse_table(self, soup) -> pd.DataFrame:
         """Parses HTML table and returns metadata as list of dictionaries.
@@ -217,9 +329,9 @@ class AmazonSource:
         df = pd.DataFrame.from_records(metadata)
         return df
 
+    @instrumented(records=len)
     def _parse_row(self, row) -> dict:
         """Extracts the data from a row on the HTML table on the source site."""
-
         tds = row.find_all('td')
         # Grab the text category and create a one-word key for the metadata dictionary
         key = self._extract_key(tds[0].text)
@@ -234,10 +346,9 @@ class AmazonSource:
             self._filepath_data, 'reviews' + '/', key + '.json.gz')
         reviews_num = int(tds[1].text.split()[1].replace(
             ',', '').replace('(', '').replace(')', ''))
-        reviews_size = requests.get(
-            reviews_url, stream=True).headers['Content-length']
-        reviews_modified = parsedate_to_datetime(requests.get(
-            reviews_url, stream=True).headers['last-modified'])
+        reviews_headers = self._headers(reviews_url)
+        reviews_size = reviews_headers['content-length']
+        reviews_modified = parsedate_to_datetime(reviews_headers['last-modified'])
         reviews_download_date = np.datetime64(
             datetime.fromisoformat('1970-01-01'))
         reviews_download_duration = 0
@@ -249,10 +360,9 @@ class AmazonSource:
             self._filepath_data, 'products' + '/', key + '.json.gz')
         products_num = int(tds[2].text.split()[1].replace(
             ',', '').replace('(', '').replace(')', ''))
-        products_size = requests.get(
-            products_url, stream=True).headers['Content-length']
-        products_modified = parsedate_to_datetime(requests.get(
-            products_url, stream=True).headers['last-modified'])
+        products_headers = self._headers(products_url)
+        products_size = products_headers['content-length']
+        products_modified = parsedate_to_datetime(products_headers['last-modified'])
         products_download_date = np.datetime64(
             datetime.fromisoformat('1970-01-01'))
         products_download_duration = 0
@@ -286,6 +396,54 @@ class AmazonSource:
 
         return reviews, products
 
+    def _index(self, url: str) -> bytes:
+        """Returns the index page of the source site, from the mirror if there is one."""
+        if not self.mirror:
+            import requests
+            return requests.get(url).content
+        if url != self._read_manifest()['url']:
+            logger.warning("Reading the mirror of {} in place of {}".format(
+                self._read_manifest()['url'], url))
+        index = self._read_manifest().get('index', INDEX)
+        with open(os.path.join(self.mirror, index), 'rb') as f:
+            return f.read()
+
+    def _headers(self, url: str) -> dict:
+        """Returns the response headers of a file, with lower case names, requesting them once.
+
+        The request is streamed and closed once the headers are read, so the body is not
+        downloaded. With a mirror, the headers are read from the manifest.
+        """
+        if url not in self._headers_cache:
+            if self.mirror:
+                files = self._read_manifest()['files']
+                if url not in files:
+                    raise FileNotFoundError("{} is not in the mirror {}".format(url, self.mirror))
+                headers = files[url]['headers']
+            else:
+                import requests
+                with requests.get(url, stream=True) as response:
+                    headers = {name.lower(): value for name, value in response.headers.items()}
+            self._headers_cache[url] = headers
+        return self._headers_cache[url]
+
+    def _mirrored(self, url: str) -> str:
+        """Returns the file URL of a mirrored file, or its URL if the mirror has no copy."""
+        entry = self._read_manifest()['files'].get(url, {})
+        if not entry.get('path'):
+            logger.warning("{} is not mirrored, downloading it from the source site".format(url))
+            return url
+        return pathlib.Path(self.mirror, entry['path']).resolve().as_uri()
+
+    def _read_manifest(self) -> dict:
+        if self._manifest is None:
+            path = os.path.join(self.mirror, MANIFEST)
+            if not os.path.isfile(path):
+                raise FileNotFoundError("No mirror manifest found at {}".format(path))
+            with open(path) as f:
+                self._manifest = json.load(f)
+        return self._manifest
+
     def _extract_key(self, s) -> str:
         """Extracts and creates a one-word key for the url dictionary entry."""
         s = s.replace(" and", "")
@@ -303,7 +461,7 @@ class AmazonSource:
         if os.path.isfile(self._filepath_metadata):
             self._load()
         else:
-            self.create_metadata()
+            self.create_metadata(self._config.read('DATA', 'url'))
 
     def _load(self) -> None:
         if os.path.isfile(self._filepath_metadata):
@@ -0,0 +1,298 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+# ======================================================================================================================== #
+# Project  : Explainable Recommendation (XRec)                                                                             #
+# Version  : 0.1.0                                                                                                         #
+# File     : \synthetic.py                                                                                                 #
+# Language : Python 3.8                                                                                                    #
+# ------------------------------------------------------------------------------------------------------------------------ #
+# Author   : John James                                                                                                    #
+# Company  : Bryant St. Labs                                                                                               #
+# Email    : john.james.ai.studio@gmail.com                                                                                #
+# URL      : https://github.com/john-james-ai/xrec                                                                         #
+# ------------------------------------------------------------------------------------------------------------------------ #
+# Created  : Monday, October 19th 2026, 9:00:00 am                                                                         #
+# Modified : Monday, October 19th 2026, 9:00:00 am                                                                         #
+# Modifier : John James (john.james.ai.studio@gmail.com)                                                                   #
+# ------------------------------------------------------------------------------------------------------------------------ #
+# License  : BSD 3-clause "New" or "Revised" License                                                                       #
+# Copyright: (c) 2021 Bryant St. Labs                                                                                      #
+# ======================================================================================================================== #
+import os
+import gzip
+import json
+import time
+import shutil
+import itertools
+import logging
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+# ------------------------------------------------------------------------------------------------------------------------ #
+logger = logging.getLogger(__name__)
+# ------------------------------------------------------------------------------------------------------------------------ #
+RATINGS = np.array([1.0, 2.0, 3.0, 4.0, 5.0])
+RATING_PROBABILITIES = np.array([0.07, 0.05, 0.08, 0.17, 0.63])
+WORDS = ('great good quality product price love works well easy use fit size color nice bought '
+         'recommend would one like really time well made little much better small perfect '
+         'comfortable looks great received item fast shipping return disappointed cheap broke '
+         'after days month year happy exactly described').split()
+# ------------------------------------------------------------------------------------------------------------------------ #
+
+
+def category_name(category: int) -> str:
+    """Returns the name of the upstream category of that position, or a unique made-up name.
+
+    Every name has a distinct first word, from which AmazonSource derives its key.
+    """
+    with open(os.path.join(os.path.dirname(__file__), 'amazon_metadata.json')) as f:
+        names = [entry['category'] for entry in json.load(f).values()]
+    return names[category] if category < len(names) else 'Category{}'.format(category)
+
+
+def power_law(rng: np.random.Generator, n: int, exponent: float, size: int) -> np.ndarray:
+    """Draws ranks in [0, n) with probability proportional to (rank + 1) ** -exponent.
+
+    The bounded continuous power law is sampled by inverting its CDF, so the cost is O(size)
+    regardless of n.
+
+    Args:
+        rng: Random generator.
+        n: Number of ranks.
+        exponent: Power law exponent. Larger values concentrate activity on fewer ranks.
+        size: Number of draws.
+
+    Returns:
+        Int64 array of ranks.
+    """
+    u = rng.random(size)
+    if abs(exponent - 1.0) < 1e-9:
+        ranks = np.power(float(n + 1), u)
+    else:
+        a = 1.0 - exponent
+        ranks = np.power(u * (np.power(float(n + 1), a) - 1.0) + 1.0, 1.0 / a)
+    return np.minimum(ranks.astype(np.int64) - 1, n - 1).clip(0)
+
+
+def scatter(ranks: np.ndarray, n: int, salt: int) -> np.ndarray:
+    """Maps ranks to IDs in [0, n) with a bijection, so the most active IDs are not consecutive."""
+    multiplier = 2654435761 % n if n > 1 else 1
+    while np.gcd(multiplier, n) != 1:
+        multiplier += 1
+    return (ranks * multiplier + salt) % n
+
+
+class SyntheticAmazon:
+    """Generates Amazon reviews and product files in the upstream JSON lines schema.
+
+    User and item activity follow bounded power laws, ratings follow the J-shaped skew of the
+    real data, review volume grows exponentially over time and review text lengths are log-normal.
+    Each category's reviews are produced in shards of shard_size rows by a pool of worker
+    processes. Every shard draws from its own generator seeded by (seed, category, shard), so the
+    output does not depend on the number of workers, and is written as a gzip member. The members
+    are concatenated into one multi-member .json.gz file per category, which gzip readers treat as
+    a single stream, so memory use is bounded by one shard per worker at any scale.
+
+    Each category has its own users and items: their IDs are offset by the category times the
+    number of users or items per category, so they never collide across categories.
+
+    An index page in the layout of the source site, readable by AmazonSource._parse_table, links
+    to the files.
+
+    The interface includes:
+        generate: Writes the reviews, products and index page.
+
+    Args:
+        n_reviews: Number of reviews per category.
+        n_categories: Number of product categories.
+        n_users: Number of users per category. Defaults to one per five reviews.
+        n_items: Number of items per category. Defaults to one per fifteen reviews.
+        user_exponent: Power law exponent of user activity.
+        item_exponent: Power law exponent of item popularity.
+        start: First Unix timestamp of the reviews.
+        end: Last Unix timestamp of the reviews.
+        growth: Exponential growth rate of review volume over the whole period.
+        shard_size: Number of reviews per shard.
+        n_workers: Number of worker processes. Defaults to the number of CPUs.
+        compresslevel: gzip compression level.
+        seed: Seed of the generators.
+
+    """
+
+    def __init__(self, n_reviews: int = 10000, n_categories: int = 1, n_users: int = None,
+                 n_items: int = None, user_exponent: float = 0.7, item_exponent: float = 0.8,
+                 start: int = 946684800, end: int = 1538352000, growth: float = 4.0,
+                 shard_size: int = 1000000, n_workers: int = None, compresslevel: int = 6,
+                 seed: int = 0) -> None:
+        self.n_reviews = n_reviews
+        self.n_categories = n_categories
+        self.n_users = n_users or max(1, n_reviews // 5)
+        self.n_items = n_items or max(1, n_reviews // 15)
+        self.user_exponent = user_exponent
+        self.item_exponent = item_exponent
+        self.start = start
+        self.end = end
+        self.growth = growth
+        self.shard_size = shard_size
+        self.n_workers = n_workers or os.cpu_count() or 1
+        self.compresslevel = compresslevel
+        self.seed = seed
+
+    def generate(self, directory: str, url: str) -> list:
+        """Writes the reviews and products of every category and the index page.
+
+        Args:
+            directory: Directory receiving index.html and the files/ subdirectory.
+            url: Base URL at which directory will be served, used in the links of the index.
+
+        Returns:
+            List of dictionaries describing each category: its name, file paths and counts.
+        """
+        started = time.perf_counter()
+        files = os.path.join(directory, 'files')
+        os.makedirs(files, exist_ok=True)
+        tasks = []
+        for c in range(self.n_categories):
+            for shard, first in enumerate(range(0, self.n_reviews, self.shard_size)):
+                tasks.append(('reviews', c, shard, min(self.shard_size, self.n_reviews - first)))
+            for shard, first in enumerate(range(0, self.n_items, self.shard_size)):
+                tasks.append(('products', c, shard, min(self.shard_size, self.n_items - first)))
+        with ProcessPoolExecutor(max_workers=self.n_workers) as executor:
+            shards = list(executor.map(self._write_shard, [(files, *task) for task in tasks]))
+
+        categories = []
+        for c in range(self.n_categories):
+            category = {'category': category_name(c)}
+            for kind in ('reviews', 'products'):
+                parts = [path for (k, cat, _, _), path in zip(tasks, shards)
+                         if k == kind and cat == c]
+                path = os.path.join(files, '{}_{}.json.gz'.format(kind, c))
+                with open(path, 'wb') as out:
+                    for part in parts:
+                        with open(part, 'rb') as f:
+                            shutil.copyfileobj(f, out, 1 << 22)
+                        os.remove(part)
+                category[kind] = path
+                category[kind + '_url'] = '{}/files/{}'.format(url, os.path.basename(path))
+            category['n_reviews'] = self.n_reviews
+            category['n_products'] = self.n_items
+            categories.append(category)
+        write_index(os.path.join(directory, 'index.html'), categories)
+        logger.info("Generated {:,} reviews in {} categories in {:.2f} seconds".format(
+            self.n_reviews * self.n_categories, self.n_categories, time.perf_counter() - started))
+        return categories
+
+    def _write_shard(self, task: tuple) -> str:
+        files, kind, category, shard, size = task
+        path = os.path.join(files, '.{}_{}.{:06d}.json.gz'.format(kind, category, shard))
+        rng = np.random.default_rng([self.seed, category, shard, kind == 'products'])
+        lines = (self._reviews(rng, category, size) if kind == 'reviews' else
+                 self._products(rng, category, shard * self.shard_size, size))
+        with gzip.open(path, 'wt', compresslevel=self.compresslevel) as f:
+            while True:
+                chunk = ''.join(itertools.islice(lines, 10000))
+                if not chunk:
+                    break
+                f.write(chunk)
+        return path
+
+    def _reviews(self, rng: np.random.Generator, category: int, size: int):
+        """Generates the JSON lines of a shard of reviews."""
+        users = scatter(power_law(rng, self.n_users, self.user_exponent, size), self.n_users,
+                        category) + category * self.n_users
+        items = scatter(power_law(rng, self.n_items, self.item_exponent, size), self.n_items,
+                        category) + category * self.n_items
+        ratings = rng.choice(RATINGS, size, p=RATING_PROBABILITIES)
+        growth = np.log1p(rng.random(size) * np.expm1(self.growth)) / self.growth
+        times = self.start + (self.end - self.start) * growth
+        times = (times.astype(np.int64) // 86400) * 86400
+        days = times.astype('datetime64[s]').astype('datetime64[D]')
+        months = days.astype('datetime64[M]')
+        years = days.astype('datetime64[Y]')
+        month = (months - years.astype('datetime64[M]')).astype(np.int64) + 1
+        day = (days - months.astype('datetime64[D]')).astype(np.int64) + 1
+        year = years.astype(np.int64) + 1970
+        lengths = np.clip(rng.lognormal(3.4, 1.0, size), 1, 2000).astype(np.int64)
+        summary_lengths = rng.integers(1, 6, size)
+        verified = rng.random(size) < 0.9
+        votes = np.where(rng.random(size) < 0.15, rng.zipf(2.0, size) + 1, 0)
+        text, offsets = _text_pool(rng)
+        starts = rng.integers(0, len(offsets) - 2001, size)
+        ends = offsets[starts + lengths] - 1
+        summary_ends = offsets[starts + summary_lengths] - 1
+        starts = offsets[starts]
+        # The generated strings need no JSON escaping, so records are formatted directly, which is
+        # several times faster than json.dumps.
+        columns = zip(ratings.tolist(), votes.tolist(), verified.tolist(), month.tolist(),
+                      day.tolist(), year.tolist(), users.tolist(), items.tolist(), starts.tolist(),
+                      ends.tolist(), summary_ends.tolist(), times.tolist())
+        for rating, vote, ok, m, d, y, user, item, start, end, summary_end, t in columns:
+            yield ('{{"overall": {}, {}"verified": {}, "reviewTime": "{:02d} {}, {}", '
+                   '"reviewerID": "A{:013X}", "asin": "B{:09d}", "reviewerName": "Reviewer {}", '
+                   '"reviewText": "{}", "summary": "{}", "unixReviewTime": {}}}\n').format(
+                rating, '"vote": "{}", '.format(vote) if vote else '', 'true' if ok else 'false',
+                m, d, y, user, item, user, text[start:end], text[start:summary_end].title(), t)
+
+    def _products(self, rng: np.random.Generator, category: int, first: int, size: int):
+        """Generates the JSON lines of a shard of products."""
+        name = category_name(category)
+        prices = np.round(np.exp(rng.normal(3.0, 1.0, size)), 2)
+        ranks = rng.integers(1, 5000000, size)
+        related = power_law(rng, self.n_items, self.item_exponent, (size, 4))
+        related += category * self.n_items
+        for i in range(size):
+            asin = category * self.n_items + first + i
+            yield json.dumps({
+                'category': [name], 'tech1': '', 'description': [], 'fit': '',
+                'title': 'Product {}'.format(asin),
+                'also_buy': ['B{:09d}'.format(j) for j in related[i, :2]], 'tech2': '',
+                'brand': 'Brand {}'.format(asin % 997), 'feature': [],
+                'rank': '{:,} in {} ('.format(ranks[i], name), 'also_view':
+                ['B{:09d}'.format(j) for j in related[i, 2:]], 'main_cat': name,
+                'similar_item': '', 'date': '', 'price': '${:.2f}'.format(prices[i]),
+                'asin': 'B{:09d}'.format(asin), 'imageURL': [], 'imageURLHighRes': []}) + '\n'
+
+
+def _text_pool(rng: np.random.Generator, n_words: int = 100000):
+    """Returns a long string of random words and the offset at which each word starts."""
+    words = np.array(WORDS)[rng.integers(0, len(WORDS), n_words)]
+    offsets = np.zeros(n_words + 1, dtype=np.int64)
+    np.cumsum(np.char.str_len(words) + 1, out=offsets[1:])
+    return ' '.join(words) + ' ', offsets
+
+
+def write_index(path: str, categories: list) -> None:
+    """Writes an index page in the layout of the source site, one table row per category."""
+    rows = ['<tr><td>{}</td><td><a href="{}">reviews</a> ({:,} reviews)</td>'
+            '<td><a href="{}">metadata</a> ({:,} products)</td></tr>'.format(
+                c['category'], c['reviews_url'], c['n_reviews'], c['products_url'], c['n_products'])
+            for c in categories]
+    with open(path, 'w') as f:
+        f.write('<html><body><table class="code-table">\n{}\n</table></body></html>\n'.format(
+            '\n'.join(rows)))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate synthetic Amazon reviews files")
+    parser.add_argument('directory')
+    parser.add_argument('--url', default='http://127.0.0.1:8000',
+                        help="Base URL at which the directory will be served.")
+    parser.add_argument('--reviews', type=int, default=10000, help="Reviews per category.")
+    parser.add_argument('--categories', type=int, default=1)
+    parser.add_argument('--users', type=int)
+    parser.add_argument('--items', type=int)
+    parser.add_argument('--shard-size', type=int, default=1000000)
+    parser.add_argument('--workers', type=int)
+    parser.add_argument('--compresslevel', type=int, default=6)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+    SyntheticAmazon(args.reviews, args.categories, args.users, args.items,
+                    shard_size=args.shard_size, n_workers=args.workers,
+                    compresslevel=args.compresslevel, seed=args.seed).generate(args.directory,
+                                                                               args.url)
+
+
+if __name__ == '__main__':
+    log_fmt = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    logging.basicConfig(level=logging.INFO, format=log_fmt)
+    main()
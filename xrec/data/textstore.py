@@ -0,0 +1,416 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+# ======================================================================================================================== #
+# Project  : Explainable Recommendation (XRec)                                                                             #
+# Version  : 0.1.0                                                                                                         #
+# File     : \textstore.py                                                                                                 #
+# Language : Python 3.8                                                                                                    #
+# ------------------------------------------------------------------------------------------------------------------------ #
+# Author   : John James                                                                                                    #
+# Company  : Bryant St. Labs                                                                                               #
+# Email    : john.james.ai.studio@gmail.com                                                                                #
+# URL      : https://github.com/john-james-ai/xrec                                                                         #
+# ------------------------------------------------------------------------------------------------------------------------ #
+# Created  : Monday, October 19th 2026, 9:00:00 am                                                                         #
+# Modified : Monday, October 19th 2026, 9:00:00 am                                                                         #
+# Modifier : John James (john.james.ai.studio@gmail.com)                                                                   #
+# ------------------------------------------------------------------------------------------------------------------------ #
+# License  : BSD 3-clause "New" or "Revised" License                                                                       #
+# Copyright: (c) 2021 Bryant St. Labs                                                                                      #
+# ======================================================================================================================== #
+import os
+import glob
+import json
+import mmap
+import zlib
+import hashlib
+import logging
+from collections import OrderedDict
+from typing import Iterable, Union
+import numpy as np
+# ------------------------------------------------------------------------------------------------------------------------ #
+logger = logging.getLogger(__name__)
+# ------------------------------------------------------------------------------------------------------------------------ #
+MANIFEST = 'manifest.json'
+BLOB = 'blob.bin'
+RUN = 'index-{:06d}.bin'
+TEXT_DTYPE = np.dtype([('digest', 'S16'), ('offset', '<i8')])
+# Each column is a raw file of records appended to by flush. The manifest counts the committed
+# records; blocks holds one more record than there are blocks, the end of the last one.
+COLUMNS = {'offsets': (np.dtype('<i8'), 'n_reviews'),
+           'lengths': (np.dtype('<i4'), 'n_reviews'),
+           'blocks': (np.dtype(('<i8', 2)), 'n_blocks'),
+           'texts': (TEXT_DTYPE, 'n_texts')}
+# Records of the digest index merged per step, which bounds the memory of a merge.
+MERGE_CHUNK = 1 << 20
+# ------------------------------------------------------------------------------------------------------------------------ #
+
+
+class TextStore:
+    """Append-only store of review texts, interned and compressed in blocks, read by review ID.
+
+    Each distinct text is stored once, in a logical stream of UTF-8 bytes cut into blocks of
+    about block_size bytes, each compressed with zlib and appended to a single blob. A text never
+    spans two blocks, so reading one decompresses exactly one block, found by a binary search of
+    the per-block index; recently read blocks are kept decompressed. Reviews are numbered in
+    order of appending, which for a store built alongside ingest is the row order of the reviews
+    artifact, and located by an int64 offset and an int32 length into the logical stream, so
+    duplicate texts share their bytes.
+
+        directory/
+            manifest.json       block size, compression level and committed counts
+            blob.bin            compressed blocks
+            blocks.bin          int64 blob and logical offsets of the start of each block
+            offsets.bin         int64 logical offset of the text of each review
+            lengths.bin         int32 length in bytes of the text of each review
+            texts.bin           16-byte BLAKE2 digest and logical offset of each distinct text
+            index-<n>.bin       runs of the texts records sorted by digest
+
+    Duplicates are found by a binary search of the digest index, a few memory-mapped runs of the
+    texts records sorted by digest, and of a dictionary of the texts appended since the last
+    flush. Each flush writes its new texts as a run and merges the last two runs, in chunks,
+    while the older one is no more than twice as large, so there are O(log n) runs and each
+    record is rewritten O(log n) times.
+
+    Readers memory map the blob and the columns, so opening a store costs nothing and every
+    process shares one physical copy. Appended texts are committed by flush, which appends the
+    pending block and the new records of every column to their files, and then replaces the
+    manifest. Only the records appended since the last flush are held in memory, and a flush
+    writes only those and merges runs of the index chunk by chunk, so flushing after every batch
+    keeps memory bounded by the batch, whatever the number of distinct texts. The
+    counts of the manifest bound what readers see, and reopening a store for appending
+    truncates every file to them, so a store interrupted during a flush reopens in its last
+    committed state.
+
+    The interface includes:
+        append: Appends texts and returns their review IDs.
+        flush: Commits the appended texts.
+        close: Flushes and releases the store.
+        get: Returns the text of one review.
+        get_many: Returns the texts of an array of reviews, decompressing each block once.
+
+    Args:
+        directory: Directory of the store, created in append mode if it does not exist.
+        mode: 'r' to read or 'a' to append.
+        block_size: Uncompressed bytes per block of a new store.
+        level: zlib compression level of a new store.
+        cache_blocks: Number of decompressed blocks kept.
+
+    """
+
+    def __init__(self, directory: str, mode: str = 'r', block_size: int = 1 << 16,
+                 level: int = 6, cache_blocks: int = 16) -> None:
+        if mode not in ('r', 'a'):
+            raise ValueError("Expected mode 'r' or 'a', found {}".format(mode))
+        self.directory = directory
+        self.mode = mode
+        self.cache_blocks = cache_blocks
+        self._cache = OrderedDict()
+        self._blob = None
+        path = os.path.join(directory, MANIFEST)
+        if not os.path.isfile(path):
+            if mode == 'r':
+                raise FileNotFoundError("No text store found at {}".format(directory))
+            self._create(block_size, level)
+        with open(path) as f:
+            self.manifest = json.load(f)
+        if mode == 'a':
+            self._truncate(BLOB, self.manifest['blob_size'])
+            for name, (dtype, _) in COLUMNS.items():
+                self._truncate(name + '.bin', self._count(name) * dtype.itemsize)
+            if 'runs' not in self.manifest:
+                # Stores written before the digest index get one built from their texts.
+                self.manifest['runs'] = []
+                self.manifest['runs'] = self._write_runs(np.array(self._map('texts')))
+                self._write_manifest()
+            self._clean_runs()
+            self._interned = {}
+            self._pending = bytearray()
+            self._new = {name: [] for name in COLUMNS}
+            self._n_raw = 0
+        self._map_columns()
+        self._map_runs()
+
+    def append(self, texts: Iterable[str]) -> np.ndarray:
+        """Appends texts, storing those not seen before, and returns their review IDs.
+
+        Args:
+            texts: Iterable of strings. None and NaN are stored as empty texts.
+
+        Returns:
+            Array of the review IDs of the texts.
+        """
+        if self.mode != 'a':
+            raise ValueError("The text store is open for reading")
+        first = len(self)
+        block_size = self.manifest['block_size']
+        data = [text.encode('utf-8') if isinstance(text, str) else b'' for text in texts]
+        digests = [hashlib.blake2b(d, digest_size=16).digest() for d in data]
+        stored = self._lookup(np.array(digests, dtype='S16'))
+        for data, digest, offset in zip(data, digests, stored.tolist()):
+            self._n_raw += len(data)
+            if offset < 0:
+                offset = self._interned.get(digest)
+            if offset is None:
+                offset = self._end()[1] + len(self._pending)
+                self._interned[digest] = offset
+                self._new['texts'].append((digest, offset))
+                self._pending += data
+                if len(self._pending) >= block_size:
+                    self._seal()
+            self._new['offsets'].append(offset)
+            self._new['lengths'].append(len(data))
+        return np.arange(first, len(self), dtype=np.int64)
+
+    def flush(self) -> None:
+        """Commits the appended texts, sealing the pending block."""
+        if self.mode != 'a':
+            return
+        if self._pending:
+            self._seal()
+        if not self._new['offsets']:
+            return
+        end = self._end()
+        logger.debug("Stored {:,} texts of {:,} bytes in {:,} bytes, {:,} compressed".format(
+            len(self._new['offsets']), self._n_raw, end[1] - int(self._blocks[-1, 1]),
+            end[0] - self.manifest['blob_size']))
+        self._sync(BLOB)
+        for name, (dtype, _) in COLUMNS.items():
+            with open(os.path.join(self.directory, name + '.bin'), 'ab') as f:
+                f.write(np.array(self._new[name], dtype=dtype).tobytes())
+                f.flush()
+                os.fsync(f.fileno())
+        runs = self._write_runs(np.array(self._new['texts'], dtype=TEXT_DTYPE))
+        self.manifest.update(n_reviews=self.manifest['n_reviews'] + len(self._new['offsets']),
+                             n_texts=self.manifest['n_texts'] + len(self._new['texts']),
+                             n_blocks=self.manifest['n_blocks'] + len(self._new['blocks']),
+                             blob_size=end[0], runs=runs)
+        self._write_manifest()
+        self._clean_runs()
+        self._interned = {}
+        self._new = {name: [] for name in COLUMNS}
+        self._n_raw = 0
+        self._map_columns()
+        self._map_runs()
+
+    def close(self) -> None:
+        """Flushes appended texts and releases the blob."""
+        self.flush()
+        if self._blob is not None:
+            self._blob.close()
+            self._blob = None
+        self._cache.clear()
+
+    def get(self, review: int) -> str:
+        """Returns the text of a review.
+
+        Raises:
+            IndexError: If the review is not in the store.
+        """
+        if not 0 <= review < len(self):
+            raise IndexError("Review {} is not in the text store".format(review))
+        offset = int(self._offset(review))
+        length = self._length(review)
+        if length == 0:
+            return ''
+        blocks = self._index()
+        if self.mode == 'a' and offset >= blocks[-1, 1]:
+            start = offset - int(blocks[-1, 1])
+            return bytes(self._pending[start:start + length]).decode('utf-8')
+        block = int(np.searchsorted(blocks[:, 1], offset, side='right')) - 1
+        start = offset - int(blocks[block, 1])
+        return self._block(block, blocks)[start:start + length].decode('utf-8')
+
+    def get_many(self, reviews) -> list:
+        """Returns the texts of an array of reviews, reading the reviews of a block together."""
+        reviews = np.asarray(reviews, dtype=np.int64)
+        texts = [None] * len(reviews)
+        for i in np.argsort(self._offset(reviews) if len(reviews) else reviews, kind='stable'):
+            texts[i] = self.get(int(reviews[i]))
+        return texts
+
+    def __getitem__(self, review) -> Union[str, list]:
+        if np.ndim(review):
+            return self.get_many(review)
+        return self.get(int(review))
+
+    def __len__(self) -> int:
+        n_new = len(self._new['offsets']) if self.mode == 'a' else 0
+        return len(self._offsets) + n_new
+
+    def __enter__(self) -> "TextStore":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    @property
+    def n_texts(self) -> int:
+        """Number of distinct texts committed."""
+        return self.manifest['n_texts']
+
+    @property
+    def n_bytes(self) -> int:
+        """Compressed size of the committed texts."""
+        return self.manifest['blob_size']
+
+    def _offset(self, reviews):
+        """Returns the logical offset of one or an array of committed or appended reviews."""
+        if self.mode == 'r' or not self._new['offsets']:
+            return self._offsets[reviews]
+        if np.ndim(reviews):
+            return np.concatenate([self._offsets, self._new['offsets']])[reviews]
+        if reviews < len(self._offsets):
+            return int(self._offsets[reviews])
+        return self._new['offsets'][reviews - len(self._offsets)]
+
+    def _length(self, review: int) -> int:
+        if review < len(self._lengths):
+            return int(self._lengths[review])
+        return self._new['lengths'][review - len(self._lengths)]
+
+    def _end(self) -> tuple:
+        """Returns the blob and logical offsets of the end of the last sealed block."""
+        if self.mode == 'a' and self._new['blocks']:
+            return self._new['blocks'][-1]
+        return int(self._blocks[-1, 0]), int(self._blocks[-1, 1])
+
+    def _index(self) -> np.ndarray:
+        """Returns the block index, including the blocks sealed since the last flush."""
+        if self.mode == 'a' and self._new['blocks']:
+            return np.concatenate([self._blocks, np.array(self._new['blocks'], dtype=np.int64)])
+        return self._blocks
+
+    def _lookup(self, digests: np.ndarray) -> np.ndarray:
+        """Returns the logical offset of the committed text of each digest, or -1."""
+        offsets = np.full(len(digests), -1, dtype=np.int64)
+        for run in self._runs:
+            at = np.minimum(np.searchsorted(run['digest'], digests), len(run) - 1)
+            found = (run['digest'][at] == digests) & (offsets < 0)
+            offsets[found] = run['offset'][at[found]]
+        return offsets
+
+    def _write_runs(self, records: np.ndarray) -> list:
+        """Writes new texts records as a run of the digest index, merging the last runs.
+
+        Returns:
+            The runs of the index, as [file name, count] pairs, to record in the manifest.
+        """
+        runs = [list(run) for run in self.manifest['runs']]
+        if len(records):
+            name = self._next_run()
+            records[np.argsort(records['digest'], kind='stable')].tofile(
+                os.path.join(self.directory, name))
+            self._sync(name)
+            runs.append([name, len(records)])
+        while len(runs) > 1 and runs[-2][1] <= 2 * runs[-1][1]:
+            name = self._next_run()
+            self._merge(runs[-2][0], runs[-1][0], name)
+            runs[-2:] = [[name, runs[-2][1] + runs[-1][1]]]
+        return runs
+
+    def _merge(self, first: str, second: str, name: str) -> None:
+        """Merges two sorted runs into a new one, a chunk of each at a time.
+
+        The position of a record in the merged run is its position in its own run plus the
+        number of records of the other run sorted before it, ties going to the first run.
+        """
+        a, b = (np.memmap(os.path.join(self.directory, run), dtype=TEXT_DTYPE, mode='r')
+                for run in (first, second))
+        merged = np.memmap(os.path.join(self.directory, name), dtype=TEXT_DTYPE, mode='w+',
+                           shape=(len(a) + len(b),))
+        for run, other, side in ((a, b, 'left'), (b, a, 'right')):
+            for start in range(0, len(run), MERGE_CHUNK):
+                chunk = np.array(run[start:start + MERGE_CHUNK])
+                positions = np.searchsorted(other['digest'], chunk['digest'], side=side)
+                merged[positions + np.arange(start, start + len(chunk))] = chunk
+        merged.flush()
+        del merged
+        self._sync(name)
+
+    def _next_run(self) -> str:
+        self.manifest['generation'] = self.manifest.get('generation', 0) + 1
+        return RUN.format(self.manifest['generation'])
+
+    def _map_runs(self) -> None:
+        self._runs = [np.memmap(os.path.join(self.directory, name), dtype=TEXT_DTYPE, mode='r',
+                                shape=(count,))
+                      for name, count in self.manifest.get('runs', []) if count]
+
+    def _clean_runs(self) -> None:
+        """Deletes the runs the manifest does not list, merged away or left by a failed flush."""
+        runs = {name for name, _ in self.manifest['runs']}
+        for path in glob.glob(os.path.join(self.directory, RUN.replace('{:06d}', '*'))):
+            if os.path.basename(path) not in runs:
+                os.remove(path)
+
+    def _seal(self) -> None:
+        """Compresses the pending bytes into a block appended to the blob."""
+        data = zlib.compress(bytes(self._pending), self.manifest['level'])
+        with open(os.path.join(self.directory, BLOB), 'ab') as f:
+            f.write(data)
+        blob, logical = self._end()
+        self._new['blocks'].append((blob + len(data), logical + len(self._pending)))
+        self._pending = bytearray()
+        if self._blob is not None:
+            self._blob.close()
+            self._blob = None
+
+    def _block(self, block: int, blocks: np.ndarray) -> bytes:
+        """Returns a decompressed block, from the cache if recently read."""
+        if block in self._cache:
+            self._cache.move_to_end(block)
+            return self._cache[block]
+        if self._blob is None:
+            with open(os.path.join(self.directory, BLOB), 'rb') as f:
+                self._blob = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        start, stop = int(blocks[block, 0]), int(blocks[block + 1, 0])
+        data = zlib.decompress(self._blob[start:stop])
+        self._cache[block] = data
+        if len(self._cache) > self.cache_blocks:
+            self._cache.popitem(last=False)
+        return data
+
+    def _create(self, block_size: int, level: int) -> None:
+        os.makedirs(self.directory, exist_ok=True)
+        for name in [BLOB] + [name + '.bin' for name in COLUMNS]:
+            open(os.path.join(self.directory, name), 'wb').close()
+        with open(os.path.join(self.directory, 'blocks.bin'), 'wb') as f:
+            f.write(np.zeros((1, 2), dtype=np.int64).tobytes())
+        self.manifest = {'block_size': block_size, 'level': level, 'n_reviews': 0,
+                         'n_texts': 0, 'n_blocks': 0, 'blob_size': 0, 'runs': [],
+                         'generation': 0}
+        self._write_manifest()
+
+    def _count(self, name: str) -> int:
+        """Returns the number of committed records of a column."""
+        return self.manifest[COLUMNS[name][1]] + (name == 'blocks')
+
+    def _map(self, name: str) -> np.ndarray:
+        """Memory maps the committed records of a column."""
+        dtype, _ = COLUMNS[name]
+        count = self._count(name)
+        if not count:
+            return np.empty((0,) + dtype.shape, dtype=dtype.base)
+        return np.memmap(os.path.join(self.directory, name + '.bin'), dtype=dtype.base,
+                         mode='r', shape=(count,) + dtype.shape)
+
+    def _map_columns(self) -> None:
+        self._offsets = self._map('offsets')
+        self._lengths = self._map('lengths')
+        self._blocks = self._map('blocks')
+
+    def _truncate(self, name: str, size: int) -> None:
+        """Drops the bytes of a file written after the last committed flush."""
+        with open(os.path.join(self.directory, name), 'r+b') as f:
+            f.truncate(size)
+
+    def _sync(self, name: str) -> None:
+        with open(os.path.join(self.directory, name), 'rb') as f:
+            os.fsync(f.fileno())
+
+    def _write_manifest(self) -> None:
+        path = os.path.join(self.directory, MANIFEST)
+        with open(path + '.part', 'w') as f:
+            json.dump(self.manifest, f, indent=2)
+        os.replace(path + '.part', path)
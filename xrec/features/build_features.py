@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+# ======================================================================================================================== #
+# Project  : Explainable Recommendation (XRec)                                                                             #
+# Version  : 0.1.0                                                                                                         #
+# File     : \build_features.py                                                                                            #
+# Language : Python 3.8                                                                                                    #
+# ------------------------------------------------------------------------------------------------------------------------ #
+# Author   : John James                                                                                                    #
+# Company  : Bryant St. Labs                                                                                               #
+# Email    : john.james.ai.studio@gmail.com                                                                                #
+# URL      : https://github.com/john-james-ai/xrec                                                                         #
+# ------------------------------------------------------------------------------------------------------------------------ #
+# Created  : Monday, October 19th 2026, 9:00:00 am                                                                         #
+# Modified : Monday, October 19th 2026, 9:00:00 am                                                                         #
+# Modifier : John James (john.james.ai.studio@gmail.com)                                                                   #
+# ------------------------------------------------------------------------------------------------------------------------ #
+# License  : BSD 3-clause "New" or "Revised" License                                                                       #
+# Copyright: (c) 2021 Bryant St. Labs                                                                                      #
+# ======================================================================================================================== #
+import os
+import logging
+from typing import Tuple
+import numpy as np
+from scipy import sparse
+from xrec.data.ingest import load_reviews
+from xrec.models.artifact import save_matrix
+from xrec.utils.instrument import instrumented, count
+# ------------------------------------------------------------------------------------------------------------------------ #
+logger = logging.getLogger(__name__)
+# ------------------------------------------------------------------------------------------------------------------------ #
+
+
+def interaction_matrix(users: np.ndarray, items: np.ndarray, values: np.ndarray,
+                       shape: tuple) -> sparse.csr_matrix:
+    """Builds a users by items CSR matrix with sorted indices. Duplicate pairs are summed."""
+    X = sparse.csr_matrix((np.asarray(values, dtype=np.float32), (users, items)), shape=shape)
+    X.sum_duplicates()
+    return X
+
+
+def temporal_split(arrays: dict, shape: tuple,
+                   test_fraction: float = 0.2) -> Tuple[sparse.csr_matrix, sparse.csr_matrix]:
+    """Splits encoded reviews at a point in time into training and test interaction matrices.
+
+    The most recent test_fraction of the reviews form the test matrix, so models are evaluated
+    on interactions that happen after everything they were trained on.
+
+    Args:
+        arrays: Dictionary of 'users', 'items', 'ratings' and 'timestamps' arrays.
+        shape: Number of users and items.
+        test_fraction: Fraction of the reviews held out for testing.
+
+    Returns:
+        Tuple of the training and test CSR matrices.
+    """
+    timestamps = np.asarray(arrays['timestamps'])
+    cutoff = np.quantile(timestamps, 1 - test_fraction) if len(timestamps) else 0
+    test = timestamps >= cutoff
+    matrices = []
+    for mask in (~test, test):
+        matrices.append(interaction_matrix(arrays['users'][mask], arrays['items'][mask],
+                                           arrays['ratings'][mask], shape))
+    return matrices[0], matrices[1]
+
+
+@instrumented()
+def build_features(reviews: str, directory: str, test_fraction: float = 0.2) -> dict:
+    """Builds the training and test interaction matrices from encoded reviews.
+
+    Args:
+        reviews: Artifact directory of reviews saved by xrec.data.ingest.save_reviews.
+        directory: Directory receiving the 'train' and 'test' matrix artifacts.
+        test_fraction: Fraction of the most recent reviews held out for testing.
+
+    Returns:
+        Dictionary of the paths of the 'train' and 'test' matrix versions.
+    """
+    arrays, vocabularies = load_reviews(reviews)
+    shape = (len(vocabularies['users']), len(vocabularies['items']))
+    X_train, X_test = temporal_split(arrays, shape, test_fraction)
+    count(X_train.nnz + X_test.nnz)
+    logger.info("Built {:,} training and {:,} test interactions of {:,} users and {:,} items"
+                .format(X_train.nnz, X_test.nnz, *shape))
+    return {'train': save_matrix(os.path.join(directory, 'train'), X_train),
+            'test': save_matrix(os.path.join(directory, 'test'), X_test)}
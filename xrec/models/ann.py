@@ -0,0 +1,247 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+# ======================================================================================================================== #
+# Project  : Explainable Recommendation (XRec)                                                                             #
+# Version  : 0.1.0                                                                                                         #
+# File     : \ann.py                                                                                                       #
+# Language : Python 3.8                                                                                                    #
+# ------------------------------------------------------------------------------------------------------------------------ #
+# Author   : John James                                                                                                    #
+# Company  : Bryant St. Labs                                                                                               #
+# Email    : john.james.ai.studio@gmail.com                                                                                #
+# URL      : https://github.com/john-james-ai/xrec                                                                         #
+# ------------------------------------------------------------------------------------------------------------------------ #
+# Created  : Monday, October 19th 2026, 9:00:00 am                                                                         #
+# Modified : Monday, October 19th 2026, 9:00:00 am                                                                         #
+# Modifier : John James (john.james.ai.studio@gmail.com)                                                                   #
+# ------------------------------------------------------------------------------------------------------------------------ #
+# License  : BSD 3-clause "New" or "Revised" License                                                                       #
+# Copyright: (c) 2021 Bryant St. Labs                                                                                      #
+# ======================================================================================================================== #
+import time
+import logging
+from typing import Tuple
+import numpy as np
+from xrec.models.artifact import save_artifact, load_artifact
+from xrec.models.predict_model import top_k
+# ------------------------------------------------------------------------------------------------------------------------ #
+logger = logging.getLogger(__name__)
+# ------------------------------------------------------------------------------------------------------------------------ #
+
+
+def kmeans(X: np.ndarray, n_clusters: int, iterations: int = 20, sample_size: int = None,
+           block_size: int = 65536, seed: int = 0) -> np.ndarray:
+    """Lloyd's k-means on a random sample of the rows of X.
+
+    Args:
+        X: Array of shape (n, d).
+        n_clusters: Number of centroids.
+        iterations: Number of Lloyd iterations.
+        sample_size: Number of rows used for training. Defaults to 256 rows per centroid.
+        block_size: Number of rows assigned at a time.
+        seed: Seed for sampling and initialization.
+
+    Returns:
+        float32 array of centroids of shape (n_clusters, d).
+    """
+    rng = np.random.default_rng(seed)
+    sample_size = min(len(X), sample_size or 256 * n_clusters)
+    sample = np.asarray(X[np.sort(rng.choice(len(X), sample_size, replace=False))],
+                        dtype=np.float32)
+    centroids = sample[rng.choice(sample_size, n_clusters, replace=sample_size < n_clusters)].copy()
+    for _ in range(iterations):
+        labels = assign(sample, centroids, block_size)
+        counts = np.bincount(labels, minlength=n_clusters)
+        sums = np.zeros_like(centroids)
+        np.add.at(sums, labels, sample)
+        empty = counts == 0
+        centroids[~empty] = sums[~empty] / counts[~empty, None]
+        centroids[empty] = sample[rng.choice(sample_size, empty.sum())]
+    return centroids
+
+
+def assign(X: np.ndarray, centroids: np.ndarray, block_size: int = 65536) -> np.ndarray:
+    """Returns the index of the nearest centroid, in Euclidean distance, of each row of X."""
+    labels = np.empty(len(X), dtype=np.int32)
+    norms = np.einsum('ij,ij->i', centroids, centroids)
+    for start in range(0, len(X), block_size):
+        block = np.asarray(X[start:start + block_size], dtype=np.float32)
+        labels[start:start + block_size] = np.argmin(norms - 2 * block @ centroids.T, axis=1)
+    return labels
+
+
+class IVFIndex:
+    """Inverted file index for approximate maximum inner product search over item embeddings.
+
+    Item vectors are partitioned by a k-means coarse quantizer into n_lists inverted lists,
+    stored contiguously in list order. A query scores the centroids, probes the n_probe lists
+    whose centroids score highest and ranks only their items, so n_probe trades recall for
+    latency. With product quantization the residual of each vector from its centroid is
+    encoded as one byte per subspace and scored through per-query lookup tables, which
+    shrinks the index by a factor of 4 * dim / pq_subspaces.
+
+    The index is saved in the artifact layout of .npy arrays and a JSON manifest, and load maps
+    the arrays into memory rather than reading them, so several processes share one copy.
+
+    The interface includes:
+        build: Trains the quantizers and builds the inverted lists.
+        search: Returns the approximate top-K items of each query.
+        save: Saves the index in the artifact layout.
+        load: Opens a saved index.
+
+    Args:
+        n_lists: Number of inverted lists. Defaults to about 4 * sqrt(n_items).
+        n_probe: Default number of lists probed per query.
+        pq_subspaces: Number of product quantization subspaces, or None to store the vectors.
+        seed: Seed for training the quantizers.
+
+    """
+
+    def __init__(self, n_lists: int = None, n_probe: int = 8, pq_subspaces: int = None,
+                 seed: int = 0) -> None:
+        self.n_lists = n_lists
+        self.n_probe = n_probe
+        self.pq_subspaces = pq_subspaces
+        self.seed = seed
+        self.arrays = {}
+
+    def build(self, vectors: np.ndarray) -> "IVFIndex":
+        """Trains the coarse (and product) quantizers and builds the inverted lists.
+
+        Args:
+            vectors: Item embeddings of shape (n_items, dim).
+
+        Returns:
+            The built index.
+        """
+        start = time.perf_counter()
+        vectors = np.asarray(vectors, dtype=np.float32)
+        n, dim = vectors.shape
+        self.n_lists = self.n_lists or max(1, int(4 * np.sqrt(n)))
+        centroids = kmeans(vectors, self.n_lists, seed=self.seed)
+        labels = assign(vectors, centroids)
+        order = np.argsort(labels, kind='stable')
+        offsets = np.zeros(self.n_lists + 1, dtype=np.int64)
+        offsets[1:] = np.cumsum(np.bincount(labels, minlength=self.n_lists))
+        self.arrays = {'centroids': centroids, 'offsets': offsets,
+                       'ids': order.astype(np.int32)}
+        if self.pq_subspaces is None:
+            self.arrays['vectors'] = vectors[order]
+        else:
+            if dim % self.pq_subspaces:
+                raise ValueError("Dimension {} is not divisible into {} subspaces".format(
+                    dim, self.pq_subspaces))
+            residuals = (vectors - centroids[labels])[order]
+            codebooks = np.stack([kmeans(sub, 256, seed=self.seed)
+                                  for sub in self._split(residuals)])
+            codes = np.stack([assign(sub, codebook).astype(np.uint8)
+                              for sub, codebook in zip(self._split(residuals), codebooks)], axis=1)
+            self.arrays['codebooks'] = codebooks
+            self.arrays['codes'] = codes
+        logger.info("Built IVF index over {} items with {} lists in {:.2f} seconds".format(
+            n, self.n_lists, time.perf_counter() - start))
+        return self
+
+    def search(self, queries: np.ndarray, k: int = 100,
+               n_probe: int = None) -> Tuple[np.ndarray, np.ndarray]:
+        """Returns the approximate top-K items of each query by inner product.
+
+        Args:
+            queries: Array of shape (n_queries, dim), e.g. user factors.
+            k: Number of items per query.
+            n_probe: Number of lists probed. Defaults to the n_probe of the index.
+
+        Returns:
+            Tuple of int32 item ids and float32 scores of shape (n_queries, k). Queries whose
+            probed lists hold fewer than k items are padded with id -1 and score -inf.
+        """
+        queries = np.atleast_2d(np.asarray(queries, dtype=np.float32))
+        n_probe = min(n_probe or self.n_probe, self.n_lists)
+        offsets = self.arrays['offsets']
+        coarse = queries @ self.arrays['centroids'].T
+        probes, _ = top_k(coarse, n_probe)
+        ids = np.full((len(queries), k), -1, dtype=np.int32)
+        scores = np.full((len(queries), k), -np.inf, dtype=np.float32)
+        for q, (query, lists) in enumerate(zip(queries, probes)):
+            sizes = offsets[lists + 1] - offsets[lists]
+            positions = np.repeat(offsets[lists] - np.cumsum(sizes) + sizes, sizes) + \
+                np.arange(sizes.sum())
+            if self.pq_subspaces is None:
+                candidate_scores = self.arrays['vectors'][positions] @ query
+            else:
+                tables = np.einsum('mcd,md->mc', self.arrays['codebooks'],
+                                   query.reshape(self.pq_subspaces, -1))
+                codes = self.arrays['codes'][positions]
+                candidate_scores = np.repeat(coarse[q, lists], sizes) + \
+                    tables[np.arange(self.pq_subspaces), codes].sum(axis=1)
+            best, best_scores = top_k(candidate_scores[None, :], k)
+            ids[q, :best.shape[1]] = self.arrays['ids'][positions[best[0]]]
+            scores[q, :best.shape[1]] = best_scores[0]
+        return ids, scores
+
+    def save(self, path: str) -> str:
+        """Saves the index as a new version of an artifact directory.
+
+        Args:
+            path: Artifact directory.
+
+        Returns:
+            Path of the new version directory.
+        """
+        return save_artifact(path, 'ivf', self.arrays,
+                             params={'n_lists': self.n_lists, 'n_probe': self.n_probe,
+                                     'pq_subspaces': self.pq_subspaces, 'seed': self.seed})
+
+    @classmethod
+    def load(cls, path: str, mmap: bool = True) -> "IVFIndex":
+        """Opens a saved index, memory mapping its arrays unless mmap is False.
+
+        Args:
+            path: Artifact directory, for the latest version, or version directory.
+            mmap: True to memory map the arrays, False to read them into memory.
+
+        Returns:
+            The index.
+        """
+        artifact = load_artifact(path, mmap=mmap)
+        index = cls(**artifact.params)
+        index.arrays = artifact.arrays
+        return index
+
+    def _split(self, X: np.ndarray) -> list:
+        return np.split(X, self.pq_subspaces, axis=1)
+
+    @property
+    def n_items(self) -> int:
+        return len(self.arrays['ids'])
+
+
+def evaluate_recall(index: IVFIndex, queries: np.ndarray, item_vectors: np.ndarray,
+                    k: int = 100, n_probes: list = (1, 2, 4, 8, 16, 32, 64)) -> list:
+    """Measures recall@K against exact search, and query latency, for several values of n_probe.
+
+    Args:
+        index: Built IVF index.
+        queries: Array of shape (n_queries, dim).
+        item_vectors: The exact item embeddings the index was built from.
+        k: Number of items per query.
+        n_probes: Values of n_probe to evaluate.
+
+    Returns:
+        List of dictionaries containing n_probe, recall and milliseconds per query.
+    """
+    queries = np.asarray(queries, dtype=np.float32)
+    exact, _ = top_k(queries @ np.asarray(item_vectors, dtype=np.float32).T, k)
+    results = []
+    for n_probe in n_probes:
+        if n_probe > index.n_lists:
+            break
+        start = time.perf_counter()
+        approximate, _ = index.search(queries, k, n_probe=n_probe)
+        milliseconds = 1000 * (time.perf_counter() - start) / len(queries)
+        hits = (approximate[:, :, None] == exact[:, None, :]).any(axis=2).sum()
+        results.append({'n_probe': n_probe, 'recall': float(hits / exact.size),
+                        'ms_per_query': milliseconds})
+        logger.info("n_probe={}: recall@{}={:.3f}, {:.3f} ms/query".format(
+            n_probe, k, results[-1]['recall'], milliseconds))
+    return results
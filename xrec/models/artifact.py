@@ -0,0 +1,454 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+# ======================================================================================================================== #
+# Project  : Explainable Recommendation (XRec)                                                                             #
+# Version  : 0.1.0                                                                                                         #
+# File     : \artifact.py                                                                                                  #
+# Language : Python 3.8                                                                                                    #
+# ------------------------------------------------------------------------------------------------------------------------ #
+# Author   : John James                                                                                                    #
+# Company  : Bryant St. Labs                                                                                               #
+# Email    : john.james.ai.studio@gmail.com                                                                                #
+# URL      : https://github.com/john-james-ai/xrec                                                                         #
+# ------------------------------------------------------------------------------------------------------------------------ #
+# Created  : Monday, October 19th 2026, 9:00:00 am                                                                         #
+# Modified : Monday, October 19th 2026, 9:00:00 am                                                                         #
+# Modifier : John James (john.james.ai.studio@gmail.com)                                                                   #
+# ------------------------------------------------------------------------------------------------------------------------ #
+# License  : BSD 3-clause "New" or "Revised" License                                                                       #
+# Copyright: (c) 2021 Bryant St. Labs                                                                                      #
+# ======================================================================================================================== #
+import os
+import json
+import uuid
+import shutil
+import logging
+from datetime import datetime
+from typing import Union
+import numpy as np
+from scipy import sparse
+# ------------------------------------------------------------------------------------------------------------------------ #
+logger = logging.getLogger(__name__)
+# ------------------------------------------------------------------------------------------------------------------------ #
+FORMAT_VERSION = 1
+LATEST = 'LATEST'
+MANIFEST = 'manifest.json'
+ROWS = 'rows'
+# ------------------------------------------------------------------------------------------------------------------------ #
+
+
+class Vocabulary:
+    """Maps between dense indices and external string IDs without building a hash table.
+
+    The IDs are held as a fixed-width bytes array in dense index order, together with a sorted
+    copy and its permutation, so both directions are array operations over memory-mapped data:
+    indexing for index to ID, and a vectorized binary search for ID to index.
+
+    Args:
+        values: Bytes array of IDs in dense index order.
+        keys: The IDs in sorted order.
+        positions: Dense index of each sorted ID.
+
+    """
+
+    def __init__(self, values: np.ndarray, keys: np.ndarray = None,
+                 positions: np.ndarray = None) -> None:
+        self.values = values
+        if keys is None:
+            positions = np.argsort(values, kind='stable')
+            keys = values[positions]
+        self.keys = keys
+        self.positions = positions
+
+    @classmethod
+    def from_ids(cls, ids) -> "Vocabulary":
+        """Creates a vocabulary from a sequence of string or bytes IDs."""
+        return cls(encode(ids))
+
+    def lookup(self, ids) -> np.ndarray:
+        """Returns the dense index of each ID, or -1 for unknown IDs."""
+        ids = encode(np.atleast_1d(ids))
+        if not len(self.keys):
+            return np.full(len(ids), -1, dtype=np.int64)
+        found = np.minimum(np.searchsorted(self.keys, ids), len(self.keys) - 1)
+        return np.where(self.keys[found] == ids, self.positions[found], -1)
+
+    def append(self, ids) -> "Vocabulary":
+        """Returns a new vocabulary with unknown IDs appended in order of first appearance.
+
+        Existing IDs keep their dense indices, and the sorted keys are merged rather than
+        re-sorted.
+        """
+        ids = encode(np.atleast_1d(ids))
+        unknown = ids[self.lookup(ids) < 0]
+        _, first = np.unique(unknown, return_index=True)
+        new = unknown[np.sort(first)]
+        if not len(new):
+            return self
+        dtype = 'S{}'.format(max(self.values.dtype.itemsize, new.dtype.itemsize))
+        order = np.argsort(new, kind='stable')
+        at = np.searchsorted(self.keys.astype(dtype), new[order].astype(dtype))
+        return Vocabulary(np.concatenate([self.values.astype(dtype), new.astype(dtype)]),
+                          np.insert(self.keys.astype(dtype), at, new[order].astype(dtype)),
+                          np.insert(np.asarray(self.positions), at, len(self) + order))
+
+    def __getitem__(self, index) -> Union[str, np.ndarray]:
+        value = self.values[index]
+        if isinstance(value, bytes):
+            return value.decode('utf-8')
+        return np.char.decode(value, 'utf-8')
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+
+def encode(ids) -> np.ndarray:
+    """Returns IDs as a fixed-width UTF-8 bytes array."""
+    ids = np.asarray(ids)
+    if ids.dtype.kind == 'S':
+        return ids
+    if not len(ids):
+        return ids.astype('S1')
+    return np.char.encode(ids.astype(str), 'utf-8')
+
+
+class Artifact:
+    """An opened model artifact.
+
+    Attributes:
+        path: Version directory of the artifact.
+        manifest: Dictionary read from the JSON manifest.
+        arrays: Dictionary of (memory-mapped) arrays.
+        vocabularies: Dictionary of Vocabulary objects.
+
+    """
+
+    def __init__(self, path: str, manifest: dict, arrays: dict, vocabularies: dict) -> None:
+        self.path = path
+        self.manifest = manifest
+        self.arrays = arrays
+        self.vocabularies = vocabularies
+
+    @property
+    def kind(self) -> str:
+        return self.manifest['kind']
+
+    @property
+    def version(self) -> int:
+        return self.manifest['version']
+
+    @property
+    def params(self) -> dict:
+        return self.manifest['params']
+
+    @property
+    def uid(self) -> str:
+        """Unique identifier of the version, which tells apart equal version numbers of different
+        artifact directories. Versions saved without one are identified by their real path."""
+        return self.manifest.get('uid') or os.path.realpath(self.path)
+
+
+def stage(root: str) -> str:
+    """Creates a staging directory for a version whose arrays are written in place.
+
+    Arrays too large to build in memory can be allocated in the staging directory with
+    np.lib.format.open_memmap, filled, and published by passing the directory to save_artifact.
+
+    Args:
+        root: Artifact directory, created if it does not exist.
+
+    Returns:
+        Path of the staging directory.
+    """
+    os.makedirs(root, exist_ok=True)
+    staging = os.path.join(root, '.tmp-' + uuid.uuid4().hex)
+    os.makedirs(staging)
+    return staging
+
+
+def save_artifact(root: str, kind: str, arrays: dict, vocabularies: dict = None,
+                  params: dict = None, staging: str = None) -> str:
+    """Saves a model as a new version in a versioned artifact directory.
+
+    The layout of a version is one .npy file per array, three .npy files per vocabulary and a
+    small JSON manifest:
+
+        root/
+            LATEST                      name of the newest version
+            v000001/
+                manifest.json
+                <array>.npy
+                <vocabulary>.values.npy
+                <vocabulary>.keys.npy
+                <vocabulary>.positions.npy
+
+    The version is written to a temporary directory that is renamed into place once complete,
+    and LATEST is replaced atomically afterwards, so readers never observe a partial version.
+
+    Args:
+        root: Artifact directory, created if it does not exist.
+        kind: Model type recorded in the manifest, e.g. 'als'.
+        arrays: Dictionary of numpy arrays.
+        vocabularies: Optional dictionary of Vocabulary objects or sequences of IDs.
+        params: Optional JSON serializable hyperparameters.
+        staging: Optional directory created by stage holding arrays already written as .npy
+            files, which are published along with arrays.
+
+    Returns:
+        Path of the new version directory.
+    """
+    staging = staging or stage(root)
+    try:
+        manifest = {'format_version': FORMAT_VERSION, 'kind': kind, 'uid': uuid.uuid4().hex,
+                    'created': datetime.now().isoformat(), 'params': params or {},
+                    'arrays': {}, 'vocabularies': {}}
+        for name, array in arrays.items():
+            array = np.ascontiguousarray(array)
+            np.save(os.path.join(staging, name + '.npy'), array)
+            manifest['arrays'][name] = {'dtype': array.dtype.str, 'shape': list(array.shape)}
+        for filename in sorted(os.listdir(staging)):
+            name = filename[:-len('.npy')]
+            if filename.endswith('.npy') and name not in manifest['arrays']:
+                array = np.load(os.path.join(staging, filename), mmap_mode='r')
+                manifest['arrays'][name] = {'dtype': array.dtype.str,
+                                            'shape': list(array.shape)}
+        for name, vocabulary in (vocabularies or {}).items():
+            if not isinstance(vocabulary, Vocabulary):
+                vocabulary = Vocabulary.from_ids(vocabulary)
+            for part in ('values', 'keys', 'positions'):
+                np.save(os.path.join(staging, '{}.{}.npy'.format(name, part)),
+                        getattr(vocabulary, part))
+            manifest['vocabularies'][name] = {'size': len(vocabulary)}
+        version = max(versions(root), default=0) + 1
+        while True:
+            manifest['version'] = version
+            with open(os.path.join(staging, MANIFEST), 'w') as f:
+                json.dump(manifest, f, indent=2)
+            path = os.path.join(root, 'v{:06d}'.format(version))
+            try:
+                os.rename(staging, path)
+                break
+            except OSError:
+                if not os.path.isdir(path):
+                    raise
+                version += 1
+        _write_latest(root, os.path.basename(path))
+    except BaseException:
+        shutil.rmtree(staging, ignore_errors=True)
+        raise
+    logger.info("Saved {} artifact version {} to {}".format(kind, version, path))
+    return path
+
+
+def load_artifact(path: str, mmap: bool = True) -> Artifact:
+    """Opens an artifact, memory mapping its arrays unless mmap is False.
+
+    Args:
+        path: Either an artifact directory, in which case its latest version is opened, or a
+            version directory.
+        mmap: True to memory map the arrays, False to read them into memory.
+
+    Returns:
+        The opened Artifact.
+    """
+    path = resolve(path)
+    with open(os.path.join(path, MANIFEST)) as f:
+        manifest = json.load(f)
+    if manifest['format_version'] > FORMAT_VERSION:
+        raise ValueError("Unsupported artifact format version {}".format(
+            manifest['format_version']))
+    mmap_mode = 'r' if mmap else None
+    arrays = {name: np.load(os.path.join(path, name + '.npy'), mmap_mode=mmap_mode)
+              for name in manifest['arrays']}
+    vocabularies = {name: Vocabulary(*[np.load(os.path.join(path, '{}.{}.npy'.format(name, part)),
+                                               mmap_mode=mmap_mode)
+                                       for part in ('values', 'keys', 'positions')])
+                    for name in manifest['vocabularies']}
+    return Artifact(path, manifest, arrays, vocabularies)
+
+
+def save_matrix(root: str, X: sparse.spmatrix, name: str = 'interactions') -> str:
+    """Saves a sparse matrix in CSR form, with sorted indices, as a new artifact version.
+
+    Args:
+        root: Artifact directory.
+        X: Sparse matrix.
+        name: Kind recorded in the manifest.
+
+    Returns:
+        Path of the new version directory.
+    """
+    X = sparse.csr_matrix(X)
+    X.sort_indices()
+    return save_artifact(root, name, {'data': X.data, 'indices': X.indices, 'indptr': X.indptr},
+                         params={'shape': list(X.shape)})
+
+
+def save_rows(root: str, rows, X_rows: sparse.spmatrix, shape: tuple) -> str:
+    """Saves replacement rows of the latest matrix in an artifact directory as a new version.
+
+    Only the given rows are written, as a layer over the previous version, so updating a few
+    rows of a large matrix costs their size rather than that of the matrix. Rows not in the
+    layer are read through to the versions below it. The manifest records the number of
+    elements written in layers since the last full matrix, and that of the full matrix, so the
+    caller can decide when to compact the layers with save_matrix(root, load_matrix(root)).
+
+    Args:
+        root: Artifact directory holding a matrix saved by save_matrix.
+        rows: Distinct indices of the replaced rows.
+        X_rows: Sparse matrix of the complete new content of each row, in the order of rows.
+        shape: Shape of the updated matrix, which may have grown.
+
+    Returns:
+        Path of the new version directory.
+    """
+    latest = load_artifact(root)
+    rows = np.asarray(rows, dtype=np.int64)
+    if len(np.unique(rows)) != len(rows):
+        raise ValueError("Replacement rows must be distinct")
+    order = np.argsort(rows)
+    X_rows = sparse.csr_matrix(X_rows)[order]
+    X_rows.sort_indices()
+    if latest.kind == ROWS:
+        base_nnz, delta_nnz = latest.params['base_nnz'], latest.params['delta_nnz']
+    else:
+        base_nnz, delta_nnz = len(latest.arrays['data']), 0
+    return save_artifact(root, ROWS, {'rows': rows[order], 'data': X_rows.data,
+                                      'indices': X_rows.indices, 'indptr': X_rows.indptr},
+                         params={'shape': list(shape), 'base': os.path.basename(latest.path),
+                                 'base_nnz': base_nnz, 'delta_nnz': delta_nnz + X_rows.nnz})
+
+
+def load_rows(path: str, rows) -> sparse.csr_matrix:
+    """Reads the given rows of a matrix saved by save_matrix and save_rows.
+
+    Each row is taken from the newest layer holding it, without merging the layers into a full
+    matrix, so the cost is that of the requested rows.
+
+    Args:
+        path: Artifact directory, for the latest version, or version directory.
+        rows: Indices of the rows to read.
+
+    Returns:
+        CSR matrix of the requested rows, in order, with the width of the latest version.
+    """
+    artifact = load_artifact(path)
+    rows = np.asarray(rows, dtype=np.int64)
+    n_cols = artifact.params['shape'][1]
+    pending = np.ones(len(rows), dtype=bool)
+    parts, positions = [], []
+    while True:
+        X = _csr(artifact)
+        if artifact.kind == ROWS:
+            layer = artifact.arrays['rows']
+            at = np.minimum(np.searchsorted(layer, rows), len(layer) - 1)
+            found = pending & (layer[at] == rows) if len(layer) else np.zeros_like(pending)
+            selected = at[found]
+        else:
+            found = pending & (rows < X.shape[0])
+            selected = rows[found]
+        part = X[selected]
+        parts.append(sparse.csr_matrix((part.data, part.indices, part.indptr),
+                                       shape=(len(selected), n_cols)))
+        positions.append(np.flatnonzero(found))
+        pending &= ~found
+        if artifact.kind != ROWS:
+            break
+        artifact = load_artifact(os.path.join(os.path.dirname(artifact.path),
+                                              artifact.params['base']))
+    parts.append(sparse.csr_matrix((int(pending.sum()), n_cols), dtype=parts[0].dtype))
+    positions.append(np.flatnonzero(pending))
+    X = sparse.vstack(parts, format='csr')[np.argsort(np.concatenate(positions))]
+    X.sort_indices()
+    return X
+
+
+def load_matrix(path: str, mmap: bool = True) -> sparse.csr_matrix:
+    """Opens a matrix saved by save_matrix, memory mapping its arrays unless mmap is False.
+
+    The memory-mapped matrix is read-only, and processes opening the same version share one
+    physical copy through the page cache. A version saved by save_rows is merged with the
+    versions below it into a matrix held in memory.
+
+    Args:
+        path: Artifact directory, for the latest version, or version directory.
+        mmap: True to memory map the arrays, False to read them into memory.
+
+    Returns:
+        CSR matrix.
+    """
+    artifact = load_artifact(path, mmap=mmap)
+    layers = []
+    while artifact.kind == ROWS:
+        layers.append(artifact)
+        artifact = load_artifact(os.path.join(os.path.dirname(artifact.path),
+                                              artifact.params['base']), mmap=mmap)
+    X = _csr(artifact)
+    if layers:
+        X = _overlay(X, layers[::-1], tuple(layers[0].params['shape']))
+    return X
+
+
+def _csr(artifact: Artifact) -> sparse.csr_matrix:
+    """Returns the CSR matrix, or layer of replacement rows, held by an artifact."""
+    arrays = tuple(artifact.arrays[name] for name in ('data', 'indices', 'indptr'))
+    shape = tuple(artifact.params['shape'])
+    if artifact.kind == ROWS:
+        shape = (len(artifact.arrays['rows']), shape[1])
+    X = sparse.csr_matrix(arrays, shape=shape, copy=False)
+    X.has_sorted_indices = True
+    return X
+
+
+def _overlay(X: sparse.csr_matrix, layers: list, shape: tuple) -> sparse.csr_matrix:
+    """Merges layers of replacement rows, oldest first, over a CSR matrix in one pass."""
+    lengths = np.zeros(shape[0], dtype=np.int64)
+    lengths[:X.shape[0]] = np.diff(X.indptr)
+    source = np.full(shape[0], -1, dtype=np.int64)
+    parts = [(np.arange(X.shape[0]), X)]
+    for i, layer in enumerate(layers):
+        rows = layer.arrays['rows']
+        source[rows] = i
+        lengths[rows] = np.diff(layer.arrays['indptr'])
+        parts.append((rows, _csr(layer)))
+    indptr = np.zeros(shape[0] + 1, dtype=np.int64)
+    np.cumsum(lengths, out=indptr[1:])
+    data = np.empty(indptr[-1], dtype=X.dtype)
+    indices = np.empty(indptr[-1], dtype=X.indices.dtype)
+    for i, (rows, part) in enumerate(parts, -1):
+        counts = np.diff(part.indptr)
+        keep = np.repeat(source[rows] == i, counts)
+        offsets = np.repeat(indptr[rows] - part.indptr[:-1], counts)
+        destination = (offsets + np.arange(part.nnz))[keep]
+        data[destination] = part.data[keep]
+        indices[destination] = part.indices[keep]
+    X = sparse.csr_matrix((data, indices, indptr), shape=shape)
+    X.has_sorted_indices = True
+    return X
+
+
+def resolve(path: str) -> str:
+    """Returns the version directory for an artifact or version directory."""
+    if os.path.isfile(os.path.join(path, MANIFEST)):
+        return path
+    latest = os.path.join(path, LATEST)
+    if not os.path.isfile(latest):
+        raise FileNotFoundError("No artifact found at {}".format(path))
+    with open(latest) as f:
+        return os.path.join(path, f.read().strip())
+
+
+def versions(root: str) -> list:
+    """Returns the sorted version numbers present in an artifact directory."""
+    if not os.path.isdir(root):
+        return []
+    return sorted(int(name[1:]) for name in os.listdir(root)
+                  if name.startswith('v') and name[1:].isdigit())
+
+
+def _write_latest(root: str, name: str) -> None:
+    """Atomically points LATEST at a version directory."""
+    staging = os.path.join(root, '.{}-{}'.format(LATEST, uuid.uuid4().hex))
+    with open(staging, 'w') as f:
+        f.write(name)
+    os.replace(staging, os.path.join(root, LATEST))
@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+# ======================================================================================================================== #
+# Project  : Explainable Recommendation (XRec)                                                                             #
+# Version  : 0.1.0                                                                                                         #
+# File     : \cache.py                                                                                                     #
+# Language : Python 3.8                                                                                                    #
+# ------------------------------------------------------------------------------------------------------------------------ #
+# Author   : John James                                                                                                    #
+# Company  : Bryant St. Labs                                                                                               #
+# Email    : john.james.ai.studio@gmail.com                                                                                #
+# URL      : https://github.com/john-james-ai/xrec                                                                         #
+# ------------------------------------------------------------------------------------------------------------------------ #
+# Created  : Monday, October 19th 2026, 9:00:00 am                                                                         #
+# Modified : Monday, October 19th 2026, 9:00:00 am                                                                         #
+# Modifier : John James (john.james.ai.studio@gmail.com)                                                                   #
+# ------------------------------------------------------------------------------------------------------------------------ #
+# License  : BSD 3-clause "New" or "Revised" License                                                                       #
+# Copyright: (c) 2021 Bryant St. Labs                                                                                      #
+# ======================================================================================================================== #
+import os
+import json
+import time
+import sqlite3
+import logging
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Hashable
+# ------------------------------------------------------------------------------------------------------------------------ #
+logger = logging.getLogger(__name__)
+# ------------------------------------------------------------------------------------------------------------------------ #
+
+
+class ExplanationCache:
+    """Bounded cache of explanations keyed by (user, item).
+
+    The memory tier is an LRU of at most max_entries explanations, each optionally expiring ttl
+    seconds after it was stored. Every entry belongs to a model version, and changing the
+    version discards the memory tier so explanations of an outdated model are never served.
+
+    The optional disk tier is a SQLite database, typically on a local disk shared by all serving
+    worker processes. Explanations computed by one process are written through to it, and a
+    memory miss in any process is looked up there before the explanation is recomputed. Rows of
+    other model versions are ignored and can be purged with purge.
+
+    The interface includes:
+        get: Returns a cached explanation or None.
+        put: Stores an explanation.
+        get_or_compute: Returns a cached explanation, computing and storing it on a miss.
+        set_version: Switches to a model version, invalidating older entries.
+        clear: Empties the memory tier.
+        purge: Deletes expired and other-version entries from the disk tier.
+        stats: Returns hit, miss and eviction counts and the hit rate.
+
+    Args:
+        max_entries: Maximum number of entries in the memory tier.
+        ttl: Optional time to live of an entry, in seconds.
+        version: Model version of the entries.
+        path: Optional SQLite database file of the shared disk tier.
+
+    """
+
+    def __init__(self, max_entries: int = 100000, ttl: float = None, version: Any = None,
+                 path: str = None) -> None:
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.version = version
+        self.path = path
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._connection = None
+        self._pid = None
+        self._counts = {'hits': 0, 'disk_hits': 0, 'misses': 0, 'evictions': 0,
+                        'expirations': 0, 'invalidations': 0}
+
+    def get(self, user: Hashable, item: Hashable) -> Any:
+        """Returns the cached explanation for (user, item), or None on a miss."""
+        key = (user, item)
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                value, expires = entry
+                if expires is None or expires > now:
+                    self._entries.move_to_end(key)
+                    self._counts['hits'] += 1
+                    return value
+                del self._entries[key]
+                self._counts['expirations'] += 1
+        if self.path is not None:
+            row = self._execute("SELECT value, expires FROM explanations WHERE version = ? AND "
+                                "user = ? AND item = ?",
+                                (str(self.version), str(user), str(item))).fetchone()
+            if row is not None and (row[1] is None or row[1] > now):
+                value = json.loads(row[0])
+                self._store(key, value, row[1])
+                with self._lock:
+                    self._counts['disk_hits'] += 1
+                return value
+        with self._lock:
+            self._counts['misses'] += 1
+        return None
+
+    def put(self, user: Hashable, item: Hashable, value: Any) -> None:
+        """Stores the explanation for (user, item) in the memory tier and the disk tier."""
+        expires = time.time() + self.ttl if self.ttl is not None else None
+        self._store((user, item), value, expires)
+        if self.path is not None:
+            self._execute("INSERT OR REPLACE INTO explanations VALUES (?, ?, ?, ?, ?)",
+                          (str(self.version), str(user), str(item), json.dumps(value), expires),
+                          commit=True)
+
+    def get_or_compute(self, user: Hashable, item: Hashable, compute: Callable[[], Any]) -> Any:
+        """Returns the cached explanation for (user, item), computing and storing it on a miss.
+
+        Args:
+            user: User ID or index.
+            item: Item ID or index.
+            compute: Callable without arguments returning a JSON serializable explanation.
+        """
+        value = self.get(user, item)
+        if value is None:
+            value = compute()
+            self.put(user, item, value)
+        return value
+
+    def set_version(self, version: Any) -> None:
+        """Switches to a model version, discarding the memory tier if the version changed."""
+        if version != self.version:
+            self.version = version
+            self.clear()
+            with self._lock:
+                self._counts['invalidations'] += 1
+
+    def clear(self) -> None:
+        """Empties the memory tier."""
+        with self._lock:
+            self._entries.clear()
+
+    def purge(self) -> int:
+        """Deletes expired entries and entries of other versions from the disk tier.
+
+        Returns:
+            Number of rows deleted.
+        """
+        if self.path is None:
+            return 0
+        cursor = self._execute("DELETE FROM explanations WHERE version != ? OR expires <= ?",
+                               (str(self.version), time.time()), commit=True)
+        return cursor.rowcount
+
+    def stats(self) -> dict:
+        """Returns the counters, the memory tier size and the overall hit rate."""
+        with self._lock:
+            stats = dict(self._counts)
+            stats['size'] = len(self._entries)
+        lookups = stats['hits'] + stats['disk_hits'] + stats['misses']
+        stats['hit_rate'] = (stats['hits'] + stats['disk_hits']) / lookups if lookups else None
+        return stats
+
+    def _store(self, key: tuple, value: Any, expires: float) -> None:
+        with self._lock:
+            self._entries[key] = (value, expires)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._counts['evictions'] += 1
+
+    def _execute(self, sql: str, parameters: tuple, commit: bool = False) -> sqlite3.Cursor:
+        """Executes a statement on this process's connection to the disk tier."""
+        with self._lock:
+            if self._connection is None or self._pid != os.getpid():
+                self._connect()
+            cursor = self._connection.execute(sql, parameters)
+            if commit:
+                self._connection.commit()
+            return cursor
+
+    def _connect(self) -> None:
+        """Opens the disk tier in write-ahead logging mode, so readers never block writers."""
+        self._connection = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        self._connection.execute("CREATE TABLE IF NOT EXISTS explanations (version TEXT, "
+                                 "user TEXT, item TEXT, value TEXT, expires REAL, "
+                                 "PRIMARY KEY (version, user, item))")
+        self._connection.commit()
+        self._pid = os.getpid()
@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+# ======================================================================================================================== #
+# Project  : Explainable Recommendation (XRec)                                                                             #
+# Version  : 0.1.0                                                                                                         #
+# File     : \checkpoint.py                                                                                                #
+# Language : Python 3.8                                                                                                    #
+# ------------------------------------------------------------------------------------------------------------------------ #
+# Author   : John James                                                                                                    #
+# Company  : Bryant St. Labs                                                                                               #
+# Email    : john.james.ai.studio@gmail.com                                                                                #
+# URL      : https://github.com/john-james-ai/xrec                                                                         #
+# ------------------------------------------------------------------------------------------------------------------------ #
+# Created  : Monday, October 19th 2026, 9:00:00 am                                                                         #
+# Modified : Monday, October 19th 2026, 9:00:00 am                                                                         #
+# Modifier : John James (john.james.ai.studio@gmail.com)                                                                   #
+# ------------------------------------------------------------------------------------------------------------------------ #
+# License  : BSD 3-clause "New" or "Revised" License                                                                       #
+# Copyright: (c) 2021 Bryant St. Labs                                                                                      #
+# ======================================================================================================================== #
+import os
+import shutil
+import logging
+import threading
+from typing import Tuple
+import numpy as np
+from xrec.models.artifact import save_artifact, load_artifact, versions
+# ------------------------------------------------------------------------------------------------------------------------ #
+logger = logging.getLogger(__name__)
+# ------------------------------------------------------------------------------------------------------------------------ #
+# Hyperparameters that only bound how long training runs, so a resumed run may extend them.
+EXTENSIBLE = ('iterations', 'epochs')
+# ------------------------------------------------------------------------------------------------------------------------ #
+
+
+class Checkpointer:
+    """Writes periodic, atomic and asynchronous training checkpoints.
+
+    A checkpoint is a version of an artifact directory holding the model arrays, the model
+    hyperparameters, the training position (iteration, or epoch and batch of the sampler), the
+    random generator state and the history. Saving copies the arrays, which is the only part that
+    stalls training, and hands the copy to a background thread that writes it. At most one write
+    is in flight: a save waits for the previous write to finish. Since every version is renamed
+    into place only once complete, a crash during a write leaves the previous checkpoint intact.
+
+    The interface includes:
+        due: Returns True if a checkpoint should be taken after a step.
+        save: Snapshots a model and writes it in the background.
+        wait: Blocks until the pending write is complete.
+        exists: Returns True if a checkpoint has been written.
+        load: Returns the arrays and state of the latest checkpoint, checked against a model.
+
+    Args:
+        directory: Artifact directory of the checkpoints.
+        every: Number of iterations or epochs between checkpoints.
+        keep: Number of most recent checkpoints retained, at least 1.
+
+    """
+
+    def __init__(self, directory: str, every: int = 1, keep: int = 2) -> None:
+        if keep < 1:
+            raise ValueError("keep must be at least 1, got {}".format(keep))
+        self.directory = directory
+        self.every = every
+        self.keep = keep
+        self._thread = None
+        self._error = None
+
+    def due(self, step: int) -> bool:
+        """Returns True if a checkpoint should be taken once step iterations or epochs are done."""
+        return self.every > 0 and step % self.every == 0
+
+    def save(self, model, position: dict, rng: dict = None) -> None:
+        """Snapshots the arrays and state of a model and writes them in the background.
+
+        Args:
+            model: FactorModel being trained.
+            position: Training position to resume from, e.g. {'iteration': 3}.
+            rng: JSON serializable random generator state.
+        """
+        arrays = {name: np.array(getattr(model, name)) for name in model.arrays}
+        params = {'model': model.kind, 'model_params': model.params(), 'position': position,
+                  'rng': rng, 'history': list(model.history)}
+        self.wait()
+        self._thread = threading.Thread(target=self._write, args=(arrays, params), daemon=True)
+        self._thread.start()
+
+    def wait(self) -> None:
+        """Blocks until the pending write is complete, re-raising any error it raised."""
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        if self._error is not None:
+            error, self._error = self._error, None
+            raise error
+
+    def exists(self) -> bool:
+        return bool(versions(self.directory))
+
+    def load(self, model=None) -> Tuple[dict, dict]:
+        """Returns the arrays and state of the latest checkpoint.
+
+        Args:
+            model: Optional FactorModel about to resume. The checkpoint must have been written
+                by a model of the same kind with the same hyperparameters, except for the number
+                of iterations or epochs.
+
+        Returns:
+            Tuple of a dictionary of writable arrays and a dictionary with the model kind, model
+            hyperparameters, position, random generator state and history.
+
+        Raises:
+            ValueError: If the checkpoint was written by a different kind of model or with
+                different hyperparameters.
+        """
+        self.wait()
+        artifact = load_artifact(self.directory, mmap=False)
+        if model is not None:
+            self._check(artifact, model)
+        logger.info("Resuming {} from checkpoint {} at {}".format(
+            artifact.params['model'], artifact.version, artifact.params['position']))
+        return artifact.arrays, artifact.params
+
+    def _check(self, artifact, model) -> None:
+        """Raises ValueError unless a checkpoint was written by a model like the given one."""
+        if artifact.params['model'] != model.kind:
+            raise ValueError("Checkpoint {} was written by model {!r}, not {!r}".format(
+                artifact.path, artifact.params['model'], model.kind))
+        stored, params = artifact.params['model_params'], model.params()
+        differences = sorted(name for name in set(stored) | set(params)
+                             if name not in EXTENSIBLE and stored.get(name) != params.get(name))
+        if differences:
+            raise ValueError("Checkpoint {} was written with different hyperparameters: {}".format(
+                artifact.path, ', '.join('{}={!r}, not {!r}'.format(
+                    name, stored.get(name), params.get(name)) for name in differences)))
+
+    def _write(self, arrays: dict, params: dict) -> None:
+        try:
+            save_artifact(self.directory, 'checkpoint', arrays, params=params)
+            for version in versions(self.directory)[:-self.keep]:
+                shutil.rmtree(os.path.join(self.directory, 'v{:06d}'.format(version)),
+                              ignore_errors=True)
+        except Exception as e:
+            self._error = e
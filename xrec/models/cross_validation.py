@@ -0,0 +1,206 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+# ======================================================================================================================== #
+# Project  : Explainable Recommendation (XRec)                                                                             #
+# Version  : 0.1.0                                                                                                         #
+# File     : \cross_validation.py                                                                                          #
+# Language : Python 3.8                                                                                                    #
+# ------------------------------------------------------------------------------------------------------------------------ #
+# Author   : John James                                                                                                    #
+# Company  : Bryant St. Labs                                                                                               #
+# Email    : john.james.ai.studio@gmail.com                                                                                #
+# URL      : https://github.com/john-james-ai/xrec                                                                         #
+# ------------------------------------------------------------------------------------------------------------------------ #
+# Created  : Monday, October 19th 2026, 9:00:00 am                                                                         #
+# Modified : Monday, October 19th 2026, 9:00:00 am                                                                         #
+# Modifier : John James (john.james.ai.studio@gmail.com)                                                                   #
+# ------------------------------------------------------------------------------------------------------------------------ #
+# License  : BSD 3-clause "New" or "Revised" License                                                                       #
+# Copyright: (c) 2021 Bryant St. Labs                                                                                      #
+# ======================================================================================================================== #
+import os
+import time
+import logging
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from typing import Tuple
+import numpy as np
+from scipy import sparse
+from xrec.models.artifact import save_artifact, load_artifact, save_matrix, load_matrix
+from xrec.models.evaluate import evaluate_recommender
+from xrec.models.predict_model import BatchRecommender
+from xrec.models.search import MODELS
+from xrec.utils.budget import limit_threads
+# ------------------------------------------------------------------------------------------------------------------------ #
+logger = logging.getLogger(__name__)
+# ------------------------------------------------------------------------------------------------------------------------ #
+
+
+def assign_folds(X: sparse.csr_matrix, n_folds: int, seed: int = 0) -> np.ndarray:
+    """Assigns every stored interaction of a CSR matrix to one of n_folds folds at random.
+
+    Args:
+        X: Users by items CSR matrix.
+        n_folds: Number of folds.
+        seed: Seed of the assignment.
+
+    Returns:
+        Int8 array of length X.nnz holding the fold of each interaction, in storage order.
+    """
+    rng = np.random.default_rng(seed)
+    return (rng.permutation(X.nnz) % n_folds).astype(np.int8)
+
+
+def split(X: sparse.csr_matrix, folds: np.ndarray,
+          fold: int) -> Tuple[sparse.csr_matrix, sparse.csr_matrix]:
+    """Splits a CSR matrix into the training and test interactions of a fold.
+
+    Args:
+        X: Users by items CSR matrix, e.g. memory mapped.
+        folds: Fold of each stored interaction, as returned by assign_folds.
+        fold: Fold held out for testing.
+
+    Returns:
+        Tuple of the training and test CSR matrices.
+    """
+    held_out = folds == fold
+    rows = np.repeat(np.arange(X.shape[0]), np.diff(X.indptr))
+    matrices = []
+    for mask in (~held_out, held_out):
+        indptr = np.zeros(X.shape[0] + 1, dtype=np.int64)
+        np.cumsum(np.bincount(rows[mask], minlength=X.shape[0]), out=indptr[1:])
+        matrices.append(sparse.csr_matrix((X.data[mask], X.indices[mask], indptr), shape=X.shape))
+    return matrices[0], matrices[1]
+
+
+class CrossValidation:
+    """K-fold cross-validation of a factor model over one shared, memory-mapped matrix.
+
+    The interaction matrix is written once in the artifact layout together with the fold of each
+    stored interaction. A fold is an index mask over that matrix rather than a copy of it: every
+    fold process memory maps the shared matrix and fold array, so the page cache holds a single
+    physical copy, and materializes only its own training and test matrices. Folds train and
+    evaluate in parallel processes, as many as fit within the CPU budget given the threads of
+    each fold and within the memory budget given the estimated working set of each fold.
+
+    The interface includes:
+        run: Runs every fold and returns the aggregated report.
+
+    Attributes:
+        report: Dictionary with the metrics of each fold and their mean and standard deviation.
+
+    Args:
+        model: Either 'als' or 'bpr'.
+        params: Dictionary of model hyperparameters.
+        n_folds: Number of folds.
+        k_values: Cutoffs at which metrics are computed.
+        cpu_budget: Number of CPUs used by all folds together. Defaults to the number of CPUs.
+        memory_budget: Optional bytes of memory used by all folds together.
+        threads_per_fold: Number of threads of each fold.
+        directory: Directory for the shared matrix and folds. Defaults to a new temporary
+            directory.
+        seed: Seed of the fold assignment.
+
+    """
+
+    def __init__(self, model: str = 'als', params: dict = None, n_folds: int = 5,
+                 k_values: tuple = (10, 20, 100), cpu_budget: int = None,
+                 memory_budget: int = None, threads_per_fold: int = 1, directory: str = None,
+                 seed: int = 0) -> None:
+        if model not in MODELS:
+            raise ValueError("Unrecognized model: {}".format(model))
+        self.model = model
+        self.params = params or {}
+        self.n_folds = n_folds
+        self.k_values = tuple(k_values)
+        self.cpu_budget = cpu_budget or os.cpu_count() or 1
+        self.memory_budget = memory_budget
+        self.threads_per_fold = threads_per_fold
+        self.directory = directory or tempfile.mkdtemp(prefix='xrec-cv-')
+        self.seed = seed
+        self.report = None
+
+    def run(self, X: sparse.csr_matrix) -> dict:
+        """Runs every fold.
+
+        Args:
+            X: Users by items CSR matrix of all interactions.
+
+        Returns:
+            Dictionary with the metrics of each fold under 'folds', and the 'mean' and 'std' of
+            each metric across folds.
+        """
+        start = time.perf_counter()
+        X = sparse.csr_matrix(X)
+        matrix = save_matrix(os.path.join(self.directory, 'interactions'), X)
+        folds = save_artifact(os.path.join(self.directory, 'folds'), 'folds',
+                              {'folds': assign_folds(X, self.n_folds, self.seed)},
+                              params={'n_folds': self.n_folds, 'seed': self.seed})
+
+        n_workers = self.n_workers(X)
+        tasks = [{'fold': fold, 'model': self.model, 'params': self.params, 'matrix': matrix,
+                  'folds': folds, 'k_values': self.k_values, 'threads': self.threads_per_fold}
+                 for fold in range(self.n_folds)]
+        with ProcessPoolExecutor(max_workers=n_workers, initializer=limit_threads,
+                                 initargs=(self.threads_per_fold,)) as executor:
+            results = list(executor.map(_run_fold, tasks))
+        for result in results:
+            logger.info("Fold {} completed in {:.2f} seconds: {}".format(
+                result['fold'], result['seconds'], result['metrics']))
+
+        names = results[0]['metrics']
+        values = {name: np.array([r['metrics'][name] for r in results], dtype=np.float64)
+                  for name in names}
+        self.report = {'model': self.model, 'params': self.params, 'n_folds': self.n_folds,
+                       'workers': n_workers, 'seconds': time.perf_counter() - start,
+                       'folds': results,
+                       'mean': {name: float(v.mean()) for name, v in values.items()},
+                       'std': {name: float(v.std()) for name, v in values.items()}}
+        logger.info("Cross-validation of {} over {} folds completed in {:.2f} seconds: {}".format(
+            self.model, self.n_folds, self.report['seconds'], self.report['mean']))
+        return self.report
+
+    def n_workers(self, X: sparse.csr_matrix) -> int:
+        """Returns the number of concurrent folds within the CPU and memory budgets.
+
+        The working set of a fold is estimated as its training matrix and transpose, its test
+        matrix, the factors, and the scoring memory of its recommender.
+        """
+        n_workers = max(1, min(self.n_folds, self.cpu_budget // self.threads_per_fold))
+        if self.memory_budget is not None:
+            per_fold = self.fold_memory(X)
+            n_workers = max(1, min(n_workers, self.memory_budget // per_fold))
+        return n_workers
+
+    def fold_memory(self, X: sparse.csr_matrix) -> int:
+        """Returns the estimated peak memory of one fold, in bytes."""
+        matrix = X.nnz * (X.data.itemsize + 8) + (X.shape[0] + X.shape[1]) * 8
+        factors = (X.shape[0] + X.shape[1]) * self.params.get('factors', 64) * 4
+        return int(2 * matrix + factors + _scoring_budget(self.threads_per_fold))
+
+
+def _scoring_budget(threads: int) -> int:
+    """Working memory of the recommender evaluating a fold, in bytes."""
+    return threads << 26
+
+
+def _run_fold(task: dict) -> dict:
+    """Trains and evaluates one fold over the shared memory-mapped matrix and folds."""
+    start = time.perf_counter()
+    X = load_matrix(task['matrix'])
+    folds = load_artifact(task['folds']).arrays['folds']
+    X_train, X_test = split(X, folds, task['fold'])
+    cls, _ = MODELS[task['model']]
+    params = dict(task['params'])
+    if task['model'] == 'als':
+        params['n_threads'] = task['threads']
+    else:
+        params['n_workers'] = 1
+    model = cls(**params).fit(X_train)
+    recommender = BatchRecommender(model.user_factors, model.item_factors,
+                                   getattr(model, 'item_bias', None),
+                                   memory_budget=_scoring_budget(task['threads']),
+                                   n_threads=task['threads'])
+    metrics = evaluate_recommender(recommender, X_test, X_train, k_values=task['k_values'])
+    return {'fold': task['fold'], 'train': int(X_train.nnz), 'test': int(X_test.nnz),
+            'metrics': metrics, 'seconds': time.perf_counter() - start}
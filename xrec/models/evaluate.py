@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+# ======================================================================================================================== #
+# Project  : Explainable Recommendation (XRec)                                                                             #
+# Version  : 0.1.0                                                                                                         #
+# File     : \evaluate.py                                                                                                  #
+# Language : Python 3.8                                                                                                    #
+# ------------------------------------------------------------------------------------------------------------------------ #
+# Author   : John James                                                                                                    #
+# Company  : Bryant St. Labs                                                                                               #
+# Email    : john.james.ai.studio@gmail.com                                                                                #
+# URL      : https://github.com/john-james-ai/xrec                                                                         #
+# ------------------------------------------------------------------------------------------------------------------------ #
+# Created  : Monday, October 19th 2026, 9:00:00 am                                                                         #
+# Modified : Monday, October 19th 2026, 9:00:00 am                                                                         #
+# Modifier : John James (john.james.ai.studio@gmail.com)                                                                   #
+# ------------------------------------------------------------------------------------------------------------------------ #
+# License  : BSD 3-clause "New" or "Revised" License                                                                       #
+# Copyright: (c) 2021 Bryant St. Labs                                                                                      #
+# ======================================================================================================================== #
+import os
+import time
+import logging
+from concurrent.futures import ProcessPoolExecutor
+from typing import Tuple
+import numpy as np
+from scipy import sparse
+from xrec.utils.sparse import csr_contains
+from xrec.utils.instrument import instrumented
+# ------------------------------------------------------------------------------------------------------------------------ #
+logger = logging.getLogger(__name__)
+# ------------------------------------------------------------------------------------------------------------------------ #
+
+
+def block_metrics(topk: np.ndarray, first: int, X_test: sparse.csr_matrix, k_values: tuple,
+                  X_train: sparse.csr_matrix = None,
+                  neighbours: sparse.csr_matrix = None) -> Tuple[dict, np.ndarray]:
+    """Computes the summed ranking metrics of a block of users.
+
+    Hits are found with one vectorized membership test of every recommended item against the
+    held-out CSR rows, and every metric is a reduction over the resulting hit matrix. Users
+    without held-out items are skipped.
+
+    Args:
+        topk: Recommended item indices of shape (n_block_users, K), padded with -1.
+        first: User index of the first row of topk.
+        X_test: Users by items CSR matrix of held-out interactions, with sorted indices.
+        k_values: Cutoffs at which metrics are computed, each at most K.
+        X_train: Optional users by items CSR matrix of training interactions, required for
+            explanation coverage.
+        neighbours: Optional items by items CSR neighbour table. A recommendation counts as
+            explainable when one of its neighbours is among the user's training items.
+
+    Returns:
+        Tuple of a dictionary of metric sums, including the number of evaluated users, and a
+        boolean array marking the items recommended to any user in the top max(k_values).
+    """
+    n_users, K = topk.shape
+    users = np.arange(first, first + n_users)
+    relevant = np.diff(X_test.indptr[first:first + n_users + 1])
+    evaluated = relevant > 0
+    valid = topk >= 0
+    items = np.where(valid, topk, 0)
+    hits = csr_contains(X_test, np.repeat(users, K), items.ravel()).reshape(n_users, K) & valid
+    hits, relevant, valid_eval = hits[evaluated], relevant[evaluated], valid[evaluated]
+
+    sums = {'users': int(evaluated.sum())}
+    discounts = 1.0 / np.log2(np.arange(2, K + 2))
+    ideal = np.cumsum(discounts)
+    for k in k_values:
+        found = hits[:, :k].sum(axis=1)
+        sums['recall@{}'.format(k)] = float((found / relevant).sum())
+        sums['precision@{}'.format(k)] = float(found.sum() / k)
+        sums['hit_rate@{}'.format(k)] = float((found > 0).sum())
+        dcg = hits[:, :k] @ discounts[:k]
+        sums['ndcg@{}'.format(k)] = float((dcg / ideal[np.minimum(relevant, k) - 1]).sum())
+    first_hit = np.argmax(hits, axis=1)
+    sums['mrr'] = float((hits.any(axis=1) / (first_hit + 1)).sum())
+
+    kmax = max(k_values)
+    if X_train is not None and neighbours is not None:
+        explainable = (X_train[first:first + n_users] @ neighbours.T).tocsr()
+        explainable.sort_indices()
+        top = items[evaluated][:, :kmax]
+        rows = np.repeat(np.arange(n_users)[evaluated], top.shape[1])
+        explained = csr_contains(explainable, rows, top.ravel()) & valid_eval[:, :kmax].ravel()
+        sums['explained'] = float(explained.sum())
+        sums['recommended'] = float(valid_eval[:, :kmax].sum())
+
+    covered = np.zeros(X_test.shape[1], dtype=bool)
+    covered[topk[evaluated][:, :kmax][valid_eval[:, :kmax]]] = True
+    return sums, covered
+
+
+def summarize(sums: dict, covered: np.ndarray) -> dict:
+    """Converts accumulated metric sums into means over the evaluated users."""
+    n = max(sums['users'], 1)
+    metrics = {name: value / n for name, value in sums.items()
+               if name not in ('users', 'explained', 'recommended')}
+    metrics['users'] = sums['users']
+    metrics['coverage'] = float(covered.mean())
+    if 'explained' in sums:
+        metrics['explanation_coverage'] = sums['explained'] / max(sums['recommended'], 1)
+    return metrics
+
+
+def evaluate(topk: np.ndarray, X_test: sparse.csr_matrix, k_values: tuple = (10, 20, 100),
+             X_train: sparse.csr_matrix = None, neighbours: sparse.csr_matrix = None,
+             block_size: int = 100000, n_workers: int = None) -> dict:
+    """Computes ranking metrics for all users from a precomputed top-K matrix.
+
+    Blocks of users are evaluated by worker processes, which receive the arrays once at start-up
+    and return only metric sums and a coverage mask per block.
+
+    Metrics are recall, precision, NDCG and hit rate at each cutoff, mean reciprocal rank over
+    the full list, catalog coverage of the top max(k_values), and, when X_train and neighbours
+    are given, explanation coverage: the share of recommendations justified by a neighbour the
+    user has interacted with.
+
+    Args:
+        topk: Recommended item indices of shape (n_users, K), e.g. a np.memmap.
+        X_test: Users by items CSR matrix of held-out interactions.
+        k_values: Cutoffs at which metrics are computed, each at most K.
+        X_train: Optional users by items CSR matrix of training interactions.
+        neighbours: Optional items by items CSR neighbour table, e.g. from ItemKNN.
+        block_size: Number of users per block.
+        n_workers: Number of worker processes. Defaults to the number of CPUs.
+
+    Returns:
+        Dictionary of metrics averaged over users with held-out interactions.
+    """
+    start = time.perf_counter()
+    X_test = _sorted(X_test)
+    k_values = tuple(k for k in k_values if k <= topk.shape[1]) or (topk.shape[1],)
+    blocks = [(first, min(first + block_size, topk.shape[0]))
+              for first in range(0, topk.shape[0], block_size)]
+    n_workers = min(n_workers or os.cpu_count() or 1, len(blocks))
+    args = (topk, X_test, k_values, X_train, neighbours)
+    if n_workers == 1:
+        _initialize_worker(*args)
+        results = map(_evaluate_block, blocks)
+        metrics = _combine(results, X_test.shape[1])
+    else:
+        with ProcessPoolExecutor(max_workers=n_workers, initializer=_initialize_worker,
+                                 initargs=args) as executor:
+            metrics = _combine(executor.map(_evaluate_block, blocks), X_test.shape[1])
+    logger.info("Evaluated {} users in {:.2f} seconds".format(
+        metrics['users'], time.perf_counter() - start))
+    return metrics
+
+
+@instrumented()
+def evaluate_recommender(recommender, X_test: sparse.csr_matrix, X_train: sparse.csr_matrix = None,
+                         k_values: tuple = (10, 20, 100),
+                         neighbours: sparse.csr_matrix = None) -> dict:
+    """Computes ranking metrics while streaming top-K blocks from a BatchRecommender.
+
+    Training interactions are excluded from the recommendations. No top-K matrix for all users
+    is materialized: each block is evaluated as soon as it is scored.
+
+    Args:
+        recommender: BatchRecommender.
+        X_test: Users by items CSR matrix of held-out interactions.
+        X_train: Optional users by items CSR matrix of training interactions.
+        k_values: Cutoffs at which metrics are computed.
+        neighbours: Optional items by items CSR neighbour table, e.g. from ItemKNN.
+
+    Returns:
+        Dictionary of metrics averaged over users with held-out interactions.
+    """
+    X_test = _sorted(X_test)
+    k = min(max(k_values), recommender.n_items)
+    k_values = tuple(kv for kv in k_values if kv <= k) or (k,)
+    results = (block_metrics(np.where(np.isfinite(scores), items, -1), first, X_test, k_values,
+                             X_train, neighbours)
+               for first, items, scores in recommender.iter_blocks(k, X_train))
+    return _combine(results, X_test.shape[1])
+
+
+def _sorted(X: sparse.csr_matrix) -> sparse.csr_matrix:
+    X = sparse.csr_matrix(X)
+    if not X.has_sorted_indices:
+        X.sort_indices()
+    return X
+
+
+def _combine(results, n_items: int) -> dict:
+    totals, covered = {}, np.zeros(n_items, dtype=bool)
+    for sums, block_covered in results:
+        for name, value in sums.items():
+            totals[name] = totals.get(name, 0) + value
+        covered |= block_covered
+    return summarize(totals, covered)
+
+
+_worker_state = {}
+
+
+def _initialize_worker(topk, X_test, k_values, X_train, neighbours) -> None:
+    """Holds the arrays shared by all blocks of a worker process."""
+    _worker_state.update(topk=topk, X_test=X_test, k_values=k_values, X_train=X_train,
+                         neighbours=neighbours)
+
+
+def _evaluate_block(block: Tuple[int, int]) -> Tuple[dict, np.ndarray]:
+    first, last = block
+    state = _worker_state
+    return block_metrics(np.asarray(state['topk'][first:last]), first, state['X_test'],
+                         state['k_values'], state['X_train'], state['neighbours'])
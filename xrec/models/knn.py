@@ -0,0 +1,257 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+# ======================================================================================================================== #
+# Project  : Explainable Recommendation (XRec)                                                                             #
+# Version  : 0.1.0                                                                                                         #
+# File     : \knn.py                                                                                                       #
+# Language : Python 3.8                                                                                                    #
+# ------------------------------------------------------------------------------------------------------------------------ #
+# Author   : John James                                                                                                    #
+# Company  : Bryant St. Labs                                                                                               #
+# Email    : john.james.ai.studio@gmail.com                                                                                #
+# URL      : https://github.com/john-james-ai/xrec                                                                         #
+# ------------------------------------------------------------------------------------------------------------------------ #
+# Created  : Monday, October 19th 2026, 9:00:00 am                                                                         #
+# Modified : Monday, October 19th 2026, 9:00:00 am                                                                         #
+# Modifier : John James (john.james.ai.studio@gmail.com)                                                                   #
+# ------------------------------------------------------------------------------------------------------------------------ #
+# License  : BSD 3-clause "New" or "Revised" License                                                                       #
+# Copyright: (c) 2021 Bryant St. Labs                                                                                      #
+# ======================================================================================================================== #
+import os
+import time
+import logging
+from concurrent.futures import ProcessPoolExecutor
+from typing import Tuple
+import numpy as np
+from scipy import sparse
+from xrec.models.artifact import save_artifact, load_artifact
+from xrec.utils.sparse import csr_contains, csr_row_ids
+# ------------------------------------------------------------------------------------------------------------------------ #
+logger = logging.getLogger(__name__)
+# ------------------------------------------------------------------------------------------------------------------------ #
+
+
+def prune(S: sparse.csr_matrix, k: int) -> sparse.csr_matrix:
+    """Keeps the k largest positive entries of each row of a CSR matrix.
+
+    Args:
+        S: CSR matrix.
+        k: Number of entries to keep per row.
+
+    Returns:
+        CSR matrix with at most k entries per row, sorted by descending value within each row.
+    """
+    rows = csr_row_ids(S)
+    keep = S.data > 0
+    rows, cols, values = rows[keep], S.indices[keep], S.data[keep]
+    order = np.lexsort((-values, rows))
+    rows, cols, values = rows[order], cols[order], values[order]
+    starts = np.searchsorted(rows, np.arange(S.shape[0]))
+    keep = np.arange(len(rows)) - starts[rows] < k
+    counts = np.bincount(rows[keep], minlength=S.shape[0])
+    indptr = np.zeros(S.shape[0] + 1, dtype=np.int64)
+    np.cumsum(counts, out=indptr[1:])
+    return sparse.csr_matrix((values[keep].astype(np.float32), cols[keep].astype(np.int32), indptr),
+                             shape=S.shape)
+
+
+class ItemKNN:
+    """Item-based nearest neighbours with explainable recommendations.
+
+    Similarities are computed as a blocked sparse product X^T X: each block of items is
+    multiplied against the whole interaction matrix, normalized, and immediately pruned to the k
+    most similar neighbours of each item before the next block is computed, so the dense
+    n_items by n_items similarity matrix never exists. Blocks are spread across worker
+    processes. The result is a compact CSR neighbour table whose row i holds the neighbours of
+    item i sorted by descending similarity.
+
+    Cosine similarity is taken over the raw interaction columns. Adjusted cosine first subtracts
+    each user's mean rating from their ratings, which is only meaningful for explicit ratings.
+
+    The interface includes:
+        fit: Computes the neighbour table from a users by items CSR matrix.
+        score: Scores every item for a set of users from the items they have seen.
+        explain: Returns the seen items that justify recommending an item to a user.
+        justify: Returns the most similar seen item for many user and item pairs at once.
+        save: Saves the neighbour table in the artifact layout.
+        load: Opens a saved neighbour table.
+
+    Attributes:
+        neighbours: CSR matrix of shape (n_items, n_items).
+        version: Artifact version the table was loaded from, or None if fitted in memory.
+        uid: Unique identifier of that artifact version, or None if fitted in memory.
+
+    Args:
+        k: Number of neighbours kept per item.
+        similarity: Either 'cosine' or 'adjusted_cosine'.
+        shrinkage: Added to the denominator to penalize similarities with little support.
+        block_size: Number of items per block.
+        n_workers: Number of worker processes. Defaults to the number of CPUs.
+
+    """
+
+    def __init__(self, k: int = 100, similarity: str = 'cosine', shrinkage: float = 0.0,
+                 block_size: int = 1024, n_workers: int = None) -> None:
+        if similarity not in ('cosine', 'adjusted_cosine'):
+            raise ValueError("Unrecognized similarity: {}".format(similarity))
+        self.k = k
+        self.similarity = similarity
+        self.shrinkage = shrinkage
+        self.block_size = block_size
+        self.n_workers = n_workers or os.cpu_count() or 1
+        self.neighbours = None
+        self.version = None
+        self.uid = None
+
+    def fit(self, X: sparse.csr_matrix) -> "ItemKNN":
+        """Computes the pruned item-item similarity table.
+
+        Args:
+            X: Users by items CSR matrix of ratings or interactions.
+
+        Returns:
+            The fitted model.
+        """
+        start = time.perf_counter()
+        X = sparse.csr_matrix(X, dtype=np.float32, copy=True)
+        if self.similarity == 'adjusted_cosine':
+            counts = np.diff(X.indptr)
+            sums = np.bincount(csr_row_ids(X), weights=X.data, minlength=X.shape[0])
+            X.data -= np.repeat(sums / np.maximum(counts, 1), counts).astype(np.float32)
+            X.eliminate_zeros()
+        X = X.tocsc()
+        norms = np.sqrt(np.asarray(X.multiply(X).sum(axis=0)).ravel())
+        blocks = [(first, min(first + self.block_size, X.shape[1]))
+                  for first in range(0, X.shape[1], self.block_size)]
+        if self.n_workers == 1 or len(blocks) == 1:
+            _initialize_worker(X, norms, self.k, self.shrinkage)
+            results = [_similarity_block(block) for block in blocks]
+        else:
+            with ProcessPoolExecutor(max_workers=self.n_workers, initializer=_initialize_worker,
+                                     initargs=(X, norms, self.k, self.shrinkage)) as executor:
+                results = list(executor.map(_similarity_block, blocks))
+        self.neighbours = sparse.vstack(results, format='csr')
+        self.version = None
+        self.uid = None
+        logger.info("Computed {} neighbours for {} items in {:.2f} seconds".format(
+            self.neighbours.nnz, X.shape[1], time.perf_counter() - start))
+        return self
+
+    def score(self, X_users: sparse.csr_matrix) -> np.ndarray:
+        """Scores every item for each user as the summed similarity to the items they have seen.
+
+        Args:
+            X_users: CSR matrix of the seen items of a set of users.
+
+        Returns:
+            Dense array of shape (n_users, n_items).
+        """
+        return np.asarray((X_users @ self.neighbours.T).todense())
+
+    def explain(self, seen: np.ndarray, item: int, n: int = 3) -> list:
+        """Returns the seen items that justify recommending an item, most similar first.
+
+        Args:
+            seen: Array of the item indices the user has interacted with.
+            item: Recommended item index.
+            n: Maximum number of justifying items.
+
+        Returns:
+            List of (item, similarity) tuples.
+        """
+        start, end = self.neighbours.indptr[item], self.neighbours.indptr[item + 1]
+        neighbours = self.neighbours.indices[start:end]
+        found = np.isin(neighbours, seen)
+        return [(int(j), float(s)) for j, s in
+                zip(neighbours[found][:n], self.neighbours.data[start:end][found][:n])]
+
+    def justify(self, X_seen: sparse.csr_matrix, users: np.ndarray,
+                items: np.ndarray) -> np.ndarray:
+        """Returns the most similar seen item for each user and recommended item pair.
+
+        This is explain with n=1, vectorized over pairs: the neighbour lists of all pairs are
+        walked one rank at a time, testing membership in the seen items with a binary search,
+        until each pair has found a seen neighbour or run out of neighbours.
+
+        Args:
+            X_seen: Users by items CSR matrix of seen items.
+            users: User index of each pair.
+            items: Recommended item index of each pair.
+
+        Returns:
+            Int32 array of the justifying item of each pair, or -1 if there is none.
+        """
+        users = np.asarray(users, dtype=np.int64)
+        items = np.asarray(items, dtype=np.int64)
+        because = np.full(len(items), -1, dtype=np.int32)
+        starts = self.neighbours.indptr[items]
+        counts = self.neighbours.indptr[items + 1] - starts
+        active = np.flatnonzero(counts > 0)
+        rank = 0
+        while active.size:
+            candidates = self.neighbours.indices[starts[active] + rank]
+            found = csr_contains(X_seen, users[active], candidates)
+            because[active[found]] = candidates[found]
+            rank += 1
+            active = active[~found & (counts[active] > rank)]
+        return because
+
+    def save(self, path: str) -> str:
+        """Saves the neighbour table as a new version of an artifact directory.
+
+        Args:
+            path: Artifact directory.
+
+        Returns:
+            Path of the new version directory.
+        """
+        return save_artifact(path, 'item_knn',
+                             {name: getattr(self.neighbours, name)
+                              for name in ('indptr', 'indices', 'data')},
+                             params={'k': self.k, 'similarity': self.similarity,
+                                     'shrinkage': self.shrinkage,
+                                     'shape': list(self.neighbours.shape)})
+
+    @classmethod
+    def load(cls, path: str, mmap: bool = True) -> "ItemKNN":
+        """Opens a saved neighbour table, memory mapping its arrays unless mmap is False.
+
+        Args:
+            path: Artifact directory, for the latest version, or version directory.
+            mmap: True to memory map the arrays, False to read them into memory.
+
+        Returns:
+            The model.
+        """
+        artifact = load_artifact(path, mmap=mmap)
+        params = dict(artifact.params)
+        shape = tuple(params.pop('shape'))
+        model = cls(**params)
+        model.neighbours = sparse.csr_matrix(
+            tuple(artifact.arrays[name] for name in ('data', 'indices', 'indptr')),
+            shape=shape, copy=False)
+        model.version = artifact.version
+        model.uid = artifact.uid
+        return model
+
+
+_worker_state = {}
+
+
+def _initialize_worker(X: sparse.csc_matrix, norms: np.ndarray, k: int, shrinkage: float) -> None:
+    """Holds the matrix and parameters shared by all blocks of a worker process."""
+    _worker_state.update(X=X, norms=norms, k=k, shrinkage=shrinkage)
+
+
+def _similarity_block(block: Tuple[int, int]) -> sparse.csr_matrix:
+    """Computes the similarities of a block of items to all items, pruned to the top k."""
+    first, last = block
+    X, norms = _worker_state['X'], _worker_state['norms']
+    S = (X[:, first:last].T @ X).tocsr()
+    rows = csr_row_ids(S)
+    denominator = norms[first + rows] * norms[S.indices] + _worker_state['shrinkage']
+    with np.errstate(divide='ignore', invalid='ignore'):
+        S.data = np.where(denominator > 0, S.data / denominator, 0).astype(np.float32)
+    S.data[S.indices == first + rows] = 0
+    return prune(S, _worker_state['k'])
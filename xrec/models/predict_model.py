@@ -0,0 +1,649 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+# ======================================================================================================================== #
+# Project  : Explainable Recommendation (XRec)                                                                             #
+# Version  : 0.1.0                                                                                                         #
+# File     : \predict_model.py                                                                                             #
+# Language : Python 3.8                                                                                                    #
+# ------------------------------------------------------------------------------------------------------------------------ #
+# Author   : John James                                                                                                    #
+# Company  : Bryant St. Labs                                                                                               #
+# Email    : john.james.ai.studio@gmail.com                                                                                #
+# URL      : https://github.com/john-james-ai/xrec                                                                         #
+# ------------------------------------------------------------------------------------------------------------------------ #
+# Created  : Monday, October 19th 2026, 9:00:00 am                                                                         #
+# Modified : Monday, October 19th 2026, 9:00:00 am                                                                         #
+# Modifier : John James (john.james.ai.studio@gmail.com)                                                                   #
+# ------------------------------------------------------------------------------------------------------------------------ #
+# License  : BSD 3-clause "New" or "Revised" License                                                                       #
+# Copyright: (c) 2021 Bryant St. Labs                                                                                      #
+# ======================================================================================================================== #
+import os
+import json
+import time
+import hashlib
+import asyncio
+import functools
+import logging
+import argparse
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterator, Tuple
+from urllib.parse import urlsplit, parse_qs
+import numpy as np
+from scipy import sparse
+from xrec.models.artifact import load_artifact
+from xrec.models.cache import ExplanationCache
+from xrec.utils.budget import MemoryPlanner
+# ------------------------------------------------------------------------------------------------------------------------ #
+logger = logging.getLogger(__name__)
+# ------------------------------------------------------------------------------------------------------------------------ #
+
+
+def top_k(scores: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Returns the indices and values of the k largest scores of each row, in descending order.
+
+    The candidates are selected with argpartition in O(n_items) per row, and only the k selected
+    entries are sorted.
+
+    Args:
+        scores: Array of shape (n_rows, n_items).
+        k: Number of entries to select.
+
+    Returns:
+        Tuple of int32 indices and scores, each of shape (n_rows, min(k, n_items)).
+    """
+    k = min(k, scores.shape[1])
+    if k < scores.shape[1]:
+        candidates = np.argpartition(scores, -k, axis=1)[:, -k:]
+    else:
+        candidates = np.broadcast_to(np.arange(k), scores.shape)
+    values = np.take_along_axis(scores, candidates, axis=1)
+    order = np.argsort(-values, axis=1, kind='stable')
+    return (np.take_along_axis(candidates, order, axis=1).astype(np.int32),
+            np.take_along_axis(values, order, axis=1))
+
+
+def mask_seen(scores: np.ndarray, X: sparse.csr_matrix, start: int) -> None:
+    """Sets the scores of the items each user has already seen to minus infinity, in place.
+
+    Args:
+        scores: Scores of shape (n_rows, n_items) for users start, start + 1, ...
+        X: Users by items CSR matrix of seen items.
+        start: User index of the first row of scores.
+    """
+    indptr = X.indptr[start:start + scores.shape[0] + 1]
+    rows = np.repeat(np.arange(scores.shape[0]), np.diff(indptr))
+    scores[rows, X.indices[indptr[0]:indptr[-1]]] = -np.inf
+
+
+class BatchRecommender:
+    """Generates top-K recommendations for blocks of users with one matrix multiply per block.
+
+    The number of users per block is chosen so that the dense score matrices of all concurrently
+    processed blocks, and the temporaries of top-K selection, fit within a memory budget. Blocks
+    are processed by a thread pool since the matrix multiply and the partitioning release the GIL.
+
+    A recommender is usually opened from a saved model with load, which memory maps the factors
+    so startup takes milliseconds and every serving process shares one physical copy.
+
+    The interface includes:
+        load: Opens a recommender over the memory-mapped factors of a saved model.
+        recommend: Returns the top-K items and scores for an array of users.
+        iter_blocks: Generates the top-K items and scores of all users, block by block.
+        recommend_all: Writes the top-K items and scores of all users into arrays.
+
+    Args:
+        user_factors: Array of shape (n_users, factors).
+        item_factors: Array of shape (n_items, factors).
+        item_bias: Optional array of shape (n_items,).
+        memory_budget: Working memory for scoring, in bytes. Defaults to one planned from the
+            configured memory budget by MemoryPlanner, and the block size is then adjusted to
+            the measured RSS as blocks are scored.
+        n_threads: Number of scoring threads. Defaults to the number of CPUs.
+        vocabularies: Optional dictionary of 'users' and 'items' ID vocabularies.
+        version: Optional version of the model the factors belong to.
+        uid: Optional unique identifier of that model version.
+
+    """
+
+    def __init__(self, user_factors: np.ndarray, item_factors: np.ndarray,
+                 item_bias: np.ndarray = None, memory_budget: int = None,
+                 n_threads: int = None, vocabularies: dict = None, version: int = None,
+                 uid: str = None) -> None:
+        self.user_factors = user_factors
+        self.item_factors = item_factors
+        self.item_bias = item_bias
+        self.n_threads = n_threads or os.cpu_count() or 1
+        self._planner = None
+        if memory_budget is None:
+            self._planner = MemoryPlanner.from_config()
+            memory_budget = self._planner.scoring_budget()
+        self.memory_budget = memory_budget
+        self.vocabularies = vocabularies or {}
+        self.version = version
+        self.uid = uid
+
+    @classmethod
+    def load(cls, path: str, memory_budget: int = None,
+             n_threads: int = None) -> "BatchRecommender":
+        """Opens a recommender over the memory-mapped factors of a saved factor model.
+
+        Args:
+            path: Artifact directory, for the latest version, or version directory.
+            memory_budget: Working memory for scoring, in bytes. Defaults to a planned one.
+            n_threads: Number of scoring threads. Defaults to the number of CPUs.
+
+        Returns:
+            The recommender.
+        """
+        start = time.perf_counter()
+        artifact = load_artifact(path)
+        recommender = cls(artifact.arrays['user_factors'], artifact.arrays['item_factors'],
+                          artifact.arrays.get('item_bias'), memory_budget=memory_budget,
+                          n_threads=n_threads, vocabularies=artifact.vocabularies,
+                          version=artifact.version, uid=artifact.uid)
+        logger.info("Opened {} model version {} in {:.1f} ms".format(
+            artifact.kind, artifact.version, 1000 * (time.perf_counter() - start)))
+        return recommender
+
+    def recommend(self, users: np.ndarray, k: int = 100,
+                  X_seen: sparse.csr_matrix = None) -> Tuple[np.ndarray, np.ndarray]:
+        """Returns the top-K items and scores for an array of users.
+
+        Args:
+            users: Array of user indices.
+            k: Number of recommendations per user.
+            X_seen: Optional users by items CSR matrix of items to exclude.
+
+        Returns:
+            Tuple of int32 items and float32 scores, each of shape (len(users), k).
+        """
+        users = np.asarray(users)
+        scores = self._score(users)
+        if X_seen is not None:
+            seen = X_seen[users]
+            mask_seen(scores, seen, 0)
+        return top_k(scores, k)
+
+    def iter_blocks(self, k: int = 100, X_seen: sparse.csr_matrix = None,
+                    start: int = 0, stop: int = None) -> Iterator[Tuple[int, np.ndarray, np.ndarray]]:
+        """Generates the top-K items and scores of a range of users, block by block, in order.
+
+        At most twice as many blocks as there are threads are in flight at any time. With a
+        planned memory budget, the size of the next blocks is adjusted to the RSS measured as
+        each block completes.
+
+        Args:
+            k: Number of recommendations per user.
+            X_seen: Optional users by items CSR matrix of items to exclude.
+            start: First user.
+            stop: One past the last user. Defaults to all users.
+
+        Yields:
+            Tuples of the first user of the block, its items and its scores.
+        """
+        stop = self.n_users if stop is None else stop
+        planned = size = self.block_size(k)
+        pending = deque()
+        with ThreadPoolExecutor(max_workers=self.n_threads) as executor:
+            first = start
+            while first < stop:
+                pending.append((first, executor.submit(
+                    self._recommend_block, first, min(first + size, stop), k, X_seen)))
+                first += size
+                if len(pending) >= 2 * self.n_threads:
+                    done, future = pending.popleft()
+                    yield (done, *future.result())
+                    if self._planner is not None:
+                        size = self._planner.adjust(size, planned, minimum=1)
+            while pending:
+                done, future = pending.popleft()
+                yield (done, *future.result())
+
+    def recommend_all(self, k: int = 100, X_seen: sparse.csr_matrix = None,
+                      items: np.ndarray = None, scores: np.ndarray = None) -> Tuple[np.ndarray, np.ndarray]:
+        """Writes the top-K items and scores of all users into arrays.
+
+        Args:
+            k: Number of recommendations per user.
+            X_seen: Optional users by items CSR matrix of items to exclude.
+            items: Optional int32 array, e.g. a np.memmap, of shape (n_users, k).
+            scores: Optional float32 array, e.g. a np.memmap, of shape (n_users, k).
+
+        Returns:
+            Tuple of the items and scores arrays.
+        """
+        k = min(k, self.n_items)
+        if items is None:
+            items = np.empty((self.n_users, k), dtype=np.int32)
+        if scores is None:
+            scores = np.empty((self.n_users, k), dtype=np.float32)
+        started = time.perf_counter()
+        for first, block_items, block_scores in self.iter_blocks(k, X_seen):
+            items[first:first + len(block_items)] = block_items
+            scores[first:first + len(block_scores)] = block_scores
+        seconds = time.perf_counter() - started
+        logger.info("Recommended {} items to {} users in {:.2f} seconds ({:,.0f} users/s)".format(
+            k, self.n_users, seconds, self.n_users / max(seconds, 1e-9)))
+        return items, scores
+
+    def block_size(self, k: int) -> int:
+        """Returns the number of users per block that keeps all threads within the memory budget.
+
+        Each user of a block needs a float32 score row plus an int64 row of partition indices.
+        """
+        per_user = self.n_items * (4 + 8) + k * 16
+        return max(1, int(self.memory_budget // (self.n_threads * per_user)))
+
+    def _score(self, users) -> np.ndarray:
+        scores = np.asarray(self.user_factors[users], dtype=np.float32) @ \
+            np.asarray(self.item_factors, dtype=np.float32).T
+        if self.item_bias is not None:
+            scores += self.item_bias
+        return scores
+
+    def _recommend_block(self, start: int, stop: int, k: int,
+                         X_seen: sparse.csr_matrix) -> Tuple[np.ndarray, np.ndarray]:
+        scores = self._score(slice(start, stop))
+        if X_seen is not None:
+            mask_seen(scores, X_seen, start)
+        return top_k(scores, k)
+
+    @property
+    def n_users(self) -> int:
+        return self.user_factors.shape[0]
+
+    @property
+    def n_items(self) -> int:
+        return self.item_factors.shape[0]
+
+
+class Overloaded(Exception):
+    """Raised when a request is rejected because too many requests are pending."""
+
+
+class LatencyTracker:
+    """Keeps the most recent latencies and reports their percentiles.
+
+    Args:
+        window: Number of recent observations kept.
+
+    """
+
+    def __init__(self, window: int = 10000) -> None:
+        self._latencies = deque(maxlen=window)
+        self.count = 0
+
+    def observe(self, seconds: float) -> None:
+        self._latencies.append(seconds)
+        self.count += 1
+
+    def percentiles(self) -> dict:
+        """Returns the p50, p95 and p99 latencies in milliseconds."""
+        if not self._latencies:
+            return {'p50': None, 'p95': None, 'p99': None}
+        p50, p95, p99 = 1000 * np.percentile(np.fromiter(self._latencies, dtype=np.float64),
+                                             [50, 95, 99])
+        return {'p50': p50, 'p95': p95, 'p99': p99}
+
+
+class MicroBatcher:
+    """Coalesces concurrent top-K requests into one scoring batch.
+
+    The first request to arrive opens a window of window_ms milliseconds. Every request arriving
+    within the window, up to max_batch requests, is scored with the same matrix multiply, which
+    runs in a worker thread so the event loop keeps accepting requests. Requests beyond
+    max_pending waiting requests are rejected with Overloaded rather than queued without bound.
+
+    Args:
+        recommender: BatchRecommender used for scoring.
+        X_seen: Optional users by items CSR matrix of items to exclude.
+        window_ms: Length of the batching window in milliseconds.
+        max_batch: Maximum number of requests per batch.
+        max_pending: Maximum number of requests waiting to be batched.
+
+    """
+
+    def __init__(self, recommender: BatchRecommender, X_seen: sparse.csr_matrix = None,
+                 window_ms: float = 2.0, max_batch: int = 256, max_pending: int = 4096) -> None:
+        self.recommender = recommender
+        self.X_seen = X_seen
+        self.window = window_ms / 1000
+        self.max_batch = max_batch
+        self.max_pending = max_pending
+        self.batches = 0
+        self.batched = 0
+        self._queue = None
+        self._executor = ThreadPoolExecutor(max_workers=1)
+
+    async def recommend(self, user: int, k: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Returns the top-K items and scores for a user once its batch has been scored."""
+        if self._queue is None:
+            self._queue = asyncio.Queue(maxsize=self.max_pending)
+        future = asyncio.get_running_loop().create_future()
+        try:
+            self._queue.put_nowait((user, k, future))
+        except asyncio.QueueFull:
+            raise Overloaded()
+        return await future
+
+    async def run(self) -> None:
+        """Forms and scores batches until cancelled."""
+        if self._queue is None:
+            self._queue = asyncio.Queue(maxsize=self.max_pending)
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + self.window
+            while len(batch) < self.max_batch:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+            users = np.array([user for user, _, _ in batch])
+            k = max(k for _, k, _ in batch)
+            try:
+                items, scores = await loop.run_in_executor(
+                    self._executor, self.recommender.recommend, users, k, self.X_seen)
+            except Exception as e:
+                for _, _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+            for row, (_, k, future) in enumerate(batch):
+                if not future.done():
+                    future.set_result((items[row, :k], scores[row, :k]))
+            self.batches += 1
+            self.batched += len(batch)
+
+    @property
+    def pending(self) -> int:
+        return self._queue.qsize() if self._queue is not None else 0
+
+
+class RecommendationService:
+    """Minimal asyncio HTTP/1.1 service answering top-K and explanation requests.
+
+    Endpoints:
+        GET /recommend?user=<id>&k=<k>: Top-K items and scores for a user.
+        GET /explain?user=<id>&item=<id>: Seen items that justify an item for a user.
+        GET /metrics: Latency percentiles, request counts, rejections and mean batch size.
+        GET /health: Liveness check.
+
+    User and item IDs are external IDs when the recommender has vocabularies, and dense indices
+    otherwise. Requests rejected by backpressure are answered with 503 and Retry-After, and
+    requests whose head exceeds the stream limit with 431. Explanations are generated, and the
+    cache consulted, in a thread pool, so they never stall the event loop.
+
+    Args:
+        recommender: BatchRecommender used for scoring.
+        X_seen: Optional users by items CSR matrix of seen items, used to exclude them from
+            recommendations and to justify explanations.
+        explainer: Optional object with an explain(seen, item) method, e.g. an ItemKNN model.
+        cache: Optional ExplanationCache consulted before explanations are generated, holding
+            entries of the current version of the model, explainer and seen items.
+        table: Optional RecommendationTable of the same model version, answering requests of
+            known users for at most its k items without scoring.
+        window_ms: Length of the batching window in milliseconds.
+        max_batch: Maximum number of requests per batch.
+        max_pending: Maximum number of requests waiting to be batched.
+        explain_workers: Number of threads generating explanations.
+
+    """
+
+    def __init__(self, recommender: BatchRecommender, X_seen: sparse.csr_matrix = None,
+                 explainer=None, cache: ExplanationCache = None, table=None,
+                 window_ms: float = 2.0, max_batch: int = 256, max_pending: int = 4096,
+                 explain_workers: int = 4) -> None:
+        self.recommender = recommender
+        self.X_seen = X_seen
+        self.explainer = explainer
+        self.cache = cache
+        if table is not None and (table.params.get('model_version') != recommender.version or
+                                  table.params.get('model_uid') != recommender.uid):
+            logger.warning("Ignoring recommendation table of model version {} ({})".format(
+                table.params.get('model_version'), table.params.get('model_uid')))
+            table = None
+        self.table = table
+        self.table_hits = 0
+        if cache is not None:
+            cache.set_version(self.version)
+        self.batcher = MicroBatcher(recommender, X_seen, window_ms=window_ms,
+                                    max_batch=max_batch, max_pending=max_pending)
+        self.latency = LatencyTracker()
+        self.rejected = 0
+        self.errors = 0
+        self._server = None
+        self._batcher_task = None
+        self._connections = {}
+        self._explain_executor = ThreadPoolExecutor(max_workers=explain_workers)
+
+    async def start(self, host: str = '127.0.0.1', port: int = 8080) -> None:
+        """Starts listening and batching."""
+        self._batcher_task = asyncio.ensure_future(self.batcher.run())
+        self._server = await asyncio.start_server(self._handle, host, port)
+        logger.info("Serving recommendations on {}".format(
+            ', '.join(str(s.getsockname()) for s in self._server.sockets)))
+
+    async def stop(self) -> None:
+        """Stops listening, closes open connections and stops batching."""
+        self._server.close()
+        for writer in self._connections.values():
+            writer.close()
+        await asyncio.gather(*self._connections, return_exceptions=True)
+        await self._server.wait_closed()
+        self._batcher_task.cancel()
+
+    @property
+    def version(self) -> tuple:
+        """Versions of the factor model, the explainer and the seen items the explanations
+        depend on. Saved models are identified by their version and its unique identifier, and
+        an explainer fitted in memory and the seen items by digests."""
+        recommender = (self.recommender.version, self.recommender.uid)
+        explainer = None
+        if getattr(self.explainer, 'version', None) is not None:
+            explainer = (self.explainer.version, self.explainer.uid)
+        elif getattr(self.explainer, 'neighbours', None) is not None:
+            explainer = _digest(self.explainer.neighbours)
+        seen = _digest(self.X_seen) if self.X_seen is not None else None
+        return (recommender, explainer, seen)
+
+    @property
+    def port(self) -> int:
+        return self._server.sockets[0].getsockname()[1]
+
+    def metrics(self) -> dict:
+        metrics = {'requests': self.latency.count, 'rejected': self.rejected,
+                   'errors': self.errors, 'pending': self.batcher.pending,
+                   'batches': self.batcher.batches,
+                   'mean_batch_size': self.batcher.batched / max(self.batcher.batches, 1),
+                   'latency_ms': self.latency.percentiles(), 'version': self.recommender.version,
+                   'table_hits': self.table_hits}
+        if self.cache is not None:
+            metrics['explanation_cache'] = self.cache.stats()
+        return metrics
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Serves the requests of one keep-alive connection."""
+        task = asyncio.current_task()
+        self._connections[task] = writer
+        try:
+            while True:
+                try:
+                    head = await reader.readuntil(b'\r\n\r\n')
+                except (asyncio.IncompleteReadError, ConnectionError):
+                    break
+                except asyncio.LimitOverrunError:
+                    self._respond(writer, 431, {'error': 'request header too large'}, False)
+                    await writer.drain()
+                    break
+                lines = head.decode('latin-1').split('\r\n')
+                request = lines[0].split(' ')
+                keep_alive = not any(line.lower() == 'connection: close' for line in lines[1:])
+                if len(request) < 2:
+                    status, body, keep_alive = 400, {'error': 'bad request'}, False
+                else:
+                    status, body = await self._route(request[0], request[1])
+                    keep_alive = keep_alive and request[0] == 'GET'
+                self._respond(writer, status, body, keep_alive)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except ConnectionError:
+            pass
+        finally:
+            self._connections.pop(task, None)
+            writer.close()
+
+    async def _route(self, method: str, target: str) -> Tuple[int, dict]:
+        url = urlsplit(target)
+        query = {key: values[0] for key, values in parse_qs(url.query).items()}
+        if method != 'GET':
+            return 405, {'error': 'method not allowed'}
+        if url.path == '/health':
+            return 200, {'status': 'ok'}
+        if url.path == '/metrics':
+            return 200, self.metrics()
+        if url.path not in ('/recommend', '/explain'):
+            return 404, {'error': 'not found'}
+
+        start = time.perf_counter()
+        try:
+            user = self._index('users', query['user'])
+            if url.path == '/recommend':
+                status, body = await self._recommend(user, query)
+            else:
+                status, body = await self._explain(user, query)
+        except Overloaded:
+            self.rejected += 1
+            return 503, {'error': 'overloaded'}
+        except (KeyError, ValueError) as e:
+            return 400, {'error': 'bad request: {}'.format(e)}
+        except Exception as e:
+            self.errors += 1
+            logger.error(e)
+            return 500, {'error': 'internal error'}
+        self.latency.observe(time.perf_counter() - start)
+        return status, body
+
+    async def _recommend(self, user: int, query: dict) -> Tuple[int, dict]:
+        k = query.get('k', '10')
+        if not k.isdigit() or int(k) < 1:
+            raise ValueError("k must be an integer of at least 1, found {}".format(k))
+        k = int(k)
+        if self.table is not None and user < self.table.n_users and k <= self.table.k:
+            items, scores, _ = self.table.lookup([user], k)
+            items, scores = items[0], scores[0]
+            self.table_hits += 1
+        else:
+            items, scores = await self.batcher.recommend(user, k)
+        keep = np.isfinite(scores)
+        return 200, {'user': query['user'], 'items': self._ids('items', items[keep]),
+                     'scores': scores[keep].tolist(), 'version': self.recommender.version}
+
+    async def _explain(self, user: int, query: dict) -> Tuple[int, dict]:
+        if self.explainer is None or self.X_seen is None:
+            return 404, {'error': 'explanations are not available'}
+        item = self._index('items', query['item'])
+
+        def explain():
+            seen = self.X_seen.indices[self.X_seen.indptr[user]:self.X_seen.indptr[user + 1]]
+            return [{'item': self._ids('items', [j])[0], 'similarity': s}
+                    for j, s in self.explainer.explain(seen, item)]
+
+        if self.cache is not None:
+            explain = functools.partial(self.cache.get_or_compute, user, item, explain)
+        because = await asyncio.get_running_loop().run_in_executor(self._explain_executor, explain)
+        return 200, {'user': query['user'], 'item': query['item'], 'because': because}
+
+    def _index(self, name: str, value: str) -> int:
+        """Converts an external ID, or a dense index without vocabularies, to a dense index."""
+        vocabulary = self.recommender.vocabularies.get(name)
+        index = int(vocabulary.lookup([value])[0]) if vocabulary is not None else int(value)
+        limit = self.recommender.n_users if name == 'users' else self.recommender.n_items
+        if not 0 <= index < limit:
+            raise ValueError("unknown {} {}".format(name[:-1], value))
+        return index
+
+    def _ids(self, name: str, indices) -> list:
+        vocabulary = self.recommender.vocabularies.get(name)
+        if vocabulary is None:
+            return [int(i) for i in indices]
+        return [str(i) for i in vocabulary[np.asarray(indices, dtype=np.int64)]]
+
+    @staticmethod
+    def _respond(writer: asyncio.StreamWriter, status: int, body: dict, keep_alive: bool) -> None:
+        reasons = {200: 'OK', 400: 'Bad Request', 404: 'Not Found', 405: 'Method Not Allowed',
+                   431: 'Request Header Fields Too Large', 500: 'Internal Server Error',
+                   503: 'Service Unavailable'}
+        payload = json.dumps(body).encode('utf-8')
+        headers = ['HTTP/1.1 {} {}'.format(status, reasons[status]),
+                   'Content-Type: application/json',
+                   'Content-Length: {}'.format(len(payload)),
+                   'Connection: {}'.format('keep-alive' if keep_alive else 'close')]
+        if status == 503:
+            headers.append('Retry-After: 1')
+        writer.write(('\r\n'.join(headers) + '\r\n\r\n').encode('latin-1') + payload)
+
+
+def _digest(X: sparse.csr_matrix) -> str:
+    """Returns a short digest of the structure and values of a CSR matrix."""
+    digest = hashlib.sha1(repr(X.shape).encode())
+    for array in (X.indptr, X.indices, X.data):
+        digest.update(np.ascontiguousarray(array).data)
+    return digest.hexdigest()[:16]
+
+
+async def serve(service: RecommendationService, host: str = '127.0.0.1', port: int = 8080) -> None:
+    """Runs a recommendation service until cancelled."""
+    await service.start(host, port)
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await service.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve top-K recommendations over HTTP")
+    parser.add_argument('model', help="Artifact directory of a saved factor model.")
+    parser.add_argument('--seen', help="Optional .npz CSR matrix of seen items.")
+    parser.add_argument('--knn', help="Optional artifact directory of an ItemKNN model.")
+    parser.add_argument('--table', help="Optional artifact directory of a recommendation table.")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8080)
+    parser.add_argument('--window-ms', type=float, default=2.0)
+    parser.add_argument('--max-batch', type=int, default=256)
+    parser.add_argument('--max-pending', type=int, default=4096)
+    parser.add_argument('--cache-entries', type=int, default=100000)
+    parser.add_argument('--cache-ttl', type=float, help="Explanation time to live in seconds.")
+    parser.add_argument('--cache-path', help="Optional SQLite file shared by worker processes.")
+    args = parser.parse_args()
+
+    X_seen = sparse.load_npz(args.seen).tocsr() if args.seen else None
+    explainer = None
+    if args.knn:
+        from xrec.models.knn import ItemKNN
+        explainer = ItemKNN.load(args.knn)
+    cache = ExplanationCache(max_entries=args.cache_entries, ttl=args.cache_ttl,
+                             path=args.cache_path)
+    table = None
+    if args.table:
+        from xrec.models.table import RecommendationTable
+        table = RecommendationTable.load(args.table)
+    service = RecommendationService(BatchRecommender.load(args.model), X_seen, explainer, cache,
+                                    table, window_ms=args.window_ms, max_batch=args.max_batch,
+                                    max_pending=args.max_pending)
+    try:
+        asyncio.run(serve(service, args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    log_fmt = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    logging.basicConfig(level=logging.INFO, format=log_fmt)
+    main()
@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+# ======================================================================================================================== #
+# Project  : Explainable Recommendation (XRec)                                                                             #
+# Version  : 0.1.0                                                                                                         #
+# File     : \sampling.py                                                                                                  #
+# Language : Python 3.8                                                                                                    #
+# ------------------------------------------------------------------------------------------------------------------------ #
+# Author   : John James                                                                                                    #
+# Company  : Bryant St. Labs                                                                                               #
+# Email    : john.james.ai.studio@gmail.com                                                                                #
+# URL      : https://github.com/john-james-ai/xrec                                                                         #
+# ------------------------------------------------------------------------------------------------------------------------ #
+# Created  : Monday, October 19th 2026, 9:00:00 am                                                                         #
+# Modified : Monday, October 19th 2026, 9:00:00 am                                                                         #
+# Modifier : John James (john.james.ai.studio@gmail.com)                                                                   #
+# ------------------------------------------------------------------------------------------------------------------------ #
+# License  : BSD 3-clause "New" or "Revised" License                                                                       #
+# Copyright: (c) 2021 Bryant St. Labs                                                                                      #
+# ======================================================================================================================== #
+import os
+import logging
+import multiprocessing as mp
+from typing import Iterator, Tuple
+import numpy as np
+from scipy import sparse
+from xrec.utils.sparse import csr_contains, csr_row_ids
+# ------------------------------------------------------------------------------------------------------------------------ #
+logger = logging.getLogger(__name__)
+# ------------------------------------------------------------------------------------------------------------------------ #
+
+
+class NegativeSampler:
+    """Draws (user, positive item, negative item) triples from an implicit feedback matrix.
+
+    Positive pairs are drawn uniformly, with replacement, from the stored elements of the CSR
+    interaction matrix. Negative items are drawn in vectorized batches, either uniformly over the
+    catalog or in proportion to item popularity raised to the power alpha. Candidates that turn
+    out to be known positives are detected with a binary search over the sorted row of the user
+    and redrawn.
+
+    Every batch is drawn from its own generator seeded with (seed, epoch, batch), so an epoch is
+    reproducible regardless of whether it is produced in-process or by any number of prefetch
+    workers.
+
+    The interface includes:
+        sample_negatives: Draws one negative item for each user in an array of users.
+        sample_batch: Returns the users, positive items and negative items for one batch.
+        epoch: Generates the batches of an epoch in the calling process.
+        prefetch: Generates the batches of an epoch from background worker processes.
+
+    Args:
+        X: Users by items CSR interaction matrix.
+        distribution: Either 'uniform' or 'popularity'.
+        alpha: Exponent applied to item counts for the popularity distribution.
+        batch_size: Number of triples per batch.
+        seed: Base seed for the per-epoch, per-batch random generators.
+        max_tries: Maximum number of redraws for candidates that hit a known positive.
+
+    """
+
+    def __init__(self, X: sparse.csr_matrix, distribution: str = 'uniform', alpha: float = 0.75,
+                 batch_size: int = 65536, seed: int = 0, max_tries: int = 20) -> None:
+        if distribution not in ('uniform', 'popularity'):
+            raise ValueError(
+                "Unrecognized distribution: {}".format(distribution))
+        self._X = sparse.csr_matrix(X)
+        self._X.sort_indices()
+        self._users = csr_row_ids(self._X)
+        self.distribution = distribution
+        self.alpha = alpha
+        self.batch_size = batch_size
+        self.seed = seed
+        self.max_tries = max_tries
+        self._cdf = None
+        if distribution == 'popularity':
+            weights = np.bincount(self._X.indices, minlength=self.n_items).astype(
+                np.float64) ** alpha
+            self._cdf = np.cumsum(weights)
+            self._cdf /= self._cdf[-1]
+
+    def sample_negatives(self, users: np.ndarray, rng: np.random.Generator) -> np.ndarray:
+        """Draws one negative item for each user.
+
+        Candidates that remain positives after max_tries redraws, which only happens for users
+        who have interacted with almost the entire catalog, are returned as drawn.
+
+        Args:
+            users: Array of user indices.
+            rng: Random generator.
+
+        Returns:
+            int32 array of item indices aligned with users.
+        """
+        negatives = self._draw(len(users), rng)
+        redraw = np.flatnonzero(csr_contains(self._X, users, negatives))
+        tries = 0
+        while redraw.size and tries < self.max_tries:
+            negatives[redraw] = self._draw(redraw.size, rng)
+            hit = csr_contains(self._X, users[redraw], negatives[redraw])
+            redraw = redraw[hit]
+            tries += 1
+        return negatives
+
+    def sample_batch(self, epoch: int, batch: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Returns the triples for one batch of an epoch.
+
+        Args:
+            epoch: Epoch number.
+            batch: Batch number within the epoch.
+
+        Returns:
+            Tuple of int32 arrays containing users, positive items and negative items.
+        """
+        rng = self.rng(epoch, batch)
+        size = min(self.batch_size, self.n_samples - batch * self.batch_size)
+        pairs = rng.integers(0, self._X.nnz, size=size)
+        users = self._users[pairs]
+        positives = self._X.indices[pairs].astype(np.int32)
+        return users, positives, self.sample_negatives(users, rng)
+
+    def epoch(self, epoch: int, start: int = 0) -> Iterator[Tuple[np.ndarray, np.ndarray, np.ndarray]]:
+        """Generates the batches of an epoch in the calling process.
+
+        Args:
+            epoch: Epoch number.
+            start: Batch number from which to start.
+        """
+        for batch in range(start, self.n_batches):
+            yield self.sample_batch(epoch, batch)
+
+    def prefetch(self, epoch: int, start: int = 0, n_workers: int = None,
+                 queue_size: int = 16) -> Iterator[Tuple[np.ndarray, np.ndarray, np.ndarray]]:
+        """Generates the batches of an epoch from background worker processes.
+
+        Worker w produces batches w, w + n_workers, ... into its own bounded queue, and batches
+        are consumed round-robin, so they are yielded in the same order and with the same
+        content as epoch(). Workers block once their queue is full, which bounds the memory held
+        by prefetched batches to roughly queue_size batches.
+
+        Args:
+            epoch: Epoch number.
+            start: Batch number from which to start.
+            n_workers: Number of worker processes. Defaults to the number of CPUs less one.
+            queue_size: Maximum number of prefetched batches across all workers.
+        """
+        n_workers = n_workers or max(1, (os.cpu_count() or 2) - 1)
+        n_workers = max(1, min(n_workers, self.n_batches - start))
+        maxsize = max(1, queue_size // n_workers)
+        queues = [mp.Queue(maxsize=maxsize) for _ in range(n_workers)]
+        workers = [mp.Process(target=_prefetch_worker,
+                              args=(self, epoch, start + w, n_workers, queues[w]),
+                              daemon=True)
+                   for w in range(n_workers)]
+        for worker in workers:
+            worker.start()
+        try:
+            for batch in range(start, self.n_batches):
+                yield queues[(batch - start) % n_workers].get()
+        finally:
+            for worker in workers:
+                if worker.is_alive():
+                    worker.terminate()
+                worker.join()
+            for queue in queues:
+                queue.close()
+
+    def rng(self, epoch: int, batch: int) -> np.random.Generator:
+        """Returns the random generator for a batch of an epoch."""
+        return np.random.default_rng([self.seed, epoch, batch])
+
+    def _draw(self, size: int, rng: np.random.Generator) -> np.ndarray:
+        """Draws candidate negative items from the sampling distribution."""
+        if self._cdf is None:
+            return rng.integers(0, self.n_items, size=size, dtype=np.int32)
+        return np.searchsorted(self._cdf, rng.random(size), side='right').astype(np.int32)
+
+    @property
+    def n_users(self) -> int:
+        return self._X.shape[0]
+
+    @property
+    def n_items(self) -> int:
+        return self._X.shape[1]
+
+    @property
+    def n_samples(self) -> int:
+        """Number of triples drawn per epoch, equal to the number of interactions."""
+        return self._X.nnz
+
+    @property
+    def n_batches(self) -> int:
+        return -(-self.n_samples // self.batch_size)
+
+
+def _prefetch_worker(sampler: NegativeSampler, epoch: int, first: int, step: int,
+                     queue: mp.Queue) -> None:
+    """Produces every step-th batch of an epoch, starting with first, into a bounded queue."""
+    for batch in range(first, sampler.n_batches, step):
+        queue.put(sampler.sample_batch(epoch, batch))
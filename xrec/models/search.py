@@ -0,0 +1,235 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+# ======================================================================================================================== #
+# Project  : Explainable Recommendation (XRec)                                                                             #
+# Version  : 0.1.0                                                                                                         #
+# File     : \search.py                                                                                                    #
+# Language : Python 3.8                                                                                                    #
+# ------------------------------------------------------------------------------------------------------------------------ #
+# Author   : John James                                                                                                    #
+# Company  : Bryant St. Labs                                                                                               #
+# Email    : john.james.ai.studio@gmail.com                                                                                #
+# URL      : https://github.com/john-james-ai/xrec                                                                         #
+# ------------------------------------------------------------------------------------------------------------------------ #
+# Created  : Monday, October 19th 2026, 9:00:00 am                                                                         #
+# Modified : Monday, October 19th 2026, 9:00:00 am                                                                         #
+# Modifier : John James (john.james.ai.studio@gmail.com)                                                                   #
+# ------------------------------------------------------------------------------------------------------------------------ #
+# License  : BSD 3-clause "New" or "Revised" License                                                                       #
+# Copyright: (c) 2021 Bryant St. Labs                                                                                      #
+# ======================================================================================================================== #
+import os
+import time
+import logging
+import tempfile
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+import numpy as np
+from scipy import sparse
+from xrec.models.artifact import save_matrix, load_matrix
+from xrec.models.evaluate import evaluate_recommender
+from xrec.models.predict_model import BatchRecommender
+from xrec.models.train_model import ALS, BPR
+from xrec.utils.budget import limit_threads
+# ------------------------------------------------------------------------------------------------------------------------ #
+logger = logging.getLogger(__name__)
+# ------------------------------------------------------------------------------------------------------------------------ #
+MODELS = {'als': (ALS, 'iterations'), 'bpr': (BPR, 'epochs')}
+# ------------------------------------------------------------------------------------------------------------------------ #
+
+
+class HyperparameterSearch:
+    """Successive-halving hyperparameter search with warm starts over a shared training matrix.
+
+    The training matrix (and, for ALS, its transpose) and the validation matrix are written once
+    in the artifact layout and memory mapped by every trial, so concurrent trials share one
+    physical copy. Trials run in worker processes, as many as the CPU budget allows given the
+    threads of each trial.
+
+    Configurations are drawn from the search space and trained for min_budget iterations (ALS)
+    or epochs (BPR). Each configuration starting after another with the same factor dimension
+    has finished is initialized from the factors of the nearest such configuration. When a rung
+    is complete, the best 1/eta of its trials are promoted and continue from their own factors
+    to eta times the budget, until max_budget is reached (Jamieson and Talwalkar, 2016).
+
+    The interface includes:
+        run: Runs the search and returns the results of every trial, best first.
+
+    Attributes:
+        results: List of result dictionaries, one per trial and rung.
+        best: The result with the highest score at the largest budget reached.
+
+    Args:
+        model: Either 'als' or 'bpr'.
+        space: Dictionary mapping hyperparameter names to lists of candidate values.
+        n_trials: Number of configurations in the first rung.
+        min_budget: Iterations or epochs in the first rung.
+        max_budget: Maximum iterations or epochs.
+        eta: Reduction factor between rungs.
+        metric: Validation metric from evaluate_recommender to maximize.
+        cpu_budget: Number of CPUs used by all trials together. Defaults to the number of CPUs.
+        threads_per_trial: Number of threads of each trial.
+        directory: Directory for the shared matrices and trial artifacts. Defaults to a new
+            temporary directory.
+        seed: Seed for drawing configurations.
+
+    """
+
+    def __init__(self, model: str = 'als', space: dict = None, n_trials: int = 27,
+                 min_budget: int = 1, max_budget: int = 27, eta: int = 3,
+                 metric: str = 'ndcg@10', cpu_budget: int = None, threads_per_trial: int = 1,
+                 directory: str = None, seed: int = 0) -> None:
+        if model not in MODELS:
+            raise ValueError("Unrecognized model: {}".format(model))
+        self.model = model
+        self.space = space or {'factors': [32, 64, 128], 'regularization': [0.001, 0.01, 0.1]}
+        self.n_trials = n_trials
+        self.min_budget = min_budget
+        self.max_budget = max_budget
+        self.eta = eta
+        self.metric = metric
+        self.cpu_budget = cpu_budget or os.cpu_count() or 1
+        self.threads_per_trial = threads_per_trial
+        self.directory = directory or tempfile.mkdtemp(prefix='xrec-search-')
+        self.seed = seed
+        self.results = []
+
+    def run(self, X_train: sparse.csr_matrix, X_valid: sparse.csr_matrix) -> list:
+        """Runs the search.
+
+        Args:
+            X_train: Users by items CSR matrix of training interactions.
+            X_valid: Users by items CSR matrix of validation interactions.
+
+        Returns:
+            List of result dictionaries, best first.
+        """
+        start = time.perf_counter()
+        # Saved as float32, the dtype the models train in, so that trials use the memory maps
+        # as they are instead of each converting a private copy.
+        X_train = sparse.csr_matrix(X_train, dtype=np.float32)
+        X_valid = sparse.csr_matrix(X_valid, dtype=np.float32)
+        matrices = {'train': save_matrix(os.path.join(self.directory, 'train'), X_train),
+                    'valid': save_matrix(os.path.join(self.directory, 'valid'), X_valid)}
+        if self.model == 'als':
+            matrices['train_t'] = save_matrix(os.path.join(self.directory, 'train_t'), X_train.T)
+
+        trials = [{'id': i, 'params': params, 'budget': self.min_budget, 'iterations': self.min_budget,
+                   'init': None} for i, params in enumerate(self._configurations())]
+        n_workers = max(1, self.cpu_budget // self.threads_per_trial)
+        with ProcessPoolExecutor(max_workers=n_workers, initializer=limit_threads,
+                                 initargs=(self.threads_per_trial,)) as executor:
+            while trials:
+                rung = self._run_rung(executor, trials, matrices, n_workers)
+                budget = trials[0]['budget']
+                if budget >= self.max_budget or len(rung) <= 1:
+                    break
+                survivors = sorted(rung, key=lambda r: r['score'], reverse=True)
+                survivors = survivors[:max(1, len(rung) // self.eta)]
+                next_budget = min(budget * self.eta, self.max_budget)
+                trials = [{'id': r['id'], 'params': r['params'], 'budget': next_budget,
+                           'iterations': next_budget - budget, 'init': r['path']}
+                          for r in survivors]
+
+        top = max(r['budget'] for r in self.results)
+        self.results.sort(key=lambda r: (r['budget'] == top, r['score']), reverse=True)
+        logger.info("Search completed {} trial runs in {:.2f} seconds. Best {}={:.4f} with {}".format(
+            len(self.results), time.perf_counter() - start, self.metric, self.best['score'],
+            self.best['params']))
+        return self.results
+
+    @property
+    def best(self) -> dict:
+        return self.results[0] if self.results else None
+
+    def _configurations(self) -> list:
+        """Draws n_trials distinct configurations from the search space, or all of them if fewer."""
+        names = sorted(self.space)
+        grid = np.array(np.meshgrid(*[np.arange(len(self.space[n])) for n in names],
+                                    indexing='ij')).reshape(len(names), -1).T
+        rng = np.random.default_rng(self.seed)
+        chosen = grid[rng.permutation(len(grid))[:self.n_trials]]
+        return [{name: _native(self.space[name][i]) for name, i in zip(names, row)}
+                for row in chosen]
+
+    def _run_rung(self, executor: ProcessPoolExecutor, trials: list, matrices: dict,
+                  n_workers: int) -> list:
+        """Runs the trials of a rung, warm starting each new configuration when possible."""
+        queue, running, rung = list(trials), {}, []
+        while queue or running:
+            while queue and len(running) < n_workers:
+                trial = queue.pop(0)
+                if trial['init'] is None:
+                    trial['init'] = self._neighbour(trial['params'])
+                task = dict(trial, model=self.model, metric=self.metric, matrices=matrices,
+                            threads=self.threads_per_trial,
+                            output=os.path.join(self.directory, 'trials', str(trial['id'])))
+                running[executor.submit(_run_trial, task)] = trial
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                running.pop(future)
+                result = future.result()
+                logger.info("Trial {} {} at budget {}: {}={:.4f} in {:.2f} seconds".format(
+                    result['id'], result['params'], result['budget'], self.metric,
+                    result['score'], result['seconds']))
+                rung.append(result)
+                self.results.append(result)
+        return rung
+
+    def _neighbour(self, params: dict) -> str:
+        """Returns the artifact of the nearest finished configuration with the same factors."""
+        candidates = [r for r in self.results
+                      if r['params'].get('factors') == params.get('factors')]
+        if not candidates:
+            return None
+        return min(candidates, key=lambda r: self._distance(r['params'], params))['path']
+
+    def _distance(self, a: dict, b: dict) -> float:
+        """Distance between configurations, on a log scale for positive numeric values."""
+        distance = 0.0
+        for name, values in self.space.items():
+            if all(isinstance(v, (int, float)) and not isinstance(v, bool) for v in values):
+                scale = np.log if min(values) > 0 else (lambda v: v)
+                span = (scale(max(values)) - scale(min(values))) or 1.0
+                distance += ((scale(a[name]) - scale(b[name])) / span) ** 2
+            else:
+                distance += float(a[name] != b[name])
+        return distance
+
+
+def _native(value):
+    """Converts numpy scalars to Python scalars so that parameters serialize to JSON."""
+    return value.item() if isinstance(value, np.generic) else value
+
+
+def _run_trial(task: dict) -> dict:
+    """Trains, evaluates and saves one trial on the shared memory-mapped matrices."""
+    start = time.perf_counter()
+    cls, budget_name = MODELS[task['model']]
+    X_train = load_matrix(task['matrices']['train'])
+    X_valid = load_matrix(task['matrices']['valid'])
+    params = dict(task['params'], **{budget_name: task['iterations']})
+    if task['model'] == 'als':
+        params['n_threads'] = task['threads']
+    else:
+        # BPR runs the epochs following those of its warm start, so no batch is drawn twice.
+        params['n_workers'] = 1
+        params['epochs'] = task['budget']
+    model = cls(**params)
+    init = {}
+    if task['init'] is not None:
+        previous = cls.load(task['init'])
+        init = {name: getattr(previous, name) for name in cls.arrays}
+        if task['model'] == 'bpr':
+            init['start_epoch'] = task['budget'] - task['iterations']
+    if task['model'] == 'als':
+        model.fit(X_train, Xt=load_matrix(task['matrices']['train_t']), **init)
+    else:
+        model.fit(X_train, **init)
+    recommender = BatchRecommender(model.user_factors, model.item_factors,
+                                   getattr(model, 'item_bias', None), n_threads=task['threads'])
+    k = int(task['metric'].split('@')[1]) if '@' in task['metric'] else 100
+    metrics = evaluate_recommender(recommender, X_valid, X_train, k_values=(k,))
+    path = model.save(task['output'])
+    return {'id': task['id'], 'params': task['params'], 'budget': task['budget'],
+            'score': metrics[task['metric']], 'metrics': metrics, 'path': path,
+            'warm_start': task['init'], 'seconds': time.perf_counter() - start}
@@ -0,0 +1,338 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+# ======================================================================================================================== #
+# Project  : Explainable Recommendation (XRec)                                                                             #
+# Version  : 0.1.0                                                                                                         #
+# File     : \table.py                                                                                                     #
+# Language : Python 3.8                                                                                                    #
+# ------------------------------------------------------------------------------------------------------------------------ #
+# Author   : John James                                                                                                    #
+# Company  : Bryant St. Labs                                                                                               #
+# Email    : john.james.ai.studio@gmail.com                                                                                #
+# URL      : https://github.com/john-james-ai/xrec                                                                         #
+# ------------------------------------------------------------------------------------------------------------------------ #
+# Created  : Monday, October 19th 2026, 9:00:00 am                                                                         #
+# Modified : Monday, October 19th 2026, 9:00:00 am                                                                         #
+# Modifier : John James (john.james.ai.studio@gmail.com)                                                                   #
+# ------------------------------------------------------------------------------------------------------------------------ #
+# License  : BSD 3-clause "New" or "Revised" License                                                                       #
+# Copyright: (c) 2021 Bryant St. Labs                                                                                      #
+# ======================================================================================================================== #
+import os
+import time
+import shutil
+import logging
+import argparse
+from typing import Tuple
+import numpy as np
+from scipy import sparse
+from xrec.models.artifact import stage, save_artifact, load_artifact, load_matrix, resolve
+from xrec.utils.budget import parse_size
+from xrec.utils.instrument import instrumented, count
+# ------------------------------------------------------------------------------------------------------------------------ #
+logger = logging.getLogger(__name__)
+# ------------------------------------------------------------------------------------------------------------------------ #
+
+
+def record_dtype(k: int, explanations: bool = False) -> np.dtype:
+    """Returns the fixed-width record of one user: k items, k scores and optionally k pointers."""
+    fields = [('items', '<i4', (k,)), ('scores', '<f4', (k,))]
+    if explanations:
+        fields.append(('because', '<i4', (k,)))
+    return np.dtype(fields)
+
+
+def score_block(model: str, output: str, start: int, stop: int, k: int,
+                seen: str = None) -> int:
+    """Computes the top-K records of a range of users and writes them to an .npy file.
+
+    This is the unit of work of a queued materialization, run by any worker of the queue. The
+    file is replaced only once complete, so a reclaimed block never leaves a partial one.
+
+    Args:
+        model: Version directory of a saved factor model.
+        output: Path of the .npy file receiving the records.
+        start: First user.
+        stop: One past the last user.
+        k: Number of recommendations per user.
+        seen: Optional matrix artifact directory or .npz CSR matrix of seen items to exclude.
+
+    Returns:
+        Number of users scored.
+    """
+    from xrec.models.predict_model import BatchRecommender
+    recommender = BatchRecommender.load(model)
+    X_seen = None
+    if seen:
+        X_seen = load_matrix(seen) if os.path.isdir(seen) else sparse.load_npz(seen).tocsr()
+    records = np.empty(stop - start, dtype=record_dtype(k))
+    for first, items, scores in recommender.iter_blocks(k, X_seen, start, stop):
+        items[~np.isfinite(scores)] = -1
+        block = records[first - start:first - start + len(items)]
+        block['items'] = items
+        block['scores'] = scores
+    temporary = output + '.part'
+    with open(temporary, 'wb') as f:
+        np.save(f, records)
+    os.replace(temporary, output)
+    return stop - start
+
+
+class RecommendationTable:
+    """Precomputed top-K recommendations of every user, looked up in O(1) by dense user index.
+
+    The table is a single .npy array of fixed-width records, one per user in dense index order,
+    holding the top-K item indices, their scores and, optionally, a pointer to the seen item that
+    best justifies each recommendation. It is written block by block straight into a memory map
+    in the artifact layout, so materializing never holds more than one block of scores in
+    memory, and readers memory map it, so a lookup touches only the pages of the requested
+    records and every process shares one physical copy.
+
+    Slots beyond the number of recommendable items of a user hold item -1 and score -inf, and
+    pointers are -1 when no seen item justifies the recommendation.
+
+    The interface includes:
+        materialize: Computes and saves the table of every user of a recommender.
+        materialize_queued: Computes and saves the table through a shared work queue.
+        load: Opens a saved table.
+        lookup: Returns the items, scores and pointers of an array of users.
+        get: Returns the recommendations of one user by external ID.
+
+    Args:
+        table: Structured array of records created by record_dtype.
+        vocabularies: Optional dictionary of 'users' and 'items' ID vocabularies.
+        params: Dictionary of the table parameters, including the model version and its unique
+            identifier.
+        version: Optional version of the table.
+
+    """
+
+    kind = 'recommendations'
+
+    def __init__(self, table: np.ndarray, vocabularies: dict = None, params: dict = None,
+                 version: int = None) -> None:
+        self.table = table
+        self.vocabularies = vocabularies or {}
+        self.params = params or {}
+        self.version = version
+
+    @classmethod
+    @instrumented()
+    def materialize(cls, recommender, path: str, k: int = 100, X_seen: sparse.csr_matrix = None,
+                    explainer=None) -> str:
+        """Computes the top-K recommendations of every user and saves them as a new version.
+
+        Args:
+            recommender: BatchRecommender producing the recommendations.
+            path: Artifact directory of the table.
+            k: Number of recommendations per user.
+            X_seen: Optional users by items CSR matrix of items to exclude, also used to justify
+                the recommendations.
+            explainer: Optional object with a justify(X_seen, users, items) method, e.g. an
+                ItemKNN model, filling the explanation pointers. Requires X_seen.
+
+        Returns:
+            Path of the new version directory.
+        """
+        if explainer is not None and X_seen is None:
+            raise ValueError("Explanation pointers require the seen items")
+        k = min(k, recommender.n_items)
+        staging = stage(path)
+        started = time.perf_counter()
+        try:
+            table = np.lib.format.open_memmap(os.path.join(staging, 'table.npy'), mode='w+',
+                                              dtype=record_dtype(k, explainer is not None),
+                                              shape=(recommender.n_users,))
+            for first, items, scores in recommender.iter_blocks(k, X_seen):
+                items[~np.isfinite(scores)] = -1
+                block = table[first:first + len(items)]
+                block['items'] = items
+                block['scores'] = scores
+                if explainer is not None:
+                    users = np.arange(first, first + len(items))[:, None].repeat(k, axis=1)
+                    because = np.full(items.shape, -1, dtype=np.int32)
+                    valid = items >= 0
+                    because[valid] = explainer.justify(X_seen, users[valid], items[valid])
+                    block['because'] = because
+            table.flush()
+            del table
+        except BaseException:
+            shutil.rmtree(staging, ignore_errors=True)
+            raise
+        seconds = time.perf_counter() - started
+        count(recommender.n_users)
+        logger.info("Materialized {} recommendations of {} users in {:.2f} seconds".format(
+            k, recommender.n_users, seconds))
+        return save_artifact(path, cls.kind, {}, vocabularies=recommender.vocabularies,
+                             params={'k': k, 'model_version': recommender.version,
+                                     'model_uid': recommender.uid,
+                                     'explanations': explainer is not None},
+                             staging=staging)
+
+    @classmethod
+    @instrumented()
+    def materialize_queued(cls, model: str, path: str, queue: str, k: int = 100,
+                           seen: str = None, block_users: int = 100000) -> str:
+        """Computes the top-K recommendations of every user through a shared work queue.
+
+        The users are split into blocks scored by the workers of the queue, typically on several
+        machines, and by this process. Each block is written to its own file in the staging
+        directory, which must be on the shared filesystem, and the blocks are then copied into
+        the table in order. Explanation pointers are not supported.
+
+        Args:
+            model: Artifact directory of a saved factor model.
+            path: Artifact directory of the table.
+            queue: SQLite database of a WorkQueue on a shared filesystem.
+            k: Number of recommendations per user.
+            seen: Optional matrix artifact directory or .npz CSR matrix of seen items to exclude.
+            block_users: Number of users per unit of work.
+
+        Returns:
+            Path of the new version directory.
+        """
+        from xrec.models.predict_model import BatchRecommender
+        from xrec.utils.workqueue import QueueExecutor
+        model = resolve(model)
+        recommender = BatchRecommender.load(model)
+        k = min(k, recommender.n_items)
+        staging = stage(path)
+        started = time.perf_counter()
+        try:
+            blocks = os.path.join(staging, 'blocks')
+            os.makedirs(blocks)
+            with QueueExecutor(queue, work=True) as pool:
+                futures = [(start, pool.submit(score_block, model,
+                                               os.path.join(blocks, '{}.npy'.format(start)),
+                                               start, min(start + block_users,
+                                                          recommender.n_users), k, seen))
+                           for start in range(0, recommender.n_users, block_users)]
+                for _, future in futures:
+                    future.result()
+            table = np.lib.format.open_memmap(os.path.join(staging, 'table.npy'), mode='w+',
+                                              dtype=record_dtype(k),
+                                              shape=(recommender.n_users,))
+            for start, _ in futures:
+                block = np.load(os.path.join(blocks, '{}.npy'.format(start)), mmap_mode='r')
+                table[start:start + len(block)] = block
+            table.flush()
+            del table
+            shutil.rmtree(blocks)
+        except BaseException:
+            shutil.rmtree(staging, ignore_errors=True)
+            raise
+        seconds = time.perf_counter() - started
+        count(recommender.n_users)
+        logger.info("Materialized {} recommendations of {} users in {} blocks in {:.2f} "
+                    "seconds".format(k, recommender.n_users, len(futures), seconds))
+        return save_artifact(path, cls.kind, {}, vocabularies=recommender.vocabularies,
+                             params={'k': k, 'model_version': recommender.version,
+                                     'model_uid': recommender.uid,
+                                     'explanations': False},
+                             staging=staging)
+
+    @classmethod
+    def load(cls, path: str, mmap: bool = True) -> "RecommendationTable":
+        """Opens a saved table, memory mapping it unless mmap is False.
+
+        Args:
+            path: Artifact directory, for the latest version, or version directory.
+            mmap: True to memory map the table, False to read it into memory.
+
+        Returns:
+            The table.
+        """
+        artifact = load_artifact(path, mmap=mmap)
+        if artifact.kind != cls.kind:
+            raise ValueError("Expected a {} artifact, found {}".format(cls.kind, artifact.kind))
+        return cls(artifact.arrays['table'], artifact.vocabularies, artifact.params,
+                   artifact.version)
+
+    def lookup(self, users, k: int = None) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Returns the precomputed recommendations of an array of users.
+
+        Args:
+            users: Array of dense user indices.
+            k: Optional number of recommendations, at most the k of the table.
+
+        Returns:
+            Tuple of items, scores and explanation pointers, each of shape (len(users), k). The
+            pointers are None if the table has none.
+        """
+        records = self.table[np.asarray(users)]
+        k = self.k if k is None else min(k, self.k)
+        because = records['because'][:, :k] if self.explanations else None
+        return records['items'][:, :k], records['scores'][:, :k], because
+
+    def get(self, user: str, k: int = None) -> list:
+        """Returns the recommendations of a user by external ID.
+
+        Args:
+            user: External user ID, or dense index if the table has no vocabularies.
+            k: Optional number of recommendations, at most the k of the table.
+
+        Returns:
+            List of dictionaries with the item ID, its score and, if the table has explanation
+            pointers, the ID of the seen item that justifies it or None.
+
+        Raises:
+            KeyError: If the user is not in the table.
+        """
+        vocabulary = self.vocabularies.get('users')
+        index = int(vocabulary.lookup([user])[0]) if vocabulary is not None else int(user)
+        if not 0 <= index < self.n_users:
+            raise KeyError(user)
+        items, scores, because = self.lookup([index], k)
+        keep = items[0] >= 0
+        result = [{'item': item, 'score': float(score)}
+                  for item, score in zip(self._ids(items[0][keep]), scores[0][keep])]
+        if because is not None:
+            for entry, pointer in zip(result, because[0][keep]):
+                entry['because'] = self._ids([pointer])[0] if pointer >= 0 else None
+        return result
+
+    def _ids(self, indices) -> list:
+        vocabulary = self.vocabularies.get('items')
+        if vocabulary is None:
+            return [int(i) for i in indices]
+        return [str(i) for i in vocabulary[np.asarray(indices, dtype=np.int64)]]
+
+    @property
+    def k(self) -> int:
+        return self.params['k']
+
+    @property
+    def explanations(self) -> bool:
+        return self.params['explanations']
+
+    @property
+    def n_users(self) -> int:
+        return len(self.table)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Materialize the recommendations of every user")
+    parser.add_argument('model', help="Artifact directory of a saved factor model.")
+    parser.add_argument('output', help="Artifact directory receiving the table.")
+    parser.add_argument('--k', type=int, default=100)
+    parser.add_argument('--seen', help="Optional .npz CSR matrix of seen items to exclude.")
+    parser.add_argument('--knn', help="Optional ItemKNN artifact directory for explanations.")
+    parser.add_argument('--memory-budget', type=parse_size,
+                        help="Scoring memory, e.g. 2G. Defaults to a planned one.")
+    args = parser.parse_args()
+
+    from xrec.models.predict_model import BatchRecommender
+    recommender = BatchRecommender.load(args.model, memory_budget=args.memory_budget)
+    X_seen = sparse.load_npz(args.seen).tocsr() if args.seen else None
+    explainer = None
+    if args.knn:
+        from xrec.models.knn import ItemKNN
+        explainer = ItemKNN.load(args.knn)
+    RecommendationTable.materialize(recommender, args.output, k=args.k, X_seen=X_seen,
+                                    explainer=explainer)
+
+
+if __name__ == '__main__':
+    log_fmt = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    logging.basicConfig(level=logging.INFO, format=log_fmt)
+    main()
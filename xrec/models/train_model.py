@@ -0,0 +1,819 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+# ======================================================================================================================== #
+# Project  : Explainable Recommendation (XRec)                                                                             #
+# Version  : 0.1.0                                                                                                         #
+# File     : \train_model.py                                                                                               #
+# Language : Python 3.8                                                                                                    #
+# ------------------------------------------------------------------------------------------------------------------------ #
+# Author   : John James                                                                                                    #
+# Company  : Bryant St. Labs                                                                                               #
+# Email    : john.james.ai.studio@gmail.com                                                                                #
+# URL      : https://github.com/john-james-ai/xrec                                                                         #
+# ------------------------------------------------------------------------------------------------------------------------ #
+# Created  : Monday, October 19th 2026, 9:00:00 am                                                                         #
+# Modified : Monday, October 19th 2026, 9:00:00 am                                                                         #
+# Modifier : John James (john.james.ai.studio@gmail.com)                                                                   #
+# ------------------------------------------------------------------------------------------------------------------------ #
+# License  : BSD 3-clause "New" or "Revised" License                                                                       #
+# Copyright: (c) 2021 Bryant St. Labs                                                                                      #
+# ======================================================================================================================== #
+import os
+import abc
+import argparse
+import time
+import logging
+import threading
+import multiprocessing as mp
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterator
+import numpy as np
+from scipy import sparse
+from xrec.models.artifact import (save_artifact, load_artifact, save_matrix, load_matrix,
+                                  save_rows, load_rows)
+from xrec.models.checkpoint import Checkpointer
+from xrec.models.sampling import NegativeSampler
+from xrec.utils.instrument import instrumented, count
+# ------------------------------------------------------------------------------------------------------------------------ #
+logger = logging.getLogger(__name__)
+# ------------------------------------------------------------------------------------------------------------------------ #
+
+
+def physical_cores() -> int:
+    """Returns the number of physical cores, falling back to the number of logical CPUs.
+
+    Without psutil, the logical count is halved when Linux reports simultaneous multithreading
+    as active, which is exact for the usual two hardware threads per core.
+    """
+    try:
+        import psutil
+        return psutil.cpu_count(logical=False) or os.cpu_count() or 1
+    except ImportError:
+        pass
+    n = os.cpu_count() or 1
+    try:
+        with open('/sys/devices/system/cpu/smt/active') as f:
+            smt = f.read().strip() == '1'
+    except OSError:
+        smt = False
+    return max(1, n // 2) if smt else n
+
+
+class FactorModel(abc.ABC):
+    """Base class for latent factor models persisted in the zero-copy artifact layout.
+
+    Subclasses set kind and implement params, which returns the constructor arguments. Saving
+    writes the factors as raw .npy arrays, the user and item ID vocabularies and the
+    hyperparameters to a new artifact version. Loading memory maps the arrays, so loading is
+    independent of model size and processes that load the same version share one physical copy
+    of the factors through the page cache.
+
+    Attributes:
+        vocabularies: Dictionary of 'users' and 'items' ID vocabularies, if known.
+
+    """
+
+    kind = None
+    arrays = ('user_factors', 'item_factors')
+
+    @abc.abstractmethod
+    def params(self) -> dict:
+        """Returns the JSON serializable constructor arguments of the model."""
+
+    def save(self, path: str, vocabularies: dict = None) -> str:
+        """Saves the model as a new version of an artifact directory.
+
+        Args:
+            path: Artifact directory.
+            vocabularies: Optional dictionary of 'users' and 'items' IDs. Defaults to the
+                vocabularies of the model.
+
+        Returns:
+            Path of the new version directory.
+        """
+        return save_artifact(path, self.kind, {name: getattr(self, name) for name in self.arrays},
+                             vocabularies=vocabularies or self.vocabularies,
+                             params=self.params())
+
+    @classmethod
+    def load(cls, path: str, mmap: bool = True) -> "FactorModel":
+        """Opens a saved model, memory mapping its arrays unless mmap is False.
+
+        Args:
+            path: Artifact directory, for the latest version, or version directory.
+            mmap: True to memory map the arrays, False to read them into memory.
+
+        Returns:
+            The model.
+        """
+        artifact = load_artifact(path, mmap=mmap)
+        if artifact.kind != cls.kind:
+            raise ValueError("Expected a {} artifact, found {}".format(cls.kind, artifact.kind))
+        model = cls(**artifact.params)
+        for name in cls.arrays:
+            setattr(model, name, artifact.arrays[name])
+        model.vocabularies = artifact.vocabularies
+        return model
+
+
+class ALS(FactorModel):
+    """Alternating least squares matrix factorization for explicit and implicit feedback.
+
+    Each half-iteration solves the regularized least squares systems of every user (or item)
+    against the fixed item (or user) factors. Rows are grouped by their number of interactions
+    into blocks whose interactions are padded to a common length, so the normal equations of a
+    whole block are formed with one batched matrix multiply. They are then solved either exactly
+    with one batched call to LAPACK or, by default, with a few batched conjugate gradient steps
+    warm-started from the current factors (Takacs, Pilaszy and Tikk, 2011), which is several
+    times cheaper for small systems. Both release the GIL, so blocks are spread across a thread
+    pool.
+
+    Explicit feedback uses weighted-lambda regularization, with the penalty of each row scaled by
+    its number of ratings. Implicit feedback uses the confidence weighting of Hu, Koren and
+    Volinsky (2008), c = 1 + alpha * r, against binary preferences.
+
+    The interface includes:
+        fit: Trains the factors on a users by items CSR matrix.
+        fold_in: Updates the factors of new or changed users and items only.
+        update: Solves the factors of given users and items from their interactions alone.
+        solve: Solves the factors of every row of a matrix against fixed counterpart factors.
+
+    Attributes:
+        user_factors: Array of shape (n_users, factors).
+        item_factors: Array of shape (n_items, factors).
+        history: List of dictionaries reporting the wall time of each iteration.
+
+    Args:
+        factors: Dimension of the latent factors.
+        regularization: L2 penalty.
+        alpha: Confidence scaling for implicit feedback.
+        implicit: True for implicit feedback, False for explicit ratings.
+        iterations: Number of alternating iterations.
+        cg_steps: Number of conjugate gradient steps per solve, or None to solve exactly.
+        block_bytes: Approximate working memory of one block of systems, in bytes.
+        n_threads: Number of solver threads. Defaults to the number of CPUs.
+        dtype: Floating point type of the factors.
+        seed: Seed for factor initialization.
+
+    """
+
+    kind = 'als'
+
+    def __init__(self, factors: int = 64, regularization: float = 0.01, alpha: float = 40.0,
+                 implicit: bool = True, iterations: int = 15, cg_steps: int = 3,
+                 block_bytes: int = 1 << 26, n_threads: int = None, dtype=np.float32,
+                 seed: int = 0) -> None:
+        self.factors = factors
+        self.regularization = regularization
+        self.alpha = alpha
+        self.implicit = implicit
+        self.iterations = iterations
+        self.cg_steps = cg_steps
+        self.block_bytes = block_bytes
+        self.n_threads = n_threads or os.cpu_count() or 1
+        self.dtype = np.dtype(dtype)
+        self.seed = seed
+        self.user_factors = None
+        self.item_factors = None
+        self.vocabularies = {}
+        self.history = []
+
+    def params(self) -> dict:
+        return {'factors': self.factors, 'regularization': self.regularization,
+                'alpha': self.alpha, 'implicit': self.implicit, 'iterations': self.iterations,
+                'cg_steps': self.cg_steps, 'block_bytes': self.block_bytes,
+                'dtype': self.dtype.name, 'seed': self.seed}
+
+    @instrumented()
+    def fit(self, X: sparse.csr_matrix, user_factors: np.ndarray = None,
+            item_factors: np.ndarray = None, Xt: sparse.csr_matrix = None,
+            checkpointer: Checkpointer = None, resume: bool = False) -> "ALS":
+        """Trains the factors on a users by items matrix.
+
+        Every iteration is a deterministic function of the factors it starts from, so training
+        resumed from a checkpoint produces the same factors, bit for bit, as uninterrupted
+        training.
+
+        Args:
+            X: Users by items CSR matrix of ratings or interaction strengths.
+            user_factors: Optional initial user factors, e.g. to warm start.
+            item_factors: Optional initial item factors, e.g. to warm start.
+            Xt: Optional items by users CSR transpose of X, e.g. a shared memory-mapped copy,
+                which avoids building the transpose.
+            checkpointer: Optional Checkpointer taking checkpoints every few iterations.
+            resume: True to continue from the latest checkpoint of checkpointer, if any.
+
+        Returns:
+            The fitted model.
+        """
+        X = sparse.csr_matrix(X, dtype=self.dtype)
+        Xt = X.T.tocsr() if Xt is None else sparse.csr_matrix(Xt, dtype=self.dtype)
+        start = 0
+        if resume and checkpointer is not None and checkpointer.exists():
+            arrays, state = checkpointer.load(self)
+            user_factors, item_factors = arrays['user_factors'], arrays['item_factors']
+            start = state['position']['iteration']
+            self.history = state['history']
+        self._initialize(X.shape, user_factors, item_factors)
+        for iteration in range(start, self.iterations):
+            self._iterate(X, Xt, iteration)
+            count(X.nnz)
+            if checkpointer is not None and checkpointer.due(iteration + 1):
+                checkpointer.save(self, {'iteration': iteration + 1}, rng={'seed': self.seed})
+        if checkpointer is not None:
+            checkpointer.wait()
+        return self
+
+    def fold_in(self, X: sparse.csr_matrix, users=None, items=None,
+                Xt: sparse.csr_matrix = None) -> "ALS":
+        """Updates the factors of new or changed users and items without retraining.
+
+        Only the rows of the given users, and the columns of the given items, are read: the
+        columns are sliced from Xt when it is given, and otherwise gathered by one scan of the
+        column indices of X, without converting X. See update for how they are solved.
+
+        Args:
+            X: Users by items CSR matrix of all interactions, including the new ones.
+            users: Dense indices of the users to update. Defaults to the new users.
+            items: Dense indices of the items to update. Defaults to the new items.
+            Xt: Optional items by users CSR transpose of X.
+
+        Returns:
+            The updated model.
+        """
+        X = sparse.csr_matrix(X)
+        n_users, n_items = len(self.user_factors), len(self.item_factors)
+        users = np.arange(n_users, X.shape[0]) if users is None else np.unique(users)
+        items = np.arange(n_items, X.shape[1]) if items is None else np.unique(items)
+        X_items = sparse.csr_matrix(Xt)[items] if Xt is not None else _columns(X, items)
+        return self.update(users, X[users], items, X_items)
+
+    def update(self, users: np.ndarray, X_users: sparse.csr_matrix, items: np.ndarray,
+               X_items: sparse.csr_matrix) -> "ALS":
+        """Solves the factors of the given users and items from their interactions alone.
+
+        The factors of the users are solved against the fixed item factors, then those of the
+        items against the fixed, updated, user factors: a single ALS half-step per side over
+        only the affected rows. Since there is no further iteration to refine a warm start, the
+        systems are solved exactly. Users and items beyond the current factors are added before
+        they are solved. The remaining factors are left unchanged.
+
+        Args:
+            users: Distinct dense indices of the users to update.
+            X_users: CSR matrix of all interactions of each user, in the order of users, as wide
+                as the number of items.
+            items: Distinct dense indices of the items to update.
+            X_items: CSR matrix of all interactions with each item, in the order of items, as
+                wide as the number of users.
+
+        Returns:
+            The updated model.
+        """
+        start = time.perf_counter()
+        self.user_factors = _grow(self.user_factors, X_items.shape[1], self.dtype)
+        self.item_factors = _grow(self.item_factors, X_users.shape[1], self.dtype)
+        if len(users):
+            self.user_factors[users] = self.solve(sparse.csr_matrix(X_users, dtype=self.dtype),
+                                                  self.item_factors, exact=True)
+        if len(items):
+            self.item_factors[items] = self.solve(sparse.csr_matrix(X_items, dtype=self.dtype),
+                                                  self.user_factors, exact=True)
+        logger.info("ALS folded in {:,} users and {:,} items in {:.2f} seconds".format(
+            len(users), len(items), time.perf_counter() - start))
+        return self
+
+    def solve(self, X: sparse.csr_matrix, Y: np.ndarray, out: np.ndarray = None,
+              exact: bool = False) -> np.ndarray:
+        """Solves the factors of every row of X against the fixed counterpart factors Y.
+
+        Args:
+            X: CSR matrix whose columns index the rows of Y.
+            Y: Fixed counterpart factors.
+            out: Optional array of shape (X.shape[0], factors) receiving the solution. Its
+                contents are the starting point of the conjugate gradient steps.
+            exact: True to solve exactly even if the model uses conjugate gradient steps.
+
+        Returns:
+            Array of shape (X.shape[0], factors).
+        """
+        X = sparse.csr_matrix(X, dtype=self.dtype)
+        if out is None:
+            out = np.zeros((X.shape[0], Y.shape[1]), dtype=self.dtype)
+        YtY = Y.T @ Y if self.implicit else None
+        with ThreadPoolExecutor(max_workers=self.n_threads) as executor:
+            for _ in executor.map(lambda rows: self._solve_block(X, Y, YtY, rows, out, exact),
+                                  self._blocks(X)):
+                pass
+        return out
+
+    def _initialize(self, shape: tuple, user_factors: np.ndarray,
+                    item_factors: np.ndarray) -> None:
+        """Initializes the factors with small random values unless they are given."""
+        rng = np.random.default_rng(self.seed)
+        scale = 0.01 if self.implicit else 1.0 / np.sqrt(self.factors)
+        if user_factors is None:
+            user_factors = rng.standard_normal(
+                (shape[0], self.factors), dtype=np.float32) * scale
+        if item_factors is None:
+            item_factors = rng.standard_normal(
+                (shape[1], self.factors), dtype=np.float32) * scale
+        self.user_factors = np.array(user_factors, dtype=self.dtype)
+        self.item_factors = np.array(item_factors, dtype=self.dtype)
+
+    def _iterate(self, X: sparse.csr_matrix, Xt: sparse.csr_matrix, iteration: int) -> None:
+        """Runs one alternating iteration and records its wall time."""
+        start = time.perf_counter()
+        self.solve(X, self.item_factors, out=self.user_factors)
+        self.solve(Xt, self.user_factors, out=self.item_factors)
+        seconds = time.perf_counter() - start
+        self.history.append({'iteration': iteration, 'seconds': seconds})
+        logger.info("ALS iteration {} completed in {:.2f} seconds".format(
+            iteration, seconds))
+
+    def _blocks(self, X: sparse.csr_matrix) -> Iterator[np.ndarray]:
+        """Partitions the rows of X into blocks of rows with similar numbers of interactions.
+
+        Rows are bucketed by the next power of two of their interaction count, which bounds the
+        padding in a block to less than half of its entries, and each bucket is split into blocks
+        that fit within block_bytes.
+        """
+        counts = np.diff(X.indptr)
+        width = np.zeros_like(counts)
+        nonzero = counts > 0
+        width[nonzero] = 1 << np.ceil(np.log2(counts[nonzero])).astype(np.int64)
+        order = np.argsort(width, kind='stable')
+        bounds = np.flatnonzero(np.diff(width[order])) + 1
+        k = self.factors
+        for bucket in np.split(order, bounds):
+            if not bucket.size:
+                continue
+            m = int(width[bucket[0]])
+            size = max(1, self.block_bytes //
+                       (self.dtype.itemsize * (m * (k + 2) + k * (k + 2))))
+            for first in range(0, bucket.size, size):
+                yield bucket[first:first + size]
+
+    def _solve_block(self, X: sparse.csr_matrix, Y: np.ndarray, YtY: np.ndarray,
+                     rows: np.ndarray, out: np.ndarray, exact: bool = False) -> None:
+        """Forms and solves the normal equations of a block of rows."""
+        k = Y.shape[1]
+        starts = X.indptr[rows]
+        counts = X.indptr[rows + 1] - starts
+        m = int(counts.max())
+        if m == 0:
+            out[rows] = 0
+            return
+        offsets = np.arange(m)
+        valid = offsets[None, :] < counts[:, None]
+        positions = np.where(valid, starts[:, None] + offsets[None, :], 0)
+        values = np.where(valid, X.data[positions], 0).astype(self.dtype)
+        Yp = Y[X.indices[positions]]
+        Yp *= valid[..., None]
+
+        eye = np.eye(k, dtype=self.dtype)
+        if self.implicit:
+            confidence = self.alpha * values
+            A = np.matmul(np.swapaxes(Yp * confidence[..., None], 1, 2), Yp)
+            A += YtY + self.regularization * eye
+            b = np.matmul((valid + confidence)[:, None, :], Yp)
+        else:
+            A = np.matmul(np.swapaxes(Yp, 1, 2), Yp)
+            A += (self.regularization * np.maximum(counts, 1)
+                  ).astype(self.dtype)[:, None, None] * eye
+            b = np.matmul(values[:, None, :], Yp)
+        if exact or self.cg_steps is None:
+            out[rows] = np.linalg.solve(A, np.swapaxes(b, 1, 2))[..., 0]
+        else:
+            out[rows] = self._conjugate_gradient(A, b[:, 0, :], out[rows])
+
+    def _conjugate_gradient(self, A: np.ndarray, b: np.ndarray, x: np.ndarray) -> np.ndarray:
+        """Runs cg_steps of conjugate gradient on a stack of symmetric positive definite systems."""
+        r = b - np.matmul(A, x[..., None])[..., 0]
+        p = r.copy()
+        rs = np.einsum('bk,bk->b', r, r)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            for _ in range(self.cg_steps):
+                Ap = np.matmul(A, p[..., None])[..., 0]
+                step = np.nan_to_num(rs / np.einsum('bk,bk->b', p, Ap))
+                x += step[:, None] * p
+                r -= step[:, None] * Ap
+                rs_new = np.einsum('bk,bk->b', r, r)
+                p = r + np.nan_to_num(rs_new / rs)[:, None] * p
+                rs = rs_new
+        return x
+
+
+class BPR(FactorModel):
+    """Bayesian personalized ranking trained with lock-free parallel minibatch SGD.
+
+    The user factors, item factors and item biases live in shared memory. Each worker process
+    draws its share of the minibatches of every epoch from a NegativeSampler and applies its
+    updates to the shared arrays without any locking (Hogwild, Niu et al., 2011). Updates from
+    different workers rarely touch the same rows, so throughput scales with the number of
+    workers up to the number of physical cores while convergence is essentially unaffected.
+    With a single worker training runs in the calling process and is deterministic.
+
+    The interface includes:
+        fit: Trains the factors on a users by items CSR matrix.
+
+    Attributes:
+        user_factors: Array of shape (n_users, factors).
+        item_factors: Array of shape (n_items, factors).
+        item_bias: Array of shape (n_items,).
+        history: List of dictionaries reporting the wall time and samples per second of each
+            epoch.
+
+    Args:
+        factors: Dimension of the latent factors.
+        learning_rate: SGD step size.
+        regularization: L2 penalty.
+        epochs: Number of epochs, each drawing as many triples as there are interactions.
+        batch_size: Number of triples per minibatch.
+        n_workers: Number of worker processes. Defaults to the number of physical cores, since
+            hyperthreads share the floating point units the updates are bound by.
+        distribution: Negative sampling distribution, either 'uniform' or 'popularity'.
+        seed: Seed for factor initialization and sampling.
+
+    """
+
+    kind = 'bpr'
+    arrays = ('user_factors', 'item_factors', 'item_bias')
+
+    def __init__(self, factors: int = 64, learning_rate: float = 0.05, regularization: float = 0.0001,
+                 epochs: int = 10, batch_size: int = 1024, n_workers: int = None,
+                 distribution: str = 'uniform', seed: int = 0) -> None:
+        self.factors = factors
+        self.learning_rate = learning_rate
+        self.regularization = regularization
+        self.epochs = epochs
+        self.batch_size = batch_size
+        self.n_workers = n_workers or physical_cores()
+        self.distribution = distribution
+        self.seed = seed
+        self.user_factors = None
+        self.item_factors = None
+        self.item_bias = None
+        self.vocabularies = {}
+        self.history = []
+
+    def params(self) -> dict:
+        return {'factors': self.factors, 'learning_rate': self.learning_rate,
+                'regularization': self.regularization, 'epochs': self.epochs,
+                'batch_size': self.batch_size, 'distribution': self.distribution,
+                'seed': self.seed}
+
+    @instrumented()
+    def fit(self, X: sparse.csr_matrix, user_factors: np.ndarray = None,
+            item_factors: np.ndarray = None, item_bias: np.ndarray = None,
+            start_epoch: int = 0, checkpointer: Checkpointer = None,
+            resume: bool = False) -> "BPR":
+        """Trains the factors on a users by items matrix of implicit feedback.
+
+        Checkpoints are taken at epoch boundaries, while the workers wait, so they are
+        consistent. The sampler draws every batch from a generator seeded by (seed, epoch,
+        batch), so the seed and the sampler position fully describe the random state, and with a
+        single worker resumed training is identical, bit for bit, to uninterrupted training.
+
+        Args:
+            X: Users by items CSR matrix. Every stored element is treated as a positive.
+            user_factors: Optional initial user factors, e.g. to warm start.
+            item_factors: Optional initial item factors, e.g. to warm start.
+            item_bias: Optional initial item biases, e.g. to warm start.
+            start_epoch: First epoch to run, e.g. the number of epochs a warm start was trained
+                for, so that its batches are not drawn again.
+            checkpointer: Optional Checkpointer taking checkpoints every few epochs.
+            resume: True to continue from the latest checkpoint of checkpointer, if any.
+
+        Returns:
+            The fitted model.
+        """
+        sampler = NegativeSampler(X, distribution=self.distribution,
+                                  batch_size=self.batch_size, seed=self.seed)
+        rng = np.random.default_rng(self.seed)
+        shapes = {'user_factors': (sampler.n_users, self.factors),
+                  'item_factors': (sampler.n_items, self.factors),
+                  'item_bias': (sampler.n_items,)}
+        initial = {'user_factors': user_factors, 'item_factors': item_factors,
+                   'item_bias': item_bias}
+        start = start_epoch
+        if resume and checkpointer is not None and checkpointer.exists():
+            initial, state = checkpointer.load(self)
+            start = state['position']['epoch']
+            self.history = state['history']
+        buffers = {}
+        for name, shape in shapes.items():
+            buffers[name] = mp.RawArray('f', int(np.prod(shape)))
+            array = _shared_array(buffers[name], shape)
+            if initial[name] is not None:
+                array[:] = initial[name]
+            elif name == 'item_bias':
+                array[:] = 0
+            else:
+                array[:] = rng.standard_normal(shape, dtype=np.float32) / self.factors
+            setattr(self, name, array)
+        self._train(sampler, buffers, shapes, start, checkpointer)
+        count(X.nnz * (self.epochs - start))
+        for name in shapes:
+            setattr(self, name, getattr(self, name).copy())
+        return self
+
+    def _train(self, sampler: NegativeSampler, buffers: dict, shapes: dict, start: int,
+               checkpointer: Checkpointer) -> None:
+        """Runs the epochs, in-process for one worker and in worker processes otherwise."""
+        n_workers = min(self.n_workers, sampler.n_batches)
+        epochs = range(start, self.epochs)
+        if n_workers == 1:
+            for epoch in epochs:
+                started = time.perf_counter()
+                _bpr_epoch(self._hyperparameters(), buffers, shapes, sampler, epoch, 0, 1)
+                self._record(epoch, started, sampler)
+                self._checkpoint(epoch, checkpointer)
+            if checkpointer is not None:
+                checkpointer.wait()
+            return
+
+        barrier = mp.Barrier(n_workers + 1)
+        workers = [mp.Process(target=_bpr_worker,
+                              args=(self._hyperparameters(), buffers, shapes, sampler, epochs,
+                                    w, n_workers, barrier),
+                              daemon=True)
+                   for w in range(n_workers)]
+        for worker in workers:
+            worker.start()
+        done = threading.Event()
+        monitor = threading.Thread(target=_monitor_workers, args=(workers, barrier, done),
+                                   daemon=True)
+        monitor.start()
+        try:
+            for epoch in epochs:
+                started = time.perf_counter()
+                barrier.wait()
+                self._record(epoch, started, sampler)
+                self._checkpoint(epoch, checkpointer)
+                barrier.wait()
+            if checkpointer is not None:
+                checkpointer.wait()
+        except threading.BrokenBarrierError:
+            for w, worker in enumerate(workers):
+                if worker.exitcode not in (None, 0):
+                    raise RuntimeError("BPR worker {} exited with code {}".format(
+                        w, worker.exitcode))
+            raise
+        finally:
+            done.set()
+            monitor.join()
+            for worker in workers:
+                worker.join(timeout=1)
+                if worker.is_alive():
+                    worker.terminate()
+
+    def _checkpoint(self, epoch: int, checkpointer: Checkpointer) -> None:
+        """Takes a checkpoint after an epoch if one is due."""
+        if checkpointer is not None and checkpointer.due(epoch + 1):
+            checkpointer.save(self, {'epoch': epoch + 1, 'batch': 0}, rng={'seed': self.seed})
+
+    def _hyperparameters(self) -> dict:
+        return {'learning_rate': self.learning_rate, 'regularization': self.regularization}
+
+    def _record(self, epoch: int, start: float, sampler: NegativeSampler) -> None:
+        """Records the wall time and throughput of an epoch."""
+        seconds = time.perf_counter() - start
+        rate = sampler.n_samples / seconds
+        self.history.append({'epoch': epoch, 'seconds': seconds,
+                             'samples_per_second': rate})
+        logger.info("BPR epoch {} completed in {:.2f} seconds ({:,.0f} samples/s)".format(
+            epoch, seconds, rate))
+
+
+def fold_in(model_path: str, matrix_path: str, user_ids, item_ids, values=None,
+            transpose_path: str = None, compact: float = 0.1) -> str:
+    """Folds new interactions into the latest ALS model and publishes a new version.
+
+    Unknown user and item IDs are appended to the model vocabularies, and the factors of every
+    user and item with new interactions are updated by ALS.update from their rows merged with
+    the new interactions, replacing the values of known pairs. Only those rows are read and
+    saved, as a layer over the latest matrix, by load_rows and save_rows. The item columns are
+    read from the transposed matrix when there is one, which is updated likewise, and otherwise
+    gathered by one scan of the matrix. Once the layers hold more than a compact fraction of the
+    elements of the full matrix, they are merged into a new full version. The model is saved
+    last, so a reader of the latest model always finds a matrix at least as recent.
+
+    Args:
+        model_path: Artifact directory of an ALS model with 'users' and 'items' vocabularies.
+        matrix_path: Artifact directory of the interaction matrix the model was trained on.
+        user_ids: Sequence of user IDs of the new interactions.
+        item_ids: Sequence of item IDs of the new interactions.
+        values: Optional sequence of ratings or interaction strengths. Defaults to ones.
+        transpose_path: Optional artifact directory of the items by users transpose of the
+            interaction matrix.
+        compact: Fraction of the full matrix the layers may reach before they are merged.
+
+    Returns:
+        Path of the new model version directory.
+    """
+    model = ALS.load(model_path, mmap=False)
+    if not {'users', 'items'} <= set(model.vocabularies or {}):
+        raise ValueError("Model {} has no user and item vocabularies".format(model_path))
+    vocabularies = {'users': model.vocabularies['users'].append(user_ids),
+                    'items': model.vocabularies['items'].append(item_ids)}
+    rows = vocabularies['users'].lookup(user_ids)
+    cols = vocabularies['items'].lookup(item_ids)
+    values = np.ones(len(rows)) if values is None else np.asarray(values)
+    shape = (len(vocabularies['users']), len(vocabularies['items']))
+    dtype = load_artifact(matrix_path).arrays['data'].dtype
+    new = sparse.csr_matrix((values, (rows, cols)), shape=shape, dtype=dtype)
+    new.sum_duplicates()
+    users, items = np.unique(rows), np.unique(cols)
+
+    X_users = _merge(_resize(load_rows(matrix_path, users), (len(users), shape[1])), new[users])
+    if transpose_path is None:
+        X_items = _columns(load_matrix(matrix_path), items)
+    else:
+        X_items = load_rows(transpose_path, items)
+    X_items = _merge(_resize(X_items, (len(items), shape[0])), new.T.tocsr()[items])
+
+    model.update(users, X_users, items, X_items)
+    _save_rows(matrix_path, users, X_users, shape, compact)
+    if transpose_path is not None:
+        _save_rows(transpose_path, items, X_items, shape[::-1], compact)
+    return model.save(model_path, vocabularies=vocabularies)
+
+
+def _save_rows(root: str, rows: np.ndarray, X_rows: sparse.csr_matrix, shape: tuple,
+               compact: float) -> None:
+    """Saves replacement rows, merging the layers into a full matrix past the compact fraction."""
+    params = load_artifact(save_rows(root, rows, X_rows, shape)).params
+    if params['delta_nnz'] > compact * params['base_nnz']:
+        save_matrix(root, load_matrix(root))
+
+
+def _merge(X: sparse.csr_matrix, new: sparse.csr_matrix) -> sparse.csr_matrix:
+    """Returns X with the stored elements of new replacing the values of the same pairs."""
+    X = X - X.multiply(new.astype(bool)) + new
+    X.eliminate_zeros()
+    X.sort_indices()
+    return X
+
+
+def _columns(X: sparse.csr_matrix, items: np.ndarray) -> sparse.csr_matrix:
+    """Returns the given sorted columns of X as rows of an items by users CSR matrix.
+
+    Columns are gathered by one scan of the column indices, so only the selected elements are
+    copied, rather than converting X to CSC.
+    """
+    positions = np.flatnonzero(np.isin(X.indices, items))
+    users = np.searchsorted(X.indptr, positions, side='right') - 1
+    local = np.searchsorted(items, X.indices[positions])
+    return sparse.csr_matrix((X.data[positions], (local, users)),
+                             shape=(len(items), X.shape[0]))
+
+
+def _grow(factors: np.ndarray, n: int, dtype) -> np.ndarray:
+    """Returns a writable copy of factors with zero rows appended up to n rows."""
+    grown = np.zeros((n, factors.shape[1]), dtype=dtype)
+    grown[:len(factors)] = factors
+    return grown
+
+
+def _resize(X: sparse.csr_matrix, shape: tuple) -> sparse.csr_matrix:
+    """Returns X with empty rows and columns appended up to shape."""
+    padding = np.full(shape[0] - X.shape[0], X.indptr[-1], dtype=X.indptr.dtype)
+    indptr = np.concatenate([X.indptr, padding])
+    return sparse.csr_matrix((X.data, X.indices, indptr), shape=shape)
+
+
+def _shared_array(buffer, shape: tuple) -> np.ndarray:
+    """Returns a float32 array view over a shared memory buffer."""
+    return np.frombuffer(buffer, dtype=np.float32).reshape(shape)
+
+
+def _bpr_worker(hyperparameters: dict, buffers: dict, shapes: dict, sampler: NegativeSampler,
+                epochs: range, worker: int, n_workers: int, barrier) -> None:
+    """Trains on every n_workers-th minibatch of each epoch, synchronizing at epoch ends.
+
+    The second barrier holds the workers while the parent records the epoch and snapshots a
+    checkpoint. A worker stops when the barrier is aborted because another one failed.
+    """
+    try:
+        for epoch in epochs:
+            _bpr_epoch(hyperparameters, buffers, shapes, sampler, epoch, worker, n_workers)
+            barrier.wait()
+            barrier.wait()
+    except threading.BrokenBarrierError:
+        pass
+
+
+def _monitor_workers(workers: list, barrier, done: threading.Event,
+                     poll: float = 0.1) -> None:
+    """Aborts the barrier as soon as a worker exits with an error, e.g. when killed for lack
+    of memory, so that the parent and the surviving workers do not wait for it forever."""
+    while not done.wait(poll):
+        if any(worker.exitcode not in (None, 0) for worker in workers):
+            barrier.abort()
+            return
+
+
+def _bpr_epoch(hyperparameters: dict, buffers: dict, shapes: dict, sampler: NegativeSampler,
+               epoch: int, worker: int, n_workers: int) -> None:
+    """Applies the SGD updates of every n_workers-th minibatch of an epoch, starting at worker."""
+    U = _shared_array(buffers['user_factors'], shapes['user_factors'])
+    V = _shared_array(buffers['item_factors'], shapes['item_factors'])
+    bias = _shared_array(buffers['item_bias'], shapes['item_bias'])
+    learning_rate = np.float32(hyperparameters['learning_rate'])
+    regularization = np.float32(hyperparameters['regularization'])
+    for batch in range(worker, sampler.n_batches, n_workers):
+        users, positives, negatives = sampler.sample_batch(epoch, batch)
+        Uu = U[users]
+        Vi = V[positives]
+        Vj = V[negatives]
+        x = np.einsum('ij,ij->i', Uu, Vi - Vj) + bias[positives] - bias[negatives]
+        g = (1.0 / (1.0 + np.exp(np.clip(x, -30, 30)))).astype(np.float32)
+        gU = g[:, None] * Uu
+        items = np.concatenate([positives, negatives])
+        _scatter_add(U, users, learning_rate * (g[:, None] * (Vi - Vj) - regularization * Uu))
+        _scatter_add(V, items, learning_rate * np.concatenate([gU - regularization * Vi,
+                                                               -gU - regularization * Vj]))
+        b = bias[items]
+        _scatter_add(bias, items, learning_rate * (np.concatenate([g, -g]) - regularization * b))
+
+
+def _scatter_add(target: np.ndarray, index: np.ndarray, values: np.ndarray) -> None:
+    """Adds the rows of values into the rows of target given by index, summing repeated indices.
+
+    Equivalent to np.add.at, which is unbuffered and an order of magnitude slower: the rows are
+    sorted by index, each run of equal indices is summed with one np.add.reduceat, and the sums
+    are added with a single fancy-indexed update over distinct rows.
+    """
+    order = np.argsort(index, kind='stable')
+    index = index[order]
+    starts = np.flatnonzero(np.concatenate([[True], index[1:] != index[:-1]]))
+    target[index[starts]] += np.add.reduceat(values[order], starts, axis=0)
+
+
+def train(name: str, X: sparse.csr_matrix, factors: int = 64, regularization: float = None,
+          iterations: int = 15, learning_rate: float = 0.05, n_workers: int = None,
+          seed: int = 0, checkpointer: Checkpointer = None, resume: bool = False) -> FactorModel:
+    """Trains an ALS or BPR model with the options shared by the command line interfaces.
+
+    Args:
+        name: Either 'als' or 'bpr'.
+        X: Users by items CSR matrix of interactions.
+        factors: Dimension of the factors.
+        regularization: Optional regularization. Defaults to that of the model.
+        iterations: ALS iterations or BPR epochs.
+        learning_rate: BPR learning rate.
+        n_workers: ALS threads or BPR worker processes.
+        seed: Seed of the initial factors and of the sampler.
+        checkpointer: Optional Checkpointer taking checkpoints during training.
+        resume: True to continue from the latest checkpoint of checkpointer, if any.
+
+    Returns:
+        The fitted model.
+    """
+    kwargs = {'factors': factors, 'seed': seed}
+    if regularization is not None:
+        kwargs['regularization'] = regularization
+    if name == 'als':
+        model = ALS(iterations=iterations, n_threads=n_workers, **kwargs)
+    elif name == 'bpr':
+        model = BPR(epochs=iterations, learning_rate=learning_rate, n_workers=n_workers, **kwargs)
+    else:
+        raise ValueError("Unknown model {}".format(name))
+    return model.fit(X, checkpointer=checkpointer, resume=resume)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Train a factor model, optionally resuming")
+    parser.add_argument('model', choices=['als', 'bpr'])
+    parser.add_argument('interactions',
+                        help=".npz CSR matrix or matrix directory of user by item interactions.")
+    parser.add_argument('output', help="Artifact directory receiving the trained model.")
+    parser.add_argument('--factors', type=int, default=64)
+    parser.add_argument('--regularization', type=float)
+    parser.add_argument('--iterations', type=int, default=15, help="ALS iterations or BPR epochs.")
+    parser.add_argument('--learning-rate', type=float, default=0.05)
+    parser.add_argument('--workers', type=int, help="ALS threads or BPR worker processes.")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--checkpoints', help="Artifact directory of the training checkpoints.")
+    parser.add_argument('--checkpoint-every', type=int, default=1)
+    parser.add_argument('--keep', type=int, default=2, help="Number of checkpoints retained.")
+    parser.add_argument('--resume', action='store_true',
+                        help="Continue from the latest checkpoint.")
+    args = parser.parse_args()
+
+    if os.path.isdir(args.interactions):
+        X = load_matrix(args.interactions)
+    else:
+        X = sparse.load_npz(args.interactions).tocsr()
+    checkpointer = None
+    if args.checkpoints:
+        checkpointer = Checkpointer(args.checkpoints, every=args.checkpoint_every, keep=args.keep)
+    model = train(args.model, X, args.factors, args.regularization, args.iterations,
+                  args.learning_rate, args.workers, args.seed, checkpointer, args.resume)
+    logger.info("Saved {} model to {}".format(args.model, model.save(args.output)))
+
+
+if __name__ == '__main__':
+    log_fmt = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    logging.basicConfig(level=logging.INFO, format=log_fmt)
+    main()
@@ -0,0 +1,206 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+# ======================================================================================================================== #
+# Project  : Explainable Recommendation (XRec)                                                                             #
+# Version  : 0.1.0                                                                                                         #
+# File     : \budget.py                                                                                                    #
+# Language : Python 3.8                                                                                                    #
+# ------------------------------------------------------------------------------------------------------------------------ #
+# Author   : John James                                                                                                    #
+# Company  : Bryant St. Labs                                                                                               #
+# Email    : john.james.ai.studio@gmail.com                                                                                #
+# URL      : https://github.com/john-james-ai/xrec                                                                         #
+# ------------------------------------------------------------------------------------------------------------------------ #
+# Created  : Monday, October 19th 2026, 9:00:00 am                                                                         #
+# Modified : Monday, October 19th 2026, 9:00:00 am                                                                         #
+# Modifier : John James (john.james.ai.studio@gmail.com)                                                                   #
+# ------------------------------------------------------------------------------------------------------------------------ #
+# License  : BSD 3-clause "New" or "Revised" License                                                                       #
+# Copyright: (c) 2021 Bryant St. Labs                                                                                      #
+# ======================================================================================================================== #
+import os
+import re
+import logging
+from xrec.utils.config import Config
+from xrec.utils.instrument import rss
+# ------------------------------------------------------------------------------------------------------------------------ #
+logger = logging.getLogger(__name__)
+# ------------------------------------------------------------------------------------------------------------------------ #
+SECTION = 'RESOURCES'
+UNITS = {'': 1, 'K': 1 << 10, 'M': 1 << 20, 'G': 1 << 30, 'T': 1 << 40}
+# Approximate resident bytes of a row of each reader while it is parsed, and of an idle worker
+# process with numpy and pandas imported.
+REVIEW_BYTES = 2048
+PRODUCT_BYTES = 4096
+WORKER_BYTES = 128 << 20
+# ------------------------------------------------------------------------------------------------------------------------ #
+
+
+def parse_size(size) -> int:
+    """Returns a number of bytes from an int or a string such as '512M', '8G' or '1.5GB'.
+
+    Raises:
+        ValueError: If the string is not a size.
+    """
+    if isinstance(size, (int, float)):
+        return int(size)
+    match = re.fullmatch(r'\s*([\d.]+)\s*([KMGT]?)i?B?\s*', str(size), re.IGNORECASE)
+    if match is None:
+        raise ValueError("Invalid size {}".format(size))
+    return int(float(match.group(1)) * UNITS[match.group(2).upper()])
+
+
+def limit_threads(n_threads: int) -> None:
+    """Limits the BLAS and OpenMP threads of a worker process so workers stay within the CPU budget.
+
+    Meant as the initializer of a process pool: the environment variables are read by BLAS
+    libraries loaded afterwards, and threadpoolctl, if installed, limits those already loaded.
+
+    Args:
+        n_threads: Number of threads of each library.
+    """
+    for variable in ('OMP_NUM_THREADS', 'OPENBLAS_NUM_THREADS', 'MKL_NUM_THREADS'):
+        os.environ[variable] = str(n_threads)
+    try:
+        from threadpoolctl import threadpool_limits
+        threadpool_limits(n_threads)
+    except ImportError:
+        pass
+
+
+def physical_memory() -> int:
+    """Returns the physical memory of the machine in bytes, or 8 GiB if it is unknown."""
+    try:
+        return os.sysconf('SC_PHYS_PAGES') * os.sysconf('SC_PAGE_SIZE')
+    except (AttributeError, OSError, ValueError):
+        return 8 << 30
+
+
+class MemoryPlanner:
+    """Derives chunk sizes, block sizes and worker counts from a global memory budget.
+
+    Every size is planned from the memory still available under the budget, the budget less
+    the resident set size of this process when the size is requested, so a stage started
+    after a memory hungry one gets smaller chunks. Readers call adjust between chunks to
+    shrink the chunk size while RSS is above the high watermark, and to grow it back, up to
+    its planned size, while RSS is below the low watermark.
+
+    The budget is read from the memory_budget key of the RESOURCES section of the
+    configuration, e.g. '8G', and defaults to half of the physical memory.
+
+    The interface includes:
+        from_config: Creates a planner from the configured budget.
+        available: Returns the memory still available under the budget.
+        share: Returns a planner of an equal share of the budget for each of several workers.
+        workers: Returns a worker count for a per-worker memory cost.
+        download_buffer: Returns the copy buffer size of each download worker.
+        batch_size: Returns the number of rows of a reader chunk.
+        scoring_budget: Returns the working memory of a scoring stage.
+        adjust: Returns a chunk size adjusted to the measured RSS.
+
+    Args:
+        budget: Memory budget in bytes, or a size string such as '8G'.
+        n_cpus: Largest worker count. Defaults to the number of CPUs.
+        high: Fraction of the budget above which chunk sizes shrink.
+        low: Fraction of the budget below which chunk sizes grow back.
+
+    """
+
+    def __init__(self, budget=None, n_cpus: int = None, high: float = 0.85,
+                 low: float = 0.5) -> None:
+        self.budget = parse_size(budget) if budget is not None else physical_memory() // 2
+        self.n_cpus = n_cpus or os.cpu_count() or 1
+        self.high = high
+        self.low = low
+
+    @classmethod
+    def from_config(cls, **kwargs) -> "MemoryPlanner":
+        """Creates a planner from the memory_budget of the RESOURCES configuration section."""
+        config = Config()
+        budget = None
+        if config.exists(SECTION, 'memory_budget'):
+            budget = config.read(SECTION, 'memory_budget')
+        return cls(budget, **kwargs)
+
+    def available(self) -> int:
+        """Returns the budget less the current RSS of this process, in bytes."""
+        return max(0, self.budget - rss())
+
+    def share(self, n_workers: int) -> "MemoryPlanner":
+        """Returns a planner of an equal share of the budget, for use in each of n_workers
+        worker processes, which measure only their own RSS."""
+        n_workers = max(n_workers, 1)
+        return MemoryPlanner(self.budget // n_workers, max(1, self.n_cpus // n_workers),
+                             self.high, self.low)
+
+    def workers(self, per_worker: int = WORKER_BYTES, limit: int = None) -> int:
+        """Returns how many workers of a given memory cost fit in the available memory.
+
+        Args:
+            per_worker: Peak memory of one worker in bytes.
+            limit: Optional largest count, e.g. the number of tasks.
+
+        Returns:
+            Worker count between 1 and the number of CPUs.
+        """
+        n = min(self.n_cpus, limit or self.n_cpus, self.available() // max(per_worker, 1))
+        return max(1, int(n))
+
+    def download_buffer(self, n_workers: int = 1, minimum: int = 64 << 10,
+                        maximum: int = 16 << 20) -> int:
+        """Returns the copy buffer size of each of n_workers download workers.
+
+        A download only needs a buffer large enough to amortize system calls, so each worker
+        gets a power of two of at most 1/64 of its share of the available memory.
+        """
+        size = self.available() // (64 * max(n_workers, 1))
+        return _clip(1 << max(size, 1).bit_length() - 1, minimum, maximum)
+
+    def batch_size(self, row_bytes: int = REVIEW_BYTES, n_workers: int = 1,
+                   minimum: int = 1000, maximum: int = 1000000) -> int:
+        """Returns the rows of a reader chunk, using a quarter of each worker's share of the
+        available memory.
+
+        Args:
+            row_bytes: Approximate resident bytes of a row while it is parsed.
+            n_workers: Number of workers reading concurrently.
+            minimum: Smallest chunk.
+            maximum: Largest chunk.
+
+        Returns:
+            Number of rows.
+        """
+        return _clip(self.available() // (4 * max(n_workers, 1) * row_bytes), minimum, maximum)
+
+    def scoring_budget(self, n_workers: int = 1, minimum: int = 1 << 26,
+                       maximum: int = 1 << 32) -> int:
+        """Returns the working memory of a scoring stage, half of each worker's share of the
+        available memory."""
+        return _clip(self.available() // (2 * max(n_workers, 1)), minimum, maximum)
+
+    def adjust(self, size: int, maximum: int, minimum: int = 1000) -> int:
+        """Returns a chunk size adjusted to the measured RSS.
+
+        Args:
+            size: Current chunk size.
+            maximum: Largest chunk size, typically the planned one.
+            minimum: Smallest chunk size.
+
+        Returns:
+            Half the size above the high watermark, one and a half times the size below the low
+            watermark, and the size otherwise, clipped to [minimum, maximum].
+        """
+        usage = rss() / self.budget
+        if usage > self.high:
+            adjusted = _clip(size // 2, minimum, maximum)
+            if adjusted < size:
+                logger.warning("RSS at {:.0%} of the memory budget, chunk size reduced to {:,}"
+                               .format(usage, adjusted))
+            return adjusted
+        if usage < self.low:
+            return _clip(size * 3 // 2, minimum, maximum)
+        return size
+
+
+def _clip(value: int, minimum: int, maximum: int) -> int:
+    return int(max(minimum, min(maximum, value)))
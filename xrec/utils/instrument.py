@@ -0,0 +1,307 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+# ======================================================================================================================== #
+# Project  : Explainable Recommendation (XRec)                                                                             #
+# Version  : 0.1.0                                                                                                         #
+# File     : \instrument.py                                                                                                #
+# Language : Python 3.8                                                                                                    #
+# ------------------------------------------------------------------------------------------------------------------------ #
+# Author   : John James                                                                                                    #
+# Company  : Bryant St. Labs                                                                                               #
+# Email    : john.james.ai.studio@gmail.com                                                                                #
+# URL      : https://github.com/john-james-ai/xrec                                                                         #
+# ------------------------------------------------------------------------------------------------------------------------ #
+# Created  : Monday, October 19th 2026, 9:00:00 am                                                                         #
+# Modified : Monday, October 19th 2026, 9:00:00 am                                                                         #
+# Modifier : John James (john.james.ai.studio@gmail.com)                                                                   #
+# ------------------------------------------------------------------------------------------------------------------------ #
+# License  : BSD 3-clause "New" or "Revised" License                                                                       #
+# Copyright: (c) 2021 Bryant St. Labs                                                                                      #
+# ======================================================================================================================== #
+import os
+import sys
+import glob
+import json
+import time
+import socket
+import logging
+import argparse
+import resource
+import threading
+import functools
+from typing import Callable
+# ------------------------------------------------------------------------------------------------------------------------ #
+logger = logging.getLogger(__name__)
+# ------------------------------------------------------------------------------------------------------------------------ #
+ENVIRONMENT = 'XREC_INSTRUMENT_DIR'
+_local = threading.local()
+# ------------------------------------------------------------------------------------------------------------------------ #
+
+
+def enable(directory: str) -> None:
+    """Starts writing the events of instrumented stages to a directory.
+
+    The directory is passed through the environment, so worker processes started afterwards,
+    by fork or spawn, write their events to it as well.
+
+    Args:
+        directory: Directory of the event files. Created if missing.
+    """
+    os.makedirs(directory, exist_ok=True)
+    os.environ[ENVIRONMENT] = os.path.abspath(directory)
+
+
+def disable() -> None:
+    """Stops writing events. Instrumented functions then run without measurement."""
+    os.environ.pop(ENVIRONMENT, None)
+
+
+def event_directory() -> str:
+    """Returns the directory events are written to, or None if instrumentation is disabled."""
+    return os.environ.get(ENVIRONMENT) or None
+
+
+def count(records: int) -> None:
+    """Adds to the records processed by the innermost stage running on this thread, if any."""
+    stack = getattr(_local, 'stack', None)
+    if stack:
+        stack[-1].records += int(records)
+
+
+def rss() -> int:
+    """Returns the current resident set size of this process in bytes."""
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError):
+        usage = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return usage if sys.platform == 'darwin' else usage * 1024
+
+
+class Stage:
+    """Measures the wall time, CPU time, peak RSS and I/O of a pipeline stage.
+
+    CPU time includes that of child processes that have been waited for, such as pool workers.
+    Peak RSS is the largest resident set size of this process sampled during the stage, and the
+    lifetime peak of waited-for child processes. Bytes read and written are the characters moved
+    through read and write system calls by this process, whether or not they reached the disk,
+    and are None where /proc/self/io is not available.
+
+    When instrumentation is enabled, the measurements are also appended as a JSON line to the
+    event file of this process, tagged with the stage name, the process ID and the enclosing
+    stage on the same thread.
+
+    The interface includes:
+        result: Dictionary of the measurements, set when the stage exits.
+        records: Records processed, set by the caller or through count.
+
+    Args:
+        name: Name of the stage.
+        interval: Seconds between RSS samples.
+        tags: Optional dictionary of JSON serializable values added to the event.
+
+    """
+
+    def __init__(self, name: str, interval: float = 0.01, tags: dict = None) -> None:
+        self.name = name
+        self.interval = interval
+        self.tags = tags or {}
+        self.records = 0
+        self.result = None
+        self._peak = 0
+        self._done = threading.Event()
+
+    def __enter__(self) -> "Stage":
+        stack = _local.__dict__.setdefault('stack', [])
+        self._parent = stack[-1].name if stack else None
+        stack.append(self)
+        self._peak = rss()
+        self._sampler = threading.Thread(target=self._sample, daemon=True)
+        self._sampler.start()
+        self._io = _io()
+        self._times = os.times()
+        self._started = time.time()
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, traceback) -> None:
+        seconds = time.perf_counter() - self._start
+        times = os.times()
+        io = _io()
+        self._done.set()
+        self._sampler.join()
+        _local.stack.remove(self)
+        cpu = sum(times[:4]) - sum(self._times[:4])
+        children = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss * 1024
+        read, written = ((io[0] - self._io[0], io[1] - self._io[1]) if io and self._io
+                         else (None, None))
+        self.result = {'seconds': seconds, 'cpu_seconds': cpu, 'peak_rss': self._peak,
+                       'children_peak_rss': children, 'bytes_read': read,
+                       'bytes_written': written, 'records': self.records,
+                       'throughput': self.records / seconds if seconds > 0 else None}
+        logger.debug("Stage {} completed in {:.2f} seconds: {:,} records, peak RSS {:,.0f} MB"
+                     .format(self.name, seconds, self.records, self._peak / 2 ** 20))
+        directory = event_directory()
+        if directory:
+            event = dict(stage=self.name, parent=self._parent, pid=os.getpid(),
+                         host=socket.gethostname(), start=self._started,
+                         error=exc_type.__name__ if exc_type else None, **self.result)
+            if self.tags:
+                event['tags'] = self.tags
+            _write(directory, event)
+
+    def _sample(self) -> None:
+        while not self._done.wait(self.interval):
+            self._peak = max(self._peak, rss())
+        self._peak = max(self._peak, rss())
+
+
+def instrumented(name: str = None, records: Callable = None) -> Callable:
+    """Decorates a function or method to run as a stage while instrumentation is enabled.
+
+    While it is disabled the function is called directly, with no measurement.
+
+    Args:
+        name: Name of the stage. Defaults to the qualified name of the function.
+        records: Optional function of the return value giving the records processed. The
+            function may instead report them through count.
+
+    Returns:
+        Decorator.
+    """
+    def decorator(function: Callable) -> Callable:
+        stage_name = name or function.__qualname__
+
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            if not event_directory():
+                return function(*args, **kwargs)
+            with Stage(stage_name) as stage:
+                result = function(*args, **kwargs)
+                if records is not None:
+                    stage.records += int(records(result))
+            return result
+        return wrapper
+    return decorator
+
+
+def merge(directory: str) -> list:
+    """Reads the events of every process from a directory, ordered by start time.
+
+    Lines that cannot be parsed, such as one cut short by a killed worker, are skipped.
+
+    Args:
+        directory: Directory of the event files.
+
+    Returns:
+        List of event dictionaries.
+    """
+    events = []
+    for path in sorted(glob.glob(os.path.join(directory, 'events-*.jsonl'))):
+        with open(path) as f:
+            for line in f:
+                try:
+                    events.append(json.loads(line))
+                except ValueError:
+                    logger.warning("Skipping a malformed event in {}".format(path))
+    return sorted(events, key=lambda e: e['start'])
+
+
+def summarize(events: list) -> dict:
+    """Aggregates events by stage.
+
+    Wall and CPU times, bytes and records are summed over the calls of each stage, and peak RSS
+    is the largest of any call. Stages nest, so the times of a stage include those of the stages
+    it encloses on the same thread. The share of each stage is its summed wall time relative to
+    the span of the run, and exceeds 1 when its calls overlap across workers.
+
+    Args:
+        events: Events from merge.
+
+    Returns:
+        Dictionary with the span of the run in seconds, and the totals of each stage ordered
+        by descending wall time.
+    """
+    if not events:
+        return {'seconds': 0.0, 'stages': {}}
+    span = max(e['start'] + e['seconds'] for e in events) - min(e['start'] for e in events)
+    stages = {}
+    for e in events:
+        s = stages.setdefault(e['stage'], {'calls': 0, 'errors': 0, 'pids': set(),
+                                           'seconds': 0.0, 'cpu_seconds': 0.0, 'peak_rss': 0,
+                                           'bytes_read': 0, 'bytes_written': 0, 'records': 0})
+        s['calls'] += 1
+        s['errors'] += e.get('error') is not None
+        s['pids'].add((e.get('host'), e['pid']))
+        s['peak_rss'] = max(s['peak_rss'], e['peak_rss'])
+        for key in ('seconds', 'cpu_seconds', 'bytes_read', 'bytes_written', 'records'):
+            s[key] += e.get(key) or 0
+    for s in stages.values():
+        s['pids'] = len(s['pids'])
+        s['share'] = s['seconds'] / span if span > 0 else None
+        s['throughput'] = s['records'] / s['seconds'] if s['seconds'] > 0 else None
+    ordered = sorted(stages.items(), key=lambda item: -item[1]['seconds'])
+    return {'seconds': span, 'stages': dict(ordered)}
+
+
+def report(directory: str) -> str:
+    """Formats the summary of the events in a directory as a table.
+
+    Args:
+        directory: Directory of the event files.
+
+    Returns:
+        Text of the report.
+    """
+    summary = summarize(merge(directory))
+    lines = ["Run of {:.2f} seconds".format(summary['seconds']),
+             "{:<40} {:>6} {:>5} {:>10} {:>7} {:>10} {:>12} {:>10} {:>10} {:>12}".format(
+                 'stage', 'calls', 'pids', 'seconds', 'share', 'cpu', 'peak RSS MB', 'read MB',
+                 'write MB', 'records')]
+    for name, s in summary['stages'].items():
+        lines.append("{:<40} {:>6} {:>5} {:>10.2f} {:>7.1%} {:>10.2f} {:>12,.0f} {:>10,.1f} "
+                     "{:>10,.1f} {:>12,}".format(
+                         name[:40], s['calls'], s['pids'], s['seconds'], s['share'] or 0,
+                         s['cpu_seconds'], s['peak_rss'] / 2 ** 20, s['bytes_read'] / 2 ** 20,
+                         s['bytes_written'] / 2 ** 20, s['records']))
+    return "\n".join(lines)
+
+
+def _write(directory: str, event: dict) -> None:
+    """Appends an event to the file of this process as a single write.
+
+    The file is named after the host as well as the process, since processes of different hosts
+    sharing the directory may have the same ID.
+    """
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(directory, 'events-{}-{}.jsonl'.format(socket.gethostname(), os.getpid()))
+    with open(path, 'a') as f:
+        f.write(json.dumps(event) + '\n')
+
+
+def _io() -> tuple:
+    """Returns the characters read and written by this process, or None if unavailable."""
+    try:
+        with open('/proc/self/io') as f:
+            counters = dict(line.split(':') for line in f)
+        return int(counters['rchar']), int(counters['wchar'])
+    except (OSError, KeyError, ValueError):
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Summarizes the instrumentation events of a run")
+    parser.add_argument('directory', help="Directory of the event files.")
+    parser.add_argument('--output', help="Optional JSON file for the summary.")
+    args = parser.parse_args()
+
+    print(report(args.directory))
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(summarize(merge(args.directory)), f, indent=2)
+
+
+if __name__ == '__main__':
+    log_fmt = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    logging.basicConfig(level=logging.INFO, format=log_fmt)
+    main()
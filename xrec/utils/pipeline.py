@@ -0,0 +1,287 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+# ======================================================================================================================== #
+# Project  : Explainable Recommendation (XRec)                                                                             #
+# Version  : 0.1.0                                                                                                         #
+# File     : \pipeline.py                                                                                                  #
+# Language : Python 3.8                                                                                                    #
+# ------------------------------------------------------------------------------------------------------------------------ #
+# Author   : John James                                                                                                    #
+# Company  : Bryant St. Labs                                                                                               #
+# Email    : john.james.ai.studio@gmail.com                                                                                #
+# URL      : https://github.com/john-james-ai/xrec                                                                         #
+# ------------------------------------------------------------------------------------------------------------------------ #
+# Created  : Monday, October 19th 2026, 9:00:00 am                                                                         #
+# Modified : Monday, October 19th 2026, 9:00:00 am                                                                         #
+# Modifier : John James (john.james.ai.studio@gmail.com)                                                                   #
+# ------------------------------------------------------------------------------------------------------------------------ #
+# License  : BSD 3-clause "New" or "Revised" License                                                                       #
+# Copyright: (c) 2021 Bryant St. Labs                                                                                      #
+# ======================================================================================================================== #
+import os
+import json
+import time
+import hashlib
+import logging
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from typing import Callable
+from xrec.utils.instrument import Stage, event_directory
+from xrec.utils.workqueue import QueueExecutor
+# ------------------------------------------------------------------------------------------------------------------------ #
+logger = logging.getLogger(__name__)
+# ------------------------------------------------------------------------------------------------------------------------ #
+
+
+class Task:
+    """A stage of a pipeline: a function and the paths it reads and writes.
+
+    The interface includes:
+        name: Unique name of the task.
+        function: Module level function called with the params as keyword arguments.
+        inputs: Files or directories read by the task.
+        outputs: Files or directories written by the task.
+        params: Dictionary of JSON serializable keyword arguments.
+        options: Dictionary of keyword arguments that do not change the outputs, such as worker
+            counts, and are left out of the fingerprint.
+        after: Names of tasks that must complete first, beyond those writing the inputs.
+        workers: Number of workers of the budget the task occupies, e.g. the size of a pool it
+            starts.
+
+    Args:
+        name: Unique name of the task.
+        function: Module level function, so it can be sent to a worker process.
+        inputs: Optional list of paths read by the task.
+        outputs: Optional list of paths written by the task.
+        params: Optional dictionary of keyword arguments of the function.
+        options: Optional dictionary of keyword arguments left out of the fingerprint.
+        after: Optional list of names of tasks to run first.
+        workers: Number of workers the task occupies.
+
+    """
+
+    def __init__(self, name: str, function: Callable, inputs: list = None, outputs: list = None,
+                 params: dict = None, options: dict = None, after: list = None,
+                 workers: int = 1) -> None:
+        self.name = name
+        self.function = function
+        self.inputs = [os.path.abspath(p) for p in inputs or []]
+        self.outputs = [os.path.abspath(p) for p in outputs or []]
+        self.params = params or {}
+        self.options = options or {}
+        self.after = list(after or [])
+        self.workers = max(1, workers)
+
+
+class Pipeline:
+    """Runs a DAG of tasks, skipping those whose inputs and parameters are unchanged.
+
+    A task depends on the tasks that write its inputs, or directories containing them, and on
+    the tasks it names as after. Tasks whose dependencies have completed run concurrently in
+    worker processes, as long as the workers they occupy fit in the budget. A task wider than
+    the budget runs alone.
+
+    The fingerprint of a task is a hash of its function, its parameters, and the path, size and
+    modification time of every file of its inputs. It is recorded in a JSON state file when the
+    task completes, after the task ran, so a task that updates one of its own inputs is not run
+    again because of it. A task is skipped if its fingerprint matches the recorded one and all
+    of its outputs exist.
+
+    With a queue, tasks are run by the workers of a shared work queue, typically on several
+    machines, and by this process, instead of by local worker processes. The worker budget
+    then bounds the workers the tasks in flight occupy across all machines.
+
+    The interface includes:
+        add: Adds a task.
+        dependencies: Returns the names of the tasks each task depends on.
+        order: Returns the tasks in a topological order.
+        fingerprint: Returns the current fingerprint of a task.
+        run: Runs the tasks that are out of date.
+
+    Args:
+        state: JSON file of the recorded fingerprints.
+        n_workers: Worker budget. Defaults to the number of CPUs.
+        queue: Optional SQLite database of a WorkQueue on a shared filesystem.
+
+    """
+
+    def __init__(self, state: str, n_workers: int = None, queue: str = None) -> None:
+        self.state = state
+        self.n_workers = n_workers or os.cpu_count() or 1
+        self.queue = queue
+        self.tasks = {}
+
+    def add(self, name: str, function: Callable, inputs: list = None, outputs: list = None,
+            params: dict = None, options: dict = None, after: list = None,
+            workers: int = 1) -> Task:
+        """Adds a task. See Task for the arguments.
+
+        Raises:
+            ValueError: If a task of the same name exists.
+        """
+        if name in self.tasks:
+            raise ValueError("Duplicate task {}".format(name))
+        self.tasks[name] = Task(name, function, inputs, outputs, params, options, after,
+                                workers)
+        return self.tasks[name]
+
+    def dependencies(self) -> dict:
+        """Returns a dictionary of the names of the tasks each task depends on.
+
+        Raises:
+            KeyError: If a task runs after an unknown task.
+        """
+        writers = [(path, task.name) for task in self.tasks.values() for path in task.outputs]
+        dependencies = {}
+        for task in self.tasks.values():
+            names = {name for path in task.inputs for output, name in writers
+                     if _contains(output, path) or _contains(path, output)}
+            for name in task.after:
+                if name not in self.tasks:
+                    raise KeyError("Task {} runs after unknown task {}".format(task.name, name))
+                names.add(name)
+            names.discard(task.name)
+            dependencies[task.name] = names
+        return dependencies
+
+    def order(self, targets: list = None) -> list:
+        """Returns the names of the tasks, or of the targets and their ancestors, in a
+        topological order.
+
+        Raises:
+            ValueError: If the tasks form a cycle.
+        """
+        dependencies = self.dependencies()
+        ordered, visiting, done = [], set(), set()
+
+        def visit(name):
+            if name in done:
+                return
+            if name in visiting:
+                raise ValueError("Cycle through task {}".format(name))
+            visiting.add(name)
+            for dependency in sorted(dependencies[name]):
+                visit(dependency)
+            visiting.discard(name)
+            done.add(name)
+            ordered.append(name)
+
+        for name in targets or self.tasks:
+            visit(name)
+        return ordered
+
+    def fingerprint(self, name: str) -> str:
+        """Returns the fingerprint of a task from its function, parameters and inputs."""
+        task = self.tasks[name]
+        digest = hashlib.sha1()
+        digest.update('{}.{}'.format(task.function.__module__,
+                                     task.function.__qualname__).encode())
+        digest.update(json.dumps(task.params, sort_keys=True, default=str).encode())
+        for path in task.inputs:
+            for entry in _files(path):
+                digest.update(json.dumps(entry).encode())
+        return digest.hexdigest()
+
+    def run(self, targets: list = None, force: list = None) -> dict:
+        """Runs the tasks that are out of date, skipping the others.
+
+        Args:
+            targets: Optional names of the tasks to bring up to date, with their ancestors.
+                Defaults to all.
+            force: Optional names of tasks to run even if they are up to date.
+
+        Returns:
+            Dictionary of the status of each task, 'completed' or 'skipped', and its seconds.
+
+        Raises:
+            Exception: The first exception raised by a task, once the running tasks complete.
+        """
+        dependencies = self.dependencies()
+        pending = self.order(targets)
+        force = set(force or [])
+        recorded = self._load()
+        results, running, stale, used, error = {}, {}, set(), 0, None
+        if self.queue:
+            pool = QueueExecutor(self.queue, work=True)
+        else:
+            pool = ProcessPoolExecutor(max_workers=min(self.n_workers, max(len(pending), 1)))
+        with pool:
+            while pending or running:
+                for name in list(pending):
+                    if error is not None or not dependencies[name] <= set(results):
+                        continue
+                    task = self.tasks[name]
+                    if name not in stale:
+                        if (name not in force and recorded.get(name) == self.fingerprint(name)
+                                and all(os.path.exists(p) for p in task.outputs)):
+                            pending.remove(name)
+                            results[name] = {'status': 'skipped', 'seconds': 0.0}
+                            logger.info("Skipped {}: up to date".format(name))
+                            continue
+                        stale.add(name)
+                    if running and used + task.workers > self.n_workers:
+                        continue
+                    pending.remove(name)
+                    used += task.workers
+                    logger.info("Started {}".format(name))
+                    future = pool.submit(_execute, name, task.function,
+                                         dict(task.params, **task.options))
+                    running[future] = (name, time.perf_counter())
+                if not running:
+                    break
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    name, started = running.pop(future)
+                    used -= self.tasks[name].workers
+                    if future.exception() is not None:
+                        logger.error("Task {} failed: {}".format(name, future.exception()))
+                        error = error or future.exception()
+                        continue
+                    recorded[name] = self.fingerprint(name)
+                    self._save(recorded)
+                    results[name] = {'status': 'completed',
+                                     'seconds': time.perf_counter() - started}
+                    logger.info("Completed {} in {:.2f} seconds".format(
+                        name, results[name]['seconds']))
+        if error is not None:
+            raise error
+        return results
+
+    def _load(self) -> dict:
+        if not os.path.isfile(self.state):
+            return {}
+        with open(self.state) as f:
+            return json.load(f)
+
+    def _save(self, recorded: dict) -> None:
+        os.makedirs(os.path.dirname(os.path.abspath(self.state)), exist_ok=True)
+        temporary = self.state + '.tmp'
+        with open(temporary, 'w') as f:
+            json.dump(recorded, f, indent=2, sort_keys=True)
+        os.replace(temporary, self.state)
+
+
+def _execute(name: str, function: Callable, params: dict):
+    """Runs a task in a worker, as an instrumented stage when instrumentation is enabled."""
+    if not event_directory():
+        return function(**params)
+    with Stage(name):
+        return function(**params)
+
+
+def _contains(directory: str, path: str) -> bool:
+    return path == directory or path.startswith(directory.rstrip(os.sep) + os.sep)
+
+
+def _files(path: str) -> list:
+    """Returns the path, size and modification time of a file or of every file of a directory."""
+    if os.path.isfile(path):
+        stat = os.stat(path)
+        return [[path, stat.st_size, stat.st_mtime_ns]]
+    if not os.path.isdir(path):
+        return [[path, None, None]]
+    entries = []
+    for root, directories, files in os.walk(path):
+        directories.sort()
+        for name in sorted(files):
+            entries.extend(_files(os.path.join(root, name)))
+    return entries
@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+# ======================================================================================================================== #
+# Project  : Explainable Recommendation (XRec)                                                                             #
+# Version  : 0.1.0                                                                                                         #
+# File     : \sparse.py                                                                                                    #
+# Language : Python 3.8                                                                                                    #
+# ------------------------------------------------------------------------------------------------------------------------ #
+# Author   : John James                                                                                                    #
+# Company  : Bryant St. Labs                                                                                               #
+# Email    : john.james.ai.studio@gmail.com                                                                                #
+# URL      : https://github.com/john-james-ai/xrec                                                                         #
+# ------------------------------------------------------------------------------------------------------------------------ #
+# Created  : Monday, October 19th 2026, 9:00:00 am                                                                         #
+# Modified : Monday, October 19th 2026, 9:00:00 am                                                                         #
+# Modifier : John James (john.james.ai.studio@gmail.com)                                                                   #
+# ------------------------------------------------------------------------------------------------------------------------ #
+# License  : BSD 3-clause "New" or "Revised" License                                                                       #
+# Copyright: (c) 2021 Bryant St. Labs                                                                                      #
+# ======================================================================================================================== #
+import numpy as np
+from scipy import sparse
+# ------------------------------------------------------------------------------------------------------------------------ #
+
+
+def csr_row_ids(X: sparse.csr_matrix) -> np.ndarray:
+    """Returns the row index of every stored element of a CSR matrix.
+
+    Args:
+        X: CSR matrix.
+
+    Returns:
+        int32 array of length X.nnz aligned with X.indices.
+    """
+    return np.repeat(np.arange(X.shape[0], dtype=np.int32), np.diff(X.indptr))
+
+
+def csr_contains(X: sparse.csr_matrix, rows: np.ndarray, cols: np.ndarray) -> np.ndarray:
+    """Tests whether each (row, col) pair is stored in a CSR matrix.
+
+    A vectorized binary search is run over the sorted column indices of each requested row, so
+    the cost is O(len(rows) * log(max row length)) with no per-pair Python work and no auxiliary
+    hash structures.
+
+    Args:
+        X: CSR matrix with sorted indices.
+        rows: Row index of each pair.
+        cols: Column index of each pair.
+
+    Returns:
+        Boolean array, True where the pair is a stored element of X.
+    """
+    if not X.has_sorted_indices:
+        X.sort_indices()
+    rows = np.asarray(rows)
+    cols = np.asarray(cols)
+    lo = X.indptr[rows].astype(np.int64)
+    hi = X.indptr[rows + 1].astype(np.int64)
+    end = hi.copy()
+    idx = np.flatnonzero(lo < hi)
+    while idx.size:
+        mid = (lo[idx] + hi[idx]) >> 1
+        less = X.indices[mid] < cols[idx]
+        lo[idx] = np.where(less, mid + 1, lo[idx])
+        hi[idx] = np.where(less, hi[idx], mid)
+        idx = idx[lo[idx] < hi[idx]]
+
+    found = lo < end
+    found[found] = X.indices[lo[found]] == cols[found]
+    return found
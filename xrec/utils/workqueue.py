@@ -0,0 +1,447 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+# ======================================================================================================================== #
+# Project  : Explainable Recommendation (XRec)                                                                             #
+# Version  : 0.1.0                                                                                                         #
+# File     : \workqueue.py                                                                                                 #
+# Language : Python 3.8                                                                                                    #
+# ------------------------------------------------------------------------------------------------------------------------ #
+# Author   : John James                                                                                                    #
+# Company  : Bryant St. Labs                                                                                               #
+# Email    : john.james.ai.studio@gmail.com                                                                                #
+# URL      : https://github.com/john-james-ai/xrec                                                                         #
+# ------------------------------------------------------------------------------------------------------------------------ #
+# Created  : Monday, October 19th 2026, 9:00:00 am                                                                         #
+# Modified : Monday, October 19th 2026, 9:00:00 am                                                                         #
+# Modifier : John James (john.james.ai.studio@gmail.com)                                                                   #
+# ------------------------------------------------------------------------------------------------------------------------ #
+# License  : BSD 3-clause "New" or "Revised" License                                                                       #
+# Copyright: (c) 2021 Bryant St. Labs                                                                                      #
+# ======================================================================================================================== #
+import os
+import time
+import uuid
+import pickle
+import socket
+import sqlite3
+import logging
+import argparse
+import inspect
+import importlib
+import threading
+from concurrent.futures import Future
+from typing import Callable
+# ------------------------------------------------------------------------------------------------------------------------ #
+logger = logging.getLogger(__name__)
+# ------------------------------------------------------------------------------------------------------------------------ #
+PENDING, CLAIMED, DONE, FAILED = 'pending', 'claimed', 'done', 'failed'
+# ------------------------------------------------------------------------------------------------------------------------ #
+
+
+class WorkQueue:
+    """Queue of work units in a SQLite database on a filesystem shared by several machines.
+
+    A unit is a module level function and its keyword arguments, both pickled, so any worker
+    with the same code can run it. A worker claims a unit with a lease that expires unless it is
+    renewed by heartbeats. A unit whose lease expired, because its worker died or lost the
+    shared filesystem, can be claimed again by another worker, up to max_attempts times, after
+    which it fails. Results are only accepted from the worker holding the lease, so units
+    should be idempotent: a stalled worker may still be running a unit that was reclaimed.
+
+    Claims run in immediate transactions, which take the database lock, so a unit is claimed by
+    a single worker. The database keeps the default rollback journal, since write-ahead logging
+    needs shared memory that network filesystems do not provide. Leases compare wall clocks of
+    different machines, which should be synchronized to well within the lease.
+
+    The interface includes:
+        put: Adds units.
+        claim: Claims the next available unit.
+        heartbeat: Renews the lease of a claimed unit.
+        complete: Records the result of a claimed unit.
+        fail: Records the failure of a claimed unit, making it available again if attempts
+            remain.
+        status: Returns the state, result and error of units.
+        counts: Returns the number of units in each state.
+        finished: Returns True if no unit is pending or claimed.
+
+    Args:
+        path: SQLite database file on the shared filesystem.
+        lease: Seconds a claim lasts without a heartbeat.
+        max_attempts: Number of claims of a unit before it fails.
+        worker: Name of this worker. Defaults to the host name and process ID.
+
+    """
+
+    def __init__(self, path: str, lease: float = 60.0, max_attempts: int = 3,
+                 worker: str = None) -> None:
+        self.path = path
+        self.lease = lease
+        self.max_attempts = max_attempts
+        self._worker = worker
+        self._lock = threading.Lock()
+        self._connection = None
+        self._pid = None
+
+    @property
+    def worker(self) -> str:
+        return self._worker or '{}:{}'.format(socket.gethostname(), os.getpid())
+
+    def put(self, units: list) -> list:
+        """Adds units, ignoring those whose key is already queued.
+
+        Args:
+            units: List of (key, function, kwargs) tuples. The key is None for a new unique key,
+                and the function a module level function or its 'module:name' path.
+
+        Returns:
+            List of the keys of the units.
+        """
+        now = time.time()
+        rows, keys = [], []
+        for key, function, kwargs in units:
+            key = key or uuid.uuid4().hex
+            keys.append(key)
+            rows.append((key, _path(function), pickle.dumps(kwargs or {}), PENDING, now, now))
+        with self._transaction() as connection:
+            connection.executemany("INSERT OR IGNORE INTO units (key, function, kwargs, state, "
+                                   "attempts, created, updated) VALUES (?, ?, ?, ?, 0, ?, ?)",
+                                   rows)
+        return keys
+
+    def claim(self) -> dict:
+        """Claims the oldest pending unit, or a unit whose lease expired.
+
+        Returns:
+            Dictionary of the key, function, kwargs and attempt number of the unit, or None if
+            no unit is available.
+        """
+        with self._transaction() as connection:
+            while True:
+                now = time.time()
+                row = connection.execute(
+                    "SELECT key, function, kwargs, attempts, state FROM units WHERE state = ? OR "
+                    "(state = ? AND expires < ?) ORDER BY created, key LIMIT 1",
+                    (PENDING, CLAIMED, now)).fetchone()
+                if row is None:
+                    return None
+                key, function, kwargs, attempts, state = row
+                if attempts >= self.max_attempts:
+                    connection.execute("UPDATE units SET state = ?, error = ?, updated = ? "
+                                       "WHERE key = ?",
+                                       (FAILED, "Lease expired after {} attempts".format(attempts),
+                                        now, key))
+                    continue
+                if state == CLAIMED:
+                    logger.warning("Reclaiming unit {} from an expired lease".format(key))
+                connection.execute("UPDATE units SET state = ?, owner = ?, expires = ?, "
+                                   "attempts = ?, updated = ? WHERE key = ?",
+                                   (CLAIMED, self.worker, now + self.lease, attempts + 1, now,
+                                    key))
+                return {'key': key, 'function': function, 'kwargs': pickle.loads(kwargs),
+                        'attempt': attempts + 1}
+
+    def heartbeat(self, key: str) -> bool:
+        """Renews the lease of a unit claimed by this worker.
+
+        Returns:
+            False if the lease was lost, e.g. reclaimed after it expired.
+        """
+        now = time.time()
+        with self._transaction() as connection:
+            cursor = connection.execute("UPDATE units SET expires = ?, updated = ? WHERE key = ? "
+                                        "AND state = ? AND owner = ?",
+                                        (now + self.lease, now, key, CLAIMED, self.worker))
+            return cursor.rowcount == 1
+
+    def complete(self, key: str, result=None) -> bool:
+        """Records the result of a unit claimed by this worker.
+
+        Returns:
+            False if the lease was lost, in which case the result is discarded.
+        """
+        with self._transaction() as connection:
+            cursor = connection.execute("UPDATE units SET state = ?, result = ?, updated = ? "
+                                        "WHERE key = ? AND state = ? AND owner = ?",
+                                        (DONE, pickle.dumps(result), time.time(), key, CLAIMED,
+                                         self.worker))
+            return cursor.rowcount == 1
+
+    def fail(self, key: str, error: str) -> bool:
+        """Records the failure of a unit claimed by this worker.
+
+        The unit becomes pending again if it has attempts left, and fails otherwise.
+
+        Returns:
+            False if the lease was lost.
+        """
+        with self._transaction() as connection:
+            cursor = connection.execute(
+                "UPDATE units SET state = CASE WHEN attempts < ? THEN ? ELSE ? END, error = ?, "
+                "updated = ? WHERE key = ? AND state = ? AND owner = ?",
+                (self.max_attempts, PENDING, FAILED, error, time.time(), key, CLAIMED,
+                 self.worker))
+            return cursor.rowcount == 1
+
+    def status(self, keys: list) -> dict:
+        """Returns a dictionary of the state, result and error of each of the given units."""
+        status = {}
+        with self._transaction() as connection:
+            for first in range(0, len(keys), 500):
+                chunk = list(keys[first:first + 500])
+                rows = connection.execute(
+                    "SELECT key, state, result, error FROM units WHERE key IN ({})".format(
+                        ','.join('?' * len(chunk))), chunk)
+                for key, state, result, error in rows:
+                    status[key] = {'state': state, 'error': error,
+                                   'result': pickle.loads(result) if result is not None else None}
+        return status
+
+    def counts(self) -> dict:
+        """Returns the number of units in each state."""
+        with self._transaction() as connection:
+            rows = connection.execute("SELECT state, COUNT(*) FROM units GROUP BY state")
+            return dict({PENDING: 0, CLAIMED: 0, DONE: 0, FAILED: 0}, **dict(rows.fetchall()))
+
+    def finished(self) -> bool:
+        """Returns True if no unit is pending or claimed."""
+        counts = self.counts()
+        return counts[PENDING] + counts[CLAIMED] == 0
+
+    def _transaction(self):
+        return _Transaction(self)
+
+    def _connect(self) -> sqlite3.Connection:
+        """Returns this process's connection, opening it after a fork."""
+        if self._connection is None or self._pid != os.getpid():
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            self._connection = sqlite3.connect(self.path, timeout=60, isolation_level=None,
+                                               check_same_thread=False)
+            self._connection.execute("CREATE TABLE IF NOT EXISTS units (key TEXT PRIMARY KEY, "
+                                     "function TEXT, kwargs BLOB, state TEXT, owner TEXT, "
+                                     "expires REAL, attempts INTEGER, result BLOB, error TEXT, "
+                                     "created REAL, updated REAL)")
+            self._connection.execute("CREATE INDEX IF NOT EXISTS units_state ON units "
+                                     "(state, created)")
+            self._pid = os.getpid()
+        return self._connection
+
+
+class _Transaction:
+    """Holds the queue's thread lock and an immediate transaction, committed on success."""
+
+    def __init__(self, queue: WorkQueue) -> None:
+        self._queue = queue
+
+    def __enter__(self) -> sqlite3.Connection:
+        self._queue._lock.acquire()
+        try:
+            self._connection = self._queue._connect()
+            self._connection.execute("BEGIN IMMEDIATE")
+        except BaseException:
+            self._queue._lock.release()
+            raise
+        return self._connection
+
+    def __exit__(self, exc_type, exc, traceback) -> None:
+        try:
+            self._connection.execute("ROLLBACK" if exc_type else "COMMIT")
+        finally:
+            self._queue._lock.release()
+
+
+class QueueExecutor:
+    """Runs functions as units of a WorkQueue, returning futures like an Executor.
+
+    A thread polls the queue for the state of the submitted units and resolves their futures,
+    so code written against concurrent.futures, e.g. with wait or as_completed, can fan work
+    out to workers on other machines. With work True, the submitting process also runs units
+    while it waits. A poll that fails, e.g. on a database locked past its timeout, is logged
+    and retried at the next one, and after max_errors consecutive failures the outstanding
+    futures fail rather than never resolve.
+
+    The interface includes:
+        submit: Queues a function call and returns its future.
+        shutdown: Stops polling, after waiting for the submitted units unless wait is False.
+
+    Args:
+        queue: WorkQueue, or the path of its database.
+        poll: Seconds between polls of the queue.
+        work: True to also run units in this process.
+        max_errors: Number of consecutive failed polls after which the futures fail.
+
+    """
+
+    def __init__(self, queue, poll: float = 0.5, work: bool = False,
+                 max_errors: int = 10) -> None:
+        self.queue = queue if isinstance(queue, WorkQueue) else WorkQueue(queue)
+        self.poll = poll
+        self.max_errors = max_errors
+        self._futures = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._poll, daemon=True)
+        self._thread.start()
+        self._worker = None
+        if work:
+            self._worker = threading.Thread(target=run_worker, args=(self.queue,),
+                                            kwargs={'poll': poll, 'stop': self._stop},
+                                            daemon=True)
+            self._worker.start()
+
+    def submit(self, function: Callable, *args, **kwargs) -> Future:
+        """Queues function(*args, **kwargs) and returns a future of its result.
+
+        Positional arguments are bound to the parameters of the function by name.
+        """
+        if args:
+            kwargs = inspect.signature(function).bind_partial(*args, **kwargs).arguments
+        future = Future()
+        future.set_running_or_notify_cancel()
+        key = self.queue.put([(None, function, kwargs)])[0]
+        with self._lock:
+            self._futures[key] = future
+        return future
+
+    def shutdown(self, wait: bool = True) -> None:
+        while wait and self._futures:
+            time.sleep(self.poll)
+        self._stop.set()
+        self._thread.join()
+        if self._worker is not None:
+            self._worker.join()
+
+    def __enter__(self) -> "QueueExecutor":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.shutdown(wait=exc[0] is None)
+
+    def _poll(self) -> None:
+        errors = 0
+        while not self._stop.wait(self.poll):
+            with self._lock:
+                keys = list(self._futures)
+            if not keys:
+                continue
+            try:
+                statuses = self.queue.status(keys)
+            except sqlite3.Error as e:
+                errors += 1
+                logger.warning("Polling the work queue failed ({} of {}): {}".format(
+                    errors, self.max_errors, e))
+                if errors >= self.max_errors:
+                    self._fail(keys, e)
+                    errors = 0
+                continue
+            errors = 0
+            for key, status in statuses.items():
+                if status['state'] not in (DONE, FAILED):
+                    continue
+                with self._lock:
+                    future = self._futures.pop(key)
+                if status['state'] == DONE:
+                    future.set_result(status['result'])
+                else:
+                    future.set_exception(RuntimeError("Unit {} failed: {}".format(
+                        key, status['error'])))
+
+    def _fail(self, keys: list, error: Exception) -> None:
+        """Fails the futures of units whose state can no longer be read."""
+        logger.error("Failing {} units after {} failed polls of the work queue".format(
+            len(keys), self.max_errors))
+        for key in keys:
+            with self._lock:
+                future = self._futures.pop(key, None)
+            if future is not None:
+                future.set_exception(RuntimeError("Lost the state of unit {}: {}".format(
+                    key, error)))
+
+
+def run_worker(queue, poll: float = 1.0, heartbeat: float = None, max_units: int = None,
+               exit_when_empty: bool = False, stop: threading.Event = None) -> int:
+    """Claims and runs units until stopped.
+
+    While a unit runs, a thread renews its lease every heartbeat seconds. An exception raised
+    by a unit is recorded as its failure.
+
+    Args:
+        queue: WorkQueue, or the path of its database.
+        poll: Seconds to wait when no unit is available.
+        heartbeat: Seconds between lease renewals. Defaults to a third of the lease.
+        max_units: Optional number of units after which to stop.
+        exit_when_empty: True to stop once no unit is pending or claimed.
+        stop: Optional event that stops the worker between units.
+
+    Returns:
+        Number of units run.
+    """
+    queue = queue if isinstance(queue, WorkQueue) else WorkQueue(queue)
+    heartbeat = heartbeat or queue.lease / 3
+    stop = stop or threading.Event()
+    n_units = 0
+    while not stop.is_set() and (max_units is None or n_units < max_units):
+        unit = queue.claim()
+        if unit is None:
+            if exit_when_empty and queue.finished():
+                break
+            stop.wait(poll)
+            continue
+        done = threading.Event()
+        beats = threading.Thread(target=_heartbeat, args=(queue, unit['key'], heartbeat, done),
+                                 daemon=True)
+        beats.start()
+        try:
+            result = _resolve(unit['function'])(**unit['kwargs'])
+        except Exception as e:
+            logger.exception("Unit {} failed".format(unit['key']))
+            done.set()
+            beats.join()
+            queue.fail(unit['key'], '{}: {}'.format(type(e).__name__, e))
+        else:
+            done.set()
+            beats.join()
+            if not queue.complete(unit['key'], result):
+                logger.warning("Discarded the result of unit {}: lease lost".format(unit['key']))
+        n_units += 1
+    return n_units
+
+
+def _heartbeat(queue: WorkQueue, key: str, interval: float, done: threading.Event) -> None:
+    while not done.wait(interval):
+        if not queue.heartbeat(key):
+            logger.warning("Lost the lease of unit {}".format(key))
+            return
+
+
+def _path(function) -> str:
+    if isinstance(function, str):
+        return function
+    return '{}:{}'.format(function.__module__, function.__qualname__)
+
+
+def _resolve(path: str) -> Callable:
+    module, _, name = path.partition(':')
+    target = importlib.import_module(module)
+    for attribute in name.split('.'):
+        target = getattr(target, attribute)
+    return target
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the units of a shared work queue")
+    parser.add_argument('queue', help="SQLite database of the queue on the shared filesystem.")
+    parser.add_argument('--lease', type=float, default=60.0)
+    parser.add_argument('--poll', type=float, default=1.0)
+    parser.add_argument('--max-units', type=int)
+    parser.add_argument('--exit-when-empty', action='store_true')
+    args = parser.parse_args()
+
+    n_units = run_worker(WorkQueue(args.queue, lease=args.lease), poll=args.poll,
+                         max_units=args.max_units, exit_when_empty=args.exit_when_empty)
+    logger.info("Ran {} units".format(n_units))
+
+
+if __name__ == '__main__':
+    log_fmt = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    logging.basicConfig(level=logging.INFO, format=log_fmt)
+    main()
@@ -0,0 +1,352 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+# ======================================================================================================================== #
+# Project  : Explainable Recommendation (XRec)                                                                             #
+# Version  : 0.1.0                                                                                                         #
+# File     : \visualize.py                                                                                                 #
+# Language : Python 3.8                                                                                                    #
+# ------------------------------------------------------------------------------------------------------------------------ #
+# Author   : John James                                                                                                    #
+# Company  : Bryant St. Labs                                                                                               #
+# Email    : john.james.ai.studio@gmail.com                                                                                #
+# URL      : https://github.com/john-james-ai/xrec                                                                         #
+# ------------------------------------------------------------------------------------------------------------------------ #
+# Created  : Monday, October 19th 2026, 9:00:00 am                                                                         #
+# Modified : Monday, October 19th 2026, 9:00:00 am                                                                         #
+# Modifier : John James (john.james.ai.studio@gmail.com)                                                                   #
+# ------------------------------------------------------------------------------------------------------------------------ #
+# License  : BSD 3-clause "New" or "Revised" License                                                                       #
+# Copyright: (c) 2021 Bryant St. Labs                                                                                      #
+# ======================================================================================================================== #
+import os
+import json
+import hashlib
+import logging
+from typing import Iterator
+import numpy as np
+import pandas as pd
+# ------------------------------------------------------------------------------------------------------------------------ #
+logger = logging.getLogger(__name__)
+# ------------------------------------------------------------------------------------------------------------------------ #
+
+
+def iter_parquet(path: str, columns: list, batch_size: int = 1 << 20) -> Iterator[dict]:
+    """Streams columns of a Parquet file or directory of files in record batches.
+
+    Args:
+        path: Parquet file, or directory of Parquet files.
+        columns: Names of the columns to read.
+        batch_size: Maximum number of rows per batch.
+
+    Yields:
+        Dictionaries mapping each column name to a numpy array.
+    """
+    try:
+        import pyarrow.dataset as ds
+    except ImportError:
+        raise ImportError("Streaming Parquet requires pyarrow")
+    for batch in ds.dataset(path, format='parquet').to_batches(columns=columns,
+                                                               batch_size=batch_size):
+        yield {name: batch.column(name).to_numpy(zero_copy_only=False) for name in columns}
+
+
+def iter_arrays(arrays: dict, columns: list = None, batch_size: int = 1 << 20) -> Iterator[dict]:
+    """Streams aligned arrays, e.g. memory-mapped interaction arrays, in batches of rows.
+
+    Args:
+        arrays: Dictionary mapping column names to arrays of equal length.
+        columns: Names of the columns to yield. Defaults to all.
+        batch_size: Number of rows per batch.
+
+    Yields:
+        Dictionaries mapping each column name to a slice of its array.
+    """
+    columns = columns or list(arrays)
+    n = len(arrays[columns[0]])
+    for start in range(0, n, batch_size):
+        yield {name: np.asarray(arrays[name][start:start + batch_size]) for name in columns}
+
+
+def dataset_version(path: str) -> str:
+    """Returns a fingerprint of a file or directory that changes whenever any file changes."""
+    files = [path] if os.path.isfile(path) else sorted(
+        os.path.join(root, name) for root, _, names in os.walk(path) for name in names)
+    digest = hashlib.sha1()
+    for name in files:
+        stat = os.stat(name)
+        digest.update('{}:{}:{}'.format(os.path.relpath(name, path), stat.st_size,
+                                        stat.st_mtime_ns).encode('utf-8'))
+    return digest.hexdigest()[:16]
+
+
+class Histogram:
+    """Counts the values of a column in fixed bins, one batch at a time.
+
+    Args:
+        column: Name of the column.
+        edges: Monotonically increasing bin edges.
+
+    """
+
+    def __init__(self, column: str, edges) -> None:
+        self.column = column
+        self.edges = np.asarray(edges, dtype=np.float64)
+        self.counts = np.zeros(len(self.edges) - 1, dtype=np.int64)
+
+    @property
+    def columns(self) -> list:
+        return [self.column]
+
+    def params(self) -> dict:
+        return {'kind': 'histogram', 'column': self.column, 'edges': self.edges.tolist()}
+
+    def update(self, batch: dict) -> None:
+        self.counts += np.histogram(batch[self.column], bins=self.edges)[0]
+
+    def result(self) -> dict:
+        return {'edges': self.edges, 'counts': self.counts}
+
+
+class Histogram2D:
+    """Counts the pairs of values of two columns in a fixed grid of bins, one batch at a time.
+
+    Args:
+        x: Name of the column along the first axis.
+        y: Name of the column along the second axis.
+        x_edges: Monotonically increasing bin edges of x.
+        y_edges: Monotonically increasing bin edges of y.
+
+    """
+
+    def __init__(self, x: str, y: str, x_edges, y_edges) -> None:
+        self.x = x
+        self.y = y
+        self.x_edges = np.asarray(x_edges, dtype=np.float64)
+        self.y_edges = np.asarray(y_edges, dtype=np.float64)
+        self.counts = np.zeros((len(self.x_edges) - 1, len(self.y_edges) - 1), dtype=np.int64)
+
+    @property
+    def columns(self) -> list:
+        return [self.x, self.y]
+
+    def params(self) -> dict:
+        return {'kind': 'histogram2d', 'x': self.x, 'y': self.y,
+                'x_edges': self.x_edges.tolist(), 'y_edges': self.y_edges.tolist()}
+
+    def update(self, batch: dict) -> None:
+        self.counts += np.histogram2d(batch[self.x], batch[self.y],
+                                      bins=(self.x_edges, self.y_edges))[0].astype(np.int64)
+
+    def result(self) -> dict:
+        return {'x_edges': self.x_edges, 'y_edges': self.y_edges, 'counts': self.counts}
+
+
+class TimeSeries:
+    """Counts the rows of each time bucket, e.g. the monthly review volume, one batch at a time.
+
+    Args:
+        column: Name of a column of Unix timestamps in seconds, or of datetime64 values.
+        unit: numpy datetime unit of the buckets, e.g. 'D', 'W', 'M' or 'Y'.
+
+    """
+
+    def __init__(self, column: str, unit: str = 'M') -> None:
+        self.column = column
+        self.unit = unit
+        self.counts = pd.Series(dtype=np.int64)
+
+    @property
+    def columns(self) -> list:
+        return [self.column]
+
+    def params(self) -> dict:
+        return {'kind': 'time_series', 'column': self.column, 'unit': self.unit}
+
+    def update(self, batch: dict) -> None:
+        values = np.asarray(batch[self.column])
+        if not np.issubdtype(values.dtype, np.datetime64):
+            values = values.astype('datetime64[s]')
+        buckets, counts = np.unique(values.astype('datetime64[{}]'.format(self.unit)),
+                                    return_counts=True)
+        self.counts = self.counts.add(pd.Series(counts, index=buckets), fill_value=0)
+
+    def result(self) -> dict:
+        counts = self.counts.sort_index()
+        return {'buckets': counts.index.values.astype('datetime64[{}]'.format(self.unit)),
+                'counts': counts.values.astype(np.int64)}
+
+
+class DegreeDistribution:
+    """Counts the rows of each key, e.g. reviews per user, and bins the counts logarithmically.
+
+    Integer keys, e.g. dense user indices, are counted with bincount. Other keys, e.g. reviewer
+    IDs, are counted per batch and merged. Only the log-binned distribution of the counts is
+    returned: for each bin of degrees, the number of keys and their density.
+
+    Args:
+        column: Name of the key column.
+        bins_per_decade: Number of logarithmic bins per power of ten of the degree.
+
+    """
+
+    def __init__(self, column: str, bins_per_decade: int = 10) -> None:
+        self.column = column
+        self.bins_per_decade = bins_per_decade
+        self._dense = np.zeros(0, dtype=np.int64)
+        self._sparse = pd.Series(dtype=np.int64)
+
+    @property
+    def columns(self) -> list:
+        return [self.column]
+
+    def params(self) -> dict:
+        return {'kind': 'degrees', 'column': self.column,
+                'bins_per_decade': self.bins_per_decade}
+
+    def update(self, batch: dict) -> None:
+        keys = np.asarray(batch[self.column])
+        if np.issubdtype(keys.dtype, np.integer):
+            counts = np.bincount(keys)
+            if len(counts) > len(self._dense):
+                self._dense = np.concatenate([self._dense, np.zeros(len(counts) - len(self._dense),
+                                                                    dtype=np.int64)])
+            self._dense[:len(counts)] += counts
+        else:
+            self._sparse = self._sparse.add(pd.Series(keys).value_counts(), fill_value=0)
+
+    def degrees(self) -> np.ndarray:
+        """Returns the count of every key seen so far."""
+        dense = self._dense[self._dense > 0]
+        return np.concatenate([dense, self._sparse.values.astype(np.int64)])
+
+    def result(self) -> dict:
+        return log_binned(self.degrees(), self.bins_per_decade)
+
+
+def log_binned(degrees: np.ndarray, bins_per_decade: int = 10) -> dict:
+    """Bins positive degrees logarithmically.
+
+    Args:
+        degrees: Array of positive integer degrees.
+        bins_per_decade: Number of bins per power of ten.
+
+    Returns:
+        Dictionary of the bin edges, the number of keys in each bin and the density, i.e. the
+        fraction of keys per unit of degree, which is comparable across bins of different widths.
+    """
+    degrees = np.asarray(degrees)
+    degrees = degrees[degrees > 0]
+    # Integer edges, so every bin holds whole degrees, starting with the bin [1, 2) and ending
+    # past the largest degree.
+    top = np.log10(degrees.max() + 1) if len(degrees) else np.log10(2)
+    n_bins = max(1, int(np.ceil(top * bins_per_decade)))
+    edges = np.unique(np.concatenate([
+        [1.0, 2.0], np.ceil(np.logspace(0, n_bins / bins_per_decade, n_bins + 1))]))
+    if len(degrees):
+        edges = edges[:np.searchsorted(edges, degrees.max(), side='right') + 1]
+        if edges[-1] <= degrees.max():
+            edges = np.append(edges, degrees.max() + 1.0)
+    counts = np.histogram(degrees, bins=edges)[0]
+    density = counts / max(len(degrees), 1) / np.diff(edges)
+    return {'edges': edges, 'counts': counts.astype(np.int64), 'density': density}
+
+
+def aggregate(batches, aggregators: dict, cache_dir: str = None, version: str = None) -> dict:
+    """Computes several aggregates in a single streaming pass, reusing cached ones.
+
+    Each aggregate is cached as an .npz file keyed by the dataset version and the parameters of
+    its aggregator, so only aggregates that are missing for the current version are computed,
+    and the data is not read at all if every aggregate is cached.
+
+    Args:
+        batches: Iterable of batches, e.g. from iter_parquet or iter_arrays, or a callable
+            taking the list of required columns and returning one.
+        aggregators: Dictionary mapping names to Histogram, Histogram2D, TimeSeries or
+            DegreeDistribution objects.
+        cache_dir: Optional directory of cached aggregates.
+        version: Dataset version, e.g. from dataset_version. Required for caching.
+
+    Returns:
+        Dictionary mapping each name to its aggregate, a dictionary of small arrays.
+    """
+    caching = cache_dir is not None and version is not None
+    results, pending = {}, {}
+    for name, aggregator in aggregators.items():
+        path = _cache_path(cache_dir, version, aggregator) if caching else None
+        if caching and os.path.isfile(path):
+            with np.load(path, allow_pickle=False) as f:
+                results[name] = {key: f[key] for key in f.files}
+        else:
+            pending[name] = aggregator
+    if pending:
+        columns = sorted({column for aggregator in pending.values()
+                          for column in aggregator.columns})
+        rows = 0
+        for batch in (batches(columns) if callable(batches) else batches):
+            for aggregator in pending.values():
+                aggregator.update(batch)
+            rows += len(next(iter(batch.values())))
+        logger.info("Aggregated {:,} rows into {}".format(rows, ', '.join(pending)))
+        for name, aggregator in pending.items():
+            results[name] = aggregator.result()
+            if caching:
+                os.makedirs(cache_dir, exist_ok=True)
+                path = _cache_path(cache_dir, version, aggregator)
+                staging = path + '.tmp.npz'
+                np.savez(staging, **results[name])
+                os.replace(staging, path)
+    return results
+
+
+def _cache_path(cache_dir: str, version: str, aggregator) -> str:
+    key = hashlib.sha1(json.dumps(aggregator.params(), sort_keys=True).encode('utf-8'))
+    return os.path.join(cache_dir, '{}-{}.npz'.format(version, key.hexdigest()[:16]))
+
+
+def _axes(ax):
+    if ax is None:
+        import matplotlib.pyplot as plt
+        _, ax = plt.subplots()
+    return ax
+
+
+def plot_histogram(histogram: dict, ax=None, **kwargs):
+    """Draws a Histogram aggregate as bars and returns the axes."""
+    ax = _axes(ax)
+    edges = histogram['edges']
+    ax.bar(edges[:-1], histogram['counts'], width=np.diff(edges), align='edge', **kwargs)
+    ax.set_ylabel('Count')
+    return ax
+
+
+def plot_histogram2d(histogram: dict, ax=None, log: bool = True, **kwargs):
+    """Draws a Histogram2D aggregate as a heatmap, with a logarithmic color scale by default."""
+    ax = _axes(ax)
+    counts = histogram['counts'].T.astype(np.float64)
+    if log:
+        from matplotlib.colors import LogNorm
+        kwargs.setdefault('norm', LogNorm(vmin=1, vmax=max(counts.max(), 1)))
+        counts[counts == 0] = np.nan
+    mesh = ax.pcolormesh(histogram['x_edges'], histogram['y_edges'], counts, **kwargs)
+    ax.figure.colorbar(mesh, ax=ax, label='Count')
+    return ax
+
+
+def plot_time_series(series: dict, ax=None, **kwargs):
+    """Draws a TimeSeries aggregate as a line of counts per bucket."""
+    ax = _axes(ax)
+    ax.plot(series['buckets'].astype('datetime64[D]'), series['counts'], **kwargs)
+    ax.set_ylabel('Count')
+    return ax
+
+
+def plot_degrees(distribution: dict, ax=None, **kwargs):
+    """Draws a log-binned degree distribution on logarithmic axes."""
+    ax = _axes(ax)
+    edges = distribution['edges']
+    centers = np.sqrt(edges[:-1] * edges[1:])
+    keep = distribution['counts'] > 0
+    ax.loglog(centers[keep], distribution['density'][keep], marker='o', **kwargs)
+    ax.set_xlabel('Degree')
+    ax.set_ylabel('Density')
+    return ax